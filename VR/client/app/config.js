@@ -36,6 +36,14 @@ export function createConfig({ window }) {
     serverHost.startsWith("wss://") && preferInsecureWebSocket
       ? serverHost.replace(/^wss:\/\//, "ws://")
       : null;
+  // HTTP origin of the websocket server, which serves `/assets/<sha256>` when
+  // started with `--serve-assets`.
+  const assetBaseUrl = serverHost.replace(/^ws(s?):\/\//, "http$1://");
+
+  // `scene_state` format requested from the server: binary frames by default,
+  // `?scene_state=delta` for acknowledged deltas, `?scene_state=json` for
+  // plain JSON frames.
+  const sceneStateFormat = searchParams.get("scene_state") ?? "binary";
 
   const calibrationOffset = new THREE.Vector3(
     Number(searchParams.get("ox") ?? 0.0),
@@ -80,6 +88,8 @@ export function createConfig({ window }) {
     isDev,
     serverHost,
     fallbackServerHost,
+    assetBaseUrl,
+    sceneStateFormat,
     preferInsecureWebSocket,
     calibrationOffset,
     initialControllerForward,
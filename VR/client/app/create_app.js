@@ -10,6 +10,12 @@ import {
 import { CHARACTER_MODES_REGISTRY } from "../modes/modes_registry.js";
 
 import { createWindowConfig, createRunConfig } from "./config.js";
+import {
+  applySceneStateDelta,
+  parseServerMessage,
+  sceneStateAck,
+  sceneStateCapabilities,
+} from "./scene_state_codec.js";
 import { createAppState } from "./state.js";
 
 export function createApp({ document, window }) {
@@ -116,6 +122,8 @@ export function createApp({ document, window }) {
   function connect(joinConfig) {
     // Connect to server via WebSocket
     state.socket = new WebSocket(configWindow.serverHost);
+    state.socket.binaryType = "arraybuffer";
+    state.sceneStateViews = new Map();
     state.sessionRole = joinConfig.serverRole ?? joinConfig.role;
     state.sessionMode = joinConfig.role;
 
@@ -134,6 +142,7 @@ export function createApp({ document, window }) {
             role: joinConfig.serverRole ?? joinConfig.role,
             requested_arm_count: joinConfig.requestedArmCount,
             character_mode: joinConfig.characterMode,
+            capabilities: sceneStateCapabilities(configWindow.sceneStateFormat),
           },
         })
       );
@@ -150,7 +159,7 @@ export function createApp({ document, window }) {
     };
 
     state.socket.onmessage = (event) => {
-      const message = JSON.parse(event.data);
+      const message = parseServerMessage(event.data);
 
       // Hello acknowledgement
       // User ID, session role, character mode, controlled arms, arm IDs
@@ -193,6 +202,16 @@ export function createApp({ document, window }) {
         setStatus(`server error: ${message.payload?.reason ?? "unknown"}`);
       }
 
+      if (message.type === "scene_state_delta") {
+        const frameId = message.payload.frame_id;
+        message.type = "scene_state";
+        message.payload = applySceneStateDelta(
+          state.sceneStateViews,
+          message.payload
+        );
+        state.socket.send(JSON.stringify(sceneStateAck(frameId)));
+      }
+
       if (message.type === "scene_state") {
         applyArmSceneState({
           demoArms,
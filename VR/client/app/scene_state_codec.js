@@ -0,0 +1,165 @@
+// Decoder for binary `scene_state` frames (see
+// virtual_field.server.scene_encoding.SceneStateFrameEncoder).
+//
+// Layout (little-endian):
+//   "VFSS" | u16 version | u16 flags | u32 json_bytes | u32 float_count
+//   JSON (space-padded to 4 bytes) | float32[float_count]
+//
+// The JSON section is the usual `scene_state` payload without `arms` plus an
+// `arm_layout` list of { arm_id, owner_user_id, offset } entries that point
+// into the float32 block.
+
+export const BINARY_SCENE_STATE_CAPABILITY = "binary_scene_state";
+export const BINARY_SCENE_STATE_VERSION = 1;
+
+const HEADER_BYTES = 16;
+const ARM_HEADER_SIZE = 5 + 7 + 7;
+const textDecoder = new TextDecoder();
+
+function readPose(values, offset) {
+  return {
+    translation: Array.from(values.subarray(offset, offset + 3)),
+    rotation_xyzw: Array.from(values.subarray(offset + 3, offset + 7)),
+  };
+}
+
+function readRows(values, offset, rowCount, rowSize) {
+  const rows = new Array(rowCount);
+  for (let row = 0; row < rowCount; row += 1) {
+    const start = offset + row * rowSize;
+    rows[row] = Array.from(values.subarray(start, start + rowSize));
+  }
+  return rows;
+}
+
+function readArm(values, entry) {
+  let cursor = entry.offset;
+  const [nodes, radii, lengths, directors, contacts] = values.subarray(
+    cursor,
+    cursor + 5
+  );
+  const base = readPose(values, cursor + 5);
+  const tip = readPose(values, cursor + 12);
+  cursor += ARM_HEADER_SIZE;
+
+  const centerline = readRows(values, cursor, nodes, 3);
+  cursor += 3 * nodes;
+  const radiiValues = Array.from(values.subarray(cursor, cursor + radii));
+  cursor += radii;
+  const lengthValues = Array.from(values.subarray(cursor, cursor + lengths));
+  cursor += lengths;
+  const directorValues = [];
+  for (let index = 0; index < directors; index += 1) {
+    directorValues.push(readRows(values, cursor + 9 * index, 3, 3));
+  }
+  cursor += 9 * directors;
+  const contactPoints = readRows(values, cursor, contacts, 3);
+
+  return {
+    arm_id: entry.arm_id,
+    owner_user_id: entry.owner_user_id,
+    base,
+    tip,
+    centerline,
+    radii: radiiValues,
+    element_lengths: lengthValues,
+    directors: directorValues,
+    contact_points: contactPoints,
+  };
+}
+
+export function decodeBinarySceneState(buffer) {
+  const view = new DataView(buffer);
+  const magic = textDecoder.decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== "VFSS") {
+    throw new Error("not a binary scene_state frame");
+  }
+  const version = view.getUint16(4, true);
+  if (version !== BINARY_SCENE_STATE_VERSION) {
+    throw new Error(`unsupported binary scene_state version ${version}`);
+  }
+  const jsonBytes = view.getUint32(8, true);
+  const floatCount = view.getUint32(12, true);
+
+  const payload = JSON.parse(
+    textDecoder.decode(new Uint8Array(buffer, HEADER_BYTES, jsonBytes))
+  );
+  const values = new Float32Array(buffer, HEADER_BYTES + jsonBytes, floatCount);
+  payload.arms = Object.fromEntries(
+    (payload.arm_layout || []).map((entry) => [entry.arm_id, readArm(values, entry)])
+  );
+  delete payload.arm_layout;
+  return payload;
+}
+
+// Parse a websocket message from the server. Binary frames are only sent after
+// the `binary_scene_state` capability was requested in `hello`; they always
+// carry `scene_state`.
+export function parseServerMessage(data) {
+  return data instanceof ArrayBuffer
+    ? { type: "scene_state", payload: decodeBinarySceneState(data) }
+    : JSON.parse(data);
+}
+
+// Delta `scene_state` frames (see virtual_field.server.scene_delta).
+//
+// `scene_state_delta` payloads list added/changed entities per kind and the ids
+// removed since the acknowledged baseline. Keyframes list every entity. Mesh
+// entries omit `asset_uri` when the client already holds it. After applying a
+// frame the client acknowledges it with `scene_state_ack`.
+
+export const DELTA_SCENE_STATE_CAPABILITY = "delta_scene_state";
+
+const DELTA_ENTITY_KINDS = ["arms", "scenery", "meshes", "overlay_points", "spheres"];
+
+export function createSceneStateView() {
+  return Object.fromEntries(DELTA_ENTITY_KINDS.map((kind) => [kind, {}]));
+}
+
+// Apply `payload` to the view that corresponds to its baseline and return the
+// resulting full `scene_state`-shaped payload. `views` maps acknowledged frame
+// ids to views. Views older than `baseline_frame_id` are dropped; keyframes
+// carry it too, since the server keeps diffing against that baseline until
+// the keyframe is acknowledged.
+export function applySceneStateDelta(views, payload) {
+  const baseline = payload.keyframe
+    ? createSceneStateView()
+    : views.get(payload.baseline_frame_id) ?? createSceneStateView();
+  const view = {};
+  for (const kind of DELTA_ENTITY_KINDS) {
+    const entities = { ...baseline[kind] };
+    for (const entityId of payload.removed?.[kind] ?? []) {
+      delete entities[entityId];
+    }
+    for (const [entityId, entity] of Object.entries(payload[kind] ?? {})) {
+      const previous = baseline[kind][entityId] ?? {};
+      entities[entityId] = { ...previous, ...entity };
+    }
+    view[kind] = entities;
+  }
+  views.set(payload.frame_id, view);
+  if (payload.baseline_frame_id !== null) {
+    for (const frameId of views.keys()) {
+      if (frameId < payload.baseline_frame_id) views.delete(frameId);
+    }
+  }
+  return {
+    ...view,
+    timestamp: payload.timestamp,
+    user_arms: payload.user_arms,
+    haptics: payload.haptics,
+  };
+}
+
+// Message acknowledging an applied `scene_state_delta` frame.
+export function sceneStateAck(frameId) {
+  return { version: 1, type: "scene_state_ack", payload: { frame_id: frameId } };
+}
+
+// Capabilities to list in `hello` for the `scene_state` format selected in the
+// client config: "binary" (default), "delta" or "json".
+export function sceneStateCapabilities(format) {
+  if (format === "json") return [];
+  if (format === "delta") return [DELTA_SCENE_STATE_CAPABILITY];
+  return [BINARY_SCENE_STATE_CAPABILITY];
+}
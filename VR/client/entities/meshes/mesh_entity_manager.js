@@ -12,7 +12,14 @@ function setObjectTransform(object3d, meshState) {
   object3d.visible = meshState.visible !== false;
 }
 
-export function createMeshEntityManager(worldRoot) {
+// Mesh assets served by the Python asset store arrive as `/assets/<sha256>`
+// paths; resolve them against the server origin rather than the page origin.
+export function resolveAssetUri(uri, assetBaseUrl) {
+  if (!assetBaseUrl || !uri.startsWith("/")) return uri;
+  return new URL(uri, assetBaseUrl).href;
+}
+
+export function createMeshEntityManager(worldRoot, { assetBaseUrl = null } = {}) {
   const gltfLoader = new GLTFLoader();
   const meshEntities = new Map();
 
@@ -43,7 +50,7 @@ export function createMeshEntityManager(worldRoot) {
         }
 
         gltfLoader.load(
-          uri,
+          resolveAssetUri(uri, assetBaseUrl),
           (gltf) => {
             if (!activeMeshIds.has(meshId)) return;
             const object3d = gltf.scene;
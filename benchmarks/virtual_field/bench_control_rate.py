@@ -0,0 +1,84 @@
+"""Benchmark the cost of a simulation tick against the control rate.
+
+Builds the controlled character modes (``cathy-foraging``, ``octo-waypoint``
+and ``coomm-octopus``) with the default layout and times one 1/60 s
+``step`` with the controller evaluated every substep (``control_dt`` unset)
+and at fixed control periods, holding or linearly interpolating the control
+output in between. Modes whose assets or dependencies are missing are
+reported as skipped.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_control_rate.py --repeat 5
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import time
+
+import click
+import numpy as np
+
+from virtual_field.server.backends import build_default_simulation
+
+MODES = ("cathy-foraging", "octo-waypoint", "coomm-octopus")
+CONTROL_DTS = (None, 5.0e-4, 1.0e-3, 2.0e-3, 5.0e-3)
+
+
+def _best_time(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command(help=__doc__)
+@click.option(
+    "--mode",
+    "modes",
+    type=click.Choice(MODES),
+    multiple=True,
+    help="Character modes to time (default: all).",
+)
+@click.option("--dt", type=float, default=1.0 / 60.0, show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+def main(modes: tuple[str, ...], dt: float, repeat: int) -> None:
+    click.echo(
+        f"{'mode':>15} {'control_dt':>11} {'interpolation':>14} "
+        f"{'step [ms]':>10} {'speedup':>8}"
+    )
+    for mode in modes or MODES:
+        try:
+            simulation = build_default_simulation("bench_user", mode)
+        except Exception as exc:  # noqa: BLE001 - report and move on
+            click.echo(f"{mode:>15} skipped: {type(exc).__name__}: {exc}")
+            continue
+        state = simulation.capture_state()
+        baseline = None
+        for control_dt in CONTROL_DTS:
+            for interpolation in ("hold", "linear"):
+                if control_dt is None and interpolation == "linear":
+                    continue
+                simulation.restore_state(state)
+                simulation.control_dt = control_dt
+                simulation.control_interpolation = interpolation
+                simulation.step(dt)
+                step_time, _ = _best_time(lambda: simulation.step(dt), repeat)
+                if baseline is None:
+                    baseline = step_time
+                label = (
+                    "every step" if control_dt is None else f"{control_dt:g}"
+                )
+                click.echo(
+                    f"{mode:>15} {label:>11} {interpolation:>14} "
+                    f"{1e3 * step_time:>10.2f} {baseline / step_time:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
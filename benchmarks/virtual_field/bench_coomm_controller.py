@@ -0,0 +1,136 @@
+"""Benchmark the COOMM sucker controller: per-arm kernel against fused kernel.
+
+Times one controller update of ``coomm-octopus`` arms as the number of arms
+grows. The per-arm path is what the simulation used to do for every arm:
+call ``_sucker_full_controller_kernel``, copy its outputs into the muscle
+group buffers and apply the activation ramp. The fused path is a single
+``_sucker_multi_arm_controller_kernel`` call writing every arm's
+activations in place.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_coomm_controller.py --n-elem 15
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import time
+
+import click
+import elastica as ea
+import numpy as np
+
+from virtual_field.runtime.coomm_octopus_simulation import (
+    LEFT_OM_GROUP_INDEX,
+    LM_GROUP_COUNT,
+    LM_GROUP_START_INDEX,
+    RIGHT_OM_GROUP_INDEX,
+    SUCKER_EPS,
+    _sucker_full_controller_kernel,
+    _sucker_multi_arm_controller_kernel,
+)
+
+GROUP_COUNT = LEFT_OM_GROUP_INDEX + 1
+
+
+class _Simulator(ea.BaseSystemCollection):
+    pass
+
+
+def _arms(n_arms: int, n_elem: int) -> list[ea.CosseratRod]:
+    simulator = _Simulator()
+    rods = []
+    for arm in range(n_arms):
+        angle = 2.0 * np.pi * arm / n_arms
+        rod = ea.CosseratRod.straight_rod(
+            n_elem,
+            np.array([0.1 * np.cos(angle), 1.0, 0.1 * np.sin(angle)]),
+            np.array([0.0, 0.0, -1.0]),
+            np.array([0.0, -1.0, 0.0]),
+            0.55,
+            0.02,
+            2000.0,
+            youngs_modulus=1.0e6,
+        )
+        simulator.append(rod)
+        rods.append(rod)
+    simulator.finalize()
+    return rods
+
+
+def _per_arm(
+    rods: list[ea.CosseratRod],
+    target_pos: np.ndarray,
+    buffers: list[list[np.ndarray]],
+    weight: float,
+) -> None:
+    for rod, activations in zip(rods, buffers):
+        for activation in activations:
+            activation.fill(0.0)
+        a_r, a_l, *a_lm = _sucker_full_controller_kernel(
+            rod.position_collection,
+            rod.director_collection[0, :, :],
+            rod.director_collection[1, :, :],
+            rod.director_collection[2, :, :],
+            rod.radius,
+            target_pos,
+            SUCKER_EPS,
+        )
+        for lm_idx in range(LM_GROUP_COUNT):
+            activations[LM_GROUP_START_INDEX + lm_idx] = a_lm[lm_idx]
+        activations[RIGHT_OM_GROUP_INDEX] = a_r
+        activations[LEFT_OM_GROUP_INDEX] = a_l
+        for i in range(len(activations)):
+            activations[i] *= weight
+
+
+def _best_time(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command(help=__doc__)
+@click.option("--n-elem", type=int, default=15, show_default=True)
+@click.option("--repeat", type=int, default=200, show_default=True)
+def main(n_elem: int, repeat: int) -> None:
+    target_pos = np.array([0.1, 1.2, -0.4])
+    weight = 0.5
+    click.echo(
+        f"{'arms':>5} {'per-arm [us]':>13} {'fused [us]':>11} {'speedup':>8}"
+    )
+    for n_arms in (2, 4, 8, 16):
+        rods = _arms(n_arms, n_elem)
+        buffers = [[np.zeros(n_elem) for _ in range(GROUP_COUNT)] for _ in rods]
+        arrays = (
+            tuple(rod.position_collection for rod in rods),
+            tuple(rod.director_collection for rod in rods),
+            tuple(rod.radius for rod in rods),
+        )
+        activations = tuple(np.zeros((GROUP_COUNT, n_elem)) for _ in rods)
+
+        def fused() -> None:
+            _sucker_multi_arm_controller_kernel(
+                *arrays, target_pos, weight, SUCKER_EPS, activations
+            )
+
+        _per_arm(rods, target_pos, buffers, weight)
+        fused()
+        per_arm_time, _ = _best_time(
+            lambda: _per_arm(rods, target_pos, buffers, weight), repeat
+        )
+        fused_time, _ = _best_time(fused, repeat)
+        click.echo(
+            f"{n_arms:>5} {1e6 * per_arm_time:>13.1f} "
+            f"{1e6 * fused_time:>11.1f} {per_arm_time / fused_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark mesh asset size and encode time for each glTF container.
+
+Compares the previous embedded glTF JSON data URI (buffer base64-encoded
+inside base64-encoded JSON) against GLB and GLB with ``KHR_mesh_quantization``
+for the ``two-gcr`` pipe maze and the ``octo-waypoint`` terrain. Meshes that
+are not available locally are replaced by a synthetic surface of similar size.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_mesh_assets.py --repeat 5
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import base64
+import json
+import time
+
+import click
+import numpy as np
+import pyvista as pv
+
+from virtual_field.runtime.mesh_assets import (
+    build_pyvista_polydata_gltf_data_uri,
+    decode_glb,
+)
+from virtual_field.runtime.octo_waypoint_simulation import EXTERNAL_MESH_PATH
+from virtual_field.runtime.two_gcr_simulation import MAZE_PATH
+
+
+def _embedded_gltf_data_uri(glb_data_uri: str) -> str:
+    """Re-wrap a GLB as the former embedded glTF JSON data URI."""
+    gltf, binary = decode_glb(base64.b64decode(glb_data_uri.split(",", 1)[1]))
+    buffer_uri = "data:application/octet-stream;base64," + base64.b64encode(
+        binary
+    ).decode("ascii")
+    gltf["buffers"] = [{"byteLength": len(binary), "uri": buffer_uri}]
+    encoded = base64.b64encode(
+        json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    ).decode("ascii")
+    return f"data:model/gltf+json;base64,{encoded}"
+
+
+def _load_meshes() -> dict[str, Any]:
+    meshes: dict[str, Any] = {}
+    if MAZE_PATH.is_file():
+        meshes["pipe maze"] = pv.read(MAZE_PATH).extract_surface().decimate(0.9)
+    else:
+        meshes["pipe maze (synthetic)"] = pv.ParametricTorus(
+            ringradius=0.3, crosssectionradius=0.05, u_res=400, v_res=100
+        ).triangulate()
+    if EXTERNAL_MESH_PATH.is_file():
+        meshes["terrain"] = pv.read(EXTERNAL_MESH_PATH)[
+            "Node_0"
+        ].extract_surface(algorithm=None)
+    else:
+        terrain = pv.ParametricRandomHills(u_res=300, v_res=300)
+        meshes["terrain (synthetic)"] = terrain.extract_surface().triangulate()
+    return meshes
+
+
+def _best_time(encode: Callable[[], str], repeat: int) -> tuple[float, str]:
+    best = np.inf
+    result = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = encode()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command(help=__doc__)
+@click.option("--repeat", type=int, default=3, show_default=True)
+def main(repeat: int) -> None:
+    click.echo(
+        f"{'mesh':>24} {'format':>16} {'size [kB]':>10} {'encode [ms]':>12}"
+    )
+    for name, mesh in _load_meshes().items():
+        glb_time, glb_uri = _best_time(
+            lambda: build_pyvista_polydata_gltf_data_uri(mesh), repeat
+        )
+        quantized_time, quantized_uri = _best_time(
+            lambda: build_pyvista_polydata_gltf_data_uri(mesh, quantize=True),
+            repeat,
+        )
+        embedded_time, embedded_uri = _best_time(
+            lambda: _embedded_gltf_data_uri(
+                build_pyvista_polydata_gltf_data_uri(mesh)
+            ),
+            repeat,
+        )
+        for label, elapsed, uri in (
+            ("embedded json", embedded_time, embedded_uri),
+            ("glb", glb_time, glb_uri),
+            ("glb quantized", quantized_time, quantized_uri),
+        ):
+            click.echo(
+                f"{name:>24} {label:>16} {len(uri) / 1e3:>10.1f} "
+                f"{1e3 * elapsed:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark the contact broadphases: uniform ``Grid`` against ``MeshBVH``.
+
+Builds both broadphases for the ``two-gcr`` pipe maze and the
+``octo-waypoint`` terrain and times the candidate-face query, and the whole
+rod-mesh contact evaluation, of a rod laid along the diagonal of the mesh
+bounds. Meshes that are not available locally
+are replaced by a synthetic surface of similar size. The grid cell size
+follows the rod element size; the BVH query box is twice the rod radius.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_mesh_bvh.py --n-elements 126
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import time
+
+import click
+import numpy as np
+import pyvista as pv
+
+from virtual_field.runtime.custom_elastica.mesh import (
+    Grid,
+    MeshBVH,
+    MeshSurface,
+    RodMeshSurfaceContactGridMethod,
+)
+from virtual_field.runtime.octo_waypoint_simulation import EXTERNAL_MESH_PATH
+from virtual_field.runtime.two_gcr_simulation import MAZE_PATH
+
+
+class _Rod:
+    def __init__(self, position_collection: np.ndarray, radius: float) -> None:
+        n_elements = position_collection.shape[1] - 1
+        self.position_collection = position_collection
+        self.rest_lengths = np.linalg.norm(
+            np.diff(position_collection, axis=1), axis=0
+        )
+        self.radius = np.full(n_elements, radius)
+        self.director_collection = np.repeat(
+            np.eye(3)[:, :, None], n_elements, axis=2
+        )
+        self.mass = np.ones(n_elements + 1)
+        self.velocity_collection = np.zeros_like(position_collection)
+        self.external_forces = np.zeros_like(position_collection)
+
+
+def _load_meshes() -> dict[str, Any]:
+    meshes: dict[str, Any] = {}
+    if MAZE_PATH.is_file():
+        meshes["pipe maze"] = pv.read(MAZE_PATH).extract_surface().decimate(0.9)
+    else:
+        meshes["pipe maze (synthetic)"] = pv.ParametricTorus(
+            ringradius=0.3, crosssectionradius=0.05, u_res=400, v_res=100
+        ).triangulate()
+    if EXTERNAL_MESH_PATH.is_file():
+        meshes["terrain"] = (
+            pv.read(EXTERNAL_MESH_PATH)["Node_0"]
+            .extract_surface(algorithm=None)
+            .triangulate()
+        )
+    else:
+        terrain = pv.ParametricRandomHills(u_res=300, v_res=300)
+        meshes["terrain (synthetic)"] = terrain.extract_surface().triangulate()
+    return meshes
+
+
+def _best_time(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command(help=__doc__)
+@click.option("--n-elements", type=int, default=126, show_default=True)
+@click.option("--radius", type=float, default=0.015, show_default=True)
+@click.option("--repeat", type=int, default=20, show_default=True)
+def main(n_elements: int, radius: float, repeat: int) -> None:
+    click.echo(
+        f"{'mesh':>22} {'faces':>8} {'method':>6} {'build [ms]':>11} "
+        f"{'query [us]':>11} {'pairs':>7} {'contact [us]':>13}"
+    )
+    for name, mesh in _load_meshes().items():
+        surface = MeshSurface(mesh)
+        bounds = np.asarray(mesh.bounds).reshape(3, 2)
+        rod = _Rod(
+            np.linspace(bounds[:, 0], bounds[:, 1], n_elements + 1).T, radius
+        )
+        element_position = np.empty((3, n_elements))
+
+        build_ms, grid = _best_time(lambda: Grid(rod, surface), 1)
+        build_bvh_ms, bvh = _best_time(
+            lambda: MeshBVH(surface, search_radius=2 * radius), 1
+        )
+        for method, broadphase, build in (
+            ("grid", grid, build_ms),
+            ("bvh", bvh, build_bvh_ms),
+        ):
+            _, face_idx, _ = broadphase.find_faces(rod.position_collection)
+            size = max(
+                face_idx.size, n_elements * broadphase.max_faces_per_cell
+            )
+            position_idx = np.empty(size, dtype=np.int64)
+            face_idx = np.empty(size, dtype=np.int64)
+            query, n_pairs = _best_time(
+                lambda: broadphase.find_faces_into(
+                    rod.position_collection,
+                    element_position,
+                    position_idx,
+                    face_idx,
+                ),
+                repeat,
+            )
+            contact = RodMeshSurfaceContactGridMethod(
+                k=1e4, nu=10.0, grid=broadphase
+            )
+            contact_time, _ = _best_time(
+                lambda: contact.apply_contact(rod, surface), repeat
+            )
+            click.echo(
+                f"{name:>22} {surface.n_faces:>8} {method:>6} "
+                f"{1e3 * build:>11.1f} {1e6 * query:>11.1f} {n_pairs:>7} "
+                f"{1e6 * contact_time:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark contact ``Grid`` construction across grid resolutions.
+
+The grid cell size follows the rod element size, so each ``--rest-length``
+gives a finer or coarser grid over the same sphere mesh. With ``--scan`` the
+former cell-by-cell scan over all faces (O(cells x faces)) is timed as well
+for comparison; it gets slow quickly on fine grids.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_mesh_grid.py --resolution 200 --scan
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+import numpy as np
+import pyvista as pv
+
+from virtual_field.runtime.custom_elastica.mesh import Grid, MeshSurface
+
+
+class _Rod:
+    def __init__(self, rest_length: float, radius: float) -> None:
+        self.rest_lengths = np.array([rest_length])
+        self.radius = np.array([radius])
+
+
+def _scan_surface_grid(surface: MeshSurface, grid_size: float) -> int:
+    faces = surface.faces
+    face_lower = faces.min(axis=1)
+    face_upper = faces.max(axis=1)
+    n_positions = [
+        int(
+            np.ceil((np.max(faces[axis]) - surface.min_point[axis]) / grid_size)
+        )
+        for axis in range(3)
+    ]
+    n_cells = 0
+    for cell in np.ndindex(*n_positions):
+        overlaps = np.ones(faces.shape[-1], dtype=bool)
+        for axis in range(3):
+            lower = surface.min_point[axis] + max(0, cell[axis] - 1) * grid_size
+            upper = surface.min_point[axis] + (
+                min(n_positions[axis] - 1, cell[axis] + 1) * grid_size
+            )
+            overlaps &= (face_lower[axis] <= upper) & (
+                face_upper[axis] >= lower
+            )
+        n_cells += bool(overlaps.any())
+    return n_cells
+
+
+@click.command(help=__doc__)
+@click.option("--resolution", type=int, default=200, show_default=True)
+@click.option(
+    "--rest-length",
+    type=float,
+    multiple=True,
+    default=(0.1, 0.05, 0.02, 0.01),
+    show_default=True,
+)
+@click.option("--scan", is_flag=True, help="Also time the cell scan.")
+def main(resolution: int, rest_length: tuple[float, ...], scan: bool) -> None:
+    mesh = pv.Sphere(theta_resolution=resolution, phi_resolution=resolution)
+    surface = MeshSurface(mesh)
+    # Compile the binning kernel outside the timed region.
+    Grid(_Rod(0.5, 0.001), surface)
+    click.echo(f"{surface.n_faces} faces")
+    click.echo(
+        f"{'grid size':>10} {'cells':>8} {'build [ms]':>11} {'scan [ms]':>10}"
+    )
+    for length in rest_length:
+        start = time.perf_counter()
+        grid = Grid(_Rod(length, 0.001), surface)
+        build = time.perf_counter() - start
+        scan_ms = float("nan")
+        if scan:
+            start = time.perf_counter()
+            _scan_surface_grid(surface, grid.size)
+            scan_ms = 1e3 * (time.perf_counter() - start)
+        n_cells = np.count_nonzero(np.diff(grid.cell_offsets))
+        click.echo(
+            f"{grid.size:>10.4f} {n_cells:>8} "
+            f"{1e3 * build:>11.1f} {scan_ms:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
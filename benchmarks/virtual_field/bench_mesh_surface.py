@@ -0,0 +1,62 @@
+"""Benchmark ``MeshSurface`` construction time across mesh sizes.
+
+Builds a wavy plane of roughly the requested number of triangles (or quads
+with ``--quads``, which ``MeshSurface`` splits into two triangles each) and
+times the full ``MeshSurface(mesh)`` construction that ``register_user`` pays
+for mesh-contact modes such as ``two-gcr``.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_mesh_surface.py --faces 10000 --faces 1000000
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+import numpy as np
+import pyvista as pv
+
+from virtual_field.runtime.custom_elastica.mesh import MeshSurface
+
+
+def _make_mesh(faces: int, quads: bool) -> pv.PolyData:
+    # A plane of n x n cells has n**2 quads, i.e. 2 * n**2 triangles.
+    resolution = max(1, int(round(np.sqrt(faces if quads else faces / 2))))
+    mesh = pv.Plane(i_resolution=resolution, j_resolution=resolution)
+    points = np.asarray(mesh.points)
+    points[:, 2] = (
+        0.05 * np.sin(8.0 * points[:, 0]) * np.cos(8.0 * points[:, 1])
+    )
+    mesh.points = points
+    return mesh if quads else mesh.triangulate()
+
+
+@click.command(help=__doc__)
+@click.option(
+    "--faces",
+    type=int,
+    multiple=True,
+    default=(10_000, 100_000, 1_000_000),
+    show_default=True,
+)
+@click.option("--quads", is_flag=True, help="Use quad faces.")
+@click.option("--repeat", type=int, default=3, show_default=True)
+def main(faces: tuple[int, ...], quads: bool, repeat: int) -> None:
+    click.echo(f"{'pv faces':>10} {'triangles':>10} {'build [ms]':>11}")
+    for target in faces:
+        mesh = _make_mesh(target, quads)
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            surface = MeshSurface(mesh)
+            best = min(best, time.perf_counter() - start)
+        click.echo(
+            f"{mesh.n_faces_strict:>10} {surface.n_faces:>10} "
+            f"{1e3 * best:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark ``scene_state`` encoding cost per connected client.
+
+Compares the per-client ``to_dict_for_client`` + ``json.dumps`` path against
+:class:`~virtual_field.server.scene_encoding.SceneStateFrameEncoder`, which
+encodes the shared part of the frame once per tick, in both the JSON and the
+binary (float32) frame formats.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_scene_state_publish.py --arms 16
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import click
+import numpy as np
+
+from virtual_field.core.state import ArmState, MeshEntity, SceneState, Transform
+from virtual_field.server.scene_encoding import SceneStateFrameEncoder
+from virtual_field.server.schema import make_message
+
+
+def _make_scene(
+    arm_count: int, node_count: int, asset_bytes: int
+) -> SceneState:
+    rng = np.random.default_rng(0)
+    arms = {}
+    for index in range(arm_count):
+        arm_id = f"user_{index // 2}_arm_{index % 2}"
+        centerline = rng.normal(size=(node_count, 3)).tolist()
+        arms[arm_id] = ArmState(
+            arm_id=arm_id,
+            owner_user_id=f"user_{index // 2}",
+            base=Transform(translation=centerline[0]),
+            tip=Transform(translation=centerline[-1]),
+            centerline=centerline,
+            radii=rng.uniform(0.01, 0.02, node_count - 1).tolist(),
+            element_lengths=rng.uniform(0.01, 0.02, node_count - 1).tolist(),
+            directors=np.tile(np.eye(3), (node_count - 1, 1, 1)).tolist(),
+        )
+    terrain = MeshEntity(
+        mesh_id="terrain",
+        owner_id="user_0",
+        asset_uri="data:model/gltf+json;base64," + "A" * asset_bytes,
+        static_asset=True,
+    )
+    return SceneState(
+        timestamp=0.0,
+        arms=arms,
+        user_arms={},
+        meshes={terrain.mesh_id: terrain},
+    )
+
+
+def _time_per_tick(publish, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        publish()
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command(help=__doc__)
+@click.option("--arms", type=int, default=16, show_default=True)
+@click.option("--nodes", type=int, default=51, show_default=True)
+@click.option("--asset-bytes", type=int, default=1_000_000, show_default=True)
+@click.option("--repeat", type=int, default=20, show_default=True)
+@click.option(
+    "--clients",
+    type=str,
+    default="1,5,10,20,50",
+    show_default=True,
+    help="Comma-separated connected-client counts.",
+)
+def main(
+    arms: int, nodes: int, asset_bytes: int, repeat: int, clients: str
+) -> None:
+    scene = _make_scene(arms, nodes, asset_bytes)
+    json_frame = SceneStateFrameEncoder(scene).encode_for_client({"terrain"})
+    binary_frame = SceneStateFrameEncoder(scene).encode_binary_for_client(
+        {"terrain"}
+    )
+    click.echo(
+        f"frame size: json {len(json_frame.encode()) / 1e3:.1f} kB, "
+        f"binary {len(binary_frame) / 1e3:.1f} kB"
+    )
+    click.echo(
+        f"{'clients':>8} {'per-client [ms]':>16} {'shared [ms]':>12} "
+        f"{'binary [ms]':>12} {'speedup':>8}"
+    )
+    for client_count in (int(value) for value in clients.split(",")):
+        sent_sets = [{"terrain"} for _ in range(client_count)]
+
+        def legacy() -> None:
+            for sent in sent_sets:
+                json.dumps(
+                    make_message("scene_state", scene.to_dict_for_client(sent))
+                )
+
+        def shared() -> None:
+            encoder = SceneStateFrameEncoder(scene)
+            for sent in sent_sets:
+                encoder.encode_for_client(sent)
+
+        def binary() -> None:
+            encoder = SceneStateFrameEncoder(scene)
+            for sent in sent_sets:
+                encoder.encode_binary_for_client(sent)
+
+        legacy_time = _time_per_tick(legacy, repeat)
+        shared_time = _time_per_tick(shared, repeat)
+        binary_time = _time_per_tick(binary, repeat)
+        click.echo(
+            f"{client_count:>8} {1e3 * legacy_time:>16.3f} "
+            f"{1e3 * shared_time:>12.3f} {1e3 * binary_time:>12.3f} "
+            f"{legacy_time / shared_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
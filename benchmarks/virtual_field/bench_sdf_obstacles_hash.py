@@ -0,0 +1,109 @@
+"""Benchmark the SDF cylinder contact: brute force against the spatial hash.
+
+Scatters random sticks at a fixed density in a box that grows with the
+obstacle count, like the ``noel-c4`` nest, and times one contact evaluation
+of a rod running through the box for ``SDFObstacleCylinders`` and
+``SDFObstacleCylindersHash``. The brute-force cost per node grows with the
+obstacle count; the hashed one stays flat.
+
+Usage::
+
+    python benchmarks/virtual_field/bench_sdf_obstacles_hash.py --n-nodes 101
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import time
+from types import SimpleNamespace
+
+import click
+import numpy as np
+
+from virtual_field.runtime.spirob_elastica.sdf_objects import (
+    SDFObstacleCylinders,
+)
+from virtual_field.runtime.spirob_elastica.sdf_objects_hash import (
+    CylinderSpatialHash,
+    SDFObstacleCylindersHash,
+)
+
+
+def _random_sticks(
+    n_obstacles: int, density: float, rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    half_width = 0.5 * (n_obstacles / density) ** (1.0 / 3.0)
+    directions = rng.normal(size=(n_obstacles, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    normals = np.cross(directions, [0.0, 0.0, 1.0])
+    return {
+        "starts": rng.uniform(-half_width, half_width, size=(n_obstacles, 3)),
+        "directions": directions,
+        "lengths": rng.uniform(0.1, 0.4, size=n_obstacles),
+        "radii": rng.uniform(0.005, 0.02, size=n_obstacles),
+        "normals": normals,
+    }
+
+
+def _best_time(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+@click.command(help=__doc__)
+@click.option("--n-nodes", type=int, default=101, show_default=True)
+@click.option("--radius", type=float, default=0.02, show_default=True)
+@click.option(
+    "--density",
+    type=float,
+    default=200.0,
+    show_default=True,
+    help="Obstacles per unit volume.",
+)
+@click.option("--repeat", type=int, default=20, show_default=True)
+def main(n_nodes: int, radius: float, density: float, repeat: int) -> None:
+    rng = np.random.default_rng(0)
+    click.echo(
+        f"{'obstacles':>10} {'build [ms]':>11} {'cells':>8} "
+        f"{'brute [ns/node]':>16} {'hash [ns/node]':>15} {'speedup':>8}"
+    )
+    for n_obstacles in (100, 1_000, 10_000, 100_000):
+        obstacles = _random_sticks(n_obstacles, density, rng)
+        half_width = 0.5 * (n_obstacles / density) ** (1.0 / 3.0)
+        positions = np.linspace(
+            [-half_width, 0.0, 0.0], [half_width, 0.0, 0.0], n_nodes
+        ).T.copy()
+        rod = SimpleNamespace(
+            position_collection=positions,
+            velocity_collection=np.zeros_like(positions),
+            external_forces=np.zeros_like(positions),
+            radius=np.full(n_nodes - 1, radius),
+        )
+
+        build, spatial_hash = _best_time(
+            lambda: CylinderSpatialHash(**obstacles, padding=radius), 1
+        )
+        brute = SDFObstacleCylinders(**obstacles)
+        hashed = SDFObstacleCylindersHash(
+            **obstacles, spatial_hash=spatial_hash
+        )
+        brute.apply_forces(rod)
+        hashed.apply_forces(rod)
+        brute_time, _ = _best_time(lambda: brute.apply_forces(rod), repeat)
+        hash_time, _ = _best_time(lambda: hashed.apply_forces(rod), repeat)
+        click.echo(
+            f"{n_obstacles:>10} {1e3 * build:>11.1f} "
+            f"{spatial_hash.n_cells:>8} {1e9 * brute_time / n_nodes:>16.0f} "
+            f"{1e9 * hash_time / n_nodes:>15.0f} "
+            f"{brute_time / hash_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from dataclasses import dataclass, field
 from importlib.resources import files
 
@@ -91,6 +93,8 @@ def _load_best_policy() -> OctoArmPolicy:
 
 @dataclass(slots=True)
 class CathyForagingSimulation(OctoArmSimulationBase):
+    # The crawl policy is updated every millisecond, not every substep.
+    control_dt: float | None = 1.0e-3
     _forage_targets: np.ndarray = field(init=False)
     head: ea.CosseratRod = field(init=False)
     head_arm_id: str = field(init=False)
@@ -309,6 +313,95 @@ class CathyForagingSimulation(OctoArmSimulationBase):
     ) -> None:
         return
 
+    def reset_mode_state(self) -> None:
+        self._head_pose = Transform(
+            translation=self.base_sphere.position_collection[:, 0].tolist(),
+            rotation_xyzw=[0.0, 0.0, 0.0, 1.0],
+        )
+        self._right_joystick_command.fill(0.0)
+        self.active_policy = self.idle_policy
+        self._tilt_active = False
+        self._cycle_heading_angle = 0.0
+        self._last_cycle_index = -1
+        self._crawl_active_until = 0.0
+        self._loco_coast_until = None
+        for hand in self._last_trigger_pressed:
+            self._last_trigger_pressed[hand] = False
+            self._clear_selected_target(hand)
+        for arm_id in self._pull_target_active:
+            self._pull_target_active[arm_id] = False
+        self.base_suction_active.fill(0.0)
+        self.middle_suction_active.fill(0.0)
+        self.target_extension.fill(0.0)
+        self.target_stiffness.fill(1.0)
+        self.target_bend.fill(0.0)
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        return {
+            "head_pose": self._head_pose.to_dict(),
+            "cycle_heading_angle": self._cycle_heading_angle,
+            "last_cycle_index": self._last_cycle_index,
+            "crawl_active_until": self._crawl_active_until,
+            "loco_coast_until": self._loco_coast_until,
+            "right_joystick_command": self._right_joystick_command.tolist(),
+            "tilt_active": self._tilt_active,
+            "selected_targets": {
+                hand: [
+                    self._selected_target_index_by_hand[hand],
+                    self._selected_target_position_by_hand[hand],
+                    self._selected_target_time_by_hand[hand],
+                    (
+                        None
+                        if self._selected_arm_id_by_hand[hand] is None
+                        else self.arm_ids.index(self._selected_arm_id_by_hand[hand])
+                    ),
+                ]
+                for hand in self._selected_target_index_by_hand
+            },
+            "pull_targets": [
+                [
+                    self._pull_target_active[arm_id],
+                    self._pull_target_position[arm_id].tolist(),
+                    self._pull_target_orientation[arm_id].tolist(),
+                ]
+                for arm_id in self.arm_ids
+            ],
+        }
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        self._head_pose = Transform.from_dict(state["head_pose"])
+        self._cycle_heading_angle = float(state["cycle_heading_angle"])
+        self._last_cycle_index = int(state["last_cycle_index"])
+        self._crawl_active_until = float(state["crawl_active_until"])
+        self._loco_coast_until = state["loco_coast_until"]
+        self._right_joystick_command[:] = state["right_joystick_command"]
+        self._tilt_active = bool(state["tilt_active"])
+        for hand, (index, position, time, arm_index) in state[
+            "selected_targets"
+        ].items():
+            self._selected_target_index_by_hand[hand] = index
+            self._selected_target_position_by_hand[hand] = position
+            self._selected_target_time_by_hand[hand] = time
+            self._selected_arm_id_by_hand[hand] = (
+                None if arm_index is None else self.arm_ids[arm_index]
+            )
+        for arm_id, (active, position, orientation) in zip(
+            self.arm_ids, state["pull_targets"]
+        ):
+            self._pull_target_active[arm_id] = bool(active)
+            self._pull_target_position[arm_id] = np.array(
+                position, dtype=np.float64
+            )
+            self._pull_target_orientation[arm_id] = np.array(
+                orientation, dtype=np.float64
+            )
+        # The active policy is the base policy turned to the cycle heading.
+        self.active_policy = (
+            self.idle_policy
+            if self._last_cycle_index < 0
+            else rotate_policy_by_angle(self.base_policy, self._cycle_heading_angle)
+        )
+
     def handle_frame_command(self, command: MultiArmCommand) -> None:
         if command.head_pose is not None:
             self._head_pose = command.head_pose
@@ -639,15 +732,20 @@ class CathyForagingSimulation(OctoArmSimulationBase):
         for elem_idx in range(self.head.director_collection.shape[-1]):
             self.head.director_collection[..., elem_idx] = rowwise
 
+    def apply_control(self) -> None:
+        self._apply_policy()
+
+    def control_buffers(self) -> list[np.ndarray]:
+        return [
+            self.base_suction_active,
+            self.middle_suction_active,
+            self.target_extension,
+            self.target_stiffness,
+            self.target_bend,
+        ]
+
     def step(self, dt: float) -> None:
-        total = max(0.0, dt)
-        if total <= 0.0:
-            return
-        substeps = max(1, int(np.ceil(total / self.dt_internal)))
-        step_dt = total / substeps
-        for _ in range(substeps):
-            self._apply_policy()
-            self._time = self.timestepper.step(self.simulator, self._time, step_dt)
+        OctoArmSimulationBase.step(self, dt)
         self._release_completed_or_expired_targets()
         self._sync_head_pose()
 
@@ -224,6 +224,26 @@ class CathyThrowSimulation(DualArmSimulationBase):
         self._set_base_pull_active(arm_id, False)
         self._set_sucker_active(arm_id, False)
 
+    def reset_mode_state(self) -> None:
+        for arm_id in self.arm_ids:
+            self._set_base_pull_active(arm_id, False)
+            self._set_sucker_active(arm_id, False)
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        return {
+            "sucker_active": [self._sucker_active[a] for a in self.arm_ids],
+            "base_pull_active": [
+                self._base_pull_active[a] for a in self.arm_ids
+            ],
+        }
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        for arm_id, sucker, base_pull in zip(
+            self.arm_ids, state["sucker_active"], state["base_pull_active"]
+        ):
+            self._set_sucker_active(arm_id, sucker)
+            self._set_base_pull_active(arm_id, base_pull)
+
     def _set_sucker_active(self, arm_id: str, active: bool) -> None:
         if arm_id not in self._sucker_active:
             return
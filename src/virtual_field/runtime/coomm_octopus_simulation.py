@@ -34,6 +34,9 @@ TM_MAX_MUSCLE_STRESS = 15_000.0 * 0
 LM_MAX_MUSCLE_STRESS = 10_000.0 * 15000
 OM_MAX_MUSCLE_STRESS = 100_000.0 * 1000
 LM_GROUP_COUNT = 4
+LM_ANGLES = np.array([0.0, np.pi / 2.0, np.pi, 3.0 * np.pi / 2.0])
+LM_COS = np.cos(LM_ANGLES)
+LM_SIN = np.sin(LM_ANGLES)
 
 # Muscle group ordering for activation assignment
 TM_GROUP_INDEX = 0
@@ -152,6 +155,142 @@ def _sucker_full_controller_kernel(
     return a_r_om, a_l_om, a_lm[0], a_lm[1], a_lm[2], a_lm[3]
 
 
+@njit(cache=True)
+def _dot(a: tuple, b: tuple) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+@njit(cache=True)
+def _cross(a: tuple, b: tuple) -> tuple:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+@njit(cache=True)
+def _normalized(v: tuple, eps: float) -> tuple:
+    norm = max(math.sqrt(_dot(v, v)), eps)
+    return (v[0] / norm, v[1] / norm, v[2] / norm)
+
+
+@njit(cache=True)
+def _reject(a: tuple, b: tuple, eps: float) -> tuple:
+    """Unit vector along the part of ``a`` normal to the unit vector ``b``."""
+    proj = _dot(a, b)
+    return _normalized(
+        (a[0] - b[0] * proj, a[1] - b[1] * proj, a[2] - b[2] * proj), eps
+    )
+
+
+@njit(cache=True)
+def _sucker_to_target(
+    x_c: np.ndarray,
+    d: np.ndarray,
+    r_xi: np.ndarray,
+    target_pos: np.ndarray,
+    j: int,
+) -> tuple:
+    """Vector from the sucker of element ``j`` to the target."""
+    return (
+        target_pos[0]
+        - (0.5 * (x_c[0, j] + x_c[0, j + 1]) + d[1, 0, j] * r_xi[j]),
+        target_pos[1]
+        - (0.5 * (x_c[1, j] + x_c[1, j + 1]) + d[1, 1, j] * r_xi[j]),
+        target_pos[2]
+        - (0.5 * (x_c[2, j] + x_c[2, j + 1]) + d[1, 2, j] * r_xi[j]),
+    )
+
+
+@njit(cache=True)
+def _sucker_multi_arm_controller_kernel(
+    positions: tuple,
+    directors: tuple,
+    radii: tuple,
+    target_pos: np.ndarray,
+    weight: float,
+    eps: float,
+    activations: tuple,
+) -> None:
+    """Sucker controller of several arms, written into ``activations``.
+
+    Element by element equivalent of :func:`_sucker_full_controller_kernel`
+    followed by the activation ramp ``weight``, without temporaries.
+    ``positions``, ``directors`` and ``radii`` hold the rod arrays of each
+    arm; ``activations`` holds one ``(group, element)`` array per arm,
+    ordered like the muscle groups.
+    """
+    for arm in range(len(positions)):
+        x_c = positions[arm]
+        d = directors[arm]
+        r_xi = radii[arm]
+        out = activations[arm]
+        n_center = x_c.shape[1] - 1
+        out[:, :] = 0.0
+
+        # Arc length of the element closest to the target.
+        nearest = 0
+        nearest_norm = np.inf
+        for j in range(n_center):
+            rho = _sucker_to_target(x_c, d, r_xi, target_pos, j)
+            rho_norm = max(math.sqrt(_dot(rho, rho)), eps)
+            if rho_norm < nearest_norm:
+                nearest = j
+                nearest_norm = rho_norm
+        arm_delta = (
+            x_c[0, -1] - x_c[0, 0],
+            x_c[1, -1] - x_c[1, 0],
+            x_c[2, -1] - x_c[2, 0],
+        )
+        arm_length = math.sqrt(_dot(arm_delta, arm_delta))
+        ds = arm_length / (n_center - 1) if n_center > 1 else 0.0
+        s_bar = arm_length if nearest == n_center - 1 else nearest * ds
+
+        for j in range(n_center):
+            d1 = (d[0, 0, j], d[0, 1, j], d[0, 2, j])
+            d2 = (d[1, 0, j], d[1, 1, j], d[1, 2, j])
+            d3 = (d[2, 0, j], d[2, 1, j], d[2, 2, j])
+            rho = _sucker_to_target(x_c, d, r_xi, target_pos, j)
+            rho_norm = max(math.sqrt(_dot(rho, rho)), eps)
+            n = (rho[0] / rho_norm, rho[1] / rho_norm, rho[2] / rho_norm)
+
+            s = arm_length if j == n_center - 1 else j * ds
+            mu = SUCKER_A_MAX * (
+                1.0
+                - 1.0
+                / (1.0 + math.exp(-SUCKER_GAMMA * (s - (s_bar + SUCKER_PHI))))
+            )
+
+            n_t = _reject(n, d3, eps)
+            sin_alpha = math.sin(
+                math.atan2(_dot(d3, _cross(d2, n_t)), _dot(d2, n_t))
+            )
+            a_om = mu * sin_alpha * sin_alpha * weight
+            if sin_alpha < 0.0:
+                out[RIGHT_OM_GROUP_INDEX, j] = a_om
+            elif sin_alpha > 0.0:
+                out[LEFT_OM_GROUP_INDEX, j] = a_om
+
+            for i in range(LM_GROUP_COUNT):
+                c = LM_COS[i]
+                s_theta = LM_SIN[i]
+                d_i = (
+                    c * d1[0] + s_theta * d2[0],
+                    c * d1[1] + s_theta * d2[1],
+                    c * d1[2] + s_theta * d2[2],
+                )
+                d_b = _normalized(_cross(d3, d_i), eps)
+                n_b = _reject(n, d_b, eps)
+                sin_alpha_b = math.sin(
+                    math.atan2(_dot(d_b, _cross(d3, n_b)), _dot(d3, n_b))
+                )
+                if sin_alpha_b > 0.0:
+                    out[LM_GROUP_START_INDEX + i, j] = (
+                        mu * sin_alpha_b * sin_alpha_b * weight
+                    )
+
+
 # TODO: Refactor later
 class ApplyOctopusMuscles(ApplyActuations):
     """ApplyMuscles."""
@@ -174,14 +313,23 @@ class ApplyOctopusMuscles(ApplyActuations):
 class COOMMOctopusSimulation(DualArmSimulationBase):
     """COOMM Octopus mode"""
 
+    # The sucker controller runs every millisecond, not every substep.
+    control_dt: float | None = 1.0e-3
     _target_sphere: ea.Sphere = field(init=False)
     _obstacle_sphere: ea.Sphere = field(init=False)
     _muscle_groups: dict[str, list[MuscleGroup]] = field(
         init=False, default_factory=dict
     )
-    _activation_buffers: dict[str, list[np.ndarray]] = field(
+    # One (muscle group, element) activation array per arm, shared with the
+    # muscles so the controller output needs no copying.
+    _activations: dict[str, np.ndarray] = field(
         init=False, default_factory=dict
     )
+    # Per-arm positions, directors, radii and activations handed to
+    # _sucker_multi_arm_controller_kernel.
+    _controller_arrays: tuple[tuple[np.ndarray, ...], ...] = field(
+        init=False, default=()
+    )
 
     def build_simulation(self) -> None:
         from virtual_field.runtime.spirob_elastica.spirob import create_spirob
@@ -309,10 +457,16 @@ class COOMMOctopusSimulation(DualArmSimulationBase):
             float(self.right_rod.radius[0]), self.right_rod
         )
         for arm_id in self.arm_ids:
-            self._activation_buffers[arm_id] = [
-                np.zeros(muscle_group.activation.shape, dtype=np.float64)
-                for muscle_group in self._muscle_groups[arm_id]
-            ]
+            muscle_groups = self._muscle_groups[arm_id]
+            activations = np.zeros(
+                (len(muscle_groups), *muscle_groups[0].activation.shape),
+                dtype=np.float64,
+            )
+            for muscle_group, activation in zip(muscle_groups, activations):
+                muscle_group.activation = activation
+                for muscle in muscle_group.muscles:
+                    muscle.activation = activation
+            self._activations[arm_id] = activations
         self.simulator.add_forcing_to(self.left_rod).using(
             ApplyOctopusMuscles,
             actuations=self._muscle_groups[self.arm_ids[0]],
@@ -366,6 +520,14 @@ class COOMMOctopusSimulation(DualArmSimulationBase):
         )
 
         self.simulator.finalize()
+        # After finalize the rod arrays are views into the memory blocks.
+        rods = [self.rods[arm_id] for arm_id in self.arm_ids]
+        self._controller_arrays = (
+            tuple(rod.position_collection for rod in rods),
+            tuple(rod.director_collection for rod in rods),
+            tuple(rod.radius for rod in rods),
+            tuple(self._activations[arm_id] for arm_id in self.arm_ids),
+        )
 
     def _create_muscle_groups(
         self, base_radius: float, rod: ea.CosseratRod
@@ -457,42 +619,21 @@ class COOMMOctopusSimulation(DualArmSimulationBase):
             muscle_group.set_current_length_as_rest_length(rod)
         return muscle_groups
 
-    def _sucker_full_controller(
-        self, rod: ea.CosseratRod, target_pos: np.ndarray
-    ) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
-        a_r_om, a_l_om, a_lm0, a_lm1, a_lm2, a_lm3 = (
-            _sucker_full_controller_kernel(
-                rod.position_collection,
-                rod.director_collection[0, :, :],
-                rod.director_collection[1, :, :],
-                rod.director_collection[2, :, :],
-                rod.radius,
-                target_pos,
-                SUCKER_EPS,
-            )
+    def apply_control(self) -> None:
+        # Transverse muscles stay off (same as journal_reach).
+        positions, directors, radii, activations = self._controller_arrays
+        _sucker_multi_arm_controller_kernel(
+            positions,
+            directors,
+            radii,
+            self._target_sphere.position_collection[:, 0],
+            min(1.0, self._time / ACTIVATION_RAMP_TIME),
+            SUCKER_EPS,
+            activations,
         )
-        return a_r_om, a_l_om, [a_lm0, a_lm1, a_lm2, a_lm3]
-
-    def _controller_activations(
-        self, rod: ea.CosseratRod, target_pos: np.ndarray, arm_id: str
-    ) -> list[np.ndarray]:
-        activations = self._activation_buffers[arm_id]
-        for activation in activations:
-            activation.fill(0.0)
-
-        a_r, a_l, a_lm = self._sucker_full_controller(rod, target_pos)
-        for lm_idx in range(min(LM_GROUP_COUNT, len(a_lm))):
-            activations[LM_GROUP_START_INDEX + lm_idx] = a_lm[lm_idx]
-        activations[TM_GROUP_INDEX].fill(
-            0.0
-        )  # keep transverse off (same as journal_reach)
-        activations[RIGHT_OM_GROUP_INDEX] = a_r
-        activations[LEFT_OM_GROUP_INDEX] = a_l
-
-        weight = min(1.0, self._time / ACTIVATION_RAMP_TIME)
-        for i in range(len(activations)):
-            activations[i] *= weight
-        return activations
+
+    def control_buffers(self) -> list[np.ndarray]:
+        return [self._activations[arm_id] for arm_id in self.arm_ids]
 
     def step(self, dt: float) -> None:
         total = max(0.0, dt)
@@ -509,10 +650,6 @@ class COOMMOctopusSimulation(DualArmSimulationBase):
                 1.2  # - 0.15 * np.sin(0.5*t)
             )
             self._target_sphere.position_collection[2, 0] = -0.4
-            # Now read updated position
-            target_pos = np.asarray(
-                self._target_sphere.position_collection[:, 0], dtype=np.float64
-            )
             self._obstacle_sphere.position_collection[0, 0] = (
                 0.0  # - 0.15 * np.cos(0.5*t)
             )
@@ -521,18 +658,7 @@ class COOMMOctopusSimulation(DualArmSimulationBase):
             )
             self._obstacle_sphere.position_collection[2, 0] = -0.4
 
-            for arm_id in self.arm_ids:
-                rod = self.rods[arm_id]
-
-                # TODO: Maybe this step can be included within the simulator module.
-                activations = self._controller_activations(
-                    rod, target_pos, arm_id
-                )
-
-                for muscle_group, activation in zip(
-                    self._muscle_groups[arm_id], activations
-                ):
-                    muscle_group.apply_activation(activation)
+            self._update_control()
             self._time = self.timestepper.step(
                 self.simulator, self._time, step_dt
             )
@@ -1,3 +1,4 @@
+from .mesh_bvh import MeshBVH
 from .mesh_contact_utils import Grid
 from .mesh_surface import MeshSurface
 from .rod_mesh_surface_contact import (
@@ -9,6 +10,7 @@ from .sphere_mesh_surface_contact import SphereMeshSurfaceContact
 __all__ = [
     "MeshSurface",
     "Grid",
+    "MeshBVH",
     "RodMeshSurfaceContactGridMethod",
     "RodMeshSurfaceContactGridMethodWithAnisotropicFriction",
     "SphereMeshSurfaceContact",
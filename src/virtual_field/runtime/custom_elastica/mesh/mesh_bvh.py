@@ -0,0 +1,464 @@
+import numpy as np
+from numba import njit
+
+from .mesh_surface import MeshSurface
+
+# Upper bound of the traversal stack. Median splits halve the faces at every
+# level, so the tree depth stays below log2(n_faces) + 1.
+_STACK_SIZE = 64
+
+
+@njit(cache=True)
+def _build_bvh(face_lower, face_upper, leaf_size):
+    """
+    This builds a bounding volume hierarchy over face bounding boxes
+    ----------
+    face_lower, face_upper : numpy.ndarray
+        2D (3, n_faces) array containing the bounding box of each face.
+    leaf_size : int
+        Maximum number of faces of a leaf node.
+
+    Returns
+    -------
+    node_lower, node_upper : numpy.ndarray
+        2D (3, n_nodes) array containing the bounding box of each node.
+    node_child : numpy.ndarray
+        1D (n_nodes) array containing the index of the first child with 'int'
+        type; the second child follows it. -1 for leaf nodes.
+    node_start, node_count : numpy.ndarray
+        1D (n_nodes) arrays containing the faces of each node as a range of
+        face_order with 'int' type.
+    face_order : numpy.ndarray
+        1D (n_faces) array containing face indices with 'int' type.
+
+    Notes
+    ----------
+    Nodes are split at the median face centroid along the axis of largest
+    centroid extent, so the tree is balanced whatever the face sizes.
+    """
+    n_faces = face_lower.shape[1]
+    max_nodes = max(1, 2 * n_faces - 1)
+    centroids = 0.5 * (face_lower + face_upper)
+    face_order = np.arange(n_faces)
+    node_lower = np.empty((3, max_nodes))
+    node_upper = np.empty((3, max_nodes))
+    node_child = np.full(max_nodes, -1, dtype=np.int64)
+    node_start = np.zeros(max_nodes, dtype=np.int64)
+    node_count = np.zeros(max_nodes, dtype=np.int64)
+
+    stack = np.empty(max_nodes, dtype=np.int64)
+    stack[0] = 0
+    top = 1
+    node_count[0] = n_faces
+    n_nodes = 1
+    while top > 0:
+        top -= 1
+        node = stack[top]
+        start = node_start[node]
+        count = node_count[node]
+        faces = face_order[start : start + count]
+        for axis in range(3):
+            node_lower[axis, node] = np.inf
+            node_upper[axis, node] = -np.inf
+        split_axis = 0
+        split_extent = 0.0
+        for axis in range(3):
+            lowest = np.inf
+            highest = -np.inf
+            for face in faces:
+                node_lower[axis, node] = min(
+                    node_lower[axis, node], face_lower[axis, face]
+                )
+                node_upper[axis, node] = max(
+                    node_upper[axis, node], face_upper[axis, face]
+                )
+                lowest = min(lowest, centroids[axis, face])
+                highest = max(highest, centroids[axis, face])
+            if highest - lowest > split_extent:
+                split_axis = axis
+                split_extent = highest - lowest
+        if count <= leaf_size or split_extent <= 0.0:
+            continue
+
+        order = np.argsort(centroids[split_axis, faces])
+        face_order[start : start + count] = faces[order]
+        half = count // 2
+        child = n_nodes
+        n_nodes += 2
+        node_child[node] = child
+        node_start[child] = start
+        node_count[child] = half
+        node_start[child + 1] = start + half
+        node_count[child + 1] = count - half
+        stack[top] = child + 1
+        stack[top + 1] = child
+        top += 2
+
+    return (
+        node_lower[:, :n_nodes].copy(),
+        node_upper[:, :n_nodes].copy(),
+        node_child[:n_nodes].copy(),
+        node_start[:n_nodes].copy(),
+        node_count[:n_nodes].copy(),
+        face_order,
+    )
+
+
+@njit(cache=True)
+def _query_bvh(
+    node_lower,
+    node_upper,
+    node_child,
+    node_start,
+    node_count,
+    face_order,
+    leaf_lower,
+    leaf_upper,
+    query_lower,
+    query_upper,
+    stack,
+    face_idx,
+    n_found,
+):
+    """
+    This appends the faces whose bounding box overlaps a query box
+    ----------
+    node_lower, node_upper, node_child, node_start, node_count, face_order : numpy.ndarray
+        Hierarchy, see _build_bvh.
+    leaf_lower, leaf_upper : numpy.ndarray
+        2D (3, n_faces) array containing the face bounding boxes in face_order.
+    query_lower, query_upper : numpy.ndarray
+        1D (3,) array containing the query box.
+    stack : numpy.ndarray
+        1D (_STACK_SIZE) work array with 'int' type.
+    face_idx : numpy.ndarray
+        1D output array for the face indices.
+    n_found : int
+        Number of entries of face_idx already in use.
+
+    Returns
+    -------
+    n_found : int
+        Updated number of entries. Faces past the end of face_idx are counted
+        but not written, so the caller can grow the buffer and query again.
+    """
+    capacity = face_idx.shape[0]
+    stack[0] = 0
+    top = 1
+    while top > 0:
+        top -= 1
+        node = stack[top]
+        if (
+            node_lower[0, node] > query_upper[0]
+            or node_upper[0, node] < query_lower[0]
+            or node_lower[1, node] > query_upper[1]
+            or node_upper[1, node] < query_lower[1]
+            or node_lower[2, node] > query_upper[2]
+            or node_upper[2, node] < query_lower[2]
+        ):
+            continue
+        child = node_child[node]
+        if child >= 0:
+            stack[top] = child + 1
+            stack[top + 1] = child
+            top += 2
+            continue
+        for i in range(node_start[node], node_start[node] + node_count[node]):
+            if (
+                leaf_lower[0, i] > query_upper[0]
+                or leaf_upper[0, i] < query_lower[0]
+                or leaf_lower[1, i] > query_upper[1]
+                or leaf_upper[1, i] < query_lower[1]
+                or leaf_lower[2, i] > query_upper[2]
+                or leaf_upper[2, i] < query_lower[2]
+            ):
+                continue
+            if n_found < capacity:
+                face_idx[n_found] = face_order[i]
+            n_found += 1
+    return n_found
+
+
+@njit(cache=True)
+def _find_faces_in_bvh(
+    node_lower,
+    node_upper,
+    node_child,
+    node_start,
+    node_count,
+    face_order,
+    leaf_lower,
+    leaf_upper,
+    search_radius,
+    position_collection,
+    element_position,
+    position_idx,
+    face_idx,
+):
+    """
+    This finds the candidate faces of every rod element in a hierarchy
+    ----------
+    node_lower, ..., leaf_upper : numpy.ndarray
+        Hierarchy, see _query_bvh.
+    search_radius : float
+        Half width of the query box around each element center.
+    position_collection : numpy.ndarray
+        2D (dim, n_nodes) array containing data with 'float' type.
+    element_position : numpy.ndarray
+        2D (dim, n_elements) output array for the element centers.
+    position_idx, face_idx : numpy.ndarray
+        1D output arrays for the (element, face) pairs, in element order.
+
+    Returns
+    -------
+    n_pairs : int
+        Number of pairs found; only the first len(face_idx) are written.
+    """
+    n_element = position_collection.shape[1] - 1
+    capacity = position_idx.shape[0]
+    stack = np.empty(_STACK_SIZE, dtype=np.int64)
+    query_lower = np.empty(3)
+    query_upper = np.empty(3)
+    n_pairs = 0
+    for i in range(n_element):
+        for axis in range(3):
+            element_position[axis, i] = 0.5 * (
+                position_collection[axis, i + 1] + position_collection[axis, i]
+            )
+            query_lower[axis] = element_position[axis, i] - search_radius
+            query_upper[axis] = element_position[axis, i] + search_radius
+        start = n_pairs
+        n_pairs = _query_bvh(
+            node_lower,
+            node_upper,
+            node_child,
+            node_start,
+            node_count,
+            face_order,
+            leaf_lower,
+            leaf_upper,
+            query_lower,
+            query_upper,
+            stack,
+            face_idx,
+            n_pairs,
+        )
+        for pair in range(start, min(n_pairs, capacity)):
+            position_idx[pair] = i
+    return n_pairs
+
+
+class MeshBVH:
+    """
+    Bounding volume hierarchy over the faces of a mesh surface, a broadphase
+    for mesh contact that can replace :class:`Grid`.
+
+    Unlike the grid it needs no global cell size, so it copes with meshes of
+    widely varying face sizes, and it has no bounds: elements far from the
+    surface just find no candidate faces. A query visits O(log n_faces) nodes
+    plus the faces near the element.
+
+    Parameters
+    ----------
+    surface : MeshSurface
+    search_radius : float, optional
+        Half width of the query box around each rod element center. It must
+        cover the element radius plus the contact tolerance. By default
+        :class:`RodMeshSurfaceContactGridMethod` derives it from its rod with
+        :meth:`compute_search_radius`; queries through :meth:`find_faces`
+        need it passed explicitly.
+    leaf_size : int
+        Maximum number of faces of a leaf node.
+
+    Examples
+    --------
+    >>> simulator.detect_contact_between(rod, mesh_surface).using(
+    ...    RodMeshSurfaceContactGridMethod,
+    ...    k=1e4,
+    ...    nu=10,
+    ...    grid=MeshBVH(mesh_surface),
+    ... )
+    """
+
+    def __init__(
+        self, surface: MeshSurface, search_radius=None, leaf_size: int = 4
+    ):
+        if search_radius is not None and not search_radius > 0.0:
+            raise ValueError(
+                f"search_radius must be positive. Got {search_radius=}"
+            )
+        if leaf_size < 1:
+            raise ValueError(f"leaf_size must be positive. Got {leaf_size=}")
+        self.n_faces = surface.n_faces
+        self.search_radius = (
+            None if search_radius is None else float(search_radius)
+        )
+        face_lower = np.ascontiguousarray(np.min(surface.faces, axis=1))
+        face_upper = np.ascontiguousarray(np.max(surface.faces, axis=1))
+        (
+            self.node_lower,
+            self.node_upper,
+            self.node_child,
+            self.node_start,
+            self.node_count,
+            self.face_order,
+        ) = _build_bvh(face_lower, face_upper, leaf_size)
+        self.leaf_lower = np.ascontiguousarray(face_lower[:, self.face_order])
+        self.leaf_upper = np.ascontiguousarray(face_upper[:, self.face_order])
+        # Initial number of candidate faces reserved per element by the
+        # contact buffers, which grow when a query finds more.
+        self.max_faces_per_cell = max(leaf_size, 8)
+
+    @staticmethod
+    def compute_search_radius(rod):
+        """
+        Query half width that covers the contact sphere of every element of
+        ``rod``, with the same margin as the grid cell size.
+        """
+        return 2 * float(np.max(rod.radius))
+
+    @property
+    def _tree(self):
+        return (
+            self.node_lower,
+            self.node_upper,
+            self.node_child,
+            self.node_start,
+            self.node_count,
+            self.face_order,
+            self.leaf_lower,
+            self.leaf_upper,
+        )
+
+    def query_box(self, lower, upper):
+        """
+        Indices of the faces whose bounding box overlaps the box
+        [lower, upper], in no particular order.
+        """
+        query_lower = np.asarray(lower, dtype=np.float64)
+        query_upper = np.asarray(upper, dtype=np.float64)
+        stack = np.empty(_STACK_SIZE, dtype=np.int64)
+        face_idx = np.empty(64, dtype=np.int64)
+        n_found = _query_bvh(
+            *self._tree, query_lower, query_upper, stack, face_idx, 0
+        )
+        if n_found > face_idx.shape[0]:
+            face_idx = np.empty(n_found, dtype=np.int64)
+            n_found = _query_bvh(
+                *self._tree, query_lower, query_upper, stack, face_idx, 0
+            )
+        return face_idx[:n_found]
+
+    def find_faces(self, position_collection, search_radius=None):
+        """
+        Candidate faces of every rod element, see :meth:`find_faces_into`.
+        This allocates the output arrays on every call.
+
+        Returns
+        -------
+        position_idx_array : numpy.ndarray
+            1D (n_pairs) array containing element indices with 'int' type.
+        face_idx_array : numpy.ndarray
+            1D (n_pairs) array containing face indices with 'int' type.
+        element_position : numpy.ndarray
+            2D (dim, n_elements) array containing data with 'float' type.
+        """
+        n_element = position_collection.shape[1] - 1
+        element_position = np.empty((3, n_element))
+        position_idx = np.empty(
+            n_element * self.max_faces_per_cell, dtype=np.int64
+        )
+        face_idx = np.empty_like(position_idx)
+        n_pairs = self.find_faces_into(
+            position_collection,
+            element_position,
+            position_idx,
+            face_idx,
+            search_radius,
+        )
+        if n_pairs > position_idx.shape[0]:
+            position_idx = np.empty(n_pairs, dtype=np.int64)
+            face_idx = np.empty_like(position_idx)
+            n_pairs = self.find_faces_into(
+                position_collection,
+                element_position,
+                position_idx,
+                face_idx,
+                search_radius,
+            )
+        return position_idx[:n_pairs], face_idx[:n_pairs], element_position
+
+    def find_faces_into(
+        self,
+        position_collection,
+        element_position,
+        position_idx,
+        face_idx,
+        search_radius=None,
+    ):
+        """
+        Write the element positions and the (element, candidate face) pairs
+        into preallocated buffers and return the number of pairs.
+        If it exceeds the buffer size, only the first pairs are written and
+        the query must be repeated with larger buffers.
+        ``search_radius`` defaults to the one given at construction.
+        """
+        if search_radius is None:
+            search_radius = self.search_radius
+        if search_radius is None:
+            raise ValueError(
+                "MeshBVH has no search_radius; pass one to the constructor "
+                "or to the query"
+            )
+        return _find_faces_in_bvh(
+            *self._tree,
+            search_radius,
+            position_collection,
+            element_position,
+            position_idx,
+            face_idx,
+        )
+
+    # Attributes stored by to_arrays.
+    _ARRAY_ATTRIBUTES = (
+        "n_faces",
+        "search_radius",
+        "node_lower",
+        "node_upper",
+        "node_child",
+        "node_start",
+        "node_count",
+        "face_order",
+        "leaf_lower",
+        "leaf_upper",
+        "max_faces_per_cell",
+    )
+
+    def to_arrays(self):
+        """
+        Return the hierarchy as a dict of numpy arrays, which can be saved
+        with numpy (no pickle) and passed to from_arrays. An unset
+        search_radius is stored as NaN.
+        """
+        arrays = {
+            name: np.asarray(getattr(self, name))
+            for name in self._ARRAY_ATTRIBUTES
+        }
+        if self.search_radius is None:
+            arrays["search_radius"] = np.asarray(np.nan)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Rebuild a hierarchy from the output of to_arrays without building it
+        again.
+        """
+        bvh = cls.__new__(cls)
+        for name in cls._ARRAY_ATTRIBUTES:
+            setattr(bvh, name, arrays[name])
+        bvh.n_faces = int(arrays["n_faces"])
+        search_radius = float(arrays["search_radius"])
+        bvh.search_radius = None if np.isnan(search_radius) else search_radius
+        bvh.max_faces_per_cell = int(arrays["max_faces_per_cell"])
+        return bvh
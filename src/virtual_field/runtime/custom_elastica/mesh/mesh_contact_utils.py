@@ -1,15 +1,10 @@
-from functools import partial
-
 import numpy as np
 from elastica._linalg import _batch_dot, _batch_norm
-from elastica.contact_utils import _node_to_element_position
 from elastica.typing import RodType
 from numba import njit
 
 from .mesh_surface import MeshSurface
 
-# import dill
-
 
 class BoundaryError(Exception):
     "Raised when rod leaves surface grid boundary"
@@ -162,6 +157,131 @@ def _batch_sphere_triangle_intersection_check(
     return no_intersection_idx, distance_from_triangle_plane
 
 
+@njit(cache=True)
+def _face_cell_pairs(first_cell, last_cell, n_positions):
+    """
+    This expands per-face ranges of overlapped grid cells into (cell, face) pairs
+    ----------
+    first_cell : numpy.ndarray
+        2D (3, n_faces) array containing data with 'int' type.
+        First overlapped cell of each face along each axis.
+    last_cell : numpy.ndarray
+        2D (3, n_faces) array containing data with 'int' type.
+        Last overlapped cell of each face along each axis (inclusive).
+    n_positions : numpy.ndarray
+        1D (3,) array containing data with 'int' type. Number of cells per axis.
+
+    Returns
+    -------
+    cell_ids : numpy.ndarray
+        1D (n_pairs) array containing data with 'int' type.
+        Row-major flat index of the cell.
+    face_ids : numpy.ndarray
+        1D (n_pairs) array containing data with 'int' type.
+        Pairs are emitted in ascending face order.
+    """
+    n_faces = first_cell.shape[1]
+    n_pairs = 0
+    for face in range(n_faces):
+        count = 1
+        for axis in range(3):
+            count *= max(0, last_cell[axis, face] - first_cell[axis, face] + 1)
+        n_pairs += count
+
+    cell_ids = np.empty(n_pairs, dtype=np.int64)
+    face_ids = np.empty(n_pairs, dtype=np.int64)
+    pair = 0
+    for face in range(n_faces):
+        for i in range(first_cell[0, face], last_cell[0, face] + 1):
+            for j in range(first_cell[1, face], last_cell[1, face] + 1):
+                for k in range(first_cell[2, face], last_cell[2, face] + 1):
+                    cell_ids[pair] = (i * n_positions[1] + j) * n_positions[
+                        2
+                    ] + k
+                    face_ids[pair] = face
+                    pair += 1
+    return cell_ids, face_ids
+
+
+@njit(cache=True)
+def _find_faces_in_packed_grid(
+    cell_offsets,
+    cell_faces,
+    n_positions,
+    grid_min,
+    grid_axes,
+    dimension,
+    grid_size,
+    position_collection,
+    element_position,
+    position_idx,
+    face_idx,
+):
+    """
+    This finds the candidate faces of every rod element in a packed grid
+    ----------
+    cell_offsets, cell_faces, n_positions : numpy.ndarray
+        Packed grid, see Grid._bin_faces.
+    grid_min : numpy.ndarray
+        1D (3,) array containing the grid origin along each grid axis.
+    grid_axes : numpy.ndarray
+        1D (3,) array containing the coordinate axis of each grid axis.
+    dimension : int
+        2 or 3; only the first dimension grid axes are used.
+    grid_size : float
+    position_collection : numpy.ndarray
+        2D (dim, n_nodes) array containing data with 'float' type.
+    element_position : numpy.ndarray
+        2D (dim, n_elements) output array for the element centers.
+    position_idx, face_idx : numpy.ndarray
+        1D output arrays for the (element, face) pairs, in element order.
+
+    Returns
+    -------
+    n_pairs : int
+        Number of pairs written.
+    n_outside : int
+        Number of elements in grid cells without faces.
+
+    Notes
+    ----------
+    The element position minus the grid origin, in units of grid size and
+    rounded, is the grid corner nearest to the element center. Since any grid
+    cell can contain at most one element, the element lies within the cell
+    spanning the neighbouring corners, whose faces are the candidates.
+    """
+    n_element = position_collection.shape[1] - 1
+    n_pairs = 0
+    n_outside = 0
+    for i in range(n_element):
+        for axis in range(3):
+            element_position[axis, i] = 0.5 * (
+                position_collection[axis, i + 1] + position_collection[axis, i]
+            )
+        cell = 0
+        inside = True
+        for axis in range(3):
+            index = 0
+            if axis < dimension:
+                index = int(
+                    np.round(
+                        (element_position[grid_axes[axis], i] - grid_min[axis])
+                        / grid_size
+                    )
+                )
+                if index < 0 or index >= n_positions[axis]:
+                    inside = False
+            cell = cell * n_positions[axis] + index
+        if not inside or cell_offsets[cell] == cell_offsets[cell + 1]:
+            n_outside += 1
+            continue
+        for face in range(cell_offsets[cell], cell_offsets[cell + 1]):
+            position_idx[n_pairs] = i
+            face_idx[n_pairs] = cell_faces[face]
+            n_pairs += 1
+    return n_pairs, n_outside
+
+
 class Grid:
     def __init__(
         self,
@@ -192,26 +312,113 @@ class Grid:
             ], "grid axes must be one of 0,1,2 for x,y,z axes respectively"
         self.axes = grid_axes
         self._generate_grid(surface)
-        if self.dimension == 2:
-            self.find_faces = partial(
-                self._find_faces_from_2D_grid,
-                surface_grid=self.surface_grid,
-                x_min=self.min_point[self.axes[0]],
-                y_min=self.min_point[self.axes[1]],
-                grid_axes=self.axes,
-                grid_size=self.size,
-                exit_boundary_condition=self.exit_boundary_condition,
-            )
-        else:
-            self.find_faces = partial(
-                self._find_faces_from_3D_grid,
-                surface_grid=self.surface_grid,
-                x_min=self.min_point[0],
-                y_min=self.min_point[1],
-                z_min=self.min_point[2],
-                grid_size=self.size,
-                exit_boundary_condition=self.exit_boundary_condition,
-            )
+
+    def find_faces(self, position_collection):
+        """
+        Candidate faces of every rod element, see :meth:`find_faces_into`.
+        This allocates the output arrays on every call.
+
+        Returns
+        -------
+        position_idx_array : numpy.ndarray
+            1D (n_pairs) array containing element indices with 'int' type.
+        face_idx_array : numpy.ndarray
+            1D (n_pairs) array containing face indices with 'int' type.
+        element_position : numpy.ndarray
+            2D (dim, n_elements) array containing data with 'float' type.
+        """
+        n_element = position_collection.shape[1] - 1
+        element_position = np.empty((3, n_element))
+        position_idx = np.empty(
+            n_element * self.max_faces_per_cell, dtype=np.int64
+        )
+        face_idx = np.empty_like(position_idx)
+        n_pairs = self.find_faces_into(
+            position_collection, element_position, position_idx, face_idx
+        )
+        return position_idx[:n_pairs], face_idx[:n_pairs], element_position
+
+    def find_faces_into(
+        self, position_collection, element_position, position_idx, face_idx
+    ):
+        """
+        Write the element positions and the (element, candidate face) pairs
+        into preallocated buffers and return the number of pairs.
+        position_idx and face_idx must hold at least
+        n_elements * max_faces_per_cell entries.
+
+        Raises
+        ------
+        BoundaryError
+            If exit_boundary_condition is set and an element lies in a grid
+            cell without faces.
+        """
+        n_pairs, n_outside = _find_faces_in_packed_grid(
+            self.cell_offsets,
+            self.cell_faces,
+            self.n_positions,
+            self.grid_min,
+            self.grid_axes,
+            self.dimension,
+            self.size,
+            position_collection,
+            element_position,
+            position_idx,
+            face_idx,
+        )
+        if self.exit_boundary_condition and n_outside > 0:
+            raise BoundaryError(
+                "Rod outside surface grid boundary"
+            )  # a rod element is within grid cells with no faces
+        return n_pairs
+
+    # Attributes stored by to_arrays, in addition to the packed grid.
+    _ARRAY_ATTRIBUTES = (
+        "dimension",
+        "n_faces",
+        "size",
+        "min_point",
+        "surface_scale",
+        "axes",
+        "n_positions",
+        "cell_offsets",
+        "cell_faces",
+        "grid_axes",
+        "grid_min",
+        "max_faces_per_cell",
+    )
+
+    def to_arrays(self):
+        """
+        Return the grid as a dict of numpy arrays, which can be saved with
+        numpy (no pickle) and passed to from_arrays.
+        """
+        return {
+            name: np.asarray(getattr(self, name))
+            for name in self._ARRAY_ATTRIBUTES
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, exit_boundary_condition=False):
+        """
+        Rebuild a grid from the output of to_arrays without binning the
+        surface faces again.
+        """
+        grid = cls.__new__(cls)
+        grid.dimension = int(arrays["dimension"])
+        grid.n_faces = int(arrays["n_faces"])
+        grid.size = float(arrays["size"])
+        grid.min_point = arrays["min_point"]
+        grid.surface_scale = arrays["surface_scale"]
+        grid.axes = [int(axis) for axis in arrays["axes"]]
+        grid.n_positions = arrays["n_positions"]
+        grid.cell_offsets = arrays["cell_offsets"]
+        grid.cell_faces = arrays["cell_faces"]
+        grid.grid_axes = arrays["grid_axes"]
+        grid.grid_min = arrays["grid_min"]
+        grid.max_faces_per_cell = int(arrays["max_faces_per_cell"])
+        grid.exit_boundary_condition = exit_boundary_condition
+        return grid
 
     @staticmethod
     def compute_grid_size(rod, surface):
@@ -231,19 +438,22 @@ class Grid:
             face_x_right = np.max(surface.faces[self.axes[0], :, :], axis=0)
             face_y_down = np.min(surface.faces[self.axes[1], :, :], axis=0)
             face_y_up = np.max(surface.faces[self.axes[1], :, :], axis=0)
-            self.surface_grid = dict(
-                self._create_surface_grid_2D(
-                    surface.faces,
-                    self.size,
-                    self.min_point[self.axes[0]],
-                    self.min_point[self.axes[1]],
-                    self.axes,
-                    face_x_left,
-                    face_x_right,
-                    face_y_down,
-                    face_y_up,
-                )
+            (
+                self.n_positions,
+                self.cell_offsets,
+                self.cell_faces,
+            ) = self._create_surface_grid_2D(
+                surface.faces,
+                self.size,
+                self.min_point[self.axes[0]],
+                self.min_point[self.axes[1]],
+                self.axes,
+                face_x_left,
+                face_x_right,
+                face_y_down,
+                face_y_up,
             )
+            self.grid_axes = np.array([*self.axes, 0], dtype=np.int64)
         elif self.dimension == 3:
             face_x_left = np.min(surface.faces[0, :, :], axis=0)
             face_x_right = np.max(surface.faces[0, :, :], axis=0)
@@ -251,24 +461,109 @@ class Grid:
             face_y_up = np.max(surface.faces[1, :, :], axis=0)
             face_z_back = np.min(surface.faces[2, :, :], axis=0)
             face_z_front = np.max(surface.faces[2, :, :], axis=0)
-            self.surface_grid = dict(
-                self._create_surface_grid_3D(
-                    surface.faces,
-                    self.size,
-                    self.min_point[0],
-                    self.min_point[1],
-                    self.min_point[2],
-                    face_x_left,
-                    face_x_right,
-                    face_y_down,
-                    face_y_up,
-                    face_z_back,
-                    face_z_front,
+            (
+                self.n_positions,
+                self.cell_offsets,
+                self.cell_faces,
+            ) = self._create_surface_grid_3D(
+                surface.faces,
+                self.size,
+                self.min_point[0],
+                self.min_point[1],
+                self.min_point[2],
+                face_x_left,
+                face_x_right,
+                face_y_down,
+                face_y_up,
+                face_z_back,
+                face_z_front,
+            )
+            self.grid_axes = np.array([0, 1, 2], dtype=np.int64)
+        # grid origin along each grid axis
+        self.grid_min = np.zeros(3)
+        self.grid_min[: self.dimension] = self.min_point[
+            self.grid_axes[: self.dimension]
+        ]
+        self.max_faces_per_cell = int(
+            np.max(np.diff(self.cell_offsets), initial=0)
+        )
+
+    @staticmethod
+    def _cell_bounds(minimum, maximum, grid_size):
+        """
+        Grid cell i along one axis spans the grid corners max(0, i - 1) to
+        min(n_positions - 1, i + 1), so neighbouring cells overlap and an element
+        rounded to the nearest corner is covered by a single cell.
+        Returns the lower and upper coordinate of every cell; both are sorted.
+        """
+        n_positions = int(
+            np.ceil((maximum - minimum) / grid_size)
+        )  # number of grid sizes that fit in this direction
+        corners = np.arange(n_positions)
+        lower = minimum + np.maximum(0, corners - 1) * grid_size
+        upper = minimum + np.minimum(n_positions - 1, corners + 1) * grid_size
+        return lower, upper
+
+    @staticmethod
+    def _bin_faces(face_lower, face_upper, cell_lower, cell_upper):
+        """
+        Bin each face's axis aligned bounding box into every grid cell it
+        overlaps. A face overlaps a cell unless it lies entirely below, above,
+        to the left of, ..., the cell, i.e. along every axis
+        cell_lower <= face_upper and cell_upper >= face_lower.
+
+        Parameters
+        ----------
+        face_lower, face_upper : list of numpy.ndarray
+            Per-axis (n_faces,) bounding box of each face.
+        cell_lower, cell_upper : list of numpy.ndarray
+            Per-axis bounds of the grid cells, from :meth:`_cell_bounds`.
+
+        Returns
+        -------
+        n_positions : numpy.ndarray
+            1D (3,) array containing the number of cells along each axis with
+            'int' type; 1 for the unused third axis of 2D grids.
+        cell_offsets : numpy.ndarray
+            1D (n_cells + 1) array containing data with 'int' type. The faces
+            of the cell with row-major flat index c are
+            cell_faces[cell_offsets[c]:cell_offsets[c + 1]].
+        cell_faces : numpy.ndarray
+            1D (n_pairs) array containing face indices with 'int' type,
+            ascending within each cell.
+        """
+        dimension = len(face_lower)
+        n_faces = face_lower[0].shape[0]
+        first_cell = np.zeros((3, n_faces), dtype=np.int64)
+        last_cell = np.zeros((3, n_faces), dtype=np.int64)
+        n_positions = np.ones(3, dtype=np.int64)
+        for axis in range(dimension):
+            # Both cell bounds are sorted, so the overlapped cells of a face
+            # form one contiguous range along each axis.
+            first_cell[axis] = np.searchsorted(
+                cell_upper[axis], face_lower[axis], side="left"
+            )
+            last_cell[axis] = (
+                np.searchsorted(
+                    cell_lower[axis], face_upper[axis], side="right"
                 )
+                - 1
             )
+            n_positions[axis] = cell_lower[axis].shape[0]
+
+        cell_ids, face_ids = _face_cell_pairs(
+            first_cell, last_cell, n_positions
+        )
+        # A stable sort keeps the faces of every cell in ascending order.
+        order = np.argsort(cell_ids, kind="stable")
+        cell_offsets = np.zeros(np.prod(n_positions) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(cell_ids, minlength=cell_offsets.size - 1),
+            out=cell_offsets[1:],
+        )
+        return n_positions, cell_offsets, face_ids[order]
 
     @staticmethod
-    @njit(cache=True)
     def _create_surface_grid_2D(
         faces,
         grid_size,
@@ -280,62 +575,20 @@ class Grid:
         face_y_down,
         face_y_up,
     ):
-        n_x_positions = int(
-            np.ceil((np.max(faces[grid_axes[0], :, :]) - x_min) / grid_size)
-        )  # number of grid sizes that fit in x direction
-        n_y_positions = int(
-            np.ceil((np.max(faces[grid_axes[1], :, :]) - y_min) / grid_size)
-        )  # number of grid sizes that fit in y direction
-        faces_grid = dict()
-        for i in range(n_x_positions):
-            x_left = x_min + (
-                max(0, i - 1) * grid_size
-            )  # current grid square left x coordinate
-            x_right = x_min + (
-                min(n_x_positions - 1, i + 1) * grid_size
-            )  # current grid square right x coordinate
-            for j in range(n_y_positions):
-                y_down = y_min + (
-                    max(0, j - 1) * grid_size
-                )  # current grid square down y coordinate
-                y_up = y_min + (
-                    min(n_y_positions - 1, j + 1) * grid_size
-                )  # current grid square up y coordinate
-                if (
-                    len(
-                        np.where(
-                            (
-                                (
-                                    face_y_down > y_up
-                                )  # if face_y_down coordinate is greater than grid square up position then face is above grid square
-                                + (
-                                    face_y_up < y_down
-                                )  # if face_y_up coordinate is lower than grid square down position then face is below grid square
-                                + (
-                                    face_x_right < x_left
-                                )  # if face_x_right coordinate is lower than grid square left position then face is to the left of the grid square
-                                + (
-                                    face_x_left > x_right
-                                )  # if face_x_left coordinate is greater than grid square right position then face is to the right of the grid square
-                            )
-                            == 0  # if the face is not below, above, to the right of or, to the left of the grid then they must intersect
-                        )[0]
-                    )
-                    > 0
-                ):
-                    faces_grid[(i, j)] = np.where(
-                        (
-                            (face_y_down > y_up)
-                            + (face_y_up < y_down)
-                            + (face_x_right < x_left)
-                            + (face_x_left > x_right)
-                        )
-                        == 0
-                    )[0]
-        return faces_grid
+        x_lower, x_upper = Grid._cell_bounds(
+            x_min, np.max(faces[grid_axes[0], :, :]), grid_size
+        )
+        y_lower, y_upper = Grid._cell_bounds(
+            y_min, np.max(faces[grid_axes[1], :, :]), grid_size
+        )
+        return Grid._bin_faces(
+            [face_x_left, face_y_down],
+            [face_x_right, face_y_up],
+            [x_lower, y_lower],
+            [x_upper, y_upper],
+        )
 
     @staticmethod
-    @njit(cache=True)
     def _create_surface_grid_3D(
         faces,
         grid_size,
@@ -349,219 +602,18 @@ class Grid:
         face_z_back,
         face_z_front,
     ):
-        n_x_positions = int(
-            np.ceil((np.max(faces[0, :, :]) - x_min) / grid_size)
-        )  # number of grid sizes that fit in x direction
-        n_y_positions = int(
-            np.ceil((np.max(faces[1, :, :]) - y_min) / grid_size)
-        )  # number of grid sizes that fit in y direction
-        n_z_positions = int(
-            np.ceil((np.max(faces[2, :, :]) - z_min) / grid_size)
-        )  # number of grid sizes that fit in z direction
-        faces_grid = dict()
-        for i in range(n_x_positions):
-            x_left = x_min + (
-                max(0, i - 1) * grid_size
-            )  # current grid cube left x coordinate
-            x_right = x_min + (
-                min(n_x_positions - 1, i + 1) * grid_size
-            )  # current grid cube right x coordinate
-            for j in range(n_y_positions):
-                y_down = y_min + (
-                    max(0, j - 1) * grid_size
-                )  # current grid cube down y coordinate
-                y_up = y_min + (
-                    min(n_y_positions - 1, j + 1) * grid_size
-                )  # current grid cube up y coordinate
-                for k in range(n_z_positions):
-                    z_back = z_min + (
-                        max(0, k - 1) * grid_size
-                    )  # current grid cube back z coordinate
-                    z_front = z_min + (
-                        min(n_z_positions - 1, k + 1) * grid_size
-                    )  # current grid cube front z coordinate
-                    if (
-                        len(
-                            np.where(
-                                (
-                                    (
-                                        face_y_down > y_up
-                                    )  # if face_y_down coordinate is greater than grid cube up position then face is above grid cube
-                                    + (
-                                        face_y_up < y_down
-                                    )  # if face_y_up coordinate is lower than grid cube down position then face is below grid cube
-                                    + (
-                                        face_x_right < x_left
-                                    )  # if face_x_right coordinate is lower than grid cube left position then face is to the left of the grid cube
-                                    + (
-                                        face_x_left > x_right
-                                    )  # if face_x_left coordinate is greater than grid cube right position then face is to the right of the grid cube
-                                    + (
-                                        face_z_front < z_back
-                                    )  # if face_z_front coordinate is lower than grid cube back position then face is behind the grid cube
-                                    + (
-                                        face_z_back > z_front
-                                    )  # if face_z_back coordinate is greater than grid cube front position then face is in front of the grid cube
-                                )
-                                == 0  # if the face is not below, above, behind, in front of, to the right of, or to the left of the grid cube then they must intersect
-                            )[0]
-                        )
-                        > 0
-                    ):
-                        faces_grid[(i, j, k)] = np.where(
-                            (
-                                (face_y_down > y_up)
-                                + (face_y_up < y_down)
-                                + (face_x_right < x_left)
-                                + (face_x_left > x_right)
-                                + (face_z_front < z_back)
-                                + (face_z_back > z_front)
-                            )
-                            == 0
-                        )[0]
-        return faces_grid
-
-    @staticmethod
-    def _find_faces_from_2D_grid(
-        surface_grid,
-        x_min,
-        y_min,
-        grid_axes,
-        grid_size,
-        position_collection,
-        exit_boundary_condition,
-    ):
-        element_position = _node_to_element_position(position_collection)
-        n_element = element_position.shape[-1]
-        position_idx_chunks: list[np.ndarray] = []
-        face_idx_chunks: list[np.ndarray] = []
-        grid_position = np.empty((2, n_element))
-        grid_position[0, :] = np.round(
-            (element_position[grid_axes[0], :] - x_min) / grid_size
-        )
-        grid_position[1, :] = np.round(
-            (element_position[grid_axes[1], :] - y_min) / grid_size
+        x_lower, x_upper = Grid._cell_bounds(
+            x_min, np.max(faces[0, :, :]), grid_size
         )
-        # here we take the element position subtract the grid left most lower corner position (to get distance from that point)
-        # The distance divided by the grid size converts the distance to units of grid size.
-        # Rounding gives us the nearest corner to that element center position
-        # Since any grid square can contain at most one element any element will have to lie within the four squares around the corner we found above.
-
-        # find face neighborhood of each element position
-        for i in range(n_element):
-            try:
-                face_idx_element_no_duplicates = surface_grid[
-                    (int(grid_position[0, i]), int(grid_position[1, i]))
-                ]
-            except KeyError:
-                face_idx_element_no_duplicates = np.empty((0))
-                if (exit_boundary_condition) and (
-                    face_idx_element_no_duplicates.size == 0
-                ):
-                    raise BoundaryError(
-                        "Rod outside surface grid boundary"
-                    )  # a rod element is within four grid squares with no faces
-
-            n_contacts = face_idx_element_no_duplicates.shape[0]
-            if n_contacts > 0:
-                face_idx_chunks.append(face_idx_element_no_duplicates)
-                position_idx_chunks.append(
-                    np.full((n_contacts,), i, dtype=np.int64)
-                )
-
-        if len(face_idx_chunks) == 0:
-            position_idx_array = np.empty((0,), dtype=np.int64)
-            face_idx_array = np.empty((0,), dtype=np.int64)
-        else:
-            position_idx_array = np.concatenate(position_idx_chunks).astype(
-                np.int64, copy=False
-            )
-            face_idx_array = np.concatenate(face_idx_chunks).astype(
-                np.int64, copy=False
-            )
-        return position_idx_array, face_idx_array, element_position
-
-    @staticmethod
-    def _find_faces_from_3D_grid(
-        surface_grid,
-        x_min,
-        y_min,
-        z_min,
-        grid_size,
-        position_collection,
-        exit_boundary_condition,
-    ):
-        """
-        here we take the element position subtract the grid left most lower corner position (to get distance from that point)
-        The distance divided by the grid size converts the distance to units of grid size.
-        Rounding gives us the nearest corner to that element center position
-        Since any grid square can contain at most one element any element will have to lie within the 8 cubes around the corner we found above.
-        """
-        element_position = _node_to_element_position(position_collection)
-        n_element = element_position.shape[-1]
-        position_idx_chunks: list[np.ndarray] = []
-        face_idx_chunks: list[np.ndarray] = []
-        grid_position = np.empty((3, n_element))
-        grid_position[0, :] = np.round(
-            (element_position[0, :] - x_min) / grid_size
+        y_lower, y_upper = Grid._cell_bounds(
+            y_min, np.max(faces[1, :, :]), grid_size
         )
-        grid_position[1, :] = np.round(
-            (element_position[1, :] - y_min) / grid_size
+        z_lower, z_upper = Grid._cell_bounds(
+            z_min, np.max(faces[2, :, :]), grid_size
         )
-        grid_position[2, :] = np.round(
-            (element_position[2, :] - z_min) / grid_size
+        return Grid._bin_faces(
+            [face_x_left, face_y_down, face_z_back],
+            [face_x_right, face_y_up, face_z_front],
+            [x_lower, y_lower, z_lower],
+            [x_upper, y_upper, z_upper],
         )
-
-        # find face neighborhood of each element position
-        for i in range(n_element):
-            try:
-                face_idx_element_no_duplicates = surface_grid[
-                    (
-                        int(grid_position[0, i]),
-                        int(grid_position[1, i]),
-                        int(grid_position[2, i]),
-                    )
-                ]
-            except KeyError:
-                face_idx_element_no_duplicates = np.empty((0))
-                if (exit_boundary_condition) and (
-                    face_idx_element_no_duplicates.size == 0
-                ):
-                    raise BoundaryError(
-                        "Rod outside surface grid boundary"
-                    )  # a rod element is within eight grid cubes with no faces
-
-            n_contacts = face_idx_element_no_duplicates.shape[0]
-            if n_contacts > 0:
-                face_idx_chunks.append(face_idx_element_no_duplicates)
-                position_idx_chunks.append(
-                    np.full((n_contacts,), i, dtype=np.int64)
-                )
-
-        if len(face_idx_chunks) == 0:
-            position_idx_array = np.empty((0,), dtype=np.int64)
-            face_idx_array = np.empty((0,), dtype=np.int64)
-        else:
-            position_idx_array = np.concatenate(position_idx_chunks).astype(
-                np.int64, copy=False
-            )
-            face_idx_array = np.concatenate(face_idx_chunks).astype(
-                np.int64, copy=False
-            )
-        return position_idx_array, face_idx_array, element_position
-
-    # def save_to(self,name:str,folder="/"):
-    #     assert folder[-1]=="/","Folder path must end with /"
-    #     if folder=="/":
-    #         folder = ""
-    #     with open("{0}{1}.dat".format(folder,name), "wb") as file:
-    #         dill.dump(self, file)
-
-    # @staticmethod
-    # def load(file_path: str):
-    #     with open(file_path, "rb") as file:
-    #         loaded_object = dill.load(file)
-    #         assert isinstance(loaded_object, Grid), (
-    #             "Loaded file must be a saved Grid object"
-    #         )
-    #     return loaded_object
@@ -47,20 +47,22 @@ class MeshSurface(Plane):
             self.n_faces,
             self.mesh.n_faces_strict,
         )
-        for face in range(self.n_faces):
+        normal_lengths = np.linalg.norm(self.face_normals, axis=0)
+        bad_faces = np.flatnonzero(
+            np.abs(normal_lengths - 1.0) > Tolerance.atol()
+        )
+        if bad_faces.size:
             assert_allclose(
-                np.linalg.norm(self.face_normals[:, face]),
+                normal_lengths[bad_faces[0]],
                 1.0,
                 atol=Tolerance.atol(),
-                err_msg="face {0}'s normal is not a unit vector".format(face),
+                err_msg="face {0}'s normal is not a unit vector".format(
+                    bad_faces[0]
+                ),
             )
 
-        self.min_point = np.array(
-            [
-                np.min(self.faces[0, :, :]),
-                np.min(self.faces[1, :, :]),
-                np.min(self.faces[2, :, :]),
-            ]
+        self.min_point = self.faces.reshape(3, -1).min(
+            axis=1
         )  # grid x zero position
         self.side_vectors = np.zeros((3, 3, self.n_faces))  # coords,sides,faces
         self.side_vectors[:, 0, :] = (
@@ -73,6 +75,48 @@ class MeshSurface(Plane):
             self.faces[:, 2, :] - self.faces[:, 1, :]
         )  # BC
 
+    # Array attributes stored by to_arrays; vertex_normals and
+    # texture_vertices are only present when the mesh has them.
+    _ARRAY_ATTRIBUTES = (
+        "scale",
+        "faces",
+        "face_indices",
+        "vertices",
+        "vertex_normals",
+        "texture_vertices",
+        "face_centers",
+        "face_normals",
+        "min_point",
+        "side_vectors",
+    )
+
+    def to_arrays(self) -> dict:
+        """
+        This function returns the surface geometry as a dict of numpy arrays,
+        which can be saved with numpy (no pickle) and passed to from_arrays.
+        """
+        arrays = {
+            name: np.asarray(getattr(self, name))
+            for name in self._ARRAY_ATTRIBUTES
+            if getattr(self, name) is not None
+        }
+        arrays["n_faces"] = np.asarray(self.n_faces)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> "MeshSurface":
+        """
+        This function rebuilds a surface from the output of to_arrays without
+        recomputing anything. The source PyVista mesh is not kept, so the
+        mesh attribute of the returned surface is None.
+        """
+        surface = cls.__new__(cls)
+        surface.mesh = None
+        for name in cls._ARRAY_ATTRIBUTES:
+            setattr(surface, name, arrays.get(name))
+        surface.n_faces = int(arrays["n_faces"])
+        return surface
+
     @staticmethod
     def scale_calculation(bounds: np.ndarray) -> np.ndarray:
         """
@@ -87,6 +131,60 @@ class MeshSurface(Plane):
 
         return scale
 
+    @staticmethod
+    def triangulate_faces(
+        pvfaces: np.ndarray, n_pv_faces: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        This function splits the pyvista connectivity array into triangles.
+
+        Triangles are kept as they are and every quad (a, b, c, d) becomes the
+        two triangles (a, b, c) and (a, c, d), in face order.
+
+        Returns
+        -------
+        triangles : np.ndarray
+            (n_faces, 3) vertex indices of each triangle.
+        source_faces : np.ndarray
+            (n_faces,) index of the pyvista face each triangle comes from.
+        """
+        pvfaces = np.asarray(pvfaces)
+        if n_pv_faces == 0:
+            return (
+                np.empty((0, 3), dtype=pvfaces.dtype),
+                np.empty(0, dtype=np.intp),
+            )
+        width = int(pvfaces[0]) + 1
+        if pvfaces.size == n_pv_faces * width and np.all(
+            pvfaces[::width] == width - 1
+        ):
+            # All faces have the same number of vertices.
+            offsets = np.arange(0, pvfaces.size, width)
+        else:
+            offsets = np.empty(n_pv_faces, dtype=np.intp)
+            offset = 0
+            for i in range(n_pv_faces):
+                offsets[i] = offset
+                offset += int(pvfaces[offset]) + 1
+        sizes = pvfaces[offsets]
+        if np.any((sizes != 3) & (sizes != 4)):
+            raise ValueError("only triangle and quad faces are supported")
+
+        triangles_per_face = sizes - 2
+        source_faces = np.repeat(np.arange(n_pv_faces), triangles_per_face)
+        starts = offsets[source_faces]
+        # 0 for a triangle and the first half of a quad, 1 for the second.
+        second = np.arange(source_faces.size) - np.repeat(
+            np.cumsum(triangles_per_face) - triangles_per_face,
+            triangles_per_face,
+        )
+        triangles = pvfaces[
+            np.stack(
+                (starts + 1, starts + 2 + second, starts + 3 + second), axis=1
+            )
+        ]
+        return triangles, source_faces
+
     @staticmethod
     def face_calculation(
         pvfaces: np.ndarray, meshpoints: np.ndarray, n_pv_faces: int
@@ -119,70 +217,17 @@ class MeshSurface(Plane):
         - This function works only if each face of the mesh has equal no. of vertices i.e
           all the faces of the mesh has similar geometry.
         """
-        vertex_no = 0
-        n_faces = 0
-        faces_temp = []
-        for i in range(n_pv_faces):
-            if pvfaces[vertex_no] == 3:
-                vertex_no += 1
-                # this current face is a triangle
-                n_faces += 1
-                face = []
-                for j in range(3):
-                    face.append(meshpoints[pvfaces[vertex_no + j]])
-                vertex_no += 3
-                faces_temp.append(face)
-            else:
-                vertex_no += 1
-                # this current face has 4 vertices so we subdivide into two triangles
-                n_faces += 2
-                face_1 = []
-                face_2 = []
-                # first triangle
-                face_1.append(meshpoints[pvfaces[vertex_no]])
-                face_1.append(meshpoints[pvfaces[vertex_no + 1]])
-                face_1.append(meshpoints[pvfaces[vertex_no + 2]])
-
-                # second triangle
-                face_2.append(meshpoints[pvfaces[vertex_no]])
-                face_2.append(meshpoints[pvfaces[vertex_no + 2]])
-                face_2.append(meshpoints[pvfaces[vertex_no + 3]])
-
-                faces_temp.append(face_1)
-                faces_temp.append(face_2)
-                vertex_no += 4
-
-        faces = np.zeros((3, 3, n_faces))
-        for i in range(n_faces):
-            for j in range(3):
-                faces[..., j, i] = faces_temp[i][j]
-
-        return faces
+        triangles, _ = MeshSurface.triangulate_faces(pvfaces, n_pv_faces)
+        # (faces, vertices, coords) -> (coords, vertices, faces)
+        return np.ascontiguousarray(
+            np.asarray(meshpoints)[triangles].transpose(2, 1, 0),
+            dtype=np.float64,
+        )
 
     def face_indices_calculation(self, pvfaces: np.ndarray, n_pv_faces: int):
-        face_indices = []
-        vertex_no = 0
-        face_count = 0
-        for i in range(n_pv_faces):
-            if pvfaces[vertex_no] == 3:
-                # face is a triangle
-                face_indices.append(
-                    pvfaces[[vertex_no + 1, vertex_no + 2, vertex_no + 3]]
-                )
-                vertex_no += 4
-                face_count += 1
-            else:
-                # face has 4 vertices
-                face_indices.append(
-                    pvfaces[[vertex_no + 1, vertex_no + 2, vertex_no + 3]]
-                )
-                face_indices.append(
-                    pvfaces[[vertex_no + 1, vertex_no + 3, vertex_no + 4]]
-                )
-                vertex_no += 5
-                face_count += 2
-        self.n_faces = face_count
-        self.face_indices = np.array(face_indices).T
+        triangles, _ = self.triangulate_faces(pvfaces, n_pv_faces)
+        self.n_faces = triangles.shape[0]
+        self.face_indices = np.ascontiguousarray(triangles.T)
 
     @staticmethod
     def face_normal_calculation(
@@ -196,23 +241,16 @@ class MeshSurface(Plane):
         in pyelastica the face are stored in the format of (n_pv_faces, 3 spatial coordinates),
         this is converted into (3 spatial coordinates, n_faces).
         """
-        vertex_no = 0
-        face_count = 0
-        face_normals = np.zeros((3, n_faces))
-        for i in range(n_pv_faces):
-            if pvfaces[vertex_no] == 3:
-                # face is a triangle
-                vertex_no += 4
-                face_normals[:, face_count] = pyvista_face_normals[i, :]
-                face_count += 1
-            else:
-                # face has 4 vertices, both triangles share same normal
-                vertex_no += 5
-                face_normals[:, face_count] = pyvista_face_normals[i, :]
-                face_normals[:, face_count + 1] = pyvista_face_normals[i, :]
-                face_count += 2
-
-        return face_normals
+        _, source_faces = MeshSurface.triangulate_faces(pvfaces, n_pv_faces)
+        if source_faces.size != n_faces:
+            raise ValueError(
+                f"expected {n_faces} triangles, pyvista faces give "
+                f"{source_faces.size}"
+            )
+        # Both triangles of a quad share its normal.
+        return np.ascontiguousarray(
+            np.asarray(pyvista_face_normals)[source_faces].T, dtype=np.float64
+        )
 
     @staticmethod
     def face_center_calculation(faces: np.ndarray, n_faces: int) -> np.ndarray:
@@ -220,11 +258,4 @@ class MeshSurface(Plane):
         This function calculates the position vector of each face of the mesh
         simply by averaging all the vertices of every face/cell.
         """
-        face_centers = np.zeros((3, n_faces))
-
-        for i in range(n_faces):
-            for j in range(3):
-                temp_sum = faces[j][..., i].sum()
-                face_centers[j][i] = temp_sum / 3
-
-        return face_centers
+        return faces[..., :n_faces].sum(axis=1) / 3
@@ -17,6 +17,7 @@ from elastica.contact_utils import (
 )
 from numba import njit
 
+from .mesh_bvh import MeshBVH
 from .mesh_contact_utils import Grid, _batch_sphere_triangle_intersection_check
 from .mesh_surface import MeshSurface
 
@@ -42,7 +43,7 @@ class RodMeshSurfaceContactGridMethod(NoContact):
         self,
         k: float,
         nu: float,
-        grid: Grid,
+        grid: Grid | MeshBVH,
         surface_tol=1e-4,
     ):
         super(RodMeshSurfaceContactGridMethod, self).__init__()
@@ -53,19 +54,46 @@ class RodMeshSurfaceContactGridMethod(NoContact):
             Contact spring constant.
         nu : float
             Contact damping constant.
-        grid : grid class instance
-            Dimension of the mesh surface's grid.
+        grid : Grid or MeshBVH
+            Broadphase of the mesh surface: a uniform grid, or a bounding
+            volume hierarchy for meshes of varying face sizes or rods
+            leaving the grid bounds. A MeshBVH without search_radius is
+            queried with MeshBVH.compute_search_radius of the rod.
         """
         self.k = k
         self.nu = nu
         self.grid = grid
         self.surface_tol = surface_tol
+        # Grid query buffers, sized on the first contact evaluation.
+        self.element_position = None
+        self._position_idx_buffer = None
+        self._face_idx_buffer = None
+        self._query_kwargs = {}
 
     @property
     def _allowed_system_two(self) -> list[Type]:
         # Modify this list to include the allowed system types for contact
         return [MeshSurface]
 
+    def _check_systems_validity(
+        self,
+        system_one,
+        system_two,
+    ) -> None:
+        """
+        This checks the contact order and types, and that the search radius of
+        a MeshBVH covers the rod elements.
+        """
+        super()._check_systems_validity(system_one, system_two)
+        if (
+            isinstance(self.grid, MeshBVH)
+            and self.grid.search_radius is not None
+            and self.grid.search_radius < np.max(system_one.radius)
+        ):
+            raise ValueError(
+                "MeshBVH search_radius must be at least the rod radius."
+            )
+
     def apply_contact(
         self,
         system_one,
@@ -83,13 +111,44 @@ class RodMeshSurfaceContactGridMethod(NoContact):
             mesh surface object.
 
         """
-        (
-            self.position_idx_array,
-            self.face_idx_array,
+        n_element = system_one.position_collection.shape[1] - 1
+        if (
+            self.element_position is None
+            or self.element_position.shape[1] != n_element
+        ):
+            self.element_position = np.empty((3, n_element))
+            self._position_idx_buffer = np.empty(
+                n_element * self.grid.max_faces_per_cell, dtype=np.int64
+            )
+            self._face_idx_buffer = np.empty_like(self._position_idx_buffer)
+            if (
+                isinstance(self.grid, MeshBVH)
+                and self.grid.search_radius is None
+            ):
+                self._query_kwargs = {
+                    "search_radius": MeshBVH.compute_search_radius(system_one)
+                }
+        n_pairs = self.grid.find_faces_into(
+            system_one.position_collection,
             self.element_position,
-        ) = self.grid.find_faces(
-            position_collection=system_one.position_collection
-        )
+            self._position_idx_buffer,
+            self._face_idx_buffer,
+            **self._query_kwargs,
+        )
+        if n_pairs > self._position_idx_buffer.size:
+            # Only a MeshBVH finds more pairs than reserved; grow and query
+            # again.
+            self._position_idx_buffer = np.empty(2 * n_pairs, dtype=np.int64)
+            self._face_idx_buffer = np.empty_like(self._position_idx_buffer)
+            n_pairs = self.grid.find_faces_into(
+                system_one.position_collection,
+                self.element_position,
+                self._position_idx_buffer,
+                self._face_idx_buffer,
+                **self._query_kwargs,
+            )
+        self.position_idx_array = self._position_idx_buffer[:n_pairs]
+        self.face_idx_array = self._face_idx_buffer[:n_pairs]
 
         return self.rod_mesh_contact(
             system_two.faces,
@@ -271,7 +330,7 @@ class RodMeshSurfaceContactGridMethodWithAnisotropicFriction(
         gamma: float,
         static_mu_array: np.ndarray,
         kinetic_mu_array: np.ndarray,
-        grid: Grid,
+        grid: Grid | MeshBVH,
         surface_tol=1e-4,
     ):
         """
@@ -291,8 +350,8 @@ class RodMeshSurfaceContactGridMethodWithAnisotropicFriction(
         kinetic_mu_array: numpy.ndarray
             1D (3,) array containing data with 'float' type.
             [forward, backward, sideways] kinetic friction coefficients.
-        grid : grid class instance
-            Dimension of the mesh surface's grid.
+        grid : Grid or MeshBVH
+            Broadphase of the mesh surface.
         """
         RodMeshSurfaceContactGridMethod.__init__(self, k, nu, grid, surface_tol)
         self.slip_velocity_tol = slip_velocity_tol
@@ -10,6 +10,7 @@ from elastica.contact_forces import NoContact, common_check_systems_validity
 from elastica.rigidbody.sphere import Sphere
 from numba import njit
 
+from .mesh_bvh import MeshBVH
 from .mesh_contact_utils import _batch_sphere_triangle_intersection_check
 from .mesh_surface import MeshSurface
 
@@ -29,6 +30,10 @@ class SphereMeshSurfaceContact(NoContact):
     ...    search_radius = 1,
     ... )
 
+    With a ``bvh``, candidate faces are the faces whose bounding box overlaps
+    the cube of half width ``search_radius`` around the sphere center, found
+    in logarithmic time instead of testing the vertices of every face.
+
     """
 
     def __init__(
@@ -37,6 +42,7 @@ class SphereMeshSurfaceContact(NoContact):
         nu: float,
         search_radius: float,
         surface_tol=1e-4,
+        bvh: MeshBVH | None = None,
     ):
         super(SphereMeshSurfaceContact, self).__init__()
         """
@@ -46,13 +52,16 @@ class SphereMeshSurfaceContact(NoContact):
             Contact spring constant.
         nu : float
             Contact damping constant.
-        grid : grid class instance
-            Dimension of the mesh surface's grid.
+        search_radius : float
+            Distance from the sphere center within which faces are tested.
+        bvh : MeshBVH, optional
+            Bounding volume hierarchy of the mesh surface.
         """
         self.k = k
         self.nu = nu
         self.search_radius = search_radius
         self.surface_tol = surface_tol
+        self.bvh = bvh
 
     @property
     def _allowed_system_one(self) -> list[Type]:
@@ -91,13 +100,19 @@ class SphereMeshSurfaceContact(NoContact):
         Apply contact forces and torques between sphere object and mesh surface object.
 
         """
-        self.face_idx_array = self.search_faces(
-            self.search_radius,
-            system_one.position_collection,
-            system_two.faces[:, 0, :],
-            system_two.faces[:, 1, :],
-            system_two.faces[:, 2, :],
-        )
+        if self.bvh is not None:
+            center = system_one.position_collection[:, 0]
+            self.face_idx_array = self.bvh.query_box(
+                center - self.search_radius, center + self.search_radius
+            )
+        else:
+            self.face_idx_array = self.search_faces(
+                self.search_radius,
+                system_one.position_collection,
+                system_two.faces[:, 0, :],
+                system_two.faces[:, 1, :],
+                system_two.faces[:, 2, :],
+            )
 
         return self.sphere_mesh_contact(
             system_one.position_collection,
@@ -4,119 +4,438 @@ from typing import Any
 
 import base64
 import json
+import struct
 from pathlib import Path
 
 import numpy as np
 
-
-# TODO: Test code to create arbitrary cylinder in gltf data format
-def build_cylinder_gltf_data_uri(
-    start: np.ndarray,
-    direction: np.ndarray,
-    normal: np.ndarray,
-    length: float,
-    radius: float,
-    color_rgba: tuple[float, float, float, float] = (0.2, 0.75, 0.25, 1.0),
-    radial_segments: int = 20,
-) -> str:
-    positions, normals, indices = _build_cylinder_geometry(
-        np.asarray(start, dtype=np.float32).reshape(3),
-        np.asarray(direction, dtype=np.float32).reshape(3),
-        np.asarray(normal, dtype=np.float32).reshape(3),
-        float(length),
-        float(radius),
-        radial_segments=radial_segments,
+from virtual_field.runtime.orientation import matrix_to_quat_xyzw
+
+GLB_MIME_TYPE = "model/gltf-binary"
+KHR_MESH_QUANTIZATION = "KHR_mesh_quantization"
+EXT_MESH_GPU_INSTANCING = "EXT_mesh_gpu_instancing"
+
+_GLB_MAGIC = b"glTF"
+_GLB_VERSION = 2
+_GLB_JSON_CHUNK = 0x4E4F534A
+_GLB_BIN_CHUNK = 0x004E4942
+
+# glTF accessor component types and buffer view targets.
+_BYTE = 5120
+_SHORT = 5122
+_UNSIGNED_SHORT = 5123
+_UNSIGNED_INT = 5125
+_FLOAT = 5126
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+_TEXTURE_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+class _BinaryChunk:
+    """Buffer views of a GLB ``BIN`` chunk, each aligned to 4 bytes."""
+
+    __slots__ = ("parts", "length", "buffer_views")
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+        self.length = 0
+        self.buffer_views: list[dict[str, Any]] = []
+
+    def add_view(
+        self,
+        data: bytes,
+        *,
+        target: int | None = None,
+        byte_stride: int | None = None,
+    ) -> int:
+        padding = -self.length % 4
+        if padding:
+            self.parts.append(b"\x00" * padding)
+            self.length += padding
+        view: dict[str, Any] = {
+            "buffer": 0,
+            "byteOffset": self.length,
+            "byteLength": len(data),
+        }
+        if byte_stride is not None:
+            view["byteStride"] = byte_stride
+        if target is not None:
+            view["target"] = target
+        self.parts.append(data)
+        self.length += len(data)
+        self.buffer_views.append(view)
+        return len(self.buffer_views) - 1
+
+    def tobytes(self) -> bytes:
+        return b"".join(self.parts)
+
+
+def encode_glb(gltf: dict[str, Any], binary: bytes) -> bytes:
+    """Pack a glTF document and its single buffer into a GLB container."""
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    binary += b"\x00" * (-len(binary) % 4)
+    total = 12 + 8 + len(json_chunk) + (8 + len(binary) if binary else 0)
+    glb = struct.pack("<4sII", _GLB_MAGIC, _GLB_VERSION, total)
+    glb += struct.pack("<II", len(json_chunk), _GLB_JSON_CHUNK) + json_chunk
+    if binary:
+        glb += struct.pack("<II", len(binary), _GLB_BIN_CHUNK) + binary
+    return glb
+
+
+def decode_glb(glb: bytes) -> tuple[dict[str, Any], bytes]:
+    """Split a GLB container into its glTF document and ``BIN`` chunk.
+
+    Raises
+    ------
+    ValueError
+        If ``glb`` is not a glTF 2.0 binary container.
+    """
+    magic, version, total = struct.unpack_from("<4sII", glb)
+    if magic != _GLB_MAGIC or version != _GLB_VERSION:
+        raise ValueError("not a glTF 2.0 binary container")
+    json_length, chunk_type = struct.unpack_from("<II", glb, 12)
+    if chunk_type != _GLB_JSON_CHUNK:
+        raise ValueError("GLB must start with a JSON chunk")
+    gltf = json.loads(glb[20 : 20 + json_length])
+    offset = 20 + json_length
+    binary = b""
+    if offset < total:
+        bin_length, chunk_type = struct.unpack_from("<II", glb, offset)
+        if chunk_type == _GLB_BIN_CHUNK:
+            binary = glb[offset + 8 : offset + 8 + bin_length]
+    return gltf, binary
+
+
+def glb_data_uri(glb: bytes) -> str:
+    return f"data:{GLB_MIME_TYPE};base64," + base64.b64encode(glb).decode(
+        "ascii"
     )
 
-    position_bytes = positions.astype("<f4", copy=False).tobytes()
-    normal_bytes = normals.astype("<f4", copy=False).tobytes()
-    index_bytes = indices.astype("<u4", copy=False).tobytes()
-    buffer_blob = position_bytes + normal_bytes + index_bytes
-    buffer_uri = "data:application/octet-stream;base64," + base64.b64encode(
-        buffer_blob
-    ).decode("ascii")
 
-    position_offset = 0
-    normal_offset = len(position_bytes)
-    index_offset = normal_offset + len(normal_bytes)
-    primitive_count = int(indices.size)
+def _material(color_rgba: tuple[float, float, float, float]) -> dict[str, Any]:
+    material: dict[str, Any] = {
+        "pbrMetallicRoughness": {
+            "baseColorFactor": list(color_rgba),
+            "metallicFactor": 0.0,
+            "roughnessFactor": 1.0,
+        },
+        "doubleSided": True,
+    }
+    if float(color_rgba[3]) < 0.999:
+        # GLTF alpha in baseColorFactor only applies when alphaMode is BLEND/MASK.
+        material["alphaMode"] = "BLEND"
+    return material
 
-    gltf = {
-        "asset": {"version": "2.0"},
-        "scene": 0,
-        "scenes": [{"nodes": [0]}],
-        "nodes": [{"mesh": 0}],
-        "materials": [
+
+def build_mesh_glb(
+    positions: np.ndarray,
+    normals: np.ndarray,
+    indices: np.ndarray,
+    *,
+    material: dict[str, Any],
+    texcoords: np.ndarray | None = None,
+    image: tuple[bytes, str] | None = None,
+    quantize: bool = False,
+    instances: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+) -> bytes:
+    """Encode one indexed triangle mesh as a GLB container.
+
+    Indices are stored as 16-bit integers whenever the vertex count allows.
+    With ``quantize``, positions are stored as normalized int16 and normals as
+    normalized int8 (``KHR_mesh_quantization``); the node translation and
+    uniform scale map the int16 range back onto the mesh bounds.
+
+    With ``instances``, the mesh is drawn once per instance transform
+    (``EXT_mesh_gpu_instancing``), so the geometry is stored only once.
+
+    Parameters
+    ----------
+    positions, normals : np.ndarray
+        ``(N, 3)`` vertex positions and unit normals.
+    indices : np.ndarray
+        Flat triangle vertex indices.
+    material : dict
+        glTF material; a ``baseColorTexture`` is added for ``image``.
+    texcoords : np.ndarray | None
+        ``(N, 2)`` texture coordinates (glTF orientation).
+    image : tuple[bytes, str] | None
+        Encoded base color texture and its MIME type, stored in the buffer.
+    quantize : bool
+        Whether to quantize positions and normals.
+    instances : tuple[np.ndarray, np.ndarray, np.ndarray] | None
+        ``(M, 3)`` translations, ``(M, 4)`` xyzw rotations and ``(M, 3)``
+        scales of the instances. Cannot be combined with ``quantize``: the
+        dequantization transform of the node would apply after the instance
+        transforms.
+    """
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    normals = np.asarray(normals, dtype=np.float32).reshape(-1, 3)
+    indices = np.asarray(indices).reshape(-1)
+    vertex_count = int(positions.shape[0])
+    if vertex_count == 0:
+        raise ValueError("mesh has no points")
+    if normals.shape != positions.shape:
+        raise ValueError("vertex normals must match points")
+    if quantize and instances is not None:
+        raise ValueError("instanced meshes cannot be quantized")
+
+    chunk = _BinaryChunk()
+    accessors: list[dict[str, Any]] = []
+    node: dict[str, Any] = {"mesh": 0}
+    extensions: list[str] = []
+    lower = positions.min(axis=0)
+    upper = positions.max(axis=0)
+    if quantize:
+        center = 0.5 * (lower.astype(np.float64) + upper)
+        half_extent = max(0.5 * float(np.max(upper - lower)), 1.0e-12)
+        # Attributes are padded to 4-byte strides as glTF requires.
+        quantized_positions = np.zeros((vertex_count, 4), dtype="<i2")
+        quantized_positions[:, :3] = np.round(
+            (positions - center) / half_extent * 32767.0
+        )
+        quantized_normals = np.zeros((vertex_count, 4), dtype="<i1")
+        quantized_normals[:, :3] = np.round(np.clip(normals, -1.0, 1.0) * 127.0)
+        accessors.append(
             {
-                "pbrMetallicRoughness": {
-                    "baseColorFactor": list(color_rgba),
-                    "metallicFactor": 0.0,
-                    "roughnessFactor": 1.0,
-                },
-                "doubleSided": True,
+                "bufferView": chunk.add_view(
+                    quantized_positions.tobytes(),
+                    target=_ARRAY_BUFFER,
+                    byte_stride=8,
+                ),
+                "componentType": _SHORT,
+                "normalized": True,
+                "count": vertex_count,
+                "type": "VEC3",
+                "min": quantized_positions[:, :3].min(axis=0).tolist(),
+                "max": quantized_positions[:, :3].max(axis=0).tolist(),
             }
-        ],
-        "buffers": [{"byteLength": len(buffer_blob), "uri": buffer_uri}],
-        "bufferViews": [
-            {
-                "buffer": 0,
-                "byteOffset": position_offset,
-                "byteLength": len(position_bytes),
-                "target": 34962,
-            },
-            {
-                "buffer": 0,
-                "byteOffset": normal_offset,
-                "byteLength": len(normal_bytes),
-                "target": 34962,
-            },
+        )
+        accessors.append(
             {
-                "buffer": 0,
-                "byteOffset": index_offset,
-                "byteLength": len(index_bytes),
-                "target": 34963,
-            },
-        ],
-        "accessors": [
+                "bufferView": chunk.add_view(
+                    quantized_normals.tobytes(),
+                    target=_ARRAY_BUFFER,
+                    byte_stride=4,
+                ),
+                "componentType": _BYTE,
+                "normalized": True,
+                "count": vertex_count,
+                "type": "VEC3",
+            }
+        )
+        node["translation"] = center.tolist()
+        node["scale"] = [half_extent] * 3
+        extensions.append(KHR_MESH_QUANTIZATION)
+    else:
+        accessors.append(
             {
-                "bufferView": 0,
-                "componentType": 5126,
-                "count": int(positions.shape[0]),
+                "bufferView": chunk.add_view(
+                    positions.astype("<f4", copy=False).tobytes(),
+                    target=_ARRAY_BUFFER,
+                ),
+                "componentType": _FLOAT,
+                "count": vertex_count,
                 "type": "VEC3",
-                "min": positions.min(axis=0).astype(float).tolist(),
-                "max": positions.max(axis=0).astype(float).tolist(),
-            },
+                "min": lower.astype(float).tolist(),
+                "max": upper.astype(float).tolist(),
+            }
+        )
+        accessors.append(
             {
-                "bufferView": 1,
-                "componentType": 5126,
-                "count": int(normals.shape[0]),
+                "bufferView": chunk.add_view(
+                    normals.astype("<f4", copy=False).tobytes(),
+                    target=_ARRAY_BUFFER,
+                ),
+                "componentType": _FLOAT,
+                "count": vertex_count,
                 "type": "VEC3",
-            },
+            }
+        )
+    attributes = {"POSITION": 0, "NORMAL": 1}
+
+    if texcoords is not None:
+        attributes["TEXCOORD_0"] = len(accessors)
+        accessors.append(
             {
-                "bufferView": 2,
-                "componentType": 5125,
-                "count": primitive_count,
-                "type": "SCALAR",
-                "min": [int(indices.min())],
-                "max": [int(indices.max())],
-            },
-        ],
+                "bufferView": chunk.add_view(
+                    np.asarray(texcoords, dtype="<f4").tobytes(),
+                    target=_ARRAY_BUFFER,
+                ),
+                "componentType": _FLOAT,
+                "count": vertex_count,
+                "type": "VEC2",
+            }
+        )
+
+    if vertex_count <= 0xFFFF:
+        index_bytes = indices.astype("<u2").tobytes()
+        index_type = _UNSIGNED_SHORT
+    else:
+        index_bytes = indices.astype("<u4").tobytes()
+        index_type = _UNSIGNED_INT
+    index_accessor = len(accessors)
+    accessors.append(
+        {
+            "bufferView": chunk.add_view(
+                index_bytes, target=_ELEMENT_ARRAY_BUFFER
+            ),
+            "componentType": index_type,
+            "count": int(indices.size),
+            "type": "SCALAR",
+            "min": [int(indices.min())],
+            "max": [int(indices.max())],
+        }
+    )
+
+    if instances is not None:
+        instance_attributes: dict[str, int] = {}
+        instance_count = None
+        for name, values, width in zip(
+            ("TRANSLATION", "ROTATION", "SCALE"), instances, (3, 4, 3)
+        ):
+            values = np.asarray(values, dtype="<f4").reshape(-1, width)
+            if instance_count is None:
+                instance_count = int(values.shape[0])
+            elif values.shape[0] != instance_count:
+                raise ValueError("instance attributes must have equal length")
+            instance_attributes[name] = len(accessors)
+            accessors.append(
+                {
+                    "bufferView": chunk.add_view(values.tobytes()),
+                    "componentType": _FLOAT,
+                    "count": instance_count,
+                    "type": f"VEC{width}",
+                }
+            )
+        if not instance_count:
+            raise ValueError("instanced mesh has no instances")
+        node["extensions"] = {
+            EXT_MESH_GPU_INSTANCING: {"attributes": instance_attributes}
+        }
+        extensions.append(EXT_MESH_GPU_INSTANCING)
+
+    gltf: dict[str, Any] = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [node],
+        "materials": [material],
         "meshes": [
             {
                 "primitives": [
                     {
-                        "attributes": {"POSITION": 0, "NORMAL": 1},
-                        "indices": 2,
+                        "attributes": attributes,
+                        "indices": index_accessor,
                         "material": 0,
                     }
                 ]
             }
         ],
+        "accessors": accessors,
     }
-    encoded = base64.b64encode(
-        json.dumps(gltf, separators=(",", ":")).encode("utf-8")
-    ).decode("ascii")
-    return f"data:model/gltf+json;base64,{encoded}"
+    if image is not None:
+        image_bytes, image_mime = image
+        image_view = chunk.add_view(image_bytes)
+        gltf["images"] = [{"bufferView": image_view, "mimeType": image_mime}]
+        gltf["textures"] = [{"source": 0}]
+        material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": 0}
+    gltf["bufferViews"] = chunk.buffer_views
+    gltf["buffers"] = [{"byteLength": chunk.length}]
+    if extensions:
+        gltf["extensionsUsed"] = extensions
+        gltf["extensionsRequired"] = extensions
+    return encode_glb(gltf, chunk.tobytes())
+
+
+# TODO: Test code to create arbitrary cylinder in gltf data format
+def build_cylinder_gltf_data_uri(
+    start: np.ndarray,
+    direction: np.ndarray,
+    normal: np.ndarray,
+    length: float,
+    radius: float,
+    color_rgba: tuple[float, float, float, float] = (0.2, 0.75, 0.25, 1.0),
+    radial_segments: int = 20,
+    quantize: bool = False,
+) -> str:
+    positions, normals, indices = _build_cylinder_geometry(
+        np.asarray(start, dtype=np.float32).reshape(3),
+        np.asarray(direction, dtype=np.float32).reshape(3),
+        np.asarray(normal, dtype=np.float32).reshape(3),
+        float(length),
+        float(radius),
+        radial_segments=radial_segments,
+    )
+    return glb_data_uri(
+        build_mesh_glb(
+            positions,
+            normals,
+            indices,
+            material=_material(color_rgba),
+            quantize=quantize,
+        )
+    )
+
+
+def build_instanced_cylinders_gltf_data_uri(
+    starts: np.ndarray,
+    directions: np.ndarray,
+    normals: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    color_rgba: tuple[float, float, float, float] = (0.2, 0.75, 0.25, 1.0),
+    radial_segments: int = 20,
+) -> str:
+    """Encode many cylinders as one GPU-instanced GLB data URI.
+
+    A unit cylinder (radius 1 along ``+y`` from 0 to 1) is stored once; each
+    cylinder becomes an instance translated to its start, rotated so that
+    ``+y`` follows its direction and ``+x`` its normal, and scaled by
+    ``(radius, length, radius)``. The result matches one
+    :func:`build_cylinder_gltf_data_uri` mesh per cylinder, drawn in a
+    single call.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+    lengths = np.asarray(lengths, dtype=np.float64).reshape(-1)
+    radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+    count = starts.shape[0]
+    if not (
+        directions.shape[0] == normals.shape[0] == count
+        and lengths.shape[0] == radii.shape[0] == count
+    ):
+        raise ValueError("cylinder attributes must have equal length")
+
+    positions, vertex_normals, indices = _build_cylinder_geometry(
+        np.zeros(3, dtype=np.float32),
+        np.array([0.0, 1.0, 0.0], dtype=np.float32),
+        np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        1.0,
+        1.0,
+        radial_segments=radial_segments,
+    )
+    rotations = np.empty((count, 4), dtype=np.float64)
+    for idx in range(count):
+        axis, normal_dir = _cylinder_frame(directions[idx], normals[idx])
+        basis = np.column_stack((normal_dir, axis, np.cross(normal_dir, axis)))
+        rotations[idx] = matrix_to_quat_xyzw(basis)
+    scales = np.column_stack((radii, lengths, radii))
+    return glb_data_uri(
+        build_mesh_glb(
+            positions,
+            vertex_normals,
+            indices,
+            material=_material(color_rgba),
+            instances=(starts, rotations, scales),
+        )
+    )
 
 
 def _vertex_normals_from_triangles(
@@ -145,14 +464,33 @@ def build_pyvista_polydata_gltf_data_uri(
     mesh: Any,
     color_rgba: tuple[float, float, float, float] = (0.42, 0.48, 0.55, 1.0),
     base_color_texture_path: str | Path | None = None,
+    quantize: bool = False,
 ) -> str:
-    """Encode a PyVista surface mesh as an embedded GLTF JSON data URI.
+    """Encode a PyVista surface mesh as a GLB (``model/gltf-binary``) data URI.
 
     The VR client loads mesh entities via ``GLTFLoader`` (see
     ``VR/client/entities/meshes/mesh_entity_manager.js``), same as
     :func:`build_cylinder_gltf_data_uri`. Use the **same** PyVista transforms
     (scale, translate, etc.) as the simulation mesh so the render matches physics.
+    See :func:`build_mesh_glb` for ``quantize``.
     """
+    return glb_data_uri(
+        build_pyvista_polydata_glb(
+            mesh,
+            color_rgba=color_rgba,
+            base_color_texture_path=base_color_texture_path,
+            quantize=quantize,
+        )
+    )
+
+
+def build_pyvista_polydata_glb(
+    mesh: Any,
+    color_rgba: tuple[float, float, float, float] = (0.42, 0.48, 0.55, 1.0),
+    base_color_texture_path: str | Path | None = None,
+    quantize: bool = False,
+) -> bytes:
+    """GLB container of :func:`build_pyvista_polydata_gltf_data_uri`."""
     import pyvista as pv
 
     if not isinstance(mesh, pv.PolyData):
@@ -183,11 +521,9 @@ def build_pyvista_polydata_gltf_data_uri(
     if normals.shape != points.shape:
         raise ValueError("vertex normals must match points")
 
-    indices = faces_reshaped[:, 1:4].astype(np.uint32, copy=False).reshape(-1)
+    indices = faces_reshaped[:, 1:4].reshape(-1)
 
-    position_bytes = points.astype("<f4", copy=False).tobytes()
-    normal_bytes = normals.astype("<f4", copy=False).tobytes()
-    texcoord_bytes: bytes | None = None
+    texcoords_array: np.ndarray | None = None
     if base_color_texture_path is not None:
         texcoords = getattr(tri, "active_texture_coordinates", None)
         if texcoords is not None:
@@ -196,41 +532,10 @@ def build_pyvista_polydata_gltf_data_uri(
                 texcoords_array = texcoords_array.copy()
                 # GLTF UV origin is upper-left for most textures in Three.js workflows.
                 texcoords_array[:, 1] = 1.0 - texcoords_array[:, 1]
-                texcoord_bytes = texcoords_array.astype(
-                    "<f4", copy=False
-                ).tobytes()
-    index_bytes = indices.tobytes()
-    buffer_blob = position_bytes + normal_bytes
-    if texcoord_bytes is not None:
-        buffer_blob += texcoord_bytes
-    buffer_blob += index_bytes
-    buffer_uri = "data:application/octet-stream;base64," + base64.b64encode(
-        buffer_blob
-    ).decode("ascii")
-
-    position_offset = 0
-    normal_offset = len(position_bytes)
-    texcoord_offset = normal_offset + len(normal_bytes)
-    index_offset = texcoord_offset + (
-        len(texcoord_bytes) if texcoord_bytes is not None else 0
-    )
-    primitive_count = int(indices.size)
+            else:
+                texcoords_array = None
 
-    alpha = float(color_rgba[3])
-    material = {
-        "pbrMetallicRoughness": {
-            "baseColorFactor": list(color_rgba),
-            "metallicFactor": 0.0,
-            "roughnessFactor": 1.0,
-        },
-        "doubleSided": True,
-    }
-    if alpha < 0.999:
-        # GLTF alpha in baseColorFactor only applies when alphaMode is BLEND/MASK.
-        material["alphaMode"] = "BLEND"
-
-    image_entry = None
-    texture_entry = None
+    image: tuple[bytes, str] | None = None
     texture_path = (
         Path(base_color_texture_path)
         if base_color_texture_path is not None
@@ -239,225 +544,60 @@ def build_pyvista_polydata_gltf_data_uri(
     if (
         texture_path is not None
         and texture_path.exists()
-        and texcoord_bytes is not None
+        and texcoords_array is not None
     ):
-        texture_mime = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-        }.get(texture_path.suffix.lower())
+        texture_mime = _TEXTURE_MIME_TYPES.get(texture_path.suffix.lower())
         if texture_mime is not None:
-            texture_encoded = base64.b64encode(
-                texture_path.read_bytes()
-            ).decode("ascii")
-            image_entry = {
-                "uri": f"data:{texture_mime};base64,{texture_encoded}"
-            }
-            texture_entry = {"source": 0}
-            material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": 0}
-
-    buffer_views = [
-        {
-            "buffer": 0,
-            "byteOffset": position_offset,
-            "byteLength": len(position_bytes),
-            "target": 34962,
-        },
-        {
-            "buffer": 0,
-            "byteOffset": normal_offset,
-            "byteLength": len(normal_bytes),
-            "target": 34962,
-        },
-    ]
-    accessors = [
-        {
-            "bufferView": 0,
-            "componentType": 5126,
-            "count": int(points.shape[0]),
-            "type": "VEC3",
-            "min": points.min(axis=0).astype(float).tolist(),
-            "max": points.max(axis=0).astype(float).tolist(),
-        },
-        {
-            "bufferView": 1,
-            "componentType": 5126,
-            "count": int(normals.shape[0]),
-            "type": "VEC3",
-        },
-    ]
-    attributes = {"POSITION": 0, "NORMAL": 1}
-    if texcoord_bytes is not None:
-        buffer_views.append(
-            {
-                "buffer": 0,
-                "byteOffset": texcoord_offset,
-                "byteLength": len(texcoord_bytes),
-                "target": 34962,
-            }
-        )
-        accessors.append(
-            {
-                "bufferView": 2,
-                "componentType": 5126,
-                "count": int(points.shape[0]),
-                "type": "VEC2",
-            }
-        )
-        attributes["TEXCOORD_0"] = 2
-        index_accessor_buffer_view = 3
-    else:
-        index_accessor_buffer_view = 2
-    buffer_views.append(
-        {
-            "buffer": 0,
-            "byteOffset": index_offset,
-            "byteLength": len(index_bytes),
-            "target": 34963,
-        }
-    )
-    accessors.append(
-        {
-            "bufferView": index_accessor_buffer_view,
-            "componentType": 5125,
-            "count": primitive_count,
-            "type": "SCALAR",
-            "min": [int(indices.min())],
-            "max": [int(indices.max())],
-        }
+            image = (texture_path.read_bytes(), texture_mime)
+
+    return build_mesh_glb(
+        points,
+        normals,
+        indices,
+        material=_material(color_rgba),
+        texcoords=texcoords_array,
+        image=image,
+        quantize=quantize,
     )
 
-    gltf = {
-        "asset": {"version": "2.0"},
-        "scene": 0,
-        "scenes": [{"nodes": [0]}],
-        "nodes": [{"mesh": 0}],
-        "materials": [material],
-        "buffers": [{"byteLength": len(buffer_blob), "uri": buffer_uri}],
-        "bufferViews": buffer_views,
-        "accessors": accessors,
-        "meshes": [
-            {
-                "primitives": [
-                    {
-                        "attributes": attributes,
-                        "indices": len(accessors) - 1,
-                        "material": 0,
-                    }
-                ]
-            }
-        ],
-    }
-    if image_entry is not None and texture_entry is not None:
-        gltf["images"] = [image_entry]
-        gltf["textures"] = [texture_entry]
-    encoded = base64.b64encode(
-        json.dumps(gltf, separators=(",", ":")).encode("utf-8")
-    ).decode("ascii")
-    return f"data:model/gltf+json;base64,{encoded}"
-
 
 def build_sphere_gltf_data_uri(
     radius: float,
     color_rgba: tuple[float, float, float, float] = (0.95, 0.82, 0.25, 1.0),
     lat_segments: int = 12,
     lon_segments: int = 18,
+    quantize: bool = False,
 ) -> str:
     positions, normals, indices = _build_sphere_geometry(
         float(radius),
         lat_segments=lat_segments,
         lon_segments=lon_segments,
     )
+    return glb_data_uri(
+        build_mesh_glb(
+            positions,
+            normals,
+            indices,
+            material=_material(color_rgba),
+            quantize=quantize,
+        )
+    )
 
-    position_bytes = positions.astype("<f4", copy=False).tobytes()
-    normal_bytes = normals.astype("<f4", copy=False).tobytes()
-    index_bytes = indices.astype("<u4", copy=False).tobytes()
-    buffer_blob = position_bytes + normal_bytes + index_bytes
-    buffer_uri = "data:application/octet-stream;base64," + base64.b64encode(
-        buffer_blob
-    ).decode("ascii")
-
-    position_offset = 0
-    normal_offset = len(position_bytes)
-    index_offset = normal_offset + len(normal_bytes)
-    primitive_count = int(indices.size)
 
-    gltf = {
-        "asset": {"version": "2.0"},
-        "scene": 0,
-        "scenes": [{"nodes": [0]}],
-        "nodes": [{"mesh": 0}],
-        "materials": [
-            {
-                "pbrMetallicRoughness": {
-                    "baseColorFactor": list(color_rgba),
-                    "metallicFactor": 0.0,
-                    "roughnessFactor": 1.0,
-                },
-                "doubleSided": True,
-            }
-        ],
-        "buffers": [{"byteLength": len(buffer_blob), "uri": buffer_uri}],
-        "bufferViews": [
-            {
-                "buffer": 0,
-                "byteOffset": position_offset,
-                "byteLength": len(position_bytes),
-                "target": 34962,
-            },
-            {
-                "buffer": 0,
-                "byteOffset": normal_offset,
-                "byteLength": len(normal_bytes),
-                "target": 34962,
-            },
-            {
-                "buffer": 0,
-                "byteOffset": index_offset,
-                "byteLength": len(index_bytes),
-                "target": 34963,
-            },
-        ],
-        "accessors": [
-            {
-                "bufferView": 0,
-                "componentType": 5126,
-                "count": int(positions.shape[0]),
-                "type": "VEC3",
-                "min": positions.min(axis=0).astype(float).tolist(),
-                "max": positions.max(axis=0).astype(float).tolist(),
-            },
-            {
-                "bufferView": 1,
-                "componentType": 5126,
-                "count": int(normals.shape[0]),
-                "type": "VEC3",
-            },
-            {
-                "bufferView": 2,
-                "componentType": 5125,
-                "count": primitive_count,
-                "type": "SCALAR",
-                "min": [int(indices.min())],
-                "max": [int(indices.max())],
-            },
-        ],
-        "meshes": [
-            {
-                "primitives": [
-                    {
-                        "attributes": {"POSITION": 0, "NORMAL": 1},
-                        "indices": 2,
-                        "material": 0,
-                    }
-                ]
-            }
-        ],
-    }
-    encoded = base64.b64encode(
-        json.dumps(gltf, separators=(",", ":")).encode("utf-8")
-    ).decode("ascii")
-    return f"data:model/gltf+json;base64,{encoded}"
+def _cylinder_frame(
+    direction: np.ndarray, normal: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Unit axis and the unit normal orthogonalized against it."""
+    axis = direction / np.linalg.norm(direction)
+    normal_dir = normal - axis * np.dot(normal, axis)
+    normal_norm = np.linalg.norm(normal_dir)
+    if normal_norm < 1.0e-6:
+        fallback = np.array([1.0, 0.0, 0.0], dtype=axis.dtype)
+        if abs(float(np.dot(fallback, axis))) > 0.95:
+            fallback = np.array([0.0, 0.0, 1.0], dtype=axis.dtype)
+        normal_dir = fallback - axis * np.dot(fallback, axis)
+        normal_norm = np.linalg.norm(normal_dir)
+    return axis, normal_dir / normal_norm
 
 
 def _build_cylinder_geometry(
@@ -471,16 +611,7 @@ def _build_cylinder_geometry(
     if radial_segments < 3:
         raise ValueError("radial_segments must be >= 3")
 
-    axis = direction / np.linalg.norm(direction)
-    normal_dir = normal - axis * np.dot(normal, axis)
-    normal_norm = np.linalg.norm(normal_dir)
-    if normal_norm < 1.0e-6:
-        fallback = np.array([1.0, 0.0, 0.0], dtype=np.float32)
-        if abs(float(np.dot(fallback, axis))) > 0.95:
-            fallback = np.array([0.0, 0.0, 1.0], dtype=np.float32)
-        normal_dir = fallback - axis * np.dot(fallback, axis)
-        normal_norm = np.linalg.norm(normal_dir)
-    normal_dir /= normal_norm
+    axis, normal_dir = _cylinder_frame(direction, normal)
     binormal = np.cross(axis, normal_dir)
     end = start + axis * length
 
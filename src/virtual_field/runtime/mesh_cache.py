@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+MESH_CACHE_ENV = "VIRTUAL_FIELD_MESH_CACHE"
+DEFAULT_MESH_CACHE_DIR = Path.home() / ".cache" / "virtual_field" / "meshes"
+# Bump when the preprocessing or the stored layout changes, so that stale
+# entries are no longer looked up.
+MESH_CACHE_VERSION = 1
+
+_DISABLED_VALUES = ("", "0", "off", "false", "no")
+
+# (path, size, mtime_ns) -> sha256 of the file contents.
+_file_digests: dict[tuple[str, int, int], str] = {}
+
+ArrayGroups = dict[str, dict[str, np.ndarray]]
+
+
+def file_digest(path: str | os.PathLike[str]) -> str:
+    """SHA-256 of a file, or of every file below a directory.
+
+    Digests are memoized per path, size and modification time, so repeated
+    registrations do not re-read unchanged sources.
+    """
+    path = Path(path)
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for child in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(child.relative_to(path).as_posix().encode("utf-8"))
+            digest.update(file_digest(child).encode("ascii"))
+        return digest.hexdigest()
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    cached = _file_digests.get(memo_key)
+    if cached is None:
+        digest = hashlib.sha256()
+        with path.open("rb") as stream:
+            for block in iter(lambda: stream.read(1 << 20), b""):
+                digest.update(block)
+        cached = _file_digests[memo_key] = digest.hexdigest()
+    return cached
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"unsupported cache key parameter: {type(value)!r}")
+
+
+@dataclass(slots=True)
+class MeshCache:
+    """On-disk cache of preprocessed meshes as plain ``.npy`` arrays.
+
+    An entry is a directory named after its key holding one
+    ``<group>.<name>.npy`` file per array, e.g. the arrays of a
+    :class:`MeshSurface`, its contact grid and the encoded GLB asset. Entries
+    are loaded memory-mapped and read-only, so a reload costs a few
+    milliseconds and concurrent users share the pages. Nothing is pickled.
+
+    Keys hash the source files together with every processing parameter, see
+    :meth:`key`; a changed source or parameter simply misses.
+
+    Parameters
+    ----------
+    root : Path
+        Directory holding the entries.
+    """
+
+    root: Path
+
+    @classmethod
+    def from_env(cls) -> MeshCache | None:
+        """Cache configured by ``VIRTUAL_FIELD_MESH_CACHE``.
+
+        Unset uses :data:`DEFAULT_MESH_CACHE_DIR`; ``0``/``off``/empty
+        disables caching (returns ``None``); anything else is the directory.
+        """
+        value = os.environ.get(MESH_CACHE_ENV)
+        if value is None:
+            return cls(DEFAULT_MESH_CACHE_DIR)
+        if value.strip().lower() in _DISABLED_VALUES:
+            return None
+        return cls(Path(value).expanduser())
+
+    def key(
+        self,
+        name: str,
+        sources: Iterable[str | os.PathLike[str]],
+        **params: Any,
+    ) -> str:
+        """Cache key of ``name`` built from ``sources`` with ``params``.
+
+        ``params`` must be JSON-serializable (numpy arrays and scalars are
+        converted) and should include every transform, decimation and grid
+        parameter that affects the stored arrays.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{name}:{MESH_CACHE_VERSION}".encode("utf-8"))
+        for source in sources:
+            digest.update(file_digest(source).encode("ascii"))
+        digest.update(
+            json.dumps(params, sort_keys=True, default=_jsonable).encode(
+                "utf-8"
+            )
+        )
+        return f"{name}-{digest.hexdigest()[:32]}"
+
+    def load(self, key: str) -> ArrayGroups | None:
+        """Memory-map the arrays of an entry, or ``None`` on a miss."""
+        entry = self.root / key
+        if not entry.is_dir():
+            return None
+        groups: ArrayGroups = {}
+        try:
+            for path in entry.glob("*.npy"):
+                group, name = path.stem.split(".", 1)
+                groups.setdefault(group, {})[name] = np.load(
+                    path, mmap_mode="r", allow_pickle=False
+                )
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                "Ignoring unreadable mesh cache entry {}: {}", key, exc
+            )
+            return None
+        logger.debug("Loaded mesh cache entry {}", key)
+        return groups
+
+    def store(self, key: str, groups: Mapping[str, Mapping[str, Any]]) -> None:
+        """Write an entry atomically; failures are logged, not raised."""
+        entry = self.root / key
+        staging: Path | None = None
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.root))
+            for group, arrays in groups.items():
+                for name, array in arrays.items():
+                    np.save(
+                        staging / f"{group}.{name}.npy",
+                        np.asarray(array),
+                        allow_pickle=False,
+                    )
+            # Another process may have stored the same entry meanwhile; both
+            # hold the same arrays, so keep whichever landed first.
+            os.rename(staging, entry)
+            staging = None
+            logger.info("Stored mesh cache entry {}", key)
+        except OSError as exc:
+            if not entry.is_dir():
+                logger.warning(
+                    "Could not store mesh cache entry {}: {}", key, exc
+                )
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Protocol, final
+from typing import Any, Callable, Hashable, Protocol, TypeVar, final
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from math import cos, pi, sin
 
 import numpy as np
@@ -23,6 +23,26 @@ from virtual_field.runtime.orientation import (
     invert_rowwise_director,
     matrix_to_quat_xyzw,
 )
+from virtual_field.runtime.shared_assets import SHARED_ASSETS
+
+T = TypeVar("T")
+
+# How actuation is applied between two control updates, see
+# ``SimulationBase.control_dt``.
+CONTROL_INTERPOLATIONS = ("hold", "linear")
+
+
+@dataclass(slots=True)
+class SimulationState:
+    """Saved copy of a simulation's system state.
+
+    Taken by :meth:`SimulationBase.capture_state` and written back in place
+    by :meth:`SimulationBase.restore_state`.
+    """
+
+    time: float
+    arrays: list[tuple[np.ndarray, np.ndarray]]  # (live array, saved copy)
+    attributes: list[tuple[Any, str, Any]]  # (system, attribute, value)
 
 
 # Simplest rod protocol.
@@ -35,7 +55,26 @@ class Rod(Protocol):
 
 @dataclass(slots=True, kw_only=True)
 class SimulationBase(ABC):
-    """Shared backend contract and rod-state helpers for simulation modes."""
+    """Shared backend contract and rod-state helpers for simulation modes.
+
+    Meshes are kept in a static registry: modes build them once (usually in
+    :meth:`build_simulation`) with :meth:`register_static_mesh` and change
+    their pose or visibility with :meth:`update_mesh`. Every change bumps a
+    per-mesh version, so the backend only republishes meshes that changed
+    (:meth:`changed_mesh_entities`) instead of rebuilding assets every step.
+
+    Read-only scenery (collision surfaces, grids, obstacle sets) is obtained
+    with :meth:`acquire_shared_asset`, so users of the same mode share one
+    copy. :meth:`close` releases it when the user leaves.
+
+    Controllers run in :meth:`apply_control`, before physics substeps of
+    ``dt_internal``. By default that happens every substep. Modes whose
+    controllers cost more than the physics they drive set ``control_dt`` to
+    run it less often. In between, the arrays of :meth:`control_buffers` keep
+    their values (``control_interpolation="hold"``). With ``"linear"`` they
+    ramp from the previous to the latest control output over one
+    ``control_dt``, which delays the actuation by one control period.
+    """
 
     user_id: str
     arm_ids: tuple[str, ...]
@@ -44,6 +83,8 @@ class SimulationBase(ABC):
     timestepper: Any = field(init=False)
     rods: dict[str, Any] = field(init=False, default_factory=dict)
     dt_internal: float = 1.0e-4
+    control_dt: float | None = None
+    control_interpolation: str = "hold"
     _time: float = field(init=False, default=0.0)
     _last_log_time: float = field(init=False, default=0.0)
     _target_position: dict[str, np.ndarray] = field(init=False)
@@ -53,13 +94,41 @@ class SimulationBase(ABC):
     _base_orientation: dict[str, np.ndarray] = field(init=False)
     _controller_orientation_offset: dict[str, np.ndarray] = field(init=False)
     _attached: dict[str, bool] = field(init=False)
+    _static_meshes: dict[str, MeshEntity] = field(
+        init=False, default_factory=dict
+    )
+    _mesh_versions: dict[str, int] = field(init=False, default_factory=dict)
+    _mesh_version: int = field(init=False, default=0)
+    _shared_asset_keys: list[Hashable] = field(init=False, default_factory=list)
+    _initial_state: SimulationState | None = field(init=False, default=None)
+    _initial_meshes: dict[str, MeshEntity] = field(
+        init=False, default_factory=dict
+    )
+    _last_control_time: float | None = field(init=False, default=None)
+    _control_start: list[np.ndarray] = field(init=False, default_factory=list)
+    _control_end: list[np.ndarray] = field(init=False, default_factory=list)
 
     @final
     def __post_init__(self) -> None:
-        self.configure_arm_bases()
-        self.build_simulation()
-        self._initialize_arm_targets()
-        self.post_mode_setup()
+        if self.control_dt is not None and self.control_dt <= 0.0:
+            raise ValueError(f"control_dt must be > 0, got {self.control_dt}")
+        if self.control_interpolation not in CONTROL_INTERPOLATIONS:
+            raise ValueError(
+                f"Unsupported control interpolation: "
+                f"{self.control_interpolation}. "
+                f"Expected one of {CONTROL_INTERPOLATIONS}"
+            )
+        try:
+            self.configure_arm_bases()
+            self.build_simulation()
+            self._initialize_arm_targets()
+            self.post_mode_setup()
+            self._initial_state = self.capture_state()
+            self._initial_meshes = dict(self._static_meshes)
+        except BaseException:
+            # Nobody will close a simulation that failed to build.
+            self.close()
+            raise
 
     # --- Abstract / Override following methods ---
 
@@ -74,6 +143,39 @@ class SimulationBase(ABC):
     def post_mode_setup(self) -> None:
         pass
 
+    def reset_mode_state(self) -> None:
+        """Reset mode state that is not stored in the simulator's systems.
+
+        Called by :meth:`reset` after the rods and bodies are restored.
+        Containers that forcings hold references to (penetration dicts,
+        recording queues) must be reset in place.
+        """
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        """JSON-serializable mode state that is not stored in the systems.
+
+        Saved in checkpoints next to the system arrays and handed back to
+        :meth:`restore_mode_state`. List per-arm values in ``arm_ids`` order
+        rather than keying them by arm id: a simulation restored from a pool
+        template has other arm ids.
+        """
+        return {}
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        """Apply a state returned by :meth:`checkpoint_mode_state`."""
+
+    def apply_control(self) -> None:
+        """Update the actuation from the current state and commands.
+
+        Called before a physics substep every ``control_dt`` (every substep
+        if ``None``). Actuation to interpolate between updates must be
+        written into the arrays of :meth:`control_buffers`.
+        """
+
+    def control_buffers(self) -> list[np.ndarray]:
+        """Actuation arrays written by :meth:`apply_control`."""
+        return []
+
     def handle_frame_command(self, command: MultiArmCommand) -> None:
         pass
 
@@ -94,6 +196,108 @@ class SimulationBase(ABC):
     def handle_command_inactive(self, arm_id: str) -> None:
         self.set_attached(arm_id, True)
 
+    def close(self) -> None:
+        """Release the shared assets held by this simulation.
+
+        Called by the backend when the user leaves. Overrides must call
+        ``super().close()``.
+        """
+        while self._shared_asset_keys:
+            SHARED_ASSETS.release(self._shared_asset_keys.pop())
+
+    # --- Snapshot / reset ---
+
+    def capture_state(self) -> SimulationState:
+        """Copy the state of the rods and every system in the simulator.
+
+        Rod arrays of a finalized simulator are views into the memory
+        blocks, so each array is resolved to the array that owns its memory
+        and every owner is copied once. Read-only arrays (shared assets) are
+        skipped. Scalar attributes, such as the active element count of a
+        growing rod, are saved as well.
+        """
+        arrays: dict[int, np.ndarray] = {}
+        attributes: list[tuple[Any, str, Any]] = []
+        systems = {id(rod): rod for rod in self.rods.values()}
+        simulator = getattr(self, "simulator", None)
+        if hasattr(simulator, "systems"):
+            for system in (*simulator.systems(), *simulator.final_systems()):
+                systems.setdefault(id(system), system)
+        for system in systems.values():
+            for name, value in getattr(system, "__dict__", {}).items():
+                if isinstance(value, np.ndarray):
+                    while isinstance(value.base, np.ndarray):
+                        value = value.base
+                    if value.flags.writeable:
+                        arrays.setdefault(id(value), value)
+                elif isinstance(value, (bool, int, float, np.number)):
+                    attributes.append((system, name, value))
+        return SimulationState(
+            time=self._time,
+            arrays=[(array, array.copy()) for array in arrays.values()],
+            attributes=attributes,
+        )
+
+    def restore_state(self, state: SimulationState) -> None:
+        """Write ``state`` back into the live systems, in place."""
+        for array, saved in state.arrays:
+            np.copyto(array, saved)
+        for system, name, value in state.attributes:
+            setattr(system, name, value)
+        self._time = state.time
+        self._last_log_time = state.time
+        self._last_control_time = None
+        self._control_end = []
+
+    def reset(self) -> None:
+        """Return the simulation to its state right after construction.
+
+        Restores the systems captured at the end of construction, resets the
+        arm targets, re-registers meshes that were changed since and calls
+        :meth:`reset_mode_state`. Nothing is rebuilt, so this is much
+        cheaper than building a new simulation.
+        """
+        if self._initial_state is None:
+            raise RuntimeError("Simulation has no captured initial state")
+        self.restore_state(self._initial_state)
+        self._initialize_arm_targets()
+        for mesh_id, mesh in self._initial_meshes.items():
+            if self._static_meshes.get(mesh_id) is not mesh:
+                self.register_static_mesh(mesh)
+        self.reset_mode_state()
+
+    def checkpoint_python_state(self) -> dict[str, Any]:
+        """Arm targets and :meth:`checkpoint_mode_state`, for checkpoints."""
+        return {
+            "targets": [
+                {
+                    "position": self._target_position[arm_id].tolist(),
+                    "orientation": self._target_orientation[arm_id].tolist(),
+                    "orientation_offset": self._controller_orientation_offset[
+                        arm_id
+                    ].tolist(),
+                    "attached": self._attached[arm_id],
+                }
+                for arm_id in self.arm_ids
+            ],
+            "mode": self.checkpoint_mode_state(),
+        }
+
+    def restore_python_state(self, state: dict[str, Any]) -> None:
+        """Apply a state returned by :meth:`checkpoint_python_state`."""
+        for arm_id, target in zip(self.arm_ids, state["targets"]):
+            self._target_position[arm_id] = np.array(
+                target["position"], dtype=np.float64
+            )
+            self._target_orientation[arm_id] = np.array(
+                target["orientation"], dtype=np.float64
+            )
+            self._controller_orientation_offset[arm_id] = np.array(
+                target["orientation_offset"], dtype=np.float64
+            )
+            self._attached[arm_id] = bool(target["attached"])
+        self.restore_mode_state(state["mode"])
+
     # ---
 
     def _initialize_arm_targets(self) -> None:
@@ -188,20 +392,133 @@ class SimulationBase(ABC):
         substeps = max(1, int(np.ceil(total / self.dt_internal)))
         step_dt = total / substeps
         for _ in range(substeps):
+            self._update_control()
             self._time = self.timestepper.step(
                 self.simulator, self._time, step_dt
             )
         if self._time - self._last_log_time >= 0.1:
             self._last_log_time = self._time
 
+    def _update_control(self) -> bool:
+        """Run :meth:`apply_control` if due, else interpolate the actuation.
+
+        Returns ``True`` if the control buffers changed.
+        """
+        if self.control_dt is not None and self._last_control_time is not None:
+            elapsed = self._time - self._last_control_time
+            # The tolerance absorbs round-off of the accumulated substeps.
+            if elapsed < self.control_dt * (1.0 - 1.0e-9):
+                if self.control_interpolation == "hold":
+                    return False
+                weight = elapsed / self.control_dt
+                for buffer, start, end in zip(
+                    self.control_buffers(),
+                    self._control_start,
+                    self._control_end,
+                ):
+                    np.subtract(end, start, out=buffer)
+                    buffer *= weight
+                    buffer += start
+                return True
+
+        linear = (
+            self.control_dt is not None
+            and self.control_interpolation == "linear"
+        )
+        if linear:
+            # Ramp on from the previous output, not from the value reached
+            # by the last interpolated substep.
+            self._control_start = self._control_end or [
+                buffer.copy() for buffer in self.control_buffers()
+            ]
+        self.apply_control()
+        self._last_control_time = self._time
+        if linear:
+            buffers = self.control_buffers()
+            self._control_end = [buffer.copy() for buffer in buffers]
+            for buffer, start in zip(buffers, self._control_start):
+                np.copyto(buffer, start)
+        return True
+
     def arm_states(self) -> dict[str, ArmState]:
         return {
             arm_id: self._rod_to_arm_state(arm_id, self.rods[arm_id])
             for arm_id in self.arm_ids
         }
 
+    # --- Static mesh registry ---
+
+    @property
+    def mesh_version(self) -> int:
+        """Version of the most recent mesh registration or update."""
+        return self._mesh_version
+
+    def register_static_mesh(self, mesh: MeshEntity) -> None:
+        """Add (or replace) a mesh in the registry and bump its version."""
+        self._mesh_version += 1
+        self._static_meshes[mesh.mesh_id] = mesh
+        self._mesh_versions[mesh.mesh_id] = self._mesh_version
+
+    def update_mesh(
+        self,
+        mesh_id: str,
+        *,
+        translation: list[float] | None = None,
+        rotation_xyzw: list[float] | None = None,
+        scale: list[float] | None = None,
+        visible: bool | None = None,
+    ) -> bool:
+        """Change the pose or visibility of a registered mesh.
+
+        The entity is replaced, never mutated, so published snapshots keep
+        their values. Returns ``True`` only if a value actually changed.
+        """
+        mesh = self._static_meshes.get(mesh_id)
+        if mesh is None:
+            return False
+        changes: dict[str, Any] = {}
+        for name, value in (
+            ("translation", translation),
+            ("rotation_xyzw", rotation_xyzw),
+            ("scale", scale),
+        ):
+            if value is not None and list(value) != getattr(mesh, name):
+                changes[name] = list(value)
+        if visible is not None and bool(visible) != mesh.visible:
+            changes["visible"] = bool(visible)
+        if not changes:
+            return False
+        self.register_static_mesh(replace(mesh, **changes))
+        return True
+
     def mesh_entities(self) -> list[MeshEntity]:
-        return []
+        """All registered meshes."""
+        return list(self._static_meshes.values())
+
+    def changed_mesh_entities(self, since_version: int) -> list[MeshEntity]:
+        """Registered meshes whose version is newer than ``since_version``."""
+        if since_version >= self._mesh_version:
+            return []
+        return [
+            self._static_meshes[mesh_id]
+            for mesh_id, version in self._mesh_versions.items()
+            if version > since_version
+        ]
+
+    # --- Shared assets ---
+
+    def acquire_shared_asset(
+        self, key: Hashable, factory: Callable[[], T]
+    ) -> T:
+        """Get a read-only asset shared with other simulations.
+
+        ``factory`` runs only if no live simulation holds ``key``; ``key``
+        must capture every input of ``factory``. The reference is released
+        by :meth:`close`.
+        """
+        value = SHARED_ASSETS.acquire(key, factory)
+        self._shared_asset_keys.append(key)
+        return value
 
     def sphere_entities(self) -> list[SphereEntity]:
         return []
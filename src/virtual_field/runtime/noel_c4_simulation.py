@@ -8,8 +8,12 @@ from pathlib import Path
 import numpy as np
 
 from virtual_field.core.state import HapticEvent, MeshEntity
-from virtual_field.runtime.mesh_assets import build_cylinder_gltf_data_uri
+from virtual_field.runtime.mesh_assets import (
+    build_instanced_cylinders_gltf_data_uri,
+)
+from virtual_field.runtime.mesh_cache import MeshCache
 from virtual_field.runtime.mode_base import DualArmSimulationBase
+from virtual_field.runtime.shared_assets import freeze_arrays
 
 
 @dataclass(slots=True)
@@ -120,6 +124,9 @@ def load_noel_c4_obstacles() -> NoelObstacleSet:
 @dataclass(slots=True)
 class NoelC4Simulation(DualArmSimulationBase):
     tip_haptic_max_penetration: float = 0.01
+    # Lattice spacing of a baked obstacle SDF, cached on disk; None evaluates
+    # the cylinders analytically through the spatial hash.
+    obstacle_sdf_grid_spacing: float | None = None
     _obstacles: NoelObstacleSet = field(init=False)
     _tip_penetration_by_arm: dict[str, float] = field(init=False, default_factory=dict)
     _haptic_events: list[HapticEvent] = field(init=False, default_factory=list)
@@ -134,11 +141,40 @@ class NoelC4Simulation(DualArmSimulationBase):
         # from virtual_field.runtime.spirob_elastica.constraints import (
         #     _SpirobBendConstraint,
         # )
+        from virtual_field.runtime.spirob_elastica.sdf_objects_grid import (
+            SDFObstacleCylindersGrid,
+            load_cylinder_sdf_grid,
+        )
         from virtual_field.runtime.spirob_elastica.sdf_objects_hash import (
+            CylinderSpatialHash,
             SDFObstacleCylindersHash,
         )
 
-        self._obstacles = load_noel_c4_obstacles()
+        # The obstacle nest is the same for every user: load it once and
+        # share it (and its render asset) while any noel-c4 user is present.
+        self._obstacles = self.acquire_shared_asset(
+            "noel-c4-obstacles",
+            lambda: freeze_arrays(load_noel_c4_obstacles()),
+        )
+        # All obstacles share one unit cylinder drawn with per-obstacle
+        # instance transforms: one asset and one draw call for the whole nest.
+        self.register_static_mesh(
+            MeshEntity(
+                mesh_id=f"{self.user_id}_noel_c4_obstacles",
+                owner_id=self.user_id,
+                asset_uri=self.acquire_shared_asset(
+                    "noel-c4-obstacles-asset",
+                    lambda: build_instanced_cylinders_gltf_data_uri(
+                        self._obstacles.starts,
+                        self._obstacles.directions,
+                        self._obstacles.normals,
+                        self._obstacles.lengths,
+                        self._obstacles.radii,
+                    ),
+                ),
+                static_asset=True,
+            )
+        )
         self._tip_penetration_by_arm = {arm_id: 0.0 for arm_id in self.arm_ids}
         self._haptic_events = [
             HapticEvent(arm_id=arm_id, active=False, intensity=0.0)
@@ -237,17 +273,62 @@ class NoelC4Simulation(DualArmSimulationBase):
         #     allowed_angle_in_deg=30,
         # )
 
+        # The obstacle hash (or baked SDF) only depends on the nest and the
+        # rod thickness, so both arms and all users with the same rods share
+        # one.
+        query_padding = float(
+            max(np.max(rod.radius) for rod in (self.left_rod, self.right_rod))
+        )
+        obstacles = self._obstacles
+        if self.obstacle_sdf_grid_spacing is None:
+            obstacle_forcing = SDFObstacleCylindersHash
+            shared_kwargs = {
+                "spatial_hash": self.acquire_shared_asset(
+                    ("noel-c4-obstacle-hash", query_padding),
+                    lambda: freeze_arrays(
+                        CylinderSpatialHash(
+                            obstacles.starts,
+                            obstacles.directions,
+                            obstacles.lengths,
+                            obstacles.radii,
+                            obstacles.normals,
+                            padding=query_padding,
+                        )
+                    ),
+                )
+            }
+        else:
+            spacing = float(self.obstacle_sdf_grid_spacing)
+            obstacle_forcing = SDFObstacleCylindersGrid
+            shared_kwargs = {
+                "sdf_grid": self.acquire_shared_asset(
+                    ("noel-c4-obstacle-sdf-grid", spacing, query_padding),
+                    lambda: freeze_arrays(
+                        load_cylinder_sdf_grid(
+                            obstacles.starts,
+                            obstacles.directions,
+                            obstacles.lengths,
+                            obstacles.radii,
+                            obstacles.normals,
+                            spacing=spacing,
+                            band=query_padding,
+                            cache=MeshCache.from_env(),
+                        )
+                    ),
+                )
+            }
         for rod in (self.left_rod, self.right_rod):
             arm_id = self.arm_ids[0] if rod is self.left_rod else self.arm_ids[1]
             self.simulator.add_forcing_to(rod).using(
-                SDFObstacleCylindersHash,
-                starts=self._obstacles.starts,
-                directions=self._obstacles.directions,
-                lengths=self._obstacles.lengths,
-                radii=self._obstacles.radii,
-                normals=self._obstacles.normals,
+                obstacle_forcing,
+                starts=obstacles.starts,
+                directions=obstacles.directions,
+                lengths=obstacles.lengths,
+                radii=obstacles.radii,
+                normals=obstacles.normals,
                 tip_penetration_state=self._tip_penetration_by_arm,
                 tip_penetration_key=arm_id,
+                **shared_kwargs,
             )
 
         damping_constant = 5.0
@@ -266,24 +347,10 @@ class NoelC4Simulation(DualArmSimulationBase):
 
         self.simulator.finalize()
 
-    def mesh_entities(self) -> list[MeshEntity]:
-        meshes: list[MeshEntity] = []
-        for idx in range(self._obstacles.starts.shape[0]):
-            meshes.append(
-                MeshEntity(
-                    mesh_id=f"{self.user_id}_noel_c4_obstacle_{idx}",
-                    owner_id=self.user_id,
-                    asset_uri=build_cylinder_gltf_data_uri(
-                        self._obstacles.starts[idx],
-                        self._obstacles.directions[idx],
-                        self._obstacles.normals[idx],
-                        float(self._obstacles.lengths[idx]),
-                        float(self._obstacles.radii[idx]),
-                    ),
-                    static_asset=True,
-                )
-            )
-        return meshes
+    def reset_mode_state(self) -> None:
+        # The obstacle forcings hold this dict; reset it in place.
+        for arm_id in self._tip_penetration_by_arm:
+            self._tip_penetration_by_arm[arm_id] = 0.0
 
     def haptic_events(self) -> list[HapticEvent]:
         for event in self._haptic_events:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from dataclasses import dataclass, field
 from importlib.resources import files
 
@@ -22,8 +24,10 @@ from virtual_field.runtime.foraging_elastica import (
     rotate_policy_by_angle,
 )
 from virtual_field.runtime.mesh_assets import (
-    build_pyvista_polydata_gltf_data_uri,
+    build_pyvista_polydata_glb,
+    glb_data_uri,
 )
+from virtual_field.runtime.mesh_cache import MeshCache
 from virtual_field.runtime.mode_base import OctoArmSimulationBase
 from virtual_field.runtime.orientation import controller_quat_xyzw_to_matrix
 from virtual_field.runtime.spirob_elastica.spirob import create_spirob
@@ -53,6 +57,52 @@ WAYPOINT_QUEUE_COLOR_RGB = [0.98, 0.74, 0.24]
 WAYPOINT_CURRENT_COLOR_RGB = [0.35, 0.95, 0.45]
 # Crawling policy has eight tentacle channels; ``arm_8`` is the head rod (kinematic).
 TENTACLE_COUNT = 8
+TERRAIN_COLOR_RGBA = (0.42, 0.48, 0.55, 1.00)
+
+
+def load_terrain_glb(plane_y: float, cache: MeshCache | None = None) -> bytes:
+    """Terrain GLB asset with its top at ``plane_y``, reloaded from ``cache``."""
+    key = None
+    if cache is not None:
+        # The whole terrain directory: scene, buffers and textures.
+        key = cache.key(
+            "octo-waypoint-terrain",
+            [EXTERNAL_MESH_PATH.parent],
+            plane_y=float(plane_y),
+            texture=EXTERNAL_MESH_BASE_COLOR_TEXTURE_PATH.name,
+            color_rgba=TERRAIN_COLOR_RGBA,
+        )
+        groups = cache.load(key)
+        if groups is not None:
+            return groups["terrain"]["glb"].tobytes()
+
+    glb = _build_terrain_glb(plane_y)
+    if cache is not None:
+        cache.store(key, {"terrain": {"glb": np.frombuffer(glb, dtype=np.uint8)}})
+    return glb
+
+
+def _build_terrain_glb(plane_y: float) -> bytes:
+    import pyvista as pv
+
+    terrain_mesh = pv.read(EXTERNAL_MESH_PATH)
+    terrain_mesh = terrain_mesh["Node_0"].extract_surface(algorithm=None)
+    terrain_mesh.translate(
+        -np.array(terrain_mesh.center), inplace=True
+    )  # center the mesh at origin
+    terrain_mesh.scale(1.2 * np.array([1, 1, 1]), inplace=True)  # rescale mesh
+    # terrain_mesh.rotate_x(
+    #     90, inplace=True
+    # )  # rotate so surface upper side points in +y
+    terrain_mesh.translate(
+        np.array([0, plane_y - terrain_mesh.bounds[3] + 0.01, 0])
+    )  # surface top point at plane_y
+    return build_pyvista_polydata_glb(
+        terrain_mesh,
+        color_rgba=TERRAIN_COLOR_RGBA,
+        base_color_texture_path=EXTERNAL_MESH_BASE_COLOR_TEXTURE_PATH,
+        quantize=True,
+    )
 
 
 class _Simulator(
@@ -129,8 +179,12 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
     enable_controller_trigger_waypoints
         If True, controller trigger adds projected waypoints. Disabled by default
         while debugging preset navigation.
+    control_dt
+        Period of the crawl policy update; the tentacle actuation is held in
+        between (see ``SimulationBase``).
     """
 
+    control_dt: float | None = 1.0e-3
     seed_pentagon_waypoints: bool = True
     preset_pentagon_radius: float = 0.45
 
@@ -160,11 +214,8 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
     target_extension: np.ndarray = field(init=False)
     target_stiffness: np.ndarray = field(init=False)
     target_bend: np.ndarray = field(init=False)
-    _terrain_asset_uri: str | None = field(init=False, default=None)
 
     def build_simulation(self) -> None:
-        import pyvista as pv
-
         # from .custom_elastica.mesh import (
         #     Grid,
         #     MeshSurface,
@@ -229,18 +280,6 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
         )
 
         plane_y = -0.02 + base_position[1]
-        terrain_mesh = pv.read(EXTERNAL_MESH_PATH)
-        terrain_mesh = terrain_mesh["Node_0"].extract_surface(algorithm=None)
-        terrain_mesh.translate(
-            -np.array(terrain_mesh.center), inplace=True
-        )  # center the mesh at origin
-        terrain_mesh.scale(1.2 * np.array([1, 1, 1]), inplace=True)  # rescale mesh
-        # terrain_mesh.rotate_x(
-        #     90, inplace=True
-        # )  # rotate so surface upper side points in +y
-        terrain_mesh.translate(
-            np.array([0, plane_y - terrain_mesh.bounds[3] + 0.01, 0])
-        )  # surface top point at plane_y
         # target_reduction = 0.8
         # logger.info(f"Mesh size {terrain_mesh.n_faces_strict}")
         # terrain_mesh_decimated = terrain_mesh.decimate(
@@ -252,10 +291,15 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
         #     f"Mesh size after decimation {terrain_mesh_decimated.n_faces_strict}"
         # )
 
-        self._terrain_asset_uri = build_pyvista_polydata_gltf_data_uri(
-            terrain_mesh,
-            color_rgba=(0.42, 0.48, 0.55, 1.00),
-            base_color_texture_path=EXTERNAL_MESH_BASE_COLOR_TEXTURE_PATH,
+        self.register_static_mesh(
+            MeshEntity(
+                mesh_id=f"{self.user_id}_waypoint_terrain",
+                owner_id=self.user_id,
+                asset_uri=glb_data_uri(
+                    load_terrain_glb(plane_y, MeshCache.from_env())
+                ),
+                static_asset=True,
+            )
         )
         # dummy_rod = create_spirob(
         #     15,
@@ -372,6 +416,56 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
     ) -> None:
         return
 
+    def reset_mode_state(self) -> None:
+        self._head_pose = Transform(
+            translation=self.base_sphere.position_collection[:, 0].tolist(),
+            rotation_xyzw=[0.0, 0.0, 0.0, 1.0],
+        )
+        self.active_policy = self.idle_policy
+        self._waypoint_queue.clear()
+        self._waypoint_active = False
+        self._cycle_heading_angle = 0.0
+        self._last_cycle_index = -1
+        self._crawl_active_until = 0.0
+        self._loco_coast_until = None
+        self._defer_heading_until = None
+        self._last_trigger_pressed = {"left": False, "right": False}
+        self.base_suction_active.fill(0.0)
+        self.middle_suction_active.fill(0.0)
+        self.target_extension.fill(0.0)
+        self.target_stiffness.fill(1.0)
+        self.target_bend.fill(0.0)
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        return {
+            "head_pose": self._head_pose.to_dict(),
+            "cycle_heading_angle": self._cycle_heading_angle,
+            "last_cycle_index": self._last_cycle_index,
+            "crawl_active_until": self._crawl_active_until,
+            "loco_coast_until": self._loco_coast_until,
+            "waypoint_queue": [w.tolist() for w in self._waypoint_queue],
+            "waypoint_active": self._waypoint_active,
+            "defer_heading_until": self._defer_heading_until,
+        }
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        self._head_pose = Transform.from_dict(state["head_pose"])
+        self._cycle_heading_angle = float(state["cycle_heading_angle"])
+        self._last_cycle_index = int(state["last_cycle_index"])
+        self._crawl_active_until = float(state["crawl_active_until"])
+        self._loco_coast_until = state["loco_coast_until"]
+        self._waypoint_queue[:] = [
+            np.array(w, dtype=np.float64) for w in state["waypoint_queue"]
+        ]
+        self._waypoint_active = bool(state["waypoint_active"])
+        self._defer_heading_until = state["defer_heading_until"]
+        # The active policy is the base policy turned to the cycle heading.
+        self.active_policy = (
+            self.idle_policy
+            if self._last_cycle_index < 0
+            else rotate_policy_by_angle(self.base_policy, self._cycle_heading_angle)
+        )
+
     def handle_frame_command(self, command: MultiArmCommand) -> None:
         if command.head_pose is not None:
             self._head_pose = command.head_pose
@@ -631,15 +725,17 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
 
         self._write_tentacle_actuation(phase, policy)
 
-    def step(self, dt: float) -> None:
-        """
-        (Note) Assume dt is always positive and not too small (probably > 1e-4).
-        """
-        substeps = max(1, int(np.ceil(dt / self.dt_internal)))
-        step_dt = dt / substeps  # Actual dt
-        for _ in range(substeps):
-            self._apply_policy()
-            self._time = self.timestepper.step(self.simulator, self._time, step_dt)
+    def apply_control(self) -> None:
+        self._apply_policy()
+
+    def control_buffers(self) -> list[np.ndarray]:
+        return [
+            self.base_suction_active,
+            self.middle_suction_active,
+            self.target_extension,
+            self.target_stiffness,
+            self.target_bend,
+        ]
 
     def sphere_entities(self) -> list[SphereEntity]:
         spheres: list[SphereEntity] = []
@@ -680,15 +776,3 @@ class OctoWaypointSimulation(OctoArmSimulationBase):
             )
 
         return spheres
-
-    def mesh_entities(self) -> list[MeshEntity]:
-        if self._terrain_asset_uri is None:
-            return []
-        return [
-            MeshEntity(
-                mesh_id=f"{self.user_id}_waypoint_terrain",
-                owner_id=self.user_id,
-                asset_uri=self._terrain_asset_uri,
-                static_asset=True,
-            )
-        ]
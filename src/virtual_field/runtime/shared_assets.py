@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, TypeVar
+
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _SharedEntry:
+    value: Any
+    refcount: int
+
+
+@dataclass(slots=True)
+class _PendingBuild:
+    """Marker of an asset whose factory is running in ``builder``."""
+
+    builder: int = field(default_factory=threading.get_ident)
+    done: threading.Event = field(default_factory=threading.Event)
+    error: BaseException | None = None
+
+
+def freeze_arrays(value: Any) -> Any:
+    """Mark the numpy arrays held by ``value`` read-only and return it.
+
+    Arrays directly on ``value`` (itself, its attributes, or the items of a
+    tuple, list or dict) are frozen; nested objects are left alone.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        return value
+    if isinstance(value, dict):
+        members = list(value.values())
+    elif isinstance(value, (tuple, list)):
+        members = list(value)
+    else:
+        members = list(getattr(value, "__dict__", {}).values())
+        for cls in type(value).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(value, name):
+                    members.append(getattr(value, name))
+    for member in members:
+        if isinstance(member, np.ndarray):
+            member.flags.writeable = False
+    return value
+
+
+@dataclass(slots=True)
+class SharedAssetRegistry:
+    """Process-wide, reference-counted registry of read-only scene assets.
+
+    Collision surfaces, contact grids and obstacle sets only depend on the
+    scenery, so simulations of different users share one instance by
+    reference instead of rebuilding and duplicating it. :meth:`acquire`
+    builds an asset on first use and counts every further user;
+    :meth:`release` evicts it when the last user is gone.
+
+    Factories run outside the registry lock: a slow build only blocks other
+    acquirers of the same key, which wait for it instead of building again.
+
+    Shared values must not be mutated. Factories should mark their numpy
+    arrays read-only with :func:`freeze_arrays`, so accidental writes raise
+    instead of leaking into other users' simulations.
+    """
+
+    _entries: dict[Hashable, _SharedEntry] = field(
+        init=False, default_factory=dict
+    )
+    _building: dict[Hashable, _PendingBuild] = field(
+        init=False, default_factory=dict
+    )
+    # Guards ``_entries`` and ``_building`` only; never held while a factory
+    # runs.
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def refcount(self, key: Hashable) -> int:
+        entry = self._entries.get(key)
+        return 0 if entry is None else entry.refcount
+
+    def acquire(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return the asset stored under ``key``, building it if needed.
+
+        Every call must be paired with a :meth:`release` of the same key.
+        ``key`` must capture every input of ``factory``. If another thread is
+        building ``key``, waits for that build and re-raises its error.
+
+        Raises
+        ------
+        ValueError
+            If ``factory`` acquires its own ``key``.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    return entry.value
+                pending = self._building.get(key)
+                if pending is None:
+                    pending = _PendingBuild()
+                    self._building[key] = pending
+                    break
+            if pending.builder == threading.get_ident():
+                raise ValueError(
+                    f"Shared asset {key!r} acquired while building"
+                )
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            # Built; look it up again (it may already have been evicted).
+
+        try:
+            value = factory()
+        except BaseException as exc:
+            pending.error = exc
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = _SharedEntry(value=value, refcount=1)
+            logger.debug("Built shared asset {}", key)
+            return value
+        finally:
+            with self._lock:
+                del self._building[key]
+            pending.done.set()
+
+    def release(self, key: Hashable) -> None:
+        """Drop one reference to ``key`` and evict it at zero.
+
+        Raises
+        ------
+        KeyError
+            If ``key`` is not held.
+        """
+        with self._lock:
+            entry = self._entries[key]
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._entries[key]
+                logger.debug("Evicted shared asset {}", key)
+
+
+SHARED_ASSETS = SharedAssetRegistry()
@@ -0,0 +1,578 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+
+if not hasattr(np, "typing"):
+    import numpy.typing as np_typing
+
+    np.typing = np_typing  # type: ignore[attr-defined]
+from elastica import NoForces
+from elastica.typing import RigidBodyType, RodType
+from loguru import logger
+from numba import njit
+
+from virtual_field.runtime.mesh_cache import MeshCache
+from virtual_field.runtime.spirob_elastica.sdf_objects import (
+    _node_radii_from_element_radii,
+)
+from virtual_field.runtime.spirob_elastica.sdf_objects_hash import (
+    CylinderSpatialHash,
+    _nearest_candidate,
+)
+
+DEFAULT_SDF_GRID_SPACING = 0.005
+
+
+@dataclass(slots=True)
+class CylinderSDFGrid:
+    """Signed distance and normal of a static cylinder set, baked on a lattice.
+
+    Values are stored at the nodes of a regular lattice of edge ``spacing``
+    covering the obstacles plus ``band``, and sampled with trilinear
+    interpolation. Distances are clamped at ``band``: farther than that only
+    the fact that nothing is in contact matters, so the band must cover the
+    largest rod radius.
+
+    The stored field ``min(sdf, band)`` is 1-Lipschitz, so the interpolated
+    distance is within :attr:`error_bound` of it everywhere;
+    :meth:`max_error` measures the actual error against the analytic SDF.
+
+    Attributes
+    ----------
+    lower : np.ndarray
+        (3,) position of the first lattice node.
+    spacing : float
+        Lattice edge length.
+    band : float
+        Distance at which the field is clamped.
+    distance : np.ndarray
+        (nx, ny, nz) clamped signed distance at the lattice nodes.
+    normal : np.ndarray
+        (nx, ny, nz, 3) outward SDF normal at the lattice nodes, zero beyond
+        the band.
+    """
+
+    lower: np.ndarray
+    spacing: float
+    band: float
+    distance: np.ndarray
+    normal: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        starts: np.ndarray,
+        directions: np.ndarray,
+        lengths: np.ndarray,
+        radii: np.ndarray,
+        normals: np.ndarray,
+        spacing: float = DEFAULT_SDF_GRID_SPACING,
+        band: float | None = None,
+    ) -> CylinderSDFGrid:
+        """Bake the SDF of the cylinders; ``band`` defaults to the largest radius."""
+        lengths = np.asarray(lengths, dtype=np.float64).reshape(-1)
+        radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+        if spacing <= 0.0:
+            raise ValueError(f"spacing must be positive. Got {spacing=}")
+        if band is None:
+            band = float(np.max(radii))
+        if band <= 0.0:
+            raise ValueError(f"band must be positive. Got {band=}")
+
+        ends = starts + directions * lengths[:, None]
+        reach = np.max(radii) + band + spacing
+        lower = np.minimum(starts, ends).min(axis=0) - reach
+        upper = np.maximum(starts, ends).max(axis=0) + reach
+        shape = np.ceil((upper - lower) / spacing).astype(np.int64) + 1
+
+        # Only distances within the band are stored, so the candidates of a
+        # spatial hash padded by the band are all that is needed.
+        spatial_hash = CylinderSpatialHash(
+            starts,
+            directions,
+            lengths,
+            radii,
+            normals,
+            cell_size=max(2.0 * (np.max(radii) + band), 4.0 * spacing),
+            padding=band,
+        )
+        distance, normal = _bake_sdf(
+            lower,
+            float(spacing),
+            shape,
+            float(band),
+            spatial_hash.starts,
+            spatial_hash.directions,
+            spatial_hash.lengths,
+            spatial_hash.radii,
+            spatial_hash.normals,
+            spatial_hash.cell_size,
+            spatial_hash.table_keys,
+            spatial_hash.table_cells,
+            spatial_hash.cell_offsets,
+            spatial_hash.cell_obstacles,
+        )
+        grid = cls(
+            lower=lower,
+            spacing=float(spacing),
+            band=float(band),
+            distance=distance,
+            normal=normal,
+        )
+        logger.info(
+            "Baked SDF grid of {} cylinders: {} nodes, spacing {:.4g}, "
+            "band {:.4g}, error bound {:.4g}",
+            lengths.size,
+            tuple(int(n) for n in shape),
+            grid.spacing,
+            grid.band,
+            grid.error_bound,
+        )
+        return grid
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return self.distance.shape
+
+    @property
+    def error_bound(self) -> float:
+        """Guaranteed bound on ``|sampled - min(sdf, band)|``.
+
+        Trilinear interpolation of a 1-Lipschitz function is off by at most
+        the weighted distance to the cell corners, which is at most half the
+        cell diagonal.
+        """
+        return 0.5 * np.sqrt(3.0) * self.spacing
+
+    def sample(self, point: np.ndarray) -> tuple[float, np.ndarray]:
+        """Interpolated signed distance and unit normal at ``point``."""
+        point = np.asarray(point, dtype=np.float64).reshape(3)
+        sdf, nx, ny, nz = _sample_sdf(
+            point[0],
+            point[1],
+            point[2],
+            self.lower,
+            self.spacing,
+            self.band,
+            self.distance,
+            self.normal,
+        )
+        return float(sdf), np.array([nx, ny, nz])
+
+    def max_error(
+        self,
+        starts: np.ndarray,
+        directions: np.ndarray,
+        lengths: np.ndarray,
+        radii: np.ndarray,
+        normals: np.ndarray,
+        n_samples: int = 100_000,
+        seed: int = 0,
+    ) -> float:
+        """Largest ``|sampled - min(sdf, band)|`` over random points in the grid.
+
+        The cylinders must be the ones the grid was baked from.
+        """
+        upper = self.lower + self.spacing * (np.asarray(self.shape) - 1)
+        points = np.random.default_rng(seed).uniform(
+            self.lower, upper, size=(n_samples, 3)
+        )
+        spatial_hash = CylinderSpatialHash(
+            starts, directions, lengths, radii, normals, padding=self.band
+        )
+        return float(
+            _max_sample_error(
+                points,
+                self.lower,
+                self.spacing,
+                self.band,
+                self.distance,
+                self.normal,
+                spatial_hash.starts,
+                spatial_hash.directions,
+                spatial_hash.lengths,
+                spatial_hash.radii,
+                spatial_hash.normals,
+                spatial_hash.cell_size,
+                spatial_hash.table_keys,
+                spatial_hash.table_cells,
+                spatial_hash.cell_offsets,
+                spatial_hash.cell_obstacles,
+            )
+        )
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Plain arrays for :class:`MeshCache`, see :meth:`from_arrays`."""
+        return {
+            "lower": np.asarray(self.lower),
+            "spacing": np.asarray(self.spacing),
+            "band": np.asarray(self.band),
+            "distance": np.asarray(self.distance),
+            "normal": np.asarray(self.normal),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> CylinderSDFGrid:
+        return cls(
+            lower=np.asarray(arrays["lower"], dtype=np.float64),
+            spacing=float(arrays["spacing"]),
+            band=float(arrays["band"]),
+            distance=arrays["distance"],
+            normal=arrays["normal"],
+        )
+
+
+def load_cylinder_sdf_grid(
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    spacing: float = DEFAULT_SDF_GRID_SPACING,
+    band: float | None = None,
+    cache: MeshCache | None = None,
+) -> CylinderSDFGrid:
+    """Bake the SDF grid of the cylinders, or reload it from ``cache``.
+
+    Entries are keyed by a digest of the obstacle arrays together with
+    ``spacing`` and ``band``.
+    """
+    if band is None:
+        band = float(np.max(radii))
+    key = None
+    if cache is not None:
+        digest = hashlib.sha256()
+        for array in (starts, directions, lengths, radii, normals):
+            digest.update(
+                np.ascontiguousarray(array, dtype=np.float64).tobytes()
+            )
+        key = cache.key(
+            "cylinder-sdf-grid",
+            [],
+            obstacles=digest.hexdigest(),
+            spacing=spacing,
+            band=band,
+        )
+        groups = cache.load(key)
+        if groups is not None:
+            return CylinderSDFGrid.from_arrays(groups["grid"])
+
+    grid = CylinderSDFGrid.build(
+        starts, directions, lengths, radii, normals, spacing, band
+    )
+    if cache is not None:
+        cache.store(key, {"grid": grid.to_arrays()})
+    return grid
+
+
+class SDFObstacleCylindersGrid(NoForces):
+    """``SDFObstacleCylinders`` sampling a baked :class:`CylinderSDFGrid`.
+
+    Takes the same obstacle arrays and contact parameters, so it can replace
+    ``SDFObstacleCylinders`` directly; each node costs one trilinear lookup
+    regardless of the number of obstacles. Distances differ from the analytic
+    ones by at most ``sdf_grid.error_bound``.
+
+    Parameters
+    ----------
+    spacing : float
+        Lattice edge length when the grid is baked here.
+    band : float | None
+        Clamp distance when the grid is baked here; must cover the rod
+        radius. Defaults to the largest cylinder radius.
+    sdf_grid : CylinderSDFGrid | None
+        Prebuilt grid of the same obstacles, e.g. shared between users.
+    cache : MeshCache | None
+        Where a grid baked here is looked up and stored.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        directions: np.ndarray,
+        lengths: np.ndarray,
+        radii: np.ndarray,
+        normals: np.ndarray,
+        tip_penetration_state: dict[str, float] | None = None,
+        tip_penetration_key: str | None = None,
+        stiffness: float = 8.0e4,
+        damping: float = 4.0,
+        spacing: float = DEFAULT_SDF_GRID_SPACING,
+        band: float | None = None,
+        sdf_grid: CylinderSDFGrid | None = None,
+        cache: MeshCache | None = None,
+    ) -> None:
+        super().__init__()
+        self.starts = starts
+        self.directions = directions
+        self.lengths = lengths.reshape(-1)
+        self.radii = radii.reshape(-1)
+        self.normals = normals
+        self.tip_penetration_state = tip_penetration_state
+        self.tip_penetration_key = tip_penetration_key
+        self.stiffness = float(stiffness)
+        self.damping = float(damping)
+        self.cache = cache
+        if sdf_grid is None:
+            sdf_grid = load_cylinder_sdf_grid(
+                starts,
+                directions,
+                self.lengths,
+                self.radii,
+                normals,
+                spacing=spacing,
+                band=band,
+                cache=cache,
+            )
+        self.sdf_grid = sdf_grid
+
+    def apply_forces(
+        self,
+        system: "RodType | RigidBodyType",
+        time: np.float64 = np.float64(0.0),
+    ) -> None:
+        positions = system.position_collection
+        velocities = system.velocity_collection
+        external_forces = system.external_forces
+        radii = system.radius
+
+        node_radii = _node_radii_from_element_radii(radii, positions.shape[1])
+        max_node_radius = float(np.max(node_radii))
+        if max_node_radius > self.sdf_grid.band:
+            logger.warning(
+                "Rod radius {:.4g} exceeds the SDF grid band {:.4g}; "
+                "baking a wider grid",
+                max_node_radius,
+                self.sdf_grid.band,
+            )
+            self.sdf_grid = load_cylinder_sdf_grid(
+                self.starts,
+                self.directions,
+                self.lengths,
+                self.radii,
+                self.normals,
+                spacing=self.sdf_grid.spacing,
+                band=max_node_radius,
+                cache=self.cache,
+            )
+        sdf_grid = self.sdf_grid
+        tip_penetration = _apply_cylinder_contact_grid(
+            positions,
+            velocities,
+            external_forces,
+            node_radii,
+            self.stiffness,
+            self.damping,
+            sdf_grid.lower,
+            sdf_grid.spacing,
+            sdf_grid.band,
+            sdf_grid.distance,
+            sdf_grid.normal,
+        )
+        if (
+            self.tip_penetration_state is not None
+            and self.tip_penetration_key is not None
+        ):
+            self.tip_penetration_state[self.tip_penetration_key] = float(
+                tip_penetration
+            )
+
+
+@njit(cache=True)  # type: ignore
+def _bake_sdf(
+    lower: np.ndarray,
+    spacing: float,
+    shape: np.ndarray,
+    band: float,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    cell_size: float,
+    table_keys: np.ndarray,
+    table_cells: np.ndarray,
+    cell_offsets: np.ndarray,
+    cell_obstacles: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    distance = np.full((shape[0], shape[1], shape[2]), band, dtype=np.float32)
+    normal = np.zeros((shape[0], shape[1], shape[2], 3), dtype=np.float32)
+    for i in range(shape[0]):
+        px = lower[0] + i * spacing
+        for j in range(shape[1]):
+            py = lower[1] + j * spacing
+            for k in range(shape[2]):
+                pz = lower[2] + k * spacing
+                sdf, nx, ny, nz, index = _nearest_candidate(
+                    px,
+                    py,
+                    pz,
+                    starts,
+                    directions,
+                    lengths,
+                    radii,
+                    normals,
+                    cell_size,
+                    table_keys,
+                    table_cells,
+                    cell_offsets,
+                    cell_obstacles,
+                )
+                if index < 0 or sdf >= band:
+                    continue
+                distance[i, j, k] = sdf
+                normal[i, j, k, 0] = nx
+                normal[i, j, k, 1] = ny
+                normal[i, j, k, 2] = nz
+    return distance, normal
+
+
+@njit(cache=True)  # type: ignore
+def _sample_sdf(
+    px: float,
+    py: float,
+    pz: float,
+    lower: np.ndarray,
+    spacing: float,
+    band: float,
+    distance: np.ndarray,
+    normal: np.ndarray,
+) -> tuple[float, float, float, float]:
+    """Trilinear distance and normalized normal; ``band`` outside the grid."""
+    fx = (px - lower[0]) / spacing
+    fy = (py - lower[1]) / spacing
+    fz = (pz - lower[2]) / spacing
+    nx_nodes, ny_nodes, nz_nodes = distance.shape
+    if (
+        not (0.0 <= fx < nx_nodes - 1)
+        or not (0.0 <= fy < ny_nodes - 1)
+        or not (0.0 <= fz < nz_nodes - 1)
+    ):
+        return band, 0.0, 0.0, 0.0
+    i = int(fx)
+    j = int(fy)
+    k = int(fz)
+    tx = fx - i
+    ty = fy - j
+    tz = fz - k
+
+    sdf = 0.0
+    gx = 0.0
+    gy = 0.0
+    gz = 0.0
+    for di in range(2):
+        wx = tx if di else 1.0 - tx
+        for dj in range(2):
+            wy = ty if dj else 1.0 - ty
+            for dk in range(2):
+                w = wx * wy * (tz if dk else 1.0 - tz)
+                sdf += w * distance[i + di, j + dj, k + dk]
+                gx += w * normal[i + di, j + dj, k + dk, 0]
+                gy += w * normal[i + di, j + dj, k + dk, 1]
+                gz += w * normal[i + di, j + dj, k + dk, 2]
+    norm = np.sqrt(gx * gx + gy * gy + gz * gz)
+    if norm <= 1.0e-12:
+        return sdf, 0.0, 0.0, 0.0
+    return sdf, gx / norm, gy / norm, gz / norm
+
+
+@njit(cache=True)  # type: ignore
+def _max_sample_error(
+    points: np.ndarray,
+    lower: np.ndarray,
+    spacing: float,
+    band: float,
+    distance: np.ndarray,
+    normal: np.ndarray,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    cell_size: float,
+    table_keys: np.ndarray,
+    table_cells: np.ndarray,
+    cell_offsets: np.ndarray,
+    cell_obstacles: np.ndarray,
+) -> float:
+    max_error = 0.0
+    for p in range(points.shape[0]):
+        px = points[p, 0]
+        py = points[p, 1]
+        pz = points[p, 2]
+        sampled, _, _, _ = _sample_sdf(
+            px, py, pz, lower, spacing, band, distance, normal
+        )
+        exact, _, _, _, index = _nearest_candidate(
+            px,
+            py,
+            pz,
+            starts,
+            directions,
+            lengths,
+            radii,
+            normals,
+            cell_size,
+            table_keys,
+            table_cells,
+            cell_offsets,
+            cell_obstacles,
+        )
+        if index < 0 or exact > band:
+            exact = band
+        max_error = max(max_error, abs(sampled - exact))
+    return max_error
+
+
+@njit(cache=True)  # type: ignore
+def _apply_cylinder_contact_grid(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    external_forces: np.ndarray,
+    node_radii: np.ndarray,
+    stiffness: float,
+    damping: float,
+    lower: np.ndarray,
+    spacing: float,
+    band: float,
+    distance: np.ndarray,
+    normal: np.ndarray,
+) -> float:
+    """``_apply_cylinder_contact`` on the baked field; returns the tip penetration."""
+    n_nodes = positions.shape[1]
+    tip_penetration = 0.0
+    for i in range(n_nodes):
+        sdf, nx, ny, nz = _sample_sdf(
+            positions[0, i],
+            positions[1, i],
+            positions[2, i],
+            lower,
+            spacing,
+            band,
+            distance,
+            normal,
+        )
+        penetration = node_radii[i] - sdf
+        if penetration <= 0.0:
+            continue
+        if i == n_nodes - 1:
+            tip_penetration = penetration
+
+        vn = (
+            velocities[0, i] * nx
+            + velocities[1, i] * ny
+            + velocities[2, i] * nz
+        )
+        force_mag = (
+            stiffness * penetration * np.sqrt(penetration) - damping * vn
+        )
+        if force_mag <= 0.0:
+            continue
+
+        external_forces[0, i] += force_mag * nx
+        external_forces[1, i] += force_mag * ny
+        external_forces[2, i] += force_mag * nz
+    return tip_penetration
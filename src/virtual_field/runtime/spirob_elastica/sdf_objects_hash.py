@@ -0,0 +1,623 @@
+from __future__ import annotations
+
+import numpy as np
+
+if not hasattr(np, "typing"):
+    import numpy.typing as np_typing
+
+    np.typing = np_typing  # type: ignore[attr-defined]
+from elastica import NoForces
+from elastica.typing import RigidBodyType, RodType
+from numba import njit
+
+from virtual_field.runtime.spirob_elastica.sdf_objects import (
+    _node_radii_from_element_radii,
+    _obstacle_cylinder_sdf_and_normal_impl,
+)
+
+# Cell coordinates are packed into one int64 key, 21 bits per axis.
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+_KEY_MASK = (1 << _KEY_BITS) - 1
+_EMPTY_KEY = -1
+
+
+class CylinderSpatialHash:
+    """Uniform spatial hash of finite cylinders for SDF contact queries.
+
+    Every cylinder is binned once into the cubic cells of size ``cell_size``
+    that come within ``padding`` of it. A point then only needs the
+    cylinders of its own cell: every cylinder whose SDF at the point is at
+    most ``padding`` is among them. Cells live in an open-addressing hash
+    table, so space is unbounded and a lookup costs O(1) whatever the number
+    of obstacles.
+
+    Parameters
+    ----------
+    starts, directions : np.ndarray
+        (n_obstacles, 3) start points and unit axis directions.
+    lengths, radii : np.ndarray
+        (n_obstacles,) cylinder lengths and radii.
+    normals : np.ndarray
+        (n_obstacles, 3) fallback radial directions, see ``SDFObstacleCylinders``.
+    cell_size : float | None
+        Edge length of a hash cell. Defaults to twice the largest cylinder
+        radius plus ``padding``.
+    padding : float
+        Distance from the cylinder surfaces covered by the candidates,
+        usually the largest rod radius.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        directions: np.ndarray,
+        lengths: np.ndarray,
+        radii: np.ndarray,
+        normals: np.ndarray,
+        cell_size: float | None = None,
+        padding: float = 0.0,
+    ) -> None:
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.directions = np.asarray(directions, dtype=np.float64)
+        self.lengths = np.asarray(lengths, dtype=np.float64).reshape(-1)
+        self.radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+        self.normals = np.asarray(normals, dtype=np.float64)
+        self.padding = float(padding)
+        if self.padding < 0.0:
+            raise ValueError(f"padding must be non-negative. Got {padding=}")
+        if cell_size is None:
+            max_radius = float(np.max(self.radii)) if self.radii.size else 0.0
+            cell_size = 2.0 * (max_radius + self.padding)
+        self.cell_size = float(cell_size)
+        if self.cell_size <= 0.0:
+            raise ValueError(f"cell_size must be positive. Got {cell_size=}")
+
+        cell_keys, obstacles = _bin_cylinders(
+            self.starts,
+            self.directions,
+            self.lengths,
+            self.radii,
+            self.padding,
+            self.cell_size,
+        )
+        # Ascending obstacles within each cell keep the brute-force
+        # tie-breaking between equally distant obstacles.
+        order = np.lexsort((obstacles, cell_keys))
+        cell_keys = cell_keys[order]
+        self.cell_obstacles = obstacles[order]
+        keys, starts_in_pairs = np.unique(cell_keys, return_index=True)
+        self.cell_offsets = np.append(starts_in_pairs, cell_keys.size).astype(
+            np.int64
+        )
+        self.table_keys, self.table_cells = _build_table(keys)
+
+    @property
+    def n_cells(self) -> int:
+        return self.cell_offsets.size - 1
+
+    def query_candidates(self, point: np.ndarray) -> np.ndarray:
+        """Indices of the cylinders binned into the cell of ``point``."""
+        point = np.asarray(point, dtype=np.float64).reshape(3)
+        cell = _lookup_cell(
+            point[0],
+            point[1],
+            point[2],
+            self.cell_size,
+            self.table_keys,
+            self.table_cells,
+        )
+        if cell < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.cell_obstacles[
+            self.cell_offsets[cell] : self.cell_offsets[cell + 1]
+        ]
+
+
+def obstacle_cylinder_sdf_and_normal_hash(
+    point: np.ndarray,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    spatial_hash: CylinderSpatialHash,
+) -> tuple[float, np.ndarray, int]:
+    """``obstacle_cylinder_sdf_and_normal`` evaluating only hash candidates.
+
+    Falls back to all obstacles when no candidate is within the hash padding,
+    so the result always equals the brute-force query.
+    """
+    point_vec = np.asarray(point, dtype=np.float64).reshape(3)
+    lengths = np.asarray(lengths, dtype=np.float64).reshape(-1)
+    radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+    sdf, nx, ny, nz, index = _nearest_candidate(
+        point_vec[0],
+        point_vec[1],
+        point_vec[2],
+        starts,
+        directions,
+        lengths,
+        radii,
+        normals,
+        spatial_hash.cell_size,
+        spatial_hash.table_keys,
+        spatial_hash.table_cells,
+        spatial_hash.cell_offsets,
+        spatial_hash.cell_obstacles,
+    )
+    if index < 0 or sdf > spatial_hash.padding:
+        sdf, normal, index = _obstacle_cylinder_sdf_and_normal_impl(
+            point_vec, starts, directions, lengths, radii, normals
+        )
+        return float(sdf), normal, int(index)
+    return float(sdf), np.array([nx, ny, nz]), int(index)
+
+
+class SDFObstacleCylindersHash(NoForces):
+    """``SDFObstacleCylinders`` with a spatial hash broadphase.
+
+    Each rod node evaluates the SDF of the cylinders in its hash cell only,
+    instead of every obstacle, with identical forces and tip penetration.
+    The hash covers nodes up to ``query_padding`` from the cylinders; it is
+    rebuilt with a larger padding if a rod with a larger radius shows up.
+
+    Parameters
+    ----------
+    cell_size : float | None
+        Hash cell size, see ``CylinderSpatialHash``.
+    query_padding : float | None
+        Largest rod node radius covered by the hash. Defaults to the largest
+        cylinder radius.
+    spatial_hash : CylinderSpatialHash | None
+        Prebuilt hash of the same obstacles, e.g. shared between rods and
+        users. Its padding and cell size are used.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        directions: np.ndarray,
+        lengths: np.ndarray,
+        radii: np.ndarray,
+        normals: np.ndarray,
+        tip_penetration_state: dict[str, float] | None = None,
+        tip_penetration_key: str | None = None,
+        stiffness: float = 8.0e4,
+        damping: float = 4.0,
+        cell_size: float | None = None,
+        query_padding: float | None = None,
+        spatial_hash: CylinderSpatialHash | None = None,
+    ) -> None:
+        super().__init__()
+        self.starts = starts
+        self.directions = directions
+        self.lengths = lengths.reshape(-1)
+        self.radii = radii.reshape(-1)
+        self.normals = normals
+        self.tip_penetration_state = tip_penetration_state
+        self.tip_penetration_key = tip_penetration_key
+        self.stiffness = float(stiffness)
+        self.damping = float(damping)
+        if spatial_hash is None:
+            if query_padding is None:
+                query_padding = float(np.max(self.radii))
+            spatial_hash = CylinderSpatialHash(
+                starts,
+                directions,
+                self.lengths,
+                self.radii,
+                normals,
+                cell_size=cell_size,
+                padding=query_padding,
+            )
+        self.spatial_hash = spatial_hash
+
+    @property
+    def query_padding(self) -> float:
+        return self.spatial_hash.padding
+
+    def apply_forces(
+        self,
+        system: "RodType | RigidBodyType",
+        time: np.float64 = np.float64(0.0),
+    ) -> None:
+        positions = system.position_collection
+        velocities = system.velocity_collection
+        external_forces = system.external_forces
+        radii = system.radius
+
+        node_radii = _node_radii_from_element_radii(radii, positions.shape[1])
+        max_node_radius = float(np.max(node_radii))
+        if max_node_radius > self.spatial_hash.padding:
+            # A new hash rather than an update: the old one may be shared.
+            self.spatial_hash = CylinderSpatialHash(
+                self.starts,
+                self.directions,
+                self.lengths,
+                self.radii,
+                self.normals,
+                cell_size=max(
+                    self.spatial_hash.cell_size, 2.0 * max_node_radius
+                ),
+                padding=max_node_radius,
+            )
+        spatial_hash = self.spatial_hash
+        tip_penetration = _apply_cylinder_contact_hash(
+            positions,
+            velocities,
+            external_forces,
+            node_radii,
+            self.starts,
+            self.directions,
+            self.lengths,
+            self.radii,
+            self.normals,
+            self.stiffness,
+            self.damping,
+            spatial_hash.cell_size,
+            spatial_hash.table_keys,
+            spatial_hash.table_cells,
+            spatial_hash.cell_offsets,
+            spatial_hash.cell_obstacles,
+        )
+        if (
+            self.tip_penetration_state is not None
+            and self.tip_penetration_key is not None
+        ):
+            self.tip_penetration_state[self.tip_penetration_key] = float(
+                tip_penetration
+            )
+
+
+@njit(cache=True)  # type: ignore
+def _cell_key(i: int, j: int, k: int) -> int:
+    return (
+        ((i + _KEY_OFFSET) & _KEY_MASK) << (2 * _KEY_BITS)
+        | ((j + _KEY_OFFSET) & _KEY_MASK) << _KEY_BITS
+        | ((k + _KEY_OFFSET) & _KEY_MASK)
+    )
+
+
+@njit(cache=True)  # type: ignore
+def _table_slot(key: int, mask: int) -> int:
+    # 64-bit mix (splitmix64 finalizer), truncated to the table size.
+    h = np.uint64(key)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    h = h ^ (h >> np.uint64(31))
+    return np.int64(h & np.uint64(mask))
+
+
+@njit(cache=True)  # type: ignore
+def _segment_distance(
+    px: float,
+    py: float,
+    pz: float,
+    sx: float,
+    sy: float,
+    sz: float,
+    dx: float,
+    dy: float,
+    dz: float,
+    length: float,
+) -> float:
+    axial = (px - sx) * dx + (py - sy) * dy + (pz - sz) * dz
+    axial = min(max(axial, 0.0), length)
+    rx = px - (sx + axial * dx)
+    ry = py - (sy + axial * dy)
+    rz = pz - (sz + axial * dz)
+    return np.sqrt(rx * rx + ry * ry + rz * rz)
+
+
+@njit(cache=True)  # type: ignore
+def _bin_cylinders(
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    padding: float,
+    cell_size: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(cell key, obstacle) pairs of the cells within reach of each cylinder.
+
+    A point within ``padding`` of a cylinder is within ``radius + padding``
+    of its axis segment, so its cell center is within that plus half the
+    cell diagonal.
+    """
+    half_diagonal = 0.5 * np.sqrt(3.0) * cell_size
+    n_obstacles = starts.shape[0]
+    first = np.empty((n_obstacles, 3), dtype=np.int64)
+    last = np.empty((n_obstacles, 3), dtype=np.int64)
+    for j in range(n_obstacles):
+        reach = radii[j] + padding
+        for axis in range(3):
+            end = starts[j, axis] + directions[j, axis] * lengths[j]
+            lower = min(starts[j, axis], end) - reach
+            upper = max(starts[j, axis], end) + reach
+            first[j, axis] = int(np.floor(lower / cell_size))
+            last[j, axis] = int(np.floor(upper / cell_size))
+
+    # First pass counts the pairs, second pass fills them.
+    cell_keys = np.empty(0, dtype=np.int64)
+    obstacles = np.empty(0, dtype=np.int64)
+    for fill in range(2):
+        n_pairs = 0
+        for j in range(n_obstacles):
+            reach = radii[j] + padding + half_diagonal
+            for i in range(first[j, 0], last[j, 0] + 1):
+                for k in range(first[j, 1], last[j, 1] + 1):
+                    for m in range(first[j, 2], last[j, 2] + 1):
+                        distance = _segment_distance(
+                            (i + 0.5) * cell_size,
+                            (k + 0.5) * cell_size,
+                            (m + 0.5) * cell_size,
+                            starts[j, 0],
+                            starts[j, 1],
+                            starts[j, 2],
+                            directions[j, 0],
+                            directions[j, 1],
+                            directions[j, 2],
+                            lengths[j],
+                        )
+                        if distance > reach:
+                            continue
+                        if fill:
+                            cell_keys[n_pairs] = _cell_key(i, k, m)
+                            obstacles[n_pairs] = j
+                        n_pairs += 1
+        if not fill:
+            cell_keys = np.empty(n_pairs, dtype=np.int64)
+            obstacles = np.empty(n_pairs, dtype=np.int64)
+    return cell_keys, obstacles
+
+
+@njit(cache=True)  # type: ignore
+def _build_table(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Open-addressing table mapping each cell key to its index in ``keys``."""
+    size = 16
+    while size < 2 * keys.size:
+        size *= 2
+    mask = size - 1
+    table_keys = np.full(size, _EMPTY_KEY, dtype=np.int64)
+    table_cells = np.full(size, -1, dtype=np.int64)
+    for cell in range(keys.size):
+        slot = _table_slot(keys[cell], mask)
+        while table_keys[slot] != _EMPTY_KEY:
+            slot = (slot + 1) & mask
+        table_keys[slot] = keys[cell]
+        table_cells[slot] = cell
+    return table_keys, table_cells
+
+
+@njit(cache=True)  # type: ignore
+def _lookup_cell(
+    px: float,
+    py: float,
+    pz: float,
+    cell_size: float,
+    table_keys: np.ndarray,
+    table_cells: np.ndarray,
+) -> int:
+    key = _cell_key(
+        int(np.floor(px / cell_size)),
+        int(np.floor(py / cell_size)),
+        int(np.floor(pz / cell_size)),
+    )
+    mask = table_keys.size - 1
+    slot = _table_slot(key, mask)
+    while table_keys[slot] != _EMPTY_KEY:
+        if table_keys[slot] == key:
+            return table_cells[slot]
+        slot = (slot + 1) & mask
+    return -1
+
+
+@njit(cache=True)  # type: ignore
+def _cylinder_sdf_and_normal(
+    px: float,
+    py: float,
+    pz: float,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    j: int,
+) -> tuple[float, float, float, float]:
+    """SDF and outward normal of cylinder ``j``, as in ``_apply_cylinder_contact``."""
+    eps = 1.0e-12
+    sx = starts[j, 0]
+    sy = starts[j, 1]
+    sz = starts[j, 2]
+    dx = directions[j, 0]
+    dy = directions[j, 1]
+    dz = directions[j, 2]
+    length = lengths[j]
+    radius = radii[j]
+    fnx = normals[j, 0]
+    fny = normals[j, 1]
+    fnz = normals[j, 2]
+
+    rx = px - sx
+    ry = py - sy
+    rz = pz - sz
+
+    axial = rx * dx + ry * dy + rz * dz
+    radial_x = rx - axial * dx
+    radial_y = ry - axial * dy
+    radial_z = rz - axial * dz
+    radial_norm = np.sqrt(
+        radial_x * radial_x + radial_y * radial_y + radial_z * radial_z
+    )
+
+    if radial_norm > eps:
+        radial_dir_x = radial_x / radial_norm
+        radial_dir_y = radial_y / radial_norm
+        radial_dir_z = radial_z / radial_norm
+    else:
+        fallback_norm = np.sqrt(fnx * fnx + fny * fny + fnz * fnz)
+        if fallback_norm > eps:
+            radial_dir_x = fnx / fallback_norm
+            radial_dir_y = fny / fallback_norm
+            radial_dir_z = fnz / fallback_norm
+        else:
+            radial_dir_x = 1.0
+            radial_dir_y = 0.0
+            radial_dir_z = 0.0
+
+    if 0.0 <= axial <= length:
+        if radial_norm >= radius:
+            return (
+                radial_norm - radius,
+                radial_dir_x,
+                radial_dir_y,
+                radial_dir_z,
+            )
+        side_distance = radius - radial_norm
+        start_cap_distance = axial
+        end_cap_distance = length - axial
+        if (
+            side_distance <= start_cap_distance
+            and side_distance <= end_cap_distance
+        ):
+            return -side_distance, radial_dir_x, radial_dir_y, radial_dir_z
+        if start_cap_distance <= end_cap_distance:
+            return -start_cap_distance, -dx, -dy, -dz
+        return -end_cap_distance, dx, dy, dz
+
+    if axial < 0.0:
+        cap_center_x = sx
+        cap_center_y = sy
+        cap_center_z = sz
+        cap_normal_x = -dx
+        cap_normal_y = -dy
+        cap_normal_z = -dz
+        axial_out = -axial
+    else:
+        cap_center_x = sx + dx * length
+        cap_center_y = sy + dy * length
+        cap_center_z = sz + dz * length
+        cap_normal_x = dx
+        cap_normal_y = dy
+        cap_normal_z = dz
+        axial_out = axial - length
+
+    if radial_norm <= radius:
+        return axial_out, cap_normal_x, cap_normal_y, cap_normal_z
+
+    diff_x = px - (cap_center_x + radial_dir_x * radius)
+    diff_y = py - (cap_center_y + radial_dir_y * radius)
+    diff_z = pz - (cap_center_z + radial_dir_z * radius)
+    diff_norm = np.sqrt(diff_x * diff_x + diff_y * diff_y + diff_z * diff_z)
+    if diff_norm <= eps:
+        return 0.0, cap_normal_x, cap_normal_y, cap_normal_z
+    return (
+        diff_norm,
+        diff_x / diff_norm,
+        diff_y / diff_norm,
+        diff_z / diff_norm,
+    )
+
+
+@njit(cache=True)  # type: ignore
+def _nearest_candidate(
+    px: float,
+    py: float,
+    pz: float,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    cell_size: float,
+    table_keys: np.ndarray,
+    table_cells: np.ndarray,
+    cell_offsets: np.ndarray,
+    cell_obstacles: np.ndarray,
+) -> tuple[float, float, float, float, int]:
+    best_sdf = 1.0e30
+    best_nx = 1.0
+    best_ny = 0.0
+    best_nz = 0.0
+    best_index = -1
+    cell = _lookup_cell(px, py, pz, cell_size, table_keys, table_cells)
+    if cell < 0:
+        return best_sdf, best_nx, best_ny, best_nz, best_index
+    for candidate in range(cell_offsets[cell], cell_offsets[cell + 1]):
+        j = cell_obstacles[candidate]
+        sdf, nx, ny, nz = _cylinder_sdf_and_normal(
+            px, py, pz, starts, directions, lengths, radii, normals, j
+        )
+        if sdf < best_sdf:
+            best_sdf = sdf
+            best_nx = nx
+            best_ny = ny
+            best_nz = nz
+            best_index = j
+    return best_sdf, best_nx, best_ny, best_nz, best_index
+
+
+@njit(cache=True)  # type: ignore
+def _apply_cylinder_contact_hash(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    external_forces: np.ndarray,
+    node_radii: np.ndarray,
+    starts: np.ndarray,
+    directions: np.ndarray,
+    lengths: np.ndarray,
+    radii: np.ndarray,
+    normals: np.ndarray,
+    stiffness: float,
+    damping: float,
+    cell_size: float,
+    table_keys: np.ndarray,
+    table_cells: np.ndarray,
+    cell_offsets: np.ndarray,
+    cell_obstacles: np.ndarray,
+) -> float:
+    """Hash-accelerated ``_apply_cylinder_contact``; returns the tip penetration.
+
+    Node radii must not exceed the hash padding. Nodes without a candidate
+    within the padding cannot touch any obstacle and get no force.
+    """
+    n_nodes = positions.shape[1]
+    tip_penetration = 0.0
+    for i in range(n_nodes):
+        best_sdf, best_nx, best_ny, best_nz, _ = _nearest_candidate(
+            positions[0, i],
+            positions[1, i],
+            positions[2, i],
+            starts,
+            directions,
+            lengths,
+            radii,
+            normals,
+            cell_size,
+            table_keys,
+            table_cells,
+            cell_offsets,
+            cell_obstacles,
+        )
+        penetration = node_radii[i] - best_sdf
+        if penetration <= 0.0:
+            continue
+        if i == n_nodes - 1:
+            tip_penetration = penetration
+
+        vx = velocities[0, i]
+        vy = velocities[1, i]
+        vz = velocities[2, i]
+        vn = vx * best_nx + vy * best_ny + vz * best_nz
+
+        force_mag = (
+            stiffness * penetration * np.sqrt(penetration) - damping * vn
+        )
+        if force_mag <= 0.0:
+            continue
+
+        external_forces[0, i] += force_mag * best_nx
+        external_forces[1, i] += force_mag * best_ny
+        external_forces[2, i] += force_mag * best_nz
+    return tip_penetration
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from collections import deque
 from dataclasses import dataclass, field
 
@@ -194,6 +196,27 @@ class SpirobsSimulation(DualArmSimulationBase):
 
         self.simulator.finalize()
 
+    def reset_mode_state(self) -> None:
+        # The SDF forcings hold these containers; reset them in place.
+        for queue in self._recording_queues.values():
+            queue.clear()
+        for arm_id in self._tip_penetration_by_arm:
+            self._tip_penetration_by_arm[arm_id] = 0.0
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        return {
+            "recorded_contacts": [
+                [[time, point] for time, point in self._recording_queues[a]]
+                for a in self.arm_ids
+            ]
+        }
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        for arm_id, contacts in zip(self.arm_ids, state["recorded_contacts"]):
+            queue = self._recording_queues[arm_id]
+            queue.clear()
+            queue.extend((time, point) for time, point in contacts)
+
     def contact_points_for_arm(self, arm_id: str) -> list[list[float]]:
         queue = self._recording_queues.get(arm_id)
         contact_points: list[list[float]] = []
@@ -4,15 +4,19 @@ from typing import Any
 
 from dataclasses import dataclass, field
 from importlib.resources import files
+from types import SimpleNamespace
 
 import numpy as np
 
 from virtual_field.core.commands import ArmCommand
 from virtual_field.core.state import MeshEntity, SphereEntity
 from virtual_field.runtime.mesh_assets import (
-    build_pyvista_polydata_gltf_data_uri,
+    build_pyvista_polydata_glb,
+    glb_data_uri,
 )
+from virtual_field.runtime.mesh_cache import MeshCache
 from virtual_field.runtime.mode_base import DualArmSimulationBase
+from virtual_field.runtime.shared_assets import freeze_arrays
 
 from .custom_elastica.contacts import TipSuctionToSphere
 from .custom_elastica.dissipation import RayleighDamping
@@ -21,6 +25,159 @@ MAZE_PATH = files("virtual_field").joinpath(
     "externals", "mesh", "pipe_maze_simple_with_marker.stl"
 )
 # MAZE_PATH = files("virtual_field").joinpath("externals", "mesh", "pipe_maze_complex_with_marker.stl")
+PIPE_MAZE_COLOR_RGBA = (0.42, 0.48, 0.55, 0.55)
+PIPE_MAZE_TARGET_REDUCTION = 0.9  # reduce number of faces by this ratio
+
+
+@dataclass(slots=True)
+class PipeMaze:
+    """Preprocessed pipe maze: contact surface and grid, GLB render asset and
+    the centers of the loose maze components, where spheres are placed."""
+
+    surface: Any
+    grid: Any
+    glb: bytes
+    sphere_centers: np.ndarray
+
+
+def load_pipe_maze(
+    center: tuple[float, float, float],
+    rod_radius: float,
+    rod_rest_length: float,
+    cache: MeshCache | None = None,
+) -> PipeMaze:
+    """Build the pipe maze around ``center``, or reload it from ``cache``.
+
+    The contact grid cell size follows the largest rod element, given by
+    ``rod_radius`` and ``rod_rest_length``, so they are part of the cache key.
+    All arrays of the returned maze are read-only, so it can be shared.
+    """
+    from .custom_elastica.mesh import Grid, MeshSurface
+
+    key = None
+    if cache is not None:
+        key = cache.key(
+            "two-gcr-pipe-maze",
+            [MAZE_PATH],
+            center=list(center),
+            target_reduction=PIPE_MAZE_TARGET_REDUCTION,
+            color_rgba=PIPE_MAZE_COLOR_RGBA,
+            rod_radius=rod_radius,
+            rod_rest_length=rod_rest_length,
+        )
+        groups = cache.load(key)
+        if groups is not None:
+            return PipeMaze(
+                surface=MeshSurface.from_arrays(groups["surface"]),
+                grid=Grid.from_arrays(groups["grid"]),
+                glb=groups["maze"]["glb"].tobytes(),
+                sphere_centers=freeze_arrays(
+                    np.array(groups["maze"]["sphere_centers"])
+                ),
+            )
+
+    maze = _build_pipe_maze(
+        np.asarray(center, dtype=np.float64), rod_radius, rod_rest_length
+    )
+    if cache is not None:
+        cache.store(
+            key,
+            {
+                "surface": maze.surface.to_arrays(),
+                "grid": maze.grid.to_arrays(),
+                "maze": {
+                    "glb": np.frombuffer(maze.glb, dtype=np.uint8),
+                    "sphere_centers": maze.sphere_centers,
+                },
+            },
+        )
+    freeze_arrays(maze.surface)
+    freeze_arrays(maze.grid)
+    freeze_arrays(maze.sphere_centers)
+    return maze
+
+
+def _build_pipe_maze(
+    center: np.ndarray, rod_radius: float, rod_rest_length: float
+) -> PipeMaze:
+    import pyvista as pv
+
+    from .custom_elastica.mesh import Grid, MeshSurface
+
+    maze_mesh = pv.read(MAZE_PATH)
+
+    maze_mesh.scale(1.03e-2 * np.array([1.0, 1.0, 1.0]), inplace=True)
+    maze_mesh.rotate_x(-90, inplace=True)
+
+    maze_mesh.translate(
+        -np.array(maze_mesh.center), inplace=True
+    )  # center the mesh at origin
+
+    # move so that max mesh value is a z=0
+    maze_mesh.translate(np.array([0, 0, maze_mesh.bounds[4]]), inplace=True)
+
+    # find vertex indices for the enterance holes
+    hole_vertex_idx = maze_mesh.points[:, 2] > -0.01 * (
+        maze_mesh.bounds[5] - maze_mesh.bounds[4]
+    )  # mesh vertices between z=0 and z=-0.01*total_z_extent
+    hole_vertices_center_x = 0.5 * (
+        max(maze_mesh.points[hole_vertex_idx, 0])
+        + min(maze_mesh.points[hole_vertex_idx, 0])
+    )
+    hole_vertices_center_y = 0.5 * (
+        max(maze_mesh.points[hole_vertex_idx, 1])
+        + min(maze_mesh.points[hole_vertex_idx, 1])
+    )
+
+    # move mesh so that origin is between hole centers
+    maze_mesh.translate(
+        np.array([-hole_vertices_center_x, -hole_vertices_center_y, 0]),
+        inplace=True,
+    )
+
+    # finally move origin to center of two bases so arms are inside hole centers
+    maze_mesh.translate(center, inplace=True)
+
+    # Label connected components
+    conn = maze_mesh.connectivity()
+
+    # Extract number of regions
+    region_ids = conn["RegionId"]
+    n_regions = region_ids.max() + 1
+
+    components = []
+    component_volumes = []
+    for i in range(n_regions):
+        comp = conn.threshold([i, i], scalars="RegionId").extract_surface(
+            algorithm="dataset_surface"
+        )
+        component_volumes.append(comp.volume)
+        components.append(comp)
+
+    pipe_mesh = components.pop(np.argmax(component_volumes)).decimate(
+        PIPE_MAZE_TARGET_REDUCTION
+    )  # largest volume will be the pipe
+    surface = MeshSurface(pipe_mesh)
+    return PipeMaze(
+        surface=surface,
+        grid=Grid(
+            SimpleNamespace(
+                radius=np.array([rod_radius]),
+                rest_lengths=np.array([rod_rest_length]),
+            ),
+            surface,
+            grid_dimension=3,
+            exit_boundary_condition=False,
+        ),
+        glb=build_pyvista_polydata_glb(
+            pipe_mesh,
+            color_rgba=PIPE_MAZE_COLOR_RGBA,
+            quantize=True,
+        ),
+        sphere_centers=np.array(
+            [comp.center for comp in components], dtype=np.float64
+        ).reshape(-1, 3),
+    )
 
 
 @dataclass(slots=True)
@@ -33,7 +190,6 @@ class TwoGCRSimulation(DualArmSimulationBase):
     _secondary_pressed: dict[str, bool] = field(init=False, default_factory=dict)
     _grip_wave_event: dict[str, int] = field(init=False, default_factory=dict)
     _joystick_command: dict[str, np.ndarray] = field(init=False, default_factory=dict)
-    _pipe_maze_asset_uri: str | None = field(init=False, default=None)
 
     def _initialize_control_state(self) -> None:
         self._primary_pressed = {}
@@ -49,6 +205,18 @@ class TwoGCRSimulation(DualArmSimulationBase):
     def post_mode_setup(self) -> None:
         self._initialize_control_state()
 
+    def reset_mode_state(self) -> None:
+        self._initialize_control_state()
+        for arm_id in self.arm_ids:
+            self._set_sucker_active(arm_id, False)
+
+    def checkpoint_mode_state(self) -> dict[str, Any]:
+        return {"sucker_active": [self._sucker_active[a] for a in self.arm_ids]}
+
+    def restore_mode_state(self, state: dict[str, Any]) -> None:
+        for arm_id, active in zip(self.arm_ids, state["sucker_active"]):
+            self._set_sucker_active(arm_id, active)
+
     def handle_commands(
         self,
         arm_id: str,
@@ -93,7 +261,6 @@ class TwoGCRSimulation(DualArmSimulationBase):
 
     def build_simulation(self) -> None:
         import elastica as ea
-        import pyvista as pv
         from elastica.memory_block.memory_block_rod import (
             MemoryBlockCosseratRod,
         )
@@ -106,8 +273,6 @@ class TwoGCRSimulation(DualArmSimulationBase):
             _TravelingContractingWave,
         )
         from .custom_elastica.mesh import (
-            Grid,
-            MeshSurface,
             RodMeshSurfaceContactGridMethod,
             SphereMeshSurfaceContact,
         )
@@ -167,74 +332,32 @@ class TwoGCRSimulation(DualArmSimulationBase):
         self.simulator.append(self.left_rod)
         self.simulator.append(self.right_rod)
 
-        # setup mesh
-        maze_mesh = pv.read(MAZE_PATH)
-
-        maze_mesh.scale(1.03e-2 * np.array([1.0, 1.0, 1.0]), inplace=True)
-        maze_mesh.rotate_x(-90, inplace=True)
-
-        maze_mesh.translate(
-            -np.array(maze_mesh.center), inplace=True
-        )  # center the mesh at origin
-
-        # move so that max mesh value is a z=0
-        maze_mesh.translate(np.array([0, 0, maze_mesh.bounds[4]]), inplace=True)
-
-        # find vertex indices for the enterance holes
-        hole_vertex_idx = maze_mesh.points[:, 2] > -0.01 * (
-            maze_mesh.bounds[5] - maze_mesh.bounds[4]
-        )  # mesh vertices between z=0 and z=-0.01*total_z_extent
-        hole_vertices_center_x = 0.5 * (
-            max(maze_mesh.points[hole_vertex_idx, 0])
-            + min(maze_mesh.points[hole_vertex_idx, 0])
+        # setup mesh: users with the same maze placement and rods share one
+        # surface and contact grid, sized for the larger of the two rods.
+        pipe_maze_key = (
+            "two-gcr-pipe-maze",
+            tuple((0.50 * (right_rod_base + left_rod_base)).tolist()),
+            max(float(np.max(rod.radius)) for rod in self.rods.values()),
+            max(float(np.max(rod.rest_lengths)) for rod in self.rods.values()),
         )
-        hole_vertices_center_y = 0.5 * (
-            max(maze_mesh.points[hole_vertex_idx, 1])
-            + min(maze_mesh.points[hole_vertex_idx, 1])
+        pipe_maze = self.acquire_shared_asset(
+            pipe_maze_key,
+            lambda: load_pipe_maze(*pipe_maze_key[1:], MeshCache.from_env()),
         )
-
-        # move mesh so that origin is between hole centers
-        maze_mesh.translate(
-            np.array([-hole_vertices_center_x, -hole_vertices_center_y, 0]),
-            inplace=True,
-        )
-
-        # finally move origin to center of two bases so arms are inside hole centers
-        maze_mesh.translate(0.50 * (right_rod_base + left_rod_base), inplace=True)
-
-        # Label connected components
-        conn = maze_mesh.connectivity()
-
-        # Extract number of regions
-        region_ids = conn["RegionId"]
-        n_regions = region_ids.max() + 1
-
-        components = []
-        component_volumes = []
-        for i in range(n_regions):
-            comp = conn.threshold([i, i], scalars="RegionId").extract_surface(
-                algorithm="dataset_surface"
+        self.register_static_mesh(
+            MeshEntity(
+                mesh_id=f"{self.user_id}_two_gcr_pipe_maze",
+                owner_id=self.user_id,
+                asset_uri=self.acquire_shared_asset(
+                    (*pipe_maze_key, "asset"),
+                    lambda: glb_data_uri(pipe_maze.glb),
+                ),
+                static_asset=True,
             )
-            component_volumes.append(comp.volume)
-            components.append(comp)
-
-        target_reduction = 0.9  # reduce number of faces by this ratio
-        pipe_mesh = components.pop(np.argmax(component_volumes)).decimate(
-            target_reduction
-        )  # largest volume will be the pipe
-        self._pipe_maze_asset_uri = build_pyvista_polydata_gltf_data_uri(
-            pipe_mesh,
-            color_rgba=(0.42, 0.48, 0.55, 0.55),
         )
-        pipe_surface = MeshSurface(pipe_mesh)
+        pipe_surface = pipe_maze.surface
         self.simulator.append(pipe_surface)
-
-        grid = Grid(
-            self.left_rod,
-            pipe_surface,
-            grid_dimension=3,
-            exit_boundary_condition=False,
-        )
+        grid = pipe_maze.grid
 
         self.simulator.detect_contact_between(self.left_rod, pipe_surface).using(
             RodMeshSurfaceContactGridMethod,
@@ -257,8 +380,8 @@ class TwoGCRSimulation(DualArmSimulationBase):
         self.spheres = []
         sphere_radius = 0.025
         sphere_density = 200.0
-        for comp in components:
-            sphere = ea.Sphere(np.array(comp.center), sphere_radius, sphere_density)
+        for center in pipe_maze.sphere_centers:
+            sphere = ea.Sphere(np.array(center), sphere_radius, sphere_density)
             self.spheres.append(sphere)
             self.simulator.append(sphere)
             self.simulator.detect_contact_between(self.left_rod, sphere).using(
@@ -401,18 +524,6 @@ class TwoGCRSimulation(DualArmSimulationBase):
 
         self.simulator.finalize()
 
-    def mesh_entities(self) -> list[MeshEntity]:
-        if self._pipe_maze_asset_uri is None:
-            return []
-        return [
-            MeshEntity(
-                mesh_id=f"{self.user_id}_two_gcr_pipe_maze",
-                owner_id=self.user_id,
-                asset_uri=self._pipe_maze_asset_uri,
-                static_asset=True,
-            )
-        ]
-
     def sphere_entities(self) -> list[SphereEntity]:
         spheres: list[SphereEntity] = []
         for idx, sphere in enumerate(self.spheres):
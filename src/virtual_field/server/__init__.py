@@ -1,6 +1,9 @@
 from .app import VRWebSocketServer, configure_logging, run_server
 from .backends import MultiArmPassThroughBackend
+from .scheduling import FixedRateScheduler, TickStats
 from .schema import make_message, validate_message
+from .sharding import ShardedProcessBackend
+from .stepping import SimulationStepWorker
 from .teleop import TeleopService
 
 __all__ = [
@@ -8,7 +11,11 @@ __all__ = [
     "configure_logging",
     "run_server",
     "MultiArmPassThroughBackend",
+    "ShardedProcessBackend",
+    "FixedRateScheduler",
+    "TickStats",
     "make_message",
     "validate_message",
+    "SimulationStepWorker",
     "TeleopService",
 ]
@@ -7,9 +7,12 @@ import base64
 import json
 import ssl
 import sys
+import threading
 import time
 from dataclasses import dataclass, field
+from functools import partial
 from itertools import count
+from pathlib import Path
 
 import click
 from loguru import logger
@@ -25,9 +28,29 @@ from virtual_field.core.mapping import SessionArmControlMapper
 from virtual_field.core.state import MeshEntity, OverlayPointsEntity, SceneState
 from virtual_field.runtime.mode_registry import SUPPORTED_CHARACTER_MODES
 
-from .backends import MultiArmPassThroughBackend
-from .schema import make_message, validate_message
+from .assets import MeshAssetStore
+from .backends import MultiArmPassThroughBackend, build_default_simulation
+from .checkpoints import CheckpointStore
+from .outbound import ClientSendQueue, Frame
+from .scene_delta import (
+    SceneEntities,
+    SceneStateDeltaEncoder,
+    scene_state_entities,
+)
+from .scene_encoding import SceneStateFrameEncoder
+from .scheduling import OVERRUN_POLICIES, FixedRateScheduler
+from .schema import (
+    BINARY_SCENE_STATE_CAPABILITY,
+    BINARY_SCENE_STATE_VERSION,
+    DELTA_SCENE_STATE_CAPABILITY,
+    PROTOCOL_VERSION,
+    make_message,
+    validate_message,
+)
+from .sharding import ShardedProcessBackend
+from .stepping import STEPPING_MODES, SimulationStepWorker
 from .teleop import TeleopService
+from .template_pool import SimulationTemplatePool
 
 
 @dataclass(slots=True)
@@ -42,6 +65,8 @@ class ClientSession:
     last_command: MultiArmCommand | None = None
     last_command_ts: float = 0.0
     sent_static_mesh_asset_ids: set[str] = field(default_factory=set)
+    scene_state_encoding: str = "json"
+    scene_delta: SceneStateDeltaEncoder | None = None
 
 
 class VRWebSocketServer:
@@ -53,6 +78,51 @@ class VRWebSocketServer:
     ``sim_hz`` and scene snapshots to subscribers at ``publish_hz``. Roles:
     ``vr_client`` (XR input → teleop → backend), ``publisher`` (meshes/overlays),
     and ``spectator`` (receive-only).
+
+    With ``stepping="thread"`` the backend is stepped by a
+    :class:`~virtual_field.server.stepping.SimulationStepWorker` thread: the
+    simulation loop only hands the latest command over, and the publish loop
+    sends the worker's latest snapshot, so heavy modes no longer stall message
+    handling. ``stepping="inline"`` steps on the event loop and stores a
+    snapshot after each tick. Either way the publish loop only reads snapshots
+    and never advances the backend. Clients that
+    negotiate delta frames get ``scene_state_delta`` messages keyed on their
+    acknowledged baseline, with a keyframe at least every
+    ``delta_keyframe_interval`` frames. A positive
+    ``process_shards`` swaps in a
+    :class:`~virtual_field.server.sharding.ShardedProcessBackend` that spreads
+    users over that many worker processes.
+
+    Every connection sends through its own
+    :class:`~virtual_field.server.outbound.ClientSendQueue`, so a slow client
+    only drops its own superseded ``scene_state`` frames (see
+    :meth:`client_send_stats`) and never delays the others.
+
+    With ``serve_assets`` inline mesh assets are moved into a
+    :class:`~virtual_field.server.assets.MeshAssetStore` and served from
+    ``/assets/<sha256>`` on the websocket port; meshes reference that path
+    in ``asset_uri``, which clients must resolve against the server's HTTP
+    origin. By default meshes keep self-contained ``data:`` URIs.
+
+    ``template_pool_sizes`` keeps that many pre-built simulations per
+    character mode in a
+    :class:`~virtual_field.server.template_pool.SimulationTemplatePool`
+    (one per shard process when sharded), so joining or resetting does not
+    stall the other users while a simulation is built.
+
+    With ``checkpoint_dir`` the simulation of every VR client that sent its
+    own ``user_id`` in ``hello`` is checkpointed there each
+    ``checkpoint_interval`` simulated seconds by a
+    :class:`~virtual_field.server.checkpoints.CheckpointStore`, and a client
+    reconnecting with the same user id and mode resumes from it, also after
+    a server restart. Server-generated ids are never checkpointed.
+
+    Both loops (and the step worker) keep a fixed rate by sleeping until
+    absolute deadlines of a
+    :class:`~virtual_field.server.scheduling.FixedRateScheduler`. Missed
+    simulation ticks are handled according to ``overrun_policy``; achieved
+    rate, overruns and lag are logged every ``stats_interval`` seconds and
+    available from :meth:`loop_stats`.
     """
 
     def __init__(
@@ -63,16 +133,87 @@ class VRWebSocketServer:
         port: int = 8765,
         sim_hz: float = 200.0,
         publish_hz: float = 72.0,
+        stepping: str = "inline",
+        process_shards: int = 0,
+        delta_keyframe_interval: int = 72,
+        delta_tolerance: float = 1.0e-4,
+        overrun_policy: str = "catch_up",
+        stats_interval: float = 10.0,
+        serve_assets: bool = False,
+        template_pool_sizes: dict[str, int] | None = None,
+        checkpoint_dir: str | None = None,
+        checkpoint_interval: float = 5.0,
     ) -> None:
+        if stepping not in STEPPING_MODES:
+            raise ValueError(
+                f"Unsupported stepping mode: {stepping}. "
+                f"Expected one of {STEPPING_MODES}"
+            )
         self.host = host
         self.port = port
         self.sim_hz = sim_hz
         self.publish_hz = publish_hz
         self.ssl_context = ssl_context
+        self.stepping = stepping
+        self.delta_keyframe_interval = delta_keyframe_interval
+        self.delta_tolerance = delta_tolerance
+        self.stats_interval = stats_interval
+        # Both loops sleep until absolute deadlines. Missed simulation ticks
+        # follow ``overrun_policy``; missed publish ticks are always skipped
+        # since only the latest snapshot is worth sending.
+        self._sim_scheduler = FixedRateScheduler(
+            period=1.0 / self.sim_hz, policy=overrun_policy
+        )
+        self._publish_scheduler = FixedRateScheduler(
+            period=1.0 / self.publish_hz, policy="skip"
+        )
 
-        self.backend = MultiArmPassThroughBackend()
+        self.assets: MeshAssetStore | None = (
+            MeshAssetStore() if serve_assets else None
+        )
+        template_pool_sizes = dict(template_pool_sizes or {})
+        if process_shards > 0:
+            self.backend: MultiArmPassThroughBackend = ShardedProcessBackend(
+                process_count=process_shards,
+                asset_store=self.assets,
+                template_pool_sizes=template_pool_sizes,
+                checkpoint_dir=checkpoint_dir,
+                checkpoint_interval=checkpoint_interval,
+            )
+        else:
+            template_pool = None
+            if any(template_pool_sizes.values()):
+                template_pool = SimulationTemplatePool(
+                    build=build_default_simulation,
+                    pool_sizes=template_pool_sizes,
+                )
+                template_pool.start()
+            checkpoint_store = None
+            if checkpoint_dir is not None:
+                checkpoint_store = CheckpointStore(
+                    Path(checkpoint_dir), interval=checkpoint_interval
+                )
+                checkpoint_store.start()
+            self.backend = MultiArmPassThroughBackend(
+                asset_store=self.assets,
+                template_pool=template_pool,
+                checkpoint_store=checkpoint_store,
+            )
+        # Guards backend mutations against the stepping thread. Uncontended
+        # (and therefore cheap) when stepping inline.
+        self._backend_lock = threading.RLock()
+        self._step_worker: SimulationStepWorker | None = None
+        self._latest_snapshot: SceneState | None = None
+        if stepping == "thread":
+            self._step_worker = SimulationStepWorker(
+                backend=self.backend,
+                dt=1.0 / self.sim_hz,
+                lock=self._backend_lock,
+                overrun_policy=overrun_policy,
+            )
 
         self._clients: set[WebSocketServerProtocol] = set()
+        self._send_queues: dict[WebSocketServerProtocol, ClientSendQueue] = {}
         self._sessions: dict[WebSocketServerProtocol, ClientSession] = {}
         self._client_user_map: dict[WebSocketServerProtocol, str] = {}
         self._heartbeat_timeout = 5.0
@@ -82,11 +223,12 @@ class VRWebSocketServer:
         self._user_counter = count(1)
         self._publisher_counter = count(1)
         logger.debug(
-            "Initialized VRWebSocketServer host={} port={} sim_hz={} publish_hz={}",
+            "Initialized VRWebSocketServer host={} port={} sim_hz={} publish_hz={} stepping={}",
             self.host,
             self.port,
             self.sim_hz,
             self.publish_hz,
+            self.stepping,
         )
 
     async def start(self) -> None:
@@ -103,9 +245,14 @@ class VRWebSocketServer:
             self.port,
             ssl=self.ssl_context,
             max_size=None,
+            process_request=(
+                self.assets.process_request if self.assets is not None else None
+            ),
         )
         # Correct port number if changed by server
         self.port = self._server.sockets[0].getsockname()[1]
+        if self._step_worker is not None:
+            self._step_worker.start()
         self._publish_task = asyncio.create_task(self._publish_loop())
         self._simulate_task = asyncio.create_task(self._simulation_loop())
         self._publish_task.add_done_callback(
@@ -131,6 +278,10 @@ class VRWebSocketServer:
             self._publish_task.cancel()
         if self._simulate_task is not None:
             self._simulate_task.cancel()
+        if self._step_worker is not None:
+            await asyncio.to_thread(self._step_worker.stop)
+        with self._backend_lock:
+            self.backend.close()
         if self._server is not None:
             self._server.close()
             await self._server.wait_closed()
@@ -141,14 +292,24 @@ class VRWebSocketServer:
 
     async def _handle_client(self, websocket: WebSocketServerProtocol) -> None:
         self._clients.add(websocket)
+        send_queue = ClientSendQueue(websocket)
+        self._send_queues[websocket] = send_queue
+        send_queue.start()
         logger.debug("Client connected. active_clients={}", len(self._clients))
         try:
             async for message in websocket:
                 responses = await self._handle_raw_message(websocket, message)
                 for response in responses:
-                    await websocket.send(json.dumps(response))
+                    send_queue.send_control(json.dumps(response))
         finally:
             self._clients.discard(websocket)
+            self._send_queues.pop(websocket, None)
+            await send_queue.close()
+            if send_queue.dropped_frames:
+                logger.debug(
+                    "Client dropped scene_state frames count={}",
+                    send_queue.dropped_frames,
+                )
             session = self._sessions.pop(websocket, None)
             if session is not None:
                 logger.debug(
@@ -156,10 +317,11 @@ class VRWebSocketServer:
                     session.user_id,
                     session.role,
                 )
-                if session.role == "vr_client":
-                    self.backend.remove_user(session.user_id)
-                self.backend.remove_owner_meshes(session.user_id)
-                self.backend.remove_owner_overlay_points(session.user_id)
+                with self._backend_lock:
+                    if session.role == "vr_client":
+                        self.backend.remove_user(session.user_id)
+                    self.backend.remove_owner_meshes(session.user_id)
+                    self.backend.remove_owner_overlay_points(session.user_id)
             self._client_user_map.pop(websocket, None)
             logger.debug(
                 "Client disconnected. active_clients={}", len(self._clients)
@@ -184,15 +346,23 @@ class VRWebSocketServer:
                     make_message("error", {"reason": "hello required first"})
                 ]
 
+            if message_type == "scene_state_ack":
+                if session.scene_delta is not None:
+                    session.scene_delta.acknowledge(
+                        int(body.get("frame_id", -1))
+                    )
+                return []
+
             if session.role == "publisher":
                 logger.debug(
                     "Routing publisher message type={} owner_id={}",
                     message_type,
                     session.user_id,
                 )
-                return self._handle_publisher_message(
-                    session, message_type, body
-                )
+                with self._backend_lock:
+                    return self._handle_publisher_message(
+                        session, message_type, body
+                    )
 
             if session.role == "spectator":
                 if message_type == "heartbeat":
@@ -213,12 +383,8 @@ class VRWebSocketServer:
 
             if message_type == "reset":
                 logger.debug("Reset requested for user_id={}", session.user_id)
-                self.backend.remove_user(session.user_id)
-                session.arm_ids = self.backend.register_user(
-                    session.user_id,
-                    character_mode=session.character_mode,
-                    requested_arm_count=session.requested_arm_count,
-                )
+                with self._backend_lock:
+                    session.arm_ids = self.backend.reset_user(session.user_id)
                 session.teleop = TeleopService(
                     SessionArmControlMapper(
                         controlled_arm_ids=(
@@ -274,6 +440,7 @@ class VRWebSocketServer:
     ) -> list[dict[str, Any]]:
         role = str(body.get("role", "vr_client"))
         logger.debug("Processing hello role={}", role)
+        encoding = self._negotiate_scene_state_encoding(body)
         if role == "publisher":
             requested_owner_id = str(body.get("owner_id", "")).strip()
             owner_id = (
@@ -289,16 +456,19 @@ class VRWebSocketServer:
                 teleop=None,
                 role="publisher",
                 last_command_ts=time.monotonic(),
+                scene_state_encoding=encoding,
+                scene_delta=self._new_scene_delta(encoding),
             )
             logger.debug("Publisher registered owner_id={}", owner_id)
             return [
                 make_message(
                     "hello_ack",
                     {
-                        "protocol": 1,
+                        "protocol": PROTOCOL_VERSION,
                         "server_time": time.time(),
                         "role": "publisher",
                         "owner_id": owner_id,
+                        **self._encoding_ack(encoding),
                     },
                 )
             ]
@@ -313,18 +483,21 @@ class VRWebSocketServer:
                 teleop=None,
                 role="spectator",
                 last_command_ts=time.monotonic(),
+                scene_state_encoding=encoding,
+                scene_delta=self._new_scene_delta(encoding),
             )
             logger.debug("Spectator registered user_id={}", spectator_id)
             return [
                 make_message(
                     "hello_ack",
                     {
-                        "protocol": 1,
+                        "protocol": PROTOCOL_VERSION,
                         "server_time": time.time(),
                         "role": "spectator",
                         "user_id": spectator_id,
                         "arm_ids": [],
                         "controlled_arm_ids": [],
+                        **self._encoding_ack(encoding),
                     },
                 ),
                 make_message(
@@ -368,11 +541,15 @@ class VRWebSocketServer:
             user_id = f"user_{next(self._user_counter)}"
 
         self._client_user_map[websocket] = user_id
-        arm_ids = self.backend.register_user(
-            user_id,
-            character_mode=character_mode,
-            requested_arm_count=requested_arm_count,
-        )
+        with self._backend_lock:
+            arm_ids = self.backend.register_user(
+                user_id,
+                character_mode=character_mode,
+                requested_arm_count=requested_arm_count,
+                # Generated ids restart with the server and would resume
+                # another person's checkpoint.
+                checkpointed=bool(requested_user_id),
+            )
         logger.debug(
             "VR client registered user_id={} arm_count={} mode={}",
             user_id,
@@ -397,19 +574,22 @@ class VRWebSocketServer:
             character_mode=character_mode,
             requested_arm_count=requested_arm_count,
             last_command_ts=time.monotonic(),
+            scene_state_encoding=encoding,
+            scene_delta=self._new_scene_delta(encoding),
         )
 
         responses = [
             make_message(
                 "hello_ack",
                 {
-                    "protocol": 1,
+                    "protocol": PROTOCOL_VERSION,
                     "server_time": time.time(),
                     "role": "vr_client",
                     "character_mode": character_mode,
                     "user_id": user_id,
                     "arm_ids": arm_ids,
                     "controlled_arm_ids": list(controlled_arm_ids),
+                    **self._encoding_ack(encoding),
                 },
             )
         ]
@@ -442,6 +622,33 @@ class VRWebSocketServer:
         )
         return responses
 
+    @staticmethod
+    def _negotiate_scene_state_encoding(body: dict[str, Any]) -> str:
+        capabilities = body.get("capabilities", [])
+        if not isinstance(capabilities, list):
+            return "json"
+        if DELTA_SCENE_STATE_CAPABILITY in capabilities:
+            return "delta"
+        if BINARY_SCENE_STATE_CAPABILITY in capabilities:
+            return "binary"
+        return "json"
+
+    def _encoding_ack(self, encoding: str) -> dict[str, Any]:
+        ack: dict[str, Any] = {"scene_state_encoding": encoding}
+        if encoding == "binary":
+            ack["binary_scene_state_version"] = BINARY_SCENE_STATE_VERSION
+        elif encoding == "delta":
+            ack["delta_keyframe_interval"] = self.delta_keyframe_interval
+        return ack
+
+    def _new_scene_delta(self, encoding: str) -> SceneStateDeltaEncoder | None:
+        if encoding != "delta":
+            return None
+        return SceneStateDeltaEncoder(
+            keyframe_interval=self.delta_keyframe_interval,
+            tolerance=self.delta_tolerance,
+        )
+
     def _handle_publisher_message(
         self, session: ClientSession, message_type: str, body: dict[str, Any]
     ) -> list[dict[str, Any]]:
@@ -463,8 +670,13 @@ class VRWebSocketServer:
                 ]
 
             mime_type = str(body.get("mime_type", "model/gltf-binary"))
-            base64.b64decode(mesh_data_b64, validate=True)
-            asset_uri = f"data:{mime_type};base64,{mesh_data_b64}"
+            mesh_data = base64.b64decode(mesh_data_b64, validate=True)
+            if self.assets is not None:
+                asset_uri = self.assets.url_for(
+                    self.assets.put(mesh_data, mime_type)
+                )
+            else:
+                asset_uri = f"data:{mime_type};base64,{mesh_data_b64}"
 
             mesh = MeshEntity(
                 mesh_id=mesh_id,
@@ -657,6 +869,7 @@ class VRWebSocketServer:
     async def _simulation_loop(self) -> None:
         dt = 1.0 / self.sim_hz
         logger.debug("Simulation loop started dt={}", dt)
+        self._sim_scheduler.start()
         while True:
             command: MultiArmCommand | None = None
             vr_client_count = 0
@@ -674,23 +887,71 @@ class VRWebSocketServer:
                     continue
                 if command is None:
                     command = session.last_command
-            if vr_client_count:
-                # One step per tick for the shared backend. ``command`` may be None
-                # until the first ``xr_input``; physics (preset octo waypoints, etc.)
-                # still runs — trigger is not required for stepping.
-                self.backend.step(dt, command)
-            elif not self._sessions:
-                self.backend.step(dt, None)
-            await asyncio.sleep(dt)
+            # One step per tick for the shared backend. ``command`` may be None
+            # until the first ``xr_input``; physics (preset octo waypoints, etc.)
+            # still runs — trigger is not required for stepping.
+            should_step = bool(vr_client_count) or not self._sessions
+            if self._step_worker is not None:
+                self._step_worker.submit(command, active=should_step)
+            else:
+                if should_step:
+                    self.backend.step(dt, command)
+                # Swap in a fresh snapshot once per tick; the publish loop keeps
+                # reading the previous one until then.
+                self._latest_snapshot = self.backend.snapshot()
+            await self._wait_next_tick("simulation", self._sim_scheduler)
 
     async def _publish_loop(self) -> None:
         dt = 1.0 / self.publish_hz
         logger.debug("Publish loop started dt={}", dt)
+        self._publish_scheduler.start()
         while True:
             if self._clients:
-                state = self.backend.step(0.0, None)
-                await self._broadcast_scene_state(state)
-            await asyncio.sleep(dt)
+                state = self._scene_state_for_publish()
+                if state is not None:
+                    self._broadcast_scene_state(state)
+            await self._wait_next_tick("publish", self._publish_scheduler)
+
+    async def _wait_next_tick(
+        self, loop_name: str, scheduler: FixedRateScheduler
+    ) -> None:
+        now = time.monotonic()
+        delay = scheduler.tick_done(now)
+        window = scheduler.roll_stats(now, self.stats_interval)
+        if window is not None:
+            logger.debug(
+                "{} loop achieved_hz={:.1f} target_hz={:.1f} overruns={} "
+                "dropped_ticks={} max_lag_ms={:.2f}",
+                loop_name,
+                window.achieved_hz,
+                scheduler.target_hz,
+                window.overruns,
+                window.dropped_ticks,
+                window.max_lag * 1.0e3,
+            )
+        await asyncio.sleep(delay)
+
+    def loop_stats(self) -> dict[str, dict[str, Any]]:
+        """Tick statistics of the current window of each loop.
+
+        ``simulation`` is the loop that gathers commands (and steps inline);
+        with ``stepping="thread"`` the stepping itself is under
+        ``step_worker``. See
+        :meth:`~virtual_field.server.scheduling.FixedRateScheduler.report`.
+        """
+        stats = {
+            "simulation": self._sim_scheduler.report(),
+            "publish": self._publish_scheduler.report(),
+        }
+        if self._step_worker is not None:
+            stats["step_worker"] = self._step_worker.tick_stats()
+        return stats
+
+    def _scene_state_for_publish(self) -> SceneState | None:
+        """Latest snapshot from the simulation loop; never steps the backend."""
+        if self._step_worker is not None:
+            return self._step_worker.latest_snapshot()
+        return self._latest_snapshot
 
     def _log_background_task_failure(
         self, task_name: str, task: asyncio.Task[None]
@@ -708,50 +969,89 @@ class VRWebSocketServer:
         if exc is not None:
             logger.opt(exception=exc).error("{} crashed", task_name)
 
-    async def _broadcast(self, message: dict[str, Any]) -> None:
+    def _broadcast(self, message: dict[str, Any]) -> None:
         encoded = json.dumps(message)
-        stale: list[WebSocketServerProtocol] = []
-        for client in tuple(self._clients):
-            try:
-                await client.send(encoded)
-            except (
-                Exception
-            ):  # pragma: no cover - network transport failure path
-                stale.append(client)
-        for client in stale:
-            self._clients.discard(client)
-        if stale:
-            logger.debug("Dropped stale clients count={}", len(stale))
-
-    async def _broadcast_scene_state(self, state: SceneState) -> None:
-        """Send ``scene_state`` with per-client omission of static mesh ``asset_uri``."""
-        stale: list[WebSocketServerProtocol] = []
-        for client in tuple(self._clients):
-            session = self._sessions.get(client)
+        for send_queue in tuple(self._send_queues.values()):
+            send_queue.send_control(encoded)
+
+    def _broadcast_scene_state(self, state: SceneState) -> None:
+        """Queue ``scene_state`` for every client without waiting on sockets.
+
+        Each client's frame is encoded by its own sender when it is actually
+        sent. The frame is encoded once per tick; clients only differ in which
+        static mesh assets they still need and whether they negotiated binary
+        frames. Delta clients get a ``scene_state_delta`` against their own
+        baseline.
+        """
+        encoder = SceneStateFrameEncoder(state)
+        entities: SceneEntities | None = None
+
+        def frame_for(session: ClientSession | None) -> Frame:
+            nonlocal entities
             if session is None:
-                payload = state.to_dict()
-            else:
-                payload = state.to_dict_for_client(
+                return encoder.encode()
+            if session.scene_delta is not None:
+                if entities is None:
+                    entities = scene_state_entities(state)
+                return json.dumps(
+                    make_message(
+                        "scene_state_delta",
+                        session.scene_delta.encode(state, entities),
+                    )
+                )
+            if session.scene_state_encoding == "binary":
+                return encoder.encode_binary_for_client(
                     session.sent_static_mesh_asset_ids
                 )
-            message = make_message("scene_state", payload)
-            encoded = json.dumps(message)
-            try:
-                await client.send(encoded)
-            except (
-                Exception
-            ):  # pragma: no cover - network transport failure path
-                stale.append(client)
-        for client in stale:
-            self._clients.discard(client)
-        if stale:
-            logger.debug("Dropped stale clients count={}", len(stale))
+            return encoder.encode_for_client(session.sent_static_mesh_asset_ids)
+
+        for client, send_queue in tuple(self._send_queues.items()):
+            send_queue.offer_scene_state(
+                partial(frame_for, self._sessions.get(client))
+            )
+
+    def client_send_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-client outbound counters keyed by user id.
+
+        Clients that have not sent ``hello`` yet are keyed by peer address.
+        See :meth:`~virtual_field.server.outbound.ClientSendQueue.stats`.
+        """
+        stats: dict[str, dict[str, Any]] = {}
+        for client, send_queue in self._send_queues.items():
+            session = self._sessions.get(client)
+            key = (
+                session.user_id
+                if session is not None
+                else str(getattr(client, "remote_address", id(client)))
+            )
+            stats[key] = send_queue.stats()
+        return stats
 
 
 async def run_server(
-    host: str, port: int, ssl_context: ssl.SSLContext | None
+    host: str,
+    port: int,
+    ssl_context: ssl.SSLContext | None,
+    stepping: str = "inline",
+    process_shards: int = 0,
+    overrun_policy: str = "catch_up",
+    serve_assets: bool = False,
+    template_pool_sizes: dict[str, int] | None = None,
+    checkpoint_dir: str | None = None,
+    checkpoint_interval: float = 5.0,
 ) -> None:
-    server = VRWebSocketServer(host=host, port=port, ssl_context=ssl_context)
+    server = VRWebSocketServer(
+        host=host,
+        port=port,
+        ssl_context=ssl_context,
+        stepping=stepping,
+        process_shards=process_shards,
+        overrun_policy=overrun_policy,
+        serve_assets=serve_assets,
+        template_pool_sizes=template_pool_sizes,
+        checkpoint_dir=checkpoint_dir,
+        checkpoint_interval=checkpoint_interval,
+    )
     await server.start()
 
     scheme = "wss" if ssl_context is not None else "ws"
@@ -785,16 +1085,84 @@ def configure_logging(verbose: bool) -> None:
 @click.option("--port", type=int, default=8765, show_default=True)
 @click.option("--ssl-cert", type=click.Path(exists=True, dir_okay=False))
 @click.option("--ssl-key", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--stepping",
+    type=click.Choice(STEPPING_MODES),
+    default="inline",
+    show_default=True,
+    help="Step physics on the event loop or on a dedicated worker thread.",
+)
+@click.option(
+    "--process-shards",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Run user simulations in this many worker processes (0: in-process).",
+)
+@click.option(
+    "--overrun-policy",
+    type=click.Choice(OVERRUN_POLICIES),
+    default="catch_up",
+    show_default=True,
+    help="Run missed simulation ticks back-to-back or drop them.",
+)
+@click.option(
+    "--serve-assets",
+    is_flag=True,
+    help="Serve mesh assets over HTTP from /assets/<sha256> instead of "
+    "sending them as data URIs.",
+)
+@click.option(
+    "--template-pool",
+    "template_pools",
+    multiple=True,
+    metavar="MODE=SIZE",
+    help="Keep SIZE pre-built simulations of character MODE ready for "
+    "joining users. Repeat for several modes.",
+)
+@click.option(
+    "--checkpoint-dir",
+    type=click.Path(file_okay=False),
+    help="Checkpoint the simulations of clients that send a user_id and "
+    "resume them when they reconnect with it.",
+)
+@click.option(
+    "--checkpoint-interval",
+    type=click.FloatRange(min=0.0, min_open=True),
+    default=5.0,
+    show_default=True,
+    help="Simulated seconds between checkpoints.",
+)
 @click.option("--verbose", is_flag=True, help="Enable debug logging output.")
 def main(
     host: str,
     port: int,
     ssl_cert: str | None,
     ssl_key: str | None,
+    stepping: str,
+    process_shards: int,
+    overrun_policy: str,
+    serve_assets: bool,
+    template_pools: tuple[str, ...],
+    checkpoint_dir: str | None,
+    checkpoint_interval: float,
     verbose: bool,
 ) -> None:
     configure_logging(verbose=verbose)
 
+    template_pool_sizes: dict[str, int] = {}
+    for entry in template_pools:
+        character_mode, _, size = entry.partition("=")
+        if (
+            character_mode not in SUPPORTED_CHARACTER_MODES
+            or not size.isdigit()
+        ):
+            raise click.UsageError(
+                f"--template-pool expects MODE=SIZE with a supported mode, "
+                f"got {entry!r}"
+            )
+        template_pool_sizes[character_mode] = int(size)
+
     # Validate and configure optional TLS.
     if (ssl_cert is None) != (ssl_key is None):
         raise click.UsageError(
@@ -812,6 +1180,13 @@ def main(
             host=host,
             port=port,
             ssl_context=ssl_context,
+            stepping=stepping,
+            process_shards=process_shards,
+            overrun_policy=overrun_policy,
+            serve_assets=serve_assets,
+            template_pool_sizes=template_pool_sizes,
+            checkpoint_dir=checkpoint_dir,
+            checkpoint_interval=checkpoint_interval,
         )
     )
 
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import base64
+import hashlib
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from urllib.parse import unquote_to_bytes
+
+from loguru import logger
+from websockets.datastructures import Headers
+
+ASSET_ROUTE_PREFIX = "/assets/"
+DEFAULT_ASSET_CONTENT_TYPE = "model/gltf-binary"
+
+HTTPResponse = tuple[HTTPStatus, list[tuple[str, str]], bytes]
+
+
+@dataclass(slots=True, frozen=True)
+class MeshAsset:
+    """Immutable asset payload stored under its SHA-256 digest."""
+
+    data: bytes
+    content_type: str
+
+
+def parse_data_uri(uri: str) -> tuple[bytes, str]:
+    """Split a ``data:`` URI into its payload and content type.
+
+    Raises
+    ------
+    ValueError
+        If ``uri`` is not a well-formed ``data:`` URI.
+    """
+    if not uri.startswith("data:") or "," not in uri:
+        raise ValueError("not a data URI")
+    header, payload = uri[5:].split(",", 1)
+    parameters = header.split(";")
+    content_type = parameters[0] or "text/plain"
+    if "base64" in parameters[1:]:
+        try:
+            return base64.b64decode(payload, validate=True), content_type
+        except ValueError as exc:
+            raise ValueError("invalid base64 payload in data URI") from exc
+    return unquote_to_bytes(payload), content_type
+
+
+@dataclass(slots=True)
+class MeshAssetStore:
+    """Content-addressed store for mesh assets, served over HTTP.
+
+    :meth:`intern_uri` turns an inline ``data:`` URI into a short
+    ``/assets/<sha256>`` path, so ``scene_state`` carries a reference instead
+    of megabytes of base64. Identical payloads (e.g. the obstacles every
+    ``noel-c4`` user builds) are stored once.
+
+    :meth:`process_request` plugs into ``websockets.serve(process_request=...)``
+    and answers ``GET /assets/<sha256>`` on the websocket port. Responses are
+    immutable and cacheable, so clients fetch each asset once and keep it
+    across reconnects and sessions; every other path falls through to the
+    websocket handshake.
+
+    The store only grows on :meth:`put`; the backend calls :meth:`prune`
+    whenever a mesh is removed or its asset replaced, so assets no mesh
+    refers to anymore are dropped.
+    """
+
+    _assets: dict[str, MeshAsset] = field(init=False, default_factory=dict)
+    # Inline URI -> asset path. Repeated lookups of the same ``str`` object
+    # reuse its cached hash, so re-interning an unchanged mesh is cheap.
+    _interned: dict[str, str] = field(init=False, default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._assets
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(asset.data) for asset in self._assets.values())
+
+    def put(
+        self, data: bytes, content_type: str = DEFAULT_ASSET_CONTENT_TYPE
+    ) -> str:
+        """Store ``data`` (once per content) and return its hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._assets:
+            self._assets[digest] = MeshAsset(
+                data=bytes(data), content_type=content_type
+            )
+            logger.debug(
+                "Stored mesh asset digest={} bytes={}", digest[:12], len(data)
+            )
+        return digest
+
+    def get(self, digest: str) -> MeshAsset | None:
+        return self._assets.get(digest)
+
+    @staticmethod
+    def url_for(digest: str) -> str:
+        return f"{ASSET_ROUTE_PREFIX}{digest}"
+
+    def intern_uri(self, uri: str) -> str:
+        """Return the store path for an inline ``data:`` URI.
+
+        Any other URI (already interned, or an external URL) is returned
+        unchanged.
+        """
+        interned = self._interned.get(uri)
+        if interned is not None:
+            return interned
+        if not uri.startswith("data:"):
+            return uri
+        data, content_type = parse_data_uri(uri)
+        interned = self.url_for(self.put(data, content_type))
+        self._interned[uri] = interned
+        return interned
+
+    def prune(self, referenced_uris: Iterable[str]) -> int:
+        """Drop assets whose path is not in ``referenced_uris``.
+
+        Returns the number of dropped assets. Interned URIs of dropped
+        assets are forgotten too, so a later :meth:`intern_uri` stores the
+        payload again.
+        """
+        live = {
+            uri[len(ASSET_ROUTE_PREFIX) :]
+            for uri in referenced_uris
+            if uri.startswith(ASSET_ROUTE_PREFIX)
+        }
+        stale = [digest for digest in self._assets if digest not in live]
+        for digest in stale:
+            del self._assets[digest]
+        if stale:
+            stale_paths = {self.url_for(digest) for digest in stale}
+            self._interned = {
+                uri: path
+                for uri, path in self._interned.items()
+                if path not in stale_paths
+            }
+            logger.debug("Pruned {} unreferenced mesh assets", len(stale))
+        return len(stale)
+
+    def process_request(
+        self, path: str, request_headers: Headers
+    ) -> HTTPResponse | None:
+        """``websockets`` hook answering asset requests before the handshake."""
+        if not path.startswith(ASSET_ROUTE_PREFIX):
+            return None
+        digest = path[len(ASSET_ROUTE_PREFIX) :].split("?", 1)[0]
+        asset = self._assets.get(digest)
+        headers = [("Access-Control-Allow-Origin", "*")]
+        if asset is None:
+            return HTTPStatus.NOT_FOUND, headers, b"unknown asset\n"
+        headers += [
+            ("Cache-Control", "public, max-age=31536000, immutable"),
+            ("ETag", f'"{digest}"'),
+        ]
+        if request_headers.get("If-None-Match") == f'"{digest}"':
+            return HTTPStatus.NOT_MODIFIED, headers, b""
+        headers.append(("Content-Type", asset.content_type))
+        return HTTPStatus.OK, headers, asset.data
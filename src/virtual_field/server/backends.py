@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from typing import Any
+
+from dataclasses import dataclass, field, replace
 from math import cos, pi, sin
 
 from loguru import logger
@@ -8,6 +10,7 @@ from loguru import logger
 from virtual_field.core.commands import ArmCommand, MultiArmCommand
 from virtual_field.core.state import (
     ArmState,
+    HapticEvent,
     MeshEntity,
     OverlayPointsEntity,
     SceneState,
@@ -21,6 +24,18 @@ from virtual_field.runtime.mode_base import (
 )
 from virtual_field.runtime.mode_registry import get_mode_spec
 
+from .assets import MeshAssetStore
+from .checkpoints import CheckpointStore
+from .template_pool import PooledSimulation, SimulationTemplatePool
+
+# ``register_user`` layout defaults; pool templates are built with them.
+DEFAULT_LAYOUT: dict[str, float] = {
+    "arm_spacing": 0.3,
+    "base_x": 0.0,
+    "base_y": 1.0,
+    "base_z": -0.15,
+}
+
 
 def _default_arm_state(
     arm_id: str, owner_user_id: str, base: Transform
@@ -73,13 +88,77 @@ def _allocate_linear_bases(
     }
 
 
+def _simulation_layout(
+    user_id: str,
+    character_mode: str,
+    *,
+    arm_count: int,
+    arm_spacing: float,
+    base_x: float,
+    base_y: float,
+    base_z: float,
+) -> tuple[dict[str, Transform], dict[str, object]]:
+    """Arm bases and mode factory arguments of a user's simulation."""
+    mode_spec = get_mode_spec(character_mode)
+    if mode_spec.base_layout == "linear":
+        base_transforms = _allocate_linear_bases(
+            user_id,
+            arm_count=arm_count,
+            arm_spacing=arm_spacing,
+            base_x=base_x,
+            base_y=base_y,
+            base_z=base_z,
+        )
+        arm_ids = list(base_transforms.keys())
+        return base_transforms, {
+            "user_id": user_id,
+            "arm_ids": tuple(arm_ids),
+            "base_left": base_transforms[arm_ids[0]].translation,
+            "base_right": base_transforms[arm_ids[1]].translation,
+        }
+    if mode_spec.base_layout == "octo":
+        base = Transform(
+            translation=[base_x, base_y, base_z],
+            rotation_xyzw=[0.0, 0.0, 0.0, 1.0],
+        )
+        base_transforms = {
+            f"{user_id}_arm_{index}": base for index in range(arm_count)
+        }
+        factory_kwargs: dict[str, object] = {
+            "user_id": user_id,
+            "arm_ids": tuple(base_transforms.keys()),
+            "base_position": (base_x, base_y, base_z),
+        }
+        if character_mode == "octo-waypoint":
+            # TODO: Temporary impl
+            factory_kwargs["enable_controller_trigger_waypoints"] = True
+        return base_transforms, factory_kwargs
+    raise ValueError(f"Unsupported base layout: {mode_spec.base_layout}")
+
+
+def build_default_simulation(
+    user_id: str, character_mode: str
+) -> SimulationBase:
+    """Simulation of ``character_mode`` with the default ``register_user`` layout.
+
+    Used to build :class:`SimulationTemplatePool` templates.
+    """
+    mode_spec = get_mode_spec(character_mode)
+    if mode_spec is None:
+        raise ValueError(f"Unsupported character mode: {character_mode}")
+    _, factory_kwargs = _simulation_layout(
+        user_id, character_mode, arm_count=mode_spec.arm_count, **DEFAULT_LAYOUT
+    )
+    return mode_spec.factory(**factory_kwargs)
+
+
 @dataclass(slots=True)
 class MultiArmPassThroughBackend:
     """Server-side scene backend for multiple users and arms.
 
     Holds per-arm ``ArmState``, meshes, overlay points, and spheres. Each
     :meth:`step` applies controller commands and returns a ``SceneState``
-    snapshot.
+    snapshot. :meth:`snapshot` returns the current state without stepping.
 
     If the user's ``character_mode`` is listed in ``SIMULATION_FACTORIES``, a
     ``DualArmSimulation`` is created: physics stepping, targets, and attachments
@@ -87,23 +166,55 @@ class MultiArmPassThroughBackend:
 
     Otherwise arm poses are updated in pass-through fashion: the tip and a
     simple centerline follow the controller target without elastica.
+
+    With an ``asset_store``, inline ``data:`` mesh assets are interned on
+    :meth:`add_or_update_mesh` and meshes carry a short store path instead.
+
+    With a ``template_pool``, users registered with the default layout get a
+    pre-built simulation from the pool instead of building one on the spot.
+
+    With a ``checkpoint_store``, the simulation of every user registered with
+    ``checkpointed=True`` is checkpointed periodically and when its user
+    leaves; a user registering again with the same id and mode resumes from
+    the latest checkpoint.
+
+    Parameters
+    ----------
+    asset_store : MeshAssetStore | None
+        Content-addressed store for mesh assets. ``None`` keeps assets inline.
+    template_pool : SimulationTemplatePool | None
+        Pool of ready simulations, closed with the backend. ``None`` builds
+        every simulation on registration.
+    checkpoint_store : CheckpointStore | None
+        Store for simulation checkpoints, closed with the backend. ``None``
+        disables checkpointing.
     """
 
+    asset_store: MeshAssetStore | None = None
+    template_pool: SimulationTemplatePool | None = None
+    checkpoint_store: CheckpointStore | None = None
     _timestamp: float = field(init=False, default=0.0)
     _arms: dict[str, ArmState] = field(init=False, default_factory=dict)
     _user_arms: dict[str, list[str]] = field(init=False, default_factory=dict)
     _user_mode: dict[str, str] = field(init=False, default_factory=dict)
+    # Users whose simulation is checkpointed and resumed.
+    _checkpointed_users: set[str] = field(init=False, default_factory=set)
     _meshes: dict[str, MeshEntity] = field(init=False, default_factory=dict)
     _overlay_points: dict[str, OverlayPointsEntity] = field(
         init=False, default_factory=dict
     )
     _spheres: dict[str, SphereEntity] = field(init=False, default_factory=dict)
-    _simulations: dict[str, SimulationBase] = field(
+    _simulations: dict[str, SimulationBase | PooledSimulation] = field(
         init=False, default_factory=dict
     )
     _previous_commands: dict[str, ArmCommand] = field(
         init=False, default_factory=dict
     )
+    _haptics: list[HapticEvent] = field(init=False, default_factory=list)
+    # Per-user ``SimulationBase.mesh_version`` already merged into ``_meshes``.
+    _mesh_sync_versions: dict[str, int] = field(
+        init=False, default_factory=dict
+    )
 
     def register_user(
         self,
@@ -114,6 +225,7 @@ class MultiArmPassThroughBackend:
         base_x: float = 0.0,
         base_y: float = 1.0,
         base_z: float = -0.15,
+        checkpointed: bool = True,
     ) -> list[str]:
         """Register a user and allocate arm ids.
 
@@ -131,6 +243,10 @@ class MultiArmPassThroughBackend:
             The y position of the base. (height)
         base_z : float
             The z position of the base. (depth)
+        checkpointed : bool
+            Whether the simulation is checkpointed and resumed from the
+            latest checkpoint of ``user_id``. Pass ``False`` for ids that do
+            not identify the same person across server restarts.
         """
         if user_id in self._user_arms:
             logger.warning(
@@ -148,49 +264,33 @@ class MultiArmPassThroughBackend:
             and requested_arm_count > 0
             else mode_spec.arm_count
         )
-        if mode_spec.base_layout == "linear":
-            base_transforms = _allocate_linear_bases(
-                user_id,
-                arm_count=arm_count,
-                arm_spacing=arm_spacing,
-                base_x=base_x,
-                base_y=base_y,
-                base_z=base_z,
-            )
-            allocated_arm_ids = list(base_transforms.keys())
-            for arm_id, base in base_transforms.items():
-                self._arms[arm_id] = _default_arm_state(arm_id, user_id, base)
-
-            simulation = mode_spec.factory(
-                user_id=user_id,
-                arm_ids=tuple(allocated_arm_ids),
-                base_left=base_transforms[allocated_arm_ids[0]].translation,
-                base_right=base_transforms[allocated_arm_ids[1]].translation,
-            )
-        elif mode_spec.base_layout == "octo":
-            allocated_arm_ids = [
-                f"{user_id}_arm_{index}" for index in range(arm_count)
-            ]
-            base = Transform(
-                translation=[base_x, base_y, base_z],
-                rotation_xyzw=[0.0, 0.0, 0.0, 1.0],
-            )
-            for arm_id in allocated_arm_ids:
-                self._arms[arm_id] = _default_arm_state(arm_id, user_id, base)
-
-            octo_kwargs: dict[str, object] = {
-                "user_id": user_id,
-                "arm_ids": tuple(allocated_arm_ids),
-                "base_position": (base_x, base_y, base_z),
-            }
-            if character_mode == "octo-waypoint":
-                # TODO: Temporary impl
-                octo_kwargs["enable_controller_trigger_waypoints"] = True
-            simulation = mode_spec.factory(**octo_kwargs)
-        else:
-            raise ValueError(
-                f"Unsupported base layout: {mode_spec.base_layout}"
-            )
+        base_transforms, factory_kwargs = _simulation_layout(
+            user_id,
+            character_mode,
+            arm_count=arm_count,
+            arm_spacing=arm_spacing,
+            base_x=base_x,
+            base_y=base_y,
+            base_z=base_z,
+        )
+        allocated_arm_ids = list(base_transforms.keys())
+        for arm_id, base in base_transforms.items():
+            self._arms[arm_id] = _default_arm_state(arm_id, user_id, base)
+
+        simulation = None
+        layout = {
+            "arm_spacing": arm_spacing,
+            "base_x": base_x,
+            "base_y": base_y,
+            "base_z": base_z,
+        }
+        if self.template_pool is not None and layout == DEFAULT_LAYOUT:
+            simulation = self.template_pool.take(character_mode, user_id)
+        if simulation is None:
+            simulation = mode_spec.factory(**factory_kwargs)
+        if self.checkpoint_store is not None and checkpointed:
+            self.checkpoint_store.restore(user_id, character_mode, simulation)
+            self._checkpointed_users.add(user_id)
 
         self._user_arms[user_id] = allocated_arm_ids
         self._user_mode[user_id] = character_mode
@@ -203,11 +303,45 @@ class MultiArmPassThroughBackend:
         # Update other assets
         for mesh in simulation.mesh_entities():
             self.add_or_update_mesh(mesh)
+        self._mesh_sync_versions[user_id] = simulation.mesh_version
         for sphere in getattr(simulation, "sphere_entities", lambda: [])():
             self.add_or_update_sphere(sphere)
 
         return allocated_arm_ids
 
+    def reset_user(self, user_id: str) -> list[str]:
+        """Return a user's simulation to its initial state.
+
+        The simulation is reset in place (:meth:`SimulationBase.reset`)
+        instead of being rebuilt. Like removing and registering the user
+        again, this drops the user's meshes, spheres and overlay points and
+        republishes the ones of the simulation.
+
+        Returns
+        -------
+        list[str]
+            The arm ids of the user, unchanged by the reset.
+        """
+        simulation = self._simulations.get(user_id)
+        if simulation is None:
+            raise ValueError(f"User {user_id} is not registered")
+        simulation.reset()
+
+        arm_ids = self._user_arms[user_id]
+        for arm_id in arm_ids:
+            self._previous_commands.pop(arm_id, None)
+        self._arms.update(simulation.arm_states())
+
+        self.remove_owner_meshes(user_id)
+        self.remove_owner_overlay_points(user_id)
+        self.remove_owner_spheres(user_id)
+        for mesh in simulation.mesh_entities():
+            self.add_or_update_mesh(mesh)
+        self._mesh_sync_versions[user_id] = simulation.mesh_version
+        for sphere in getattr(simulation, "sphere_entities", lambda: [])():
+            self.add_or_update_sphere(sphere)
+        return list(arm_ids)
+
     def remove_user(self, user_id: str) -> None:
         """
         Remove a user from the backend.
@@ -216,8 +350,17 @@ class MultiArmPassThroughBackend:
         for arm_id in arm_ids:
             self._arms.pop(arm_id, None)
             self._previous_commands.pop(arm_id, None)
-        self._user_mode.pop(user_id, None)
-        self._simulations.pop(user_id, None)
+        character_mode = self._user_mode.pop(user_id, None)
+        simulation = self._simulations.pop(user_id, None)
+        checkpointed = user_id in self._checkpointed_users
+        self._checkpointed_users.discard(user_id)
+        if simulation is not None:
+            if self.checkpoint_store is not None and checkpointed:
+                self.checkpoint_store.submit(
+                    user_id, character_mode, simulation
+                )
+            simulation.close()
+        self._mesh_sync_versions.pop(user_id, None)
         self.remove_owner_meshes(user_id)
         self.remove_owner_overlay_points(user_id)
         self.remove_owner_spheres(user_id)
@@ -256,18 +399,33 @@ class MultiArmPassThroughBackend:
                 simulation.handle_command_inactive(arm_id)
                 self._previous_commands.pop(arm_id, None)
 
-        # Step the simulations and merge their meshes/spheres into the backend.
-        for simulation in self._simulations.values():
+        # Step the simulations and merge their spheres and changed meshes into
+        # the backend.
+        for user_id, simulation in self._simulations.items():
             simulation.step(max(dt, 1.0e-4))
             self._arms.update(simulation.arm_states())
-            for mesh in simulation.mesh_entities():
+            for mesh in simulation.changed_mesh_entities(
+                self._mesh_sync_versions.get(user_id, 0)
+            ):
                 self.add_or_update_mesh(mesh)
+            self._mesh_sync_versions[user_id] = simulation.mesh_version
             for sphere in getattr(simulation, "sphere_entities", lambda: [])():
                 self.add_or_update_sphere(sphere)
 
+        if self.checkpoint_store is not None and self.checkpoint_store.due(
+            self._timestamp
+        ):
+            for user_id in self._checkpointed_users:
+                self.checkpoint_store.submit(
+                    user_id,
+                    self._user_mode[user_id],
+                    self._simulations[user_id],
+                )
+
         haptics = []
         for simulation in self._simulations.values():
             haptics.extend(simulation.haptic_events())
+        self._haptics = haptics
 
         return SceneState(
             timestamp=self._timestamp,
@@ -279,15 +437,67 @@ class MultiArmPassThroughBackend:
             haptics=haptics,
         )
 
+    def snapshot(self) -> SceneState:
+        """
+        Return the current scene without stepping.
+
+        The containers are copied, so the snapshot can be read (e.g. serialized
+        by the publish loop) while the backend keeps stepping. Entities are
+        shared; :meth:`step`, the mesh updates and the pass-through arm
+        commands replace them rather than mutate them.
+        """
+        return SceneState(
+            timestamp=self._timestamp,
+            arms=dict(self._arms),
+            user_arms={
+                user_id: list(arm_ids)
+                for user_id, arm_ids in self._user_arms.items()
+            },
+            meshes=dict(self._meshes),
+            overlay_points=dict(self._overlay_points),
+            spheres=dict(self._spheres),
+            haptics=list(self._haptics),
+        )
+
+    def close(self) -> None:
+        """
+        Release backend resources: the template pool and the shared assets
+        of every simulation. With a checkpoint store, every simulation is
+        checkpointed first.
+        """
+        if self.template_pool is not None:
+            self.template_pool.close()
+        for user_id, simulation in self._simulations.items():
+            if (
+                self.checkpoint_store is not None
+                and user_id in self._checkpointed_users
+            ):
+                self.checkpoint_store.submit(
+                    user_id, self._user_mode[user_id], simulation
+                )
+            simulation.close()
+        self._simulations.clear()
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.close()
+
     def add_or_update_mesh(self, mesh: MeshEntity) -> None:
         """
-        Add or update a mesh.
+        Add or update a mesh, interning its asset if a store is configured.
+        An asset replaced by a new payload is dropped from the store once no
+        mesh refers to it.
         """
+        if self.asset_store is not None and mesh.asset_uri:
+            asset_uri = self.asset_store.intern_uri(mesh.asset_uri)
+            if asset_uri != mesh.asset_uri:
+                mesh = replace(mesh, asset_uri=asset_uri)
+        previous = self._meshes.get(mesh.mesh_id)
         self._meshes[mesh.mesh_id] = mesh
+        if previous is not None and previous.asset_uri != mesh.asset_uri:
+            self._prune_assets()
 
     def remove_mesh(self, mesh_id: str, owner_id: str | None = None) -> None:
         """
-        Remove a mesh.
+        Remove a mesh and drop its asset if no other mesh refers to it.
         """
         mesh = self._meshes.get(mesh_id)
         if mesh is None:
@@ -295,6 +505,7 @@ class MultiArmPassThroughBackend:
         if owner_id is not None and mesh.owner_id != owner_id:
             return
         self._meshes.pop(mesh_id, None)
+        self._prune_assets()
 
     def remove_owner_meshes(self, owner_id: str) -> None:
         """
@@ -307,6 +518,15 @@ class MultiArmPassThroughBackend:
         ]
         for mesh_id in mesh_ids:
             self._meshes.pop(mesh_id, None)
+        if mesh_ids:
+            self._prune_assets()
+
+    def _prune_assets(self) -> None:
+        """Drop stored assets no remaining mesh refers to."""
+        if self.asset_store is not None:
+            self.asset_store.prune(
+                mesh.asset_uri for mesh in self._meshes.values()
+            )
 
     def update_mesh_transform(
         self,
@@ -324,14 +544,17 @@ class MultiArmPassThroughBackend:
         mesh = self._meshes.get(mesh_id)
         if mesh is None or mesh.owner_id != owner_id:
             return False
+        changes: dict[str, Any] = {}
         if translation is not None:
-            mesh.translation = translation
+            changes["translation"] = translation
         if rotation_xyzw is not None:
-            mesh.rotation_xyzw = rotation_xyzw
+            changes["rotation_xyzw"] = rotation_xyzw
         if scale is not None:
-            mesh.scale = scale
+            changes["scale"] = scale
         if visible is not None:
-            mesh.visible = visible
+            changes["visible"] = visible
+        # Replaced, not mutated: snapshots share the entities.
+        self._meshes[mesh_id] = replace(mesh, **changes)
         return True
 
     def add_or_update_sphere(self, sphere: SphereEntity) -> None:
@@ -402,10 +625,11 @@ class MultiArmPassThroughBackend:
         if not command.active:
             return
 
-        # Default behavior: update the arm state to follow the controller target.
+        # Default behavior: make the arm follow the controller target. The
+        # state is replaced, not mutated: snapshots share the entities.
         target = command.target.translation
         base = state.base.translation
-        state.tip = Transform(
+        tip = Transform(
             translation=[
                 target[0],
                 target[1],
@@ -413,25 +637,31 @@ class MultiArmPassThroughBackend:
             ],
             rotation_xyzw=command.target.rotation_xyzw,
         )
-        state.centerline = [
+        centerline = [
             [base[0], base[1], base[2]],
             [
-                (base[0] + state.tip.translation[0]) / 2.0,
-                (base[1] + state.tip.translation[1]) / 2.0,
-                (base[2] + state.tip.translation[2]) / 2.0,
+                (base[0] + tip.translation[0]) / 2.0,
+                (base[1] + tip.translation[1]) / 2.0,
+                (base[2] + tip.translation[2]) / 2.0,
             ],
             [
-                state.tip.translation[0],
-                state.tip.translation[1],
-                state.tip.translation[2],
+                tip.translation[0],
+                tip.translation[1],
+                tip.translation[2],
             ],
         ]
-        state.element_lengths = [
+        element_lengths = [
             (
-                (state.centerline[i + 1][0] - state.centerline[i][0]) ** 2
-                + (state.centerline[i + 1][1] - state.centerline[i][1]) ** 2
-                + (state.centerline[i + 1][2] - state.centerline[i][2]) ** 2
+                (centerline[i + 1][0] - centerline[i][0]) ** 2
+                + (centerline[i + 1][1] - centerline[i][1]) ** 2
+                + (centerline[i + 1][2] - centerline[i][2]) ** 2
             )
             ** 0.5
-            for i in range(len(state.centerline) - 1)
+            for i in range(len(centerline) - 1)
         ]
+        self._arms[state.arm_id] = replace(
+            state,
+            tip=tip,
+            centerline=centerline,
+            element_lengths=element_lengths,
+        )
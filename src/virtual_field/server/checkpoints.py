@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from typing import Any
+
+import json
+import os
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+from loguru import logger
+
+from virtual_field.runtime.mode_base import SimulationBase, SimulationState
+
+# Bump when the file layout or the saved state changes; older files are
+# ignored on restore.
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".ckpt"
+
+_MAGIC = b"VFCKPT\0\0"
+_PREAMBLE = struct.Struct("<8sQ")  # magic, header length
+_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _scalar(value: Any) -> bool | int | float:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+@dataclass(slots=True)
+class PendingCheckpoint:
+    """State captured on the simulation thread, waiting to be written."""
+
+    character_mode: str
+    state: SimulationState
+    python_state: dict[str, Any]
+
+
+def write_checkpoint(path: Path, checkpoint: PendingCheckpoint) -> None:
+    """Write ``checkpoint`` to ``path`` atomically.
+
+    The file holds a JSON header (mode, time, scalar attributes, Python
+    state and the layout of the arrays) followed by the raw arrays, each
+    aligned to 64 bytes, so :func:`read_checkpoint` can memory-map them.
+    """
+    layout = []
+    offset = 0
+    for _, saved in checkpoint.state.arrays:
+        layout.append(
+            {
+                "dtype": saved.dtype.str,
+                "shape": list(saved.shape),
+                "offset": offset,
+            }
+        )
+        offset = _aligned(offset + saved.nbytes)
+    header = json.dumps(
+        {
+            "version": CHECKPOINT_VERSION,
+            "character_mode": checkpoint.character_mode,
+            "time": float(checkpoint.state.time),
+            "attributes": [
+                [name, _scalar(value)]
+                for _, name, value in checkpoint.state.attributes
+            ],
+            "python_state": checkpoint.python_state,
+            "arrays": layout,
+        }
+    ).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, staging = tempfile.mkstemp(
+        prefix=f".{path.name}-", dir=path.parent
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            stream.write(_PREAMBLE.pack(_MAGIC, len(header)))
+            stream.write(header)
+            for (_, saved), entry in zip(checkpoint.state.arrays, layout):
+                stream.seek(data_start + entry["offset"])
+                stream.write(np.ascontiguousarray(saved).tobytes())
+        os.replace(staging, path)
+    except BaseException:
+        Path(staging).unlink(missing_ok=True)
+        raise
+
+
+def read_checkpoint(path: Path) -> tuple[dict[str, Any], list[np.ndarray]]:
+    """Header and read-only memory-mapped arrays of a checkpoint file."""
+    with path.open("rb") as stream:
+        magic, header_size = _PREAMBLE.unpack(stream.read(_PREAMBLE.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a simulation checkpoint")
+        header = json.loads(stream.read(header_size))
+    data_start = _aligned(_PREAMBLE.size + header_size)
+    arrays = [
+        (
+            np.memmap(
+                path,
+                dtype=np.dtype(entry["dtype"]),
+                mode="r",
+                offset=data_start + entry["offset"],
+                shape=tuple(entry["shape"]),
+            )
+            if np.prod(entry["shape"]) > 0
+            else np.empty(entry["shape"], dtype=np.dtype(entry["dtype"]))
+        )
+        for entry in header["arrays"]
+    ]
+    return header, arrays
+
+
+def _restore(
+    simulation: SimulationBase,
+    header: dict[str, Any],
+    arrays: list[np.ndarray],
+) -> bool:
+    """Copy a checkpoint into ``simulation`` if their layouts match."""
+    live = simulation.capture_state()
+    if len(arrays) != len(live.arrays) or len(header["attributes"]) != len(
+        live.attributes
+    ):
+        return False
+    for (array, _), saved in zip(live.arrays, arrays):
+        if array.shape != saved.shape or array.dtype != saved.dtype:
+            return False
+    for (_, name, _), (saved_name, _) in zip(
+        live.attributes, header["attributes"]
+    ):
+        if name != saved_name:
+            return False
+
+    live.arrays = [
+        (array, saved) for (array, _), saved in zip(live.arrays, arrays)
+    ]
+    live.attributes = [
+        (system, name, type(value)(saved))
+        for (system, name, value), (_, saved) in zip(
+            live.attributes, header["attributes"]
+        )
+    ]
+    live.time = header["time"]
+    simulation.restore_state(live)
+    simulation.restore_python_state(header["python_state"])
+    return True
+
+
+@dataclass(slots=True)
+class CheckpointStore:
+    """Periodic on-disk checkpoints of user simulations.
+
+    The backend calls :meth:`submit` from the simulation thread whenever
+    :meth:`due` says so. That only copies the state arrays
+    (:meth:`SimulationBase.capture_state`) and the Python state
+    (:meth:`SimulationBase.checkpoint_python_state`); a background thread
+    started by :meth:`start` writes them to ``<root>/<user_id>.ckpt``, so a
+    slow disk never delays a tick. When several checkpoints of a user are
+    waiting, only the latest is written.
+
+    :meth:`restore` copies a user's latest checkpoint into a newly built
+    simulation of the same character mode, so a user reconnecting after a
+    server restart resumes where they were.
+
+    Parameters
+    ----------
+    root : Path
+        Directory holding one checkpoint file per user.
+    interval : float
+        Simulated seconds between checkpoints of all users.
+    """
+
+    root: Path
+    interval: float = 5.0
+    _pending: dict[str, PendingCheckpoint] = field(
+        init=False, default_factory=dict
+    )
+    # Checkpoints taken by the writer thread and not yet on disk.
+    _writing: dict[str, PendingCheckpoint] = field(
+        init=False, default_factory=dict
+    )
+    _condition: threading.Condition = field(
+        init=False, default_factory=threading.Condition
+    )
+    _thread: threading.Thread | None = field(init=False, default=None)
+    _closed: bool = field(init=False, default=False)
+    _last_checkpoint_time: float | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.interval <= 0.0:
+            raise ValueError(
+                f"Checkpoint interval must be > 0, got {self.interval}"
+            )
+        self.root = Path(self.root).expanduser()
+
+    def path(self, user_id: str) -> Path:
+        return self.root / f"{quote(user_id, safe='')}{CHECKPOINT_SUFFIX}"
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._write_loop,
+            name="virtual-field-checkpoints",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def due(self, timestamp: float) -> bool:
+        """Whether ``interval`` has passed since the last due checkpoint."""
+        if (
+            self._last_checkpoint_time is not None
+            and timestamp - self._last_checkpoint_time < self.interval
+        ):
+            return False
+        self._last_checkpoint_time = timestamp
+        return True
+
+    def submit(
+        self,
+        user_id: str,
+        character_mode: str,
+        simulation: SimulationBase,
+    ) -> None:
+        """Capture the state of ``simulation`` and queue it for writing."""
+        checkpoint = PendingCheckpoint(
+            character_mode=character_mode,
+            state=simulation.capture_state(),
+            python_state=simulation.checkpoint_python_state(),
+        )
+        with self._condition:
+            self._pending[user_id] = checkpoint
+            self._condition.notify()
+
+    def restore(
+        self,
+        user_id: str,
+        character_mode: str,
+        simulation: SimulationBase,
+    ) -> bool:
+        """Load the latest checkpoint of ``user_id`` into ``simulation``.
+
+        Returns ``False``, leaving ``simulation`` untouched, if there is no
+        checkpoint or it was written for another mode or layout.
+        """
+        with self._condition:
+            pending = self._pending.get(user_id) or self._writing.get(user_id)
+        try:
+            if pending is not None:
+                header: dict[str, Any] = {
+                    "version": CHECKPOINT_VERSION,
+                    "character_mode": pending.character_mode,
+                    "time": pending.state.time,
+                    "attributes": [
+                        [name, value]
+                        for _, name, value in pending.state.attributes
+                    ],
+                    "python_state": pending.python_state,
+                }
+                arrays = [saved for _, saved in pending.state.arrays]
+            else:
+                path = self.path(user_id)
+                if not path.is_file():
+                    return False
+                header, arrays = read_checkpoint(path)
+            if (
+                header["version"] != CHECKPOINT_VERSION
+                or header["character_mode"] != character_mode
+            ):
+                return False
+            restored = _restore(simulation, header, arrays)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning(
+                "Ignoring unreadable checkpoint of user {}: {}", user_id, exc
+            )
+            return False
+        if restored:
+            logger.info(
+                "Restored user {} from checkpoint at t={:.3f}",
+                user_id,
+                header["time"],
+            )
+        else:
+            logger.warning(
+                "Ignoring checkpoint of user {}: simulation layout changed",
+                user_id,
+            )
+        return restored
+
+    def close(self) -> None:
+        """Write the waiting checkpoints and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._condition:
+            self._writing, self._pending = self._pending, {}
+        for user_id, checkpoint in self._writing.items():
+            try:
+                write_checkpoint(self.path(user_id), checkpoint)
+            except OSError as exc:
+                logger.warning(
+                    "Could not write checkpoint of user {}: {}", user_id, exc
+                )
+        with self._condition:
+            self._writing = {}
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            self._write_pending()
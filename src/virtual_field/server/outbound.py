@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+
+from loguru import logger
+from websockets import WebSocketServerProtocol
+
+Frame = str | bytes
+
+
+@dataclass(slots=True)
+class ClientSendQueue:
+    """Outbound queue and sender task of one websocket connection.
+
+    Control messages (``hello_ack``, ``mesh_ack``, errors, ...) are queued in
+    order and always delivered. ``scene_state`` frames go into a single slot
+    that only keeps the newest one: a frame still waiting while the socket is
+    busy is superseded by the next tick and counted in
+    :attr:`dropped_frames`. Control messages are sent before a pending frame.
+
+    Frames are offered as callables and only encoded when they are actually
+    sent, so per-client encoder state (static mesh assets already delivered,
+    delta baselines) never refers to a frame that was dropped. A frame whose
+    encoding raises is logged, counted in :attr:`failed_frames` and skipped;
+    the client keeps receiving later frames.
+
+    A client that lets more than ``max_control`` control messages pile up is
+    disconnected rather than having them dropped.
+
+    Parameters
+    ----------
+    websocket : WebSocketServerProtocol
+        Connection to send on.
+    max_control : int
+        Maximum number of queued control messages.
+    """
+
+    websocket: WebSocketServerProtocol
+    max_control: int = 256
+    sent_frames: int = field(init=False, default=0)
+    dropped_frames: int = field(init=False, default=0)
+    failed_frames: int = field(init=False, default=0)
+    sent_control: int = field(init=False, default=0)
+    _control: deque[Frame] = field(init=False, default_factory=deque)
+    _frame: Callable[[], Frame] | None = field(init=False, default=None)
+    _wake: asyncio.Event = field(init=False, default_factory=asyncio.Event)
+    _overflowed: bool = field(init=False, default=False)
+    _task: asyncio.Task[None] | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.max_control < 1:
+            raise ValueError("max_control must be >= 1")
+
+    @property
+    def pending_control(self) -> int:
+        return len(self._control)
+
+    @property
+    def has_pending_frame(self) -> bool:
+        return self._frame is not None
+
+    def send_control(self, message: Frame) -> None:
+        """Queue a control message; it is never dropped."""
+        if len(self._control) >= self.max_control:
+            self._overflowed = True
+        else:
+            self._control.append(message)
+        self._wake.set()
+
+    def offer_scene_state(self, frame: Callable[[], Frame]) -> None:
+        """Replace the pending ``scene_state`` frame with a newer one."""
+        if self._frame is not None:
+            self.dropped_frames += 1
+        self._frame = frame
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the sender task; queued messages are discarded."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sent_frames": self.sent_frames,
+            "dropped_frames": self.dropped_frames,
+            "failed_frames": self.failed_frames,
+            "sent_control": self.sent_control,
+            "pending_control": self.pending_control,
+        }
+
+    async def flush(self) -> None:
+        """Send everything that is queued now, control messages first."""
+        while self._control:
+            await self.websocket.send(self._control.popleft())
+            self.sent_control += 1
+        frame = self._frame
+        if frame is not None:
+            self._frame = None
+            try:
+                message = frame()
+            except Exception:
+                # An encoder bug must not end the sender and silently stall
+                # a connected client; skip this frame and send the next one.
+                self.failed_frames += 1
+                logger.exception("Failed to encode scene_state frame")
+                return
+            await self.websocket.send(message)
+            self.sent_frames += 1
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._wake.wait()
+                self._wake.clear()
+                if self._overflowed:
+                    logger.warning(
+                        "Closing client with {} unsent control messages",
+                        len(self._control),
+                    )
+                    await self.websocket.close(
+                        code=1013, reason="outbound queue full"
+                    )
+                    return
+                await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pragma: no cover - network transport failure path
+            logger.debug("Client send failed; stopping its sender")
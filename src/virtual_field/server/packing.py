@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import numpy as np
+
+from virtual_field.core.state import ArmState, SphereEntity, Transform
+
+# Flat numeric records for arm and sphere state, written into caller-owned
+# buffers of any float dtype. Ids travel separately. Used by the shard frames in
+# ``sharding`` and by binary ``scene_state`` frames.
+
+# Per-arm header: node/radius/length/director/contact counts, base and tip
+# poses (translation + quaternion each).
+ARM_HEADER_SIZE = 5 + 7 + 7
+# Per-sphere record: translation, radius, color, visible flag.
+SPHERE_RECORD_SIZE = 3 + 1 + 3 + 1
+
+
+def _check_capacity(buffer: np.ndarray, end: int) -> None:
+    if end > buffer.shape[0]:
+        raise ValueError(
+            f"frame capacity exceeded: need {end} floats, "
+            f"have {buffer.shape[0]}"
+        )
+
+
+def packed_arm_size(arm: ArmState) -> int:
+    """Number of values :func:`pack_arm_state` writes for ``arm``."""
+    return (
+        ARM_HEADER_SIZE
+        + 3 * len(arm.centerline)
+        + len(arm.radii)
+        + len(arm.element_lengths)
+        + 9 * len(arm.directors)
+        + 3 * len(arm.contact_points)
+    )
+
+
+def pack_arm_state(buffer: np.ndarray, offset: int, arm: ArmState) -> int:
+    """Write the numeric part of ``arm`` into ``buffer`` at ``offset``.
+
+    Returns the offset just past the written record. Ids are not packed; the
+    caller ships them alongside the offset.
+    """
+    n_nodes = len(arm.centerline)
+    n_radii = len(arm.radii)
+    n_lengths = len(arm.element_lengths)
+    n_directors = len(arm.directors)
+    n_contacts = len(arm.contact_points)
+    end = offset + packed_arm_size(arm)
+    _check_capacity(buffer, end)
+
+    buffer[offset : offset + 5] = (
+        n_nodes,
+        n_radii,
+        n_lengths,
+        n_directors,
+        n_contacts,
+    )
+    cursor = offset + 5
+    for pose in (arm.base, arm.tip):
+        buffer[cursor : cursor + 3] = pose.translation
+        buffer[cursor + 3 : cursor + 7] = pose.rotation_xyzw
+        cursor += 7
+    for values, size in (
+        (arm.centerline, 3 * n_nodes),
+        (arm.radii, n_radii),
+        (arm.element_lengths, n_lengths),
+        (arm.directors, 9 * n_directors),
+        (arm.contact_points, 3 * n_contacts),
+    ):
+        if size:
+            buffer[cursor : cursor + size] = np.asarray(
+                values, dtype=np.float64
+            ).ravel()
+        cursor += size
+    return end
+
+
+def unpack_arm_state(
+    buffer: np.ndarray, offset: int, arm_id: str, owner_user_id: str | None
+) -> ArmState:
+    """Rebuild an ``ArmState`` written by :func:`pack_arm_state`."""
+    n_nodes, n_radii, n_lengths, n_directors, n_contacts = (
+        int(value) for value in buffer[offset : offset + 5]
+    )
+    cursor = offset + 5
+    poses = []
+    for _ in range(2):
+        poses.append(
+            Transform(
+                translation=buffer[cursor : cursor + 3].tolist(),
+                rotation_xyzw=buffer[cursor + 3 : cursor + 7].tolist(),
+            )
+        )
+        cursor += 7
+
+    def take(size: int) -> np.ndarray:
+        nonlocal cursor
+        values = buffer[cursor : cursor + size]
+        cursor += size
+        return values
+
+    return ArmState(
+        arm_id=arm_id,
+        owner_user_id=owner_user_id,
+        base=poses[0],
+        tip=poses[1],
+        centerline=take(3 * n_nodes).reshape(n_nodes, 3).tolist(),
+        radii=take(n_radii).tolist(),
+        element_lengths=take(n_lengths).tolist(),
+        directors=take(9 * n_directors).reshape(n_directors, 3, 3).tolist(),
+        contact_points=take(3 * n_contacts).reshape(n_contacts, 3).tolist(),
+    )
+
+
+def pack_sphere(buffer: np.ndarray, offset: int, sphere: SphereEntity) -> int:
+    """Write ``sphere`` into ``buffer`` and return the next free offset."""
+    end = offset + SPHERE_RECORD_SIZE
+    _check_capacity(buffer, end)
+    buffer[offset : offset + 3] = sphere.translation
+    buffer[offset + 3] = sphere.radius
+    buffer[offset + 4 : offset + 7] = sphere.color_rgb
+    buffer[offset + 7] = 1.0 if sphere.visible else 0.0
+    return end
+
+
+def unpack_sphere(
+    buffer: np.ndarray, offset: int, sphere_id: str, owner_id: str
+) -> SphereEntity:
+    """Rebuild a ``SphereEntity`` written by :func:`pack_sphere`."""
+    return SphereEntity(
+        sphere_id=sphere_id,
+        owner_id=owner_id,
+        translation=buffer[offset : offset + 3].tolist(),
+        radius=float(buffer[offset + 3]),
+        color_rgb=buffer[offset + 4 : offset + 7].tolist(),
+        visible=bool(buffer[offset + 7] > 0.5),
+    )
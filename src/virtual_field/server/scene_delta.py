@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from typing import Any
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from virtual_field.core.state import JSONDict, SceneState
+
+# Entity collections that are diffed by id. ``user_arms``, ``timestamp`` and
+# ``haptics`` are small and always sent as-is.
+DELTA_ENTITY_KINDS = ("arms", "scenery", "meshes", "overlay_points", "spheres")
+
+SceneEntities = dict[str, dict[str, JSONDict]]
+
+
+def scene_state_entities(state: SceneState) -> SceneEntities:
+    """Serialize every diffable entity of ``state`` once, keyed by kind and id.
+
+    Computed once per tick and shared by all delta clients.
+    """
+    return {
+        "arms": {arm_id: arm.to_dict() for arm_id, arm in state.arms.items()},
+        "scenery": {
+            name: transform.to_dict()
+            for name, transform in state.scenery.items()
+        },
+        "meshes": {
+            mesh_id: mesh.to_dict() for mesh_id, mesh in state.meshes.items()
+        },
+        "overlay_points": {
+            overlay_id: overlay.to_dict()
+            for overlay_id, overlay in state.overlay_points.items()
+        },
+        "spheres": {
+            sphere_id: sphere.to_dict()
+            for sphere_id, sphere in state.spheres.items()
+        },
+    }
+
+
+def entity_changed(previous: Any, current: Any, tolerance: float) -> bool:
+    """Whether two serialized entities differ by more than ``tolerance``.
+
+    Numbers (including nested numeric lists) are compared by absolute
+    difference; everything else must match exactly.
+    """
+    if previous is current:
+        return False
+    if isinstance(current, dict):
+        if not isinstance(previous, dict) or previous.keys() != current.keys():
+            return True
+        return any(
+            entity_changed(previous[key], value, tolerance)
+            for key, value in current.items()
+        )
+    if isinstance(current, list):
+        if not isinstance(previous, list) or len(previous) != len(current):
+            return True
+        if not current:
+            return False
+        try:
+            previous_array = np.asarray(previous, dtype=np.float64)
+            current_array = np.asarray(current, dtype=np.float64)
+        except (TypeError, ValueError):
+            return any(
+                entity_changed(old, new, tolerance)
+                for old, new in zip(previous, current)
+            )
+        if previous_array.shape != current_array.shape:
+            return True
+        return bool(np.any(np.abs(current_array - previous_array) > tolerance))
+    if isinstance(current, (int, float)) and not isinstance(current, bool):
+        if isinstance(previous, bool) or not isinstance(previous, (int, float)):
+            return True
+        return abs(current - previous) > tolerance
+    return previous != current
+
+
+@dataclass(slots=True)
+class SceneStateDeltaEncoder:
+    """Per-client ``scene_state_delta`` encoder with acknowledged baselines.
+
+    Every frame is diffed against the last frame the client acknowledged with
+    ``scene_state_ack``; unacknowledged frames are never used as a baseline, so
+    a lost or late frame only delays its changes. Entities are sent whole when
+    added or changed beyond ``tolerance`` and listed under ``removed`` when
+    gone. Mesh ``asset_uri`` is omitted when the baseline already has it.
+
+    A keyframe (every entity with its asset, ``removed`` empty) is sent when
+    there is no baseline and every ``keyframe_interval`` frames, so clients
+    recover from any divergence. Its ``baseline_frame_id`` still names the
+    acknowledged baseline, which later deltas use until the keyframe is
+    acknowledged, so clients know which views they can drop.
+
+    Parameters
+    ----------
+    keyframe_interval : int
+        Maximum number of frames between keyframes.
+    tolerance : float
+        Absolute tolerance below which numeric changes are not sent.
+    max_pending : int
+        Number of unacknowledged frames remembered for late acknowledgements.
+    """
+
+    keyframe_interval: int = 72
+    tolerance: float = 1.0e-4
+    max_pending: int = 64
+    _next_frame_id: int = field(init=False, default=1)
+    _frames_since_keyframe: int = field(init=False, default=0)
+    _acked_frame_id: int | None = field(init=False, default=None)
+    _acked: SceneEntities | None = field(init=False, default=None)
+    _pending: dict[int, SceneEntities] = field(init=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be >= 1")
+        if self.tolerance < 0.0:
+            raise ValueError("tolerance must be >= 0")
+        if self.max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+
+    @property
+    def acked_frame_id(self) -> int | None:
+        return self._acked_frame_id
+
+    def encode(self, state: SceneState, entities: SceneEntities) -> JSONDict:
+        """Build the next ``scene_state_delta`` payload.
+
+        Parameters
+        ----------
+        state : SceneState
+            Scene snapshot of this tick.
+        entities : SceneEntities
+            ``scene_state_entities(state)``, shared across clients.
+        """
+        frame_id = self._next_frame_id
+        self._next_frame_id += 1
+        baseline = self._acked
+        keyframe = (
+            baseline is None
+            or self._frames_since_keyframe + 1 >= self.keyframe_interval
+        )
+        self._frames_since_keyframe = (
+            0 if keyframe else self._frames_since_keyframe + 1
+        )
+
+        payload: JSONDict = {
+            "frame_id": frame_id,
+            # On keyframes, the frame the next deltas may still be diffed
+            # against until this one is acknowledged.
+            "baseline_frame_id": self._acked_frame_id,
+            "keyframe": keyframe,
+            "timestamp": state.timestamp,
+            "user_arms": state.user_arms,
+            "haptics": [event.to_dict() for event in state.haptics],
+        }
+        removed: dict[str, list[str]] = {}
+        client_view: SceneEntities = {}
+        for kind in DELTA_ENTITY_KINDS:
+            current = entities[kind]
+            previous = {} if baseline is None else baseline[kind]
+            changed: dict[str, JSONDict] = {}
+            view: dict[str, JSONDict] = {}
+            for entity_id, entity in current.items():
+                old = previous.get(entity_id)
+                if old is not None and not entity_changed(
+                    old, entity, self.tolerance
+                ):
+                    view[entity_id] = old
+                    if keyframe:
+                        changed[entity_id] = old
+                    continue
+                view[entity_id] = entity
+                # Keyframes replace the client view, so they carry assets.
+                changed[entity_id] = self._wire(
+                    kind, entity, None if keyframe else old
+                )
+            payload[kind] = changed
+            if not keyframe:
+                removed[kind] = [
+                    entity_id
+                    for entity_id in previous
+                    if entity_id not in current
+                ]
+            client_view[kind] = view
+        payload["removed"] = removed
+
+        self._pending[frame_id] = client_view
+        while len(self._pending) > self.max_pending:
+            self._pending.pop(next(iter(self._pending)))
+        return payload
+
+    def acknowledge(self, frame_id: int) -> bool:
+        """Adopt ``frame_id`` as the baseline if it is still pending."""
+        view = self._pending.get(frame_id)
+        if view is None:
+            return False
+        self._acked = view
+        self._acked_frame_id = frame_id
+        for pending_id in [key for key in self._pending if key <= frame_id]:
+            self._pending.pop(pending_id)
+        return True
+
+    @staticmethod
+    def _wire(kind: str, entity: JSONDict, old: JSONDict | None) -> JSONDict:
+        if (
+            kind == "meshes"
+            and old is not None
+            and old.get("asset_uri") == entity.get("asset_uri")
+        ):
+            return {
+                key: value
+                for key, value in entity.items()
+                if key != "asset_uri"
+            }
+        return entity
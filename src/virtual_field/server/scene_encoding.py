@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from typing import Any
+
+import json
+import struct
+
+import numpy as np
+
+from virtual_field.core.state import SceneState
+
+from .packing import pack_arm_state, packed_arm_size, unpack_arm_state
+from .schema import BINARY_SCENE_STATE_VERSION, make_message
+
+# Binary ``scene_state`` frame header: magic, layout version, reserved flags,
+# byte length of the JSON section, number of float32 values that follow it.
+BINARY_SCENE_STATE_MAGIC = b"VFSS"
+_BINARY_HEADER = struct.Struct("<4sHHII")
+
+
+class SceneStateFrameEncoder:
+    """Encode one ``scene_state`` tick for many clients.
+
+    Everything except ``meshes`` is identical for all subscribers, so it is
+    encoded once per tick. Each mesh is encoded at most twice (with and without
+    ``asset_uri``), and the per-client mesh object is only rebuilt for clients
+    that still need a full static asset. Clients that are up to date share a
+    single encoded frame.
+
+    The JSON text decodes to the same message as
+    ``make_message("scene_state", state.to_dict_for_client(sent))``; only the
+    position of the ``meshes`` key differs.
+
+    The binary frame (:meth:`encode_binary_for_client`) carries the same
+    content. Per-arm arrays are packed as little-endian float32 records (see
+    :func:`~virtual_field.server.packing.pack_arm_state`) after a small JSON
+    section holding everything else plus the arm layout::
+
+        "VFSS" | u16 version | u16 flags | u32 json_bytes | u32 float_count
+        JSON (space-padded to 4 bytes) | float32[float_count]
+
+    Parameters
+    ----------
+    state : SceneState
+        Scene snapshot to publish.
+    """
+
+    __slots__ = (
+        "_state",
+        "_meshes",
+        "_static_mesh_ids",
+        "_full_fragments",
+        "_stripped_fragments",
+        "_shared",
+        "_head",
+        "_frames",
+        "_binary_head",
+        "_binary_floats",
+        "_binary_frames",
+    )
+
+    def __init__(self, state: SceneState) -> None:
+        self._state = state
+        self._meshes = state.meshes
+        self._static_mesh_ids = frozenset(
+            mesh_id
+            for mesh_id, mesh in state.meshes.items()
+            if mesh.static_asset
+        )
+        self._full_fragments: dict[str, str] = {}
+        self._stripped_fragments: dict[str, str] = {}
+        self._frames: dict[frozenset[str], str] = {}
+        self._binary_frames: dict[frozenset[str], bytes] = {}
+        self._head: str | None = None
+        self._binary_head: str | None = None
+        self._binary_floats: bytes = b""
+
+        self._shared = {
+            "timestamp": state.timestamp,
+            "scenery": {
+                name: transform.to_dict()
+                for name, transform in state.scenery.items()
+            },
+            "user_arms": state.user_arms,
+            "overlay_points": {
+                overlay_id: overlay.to_dict()
+                for overlay_id, overlay in state.overlay_points.items()
+            },
+            "spheres": {
+                sphere_id: sphere.to_dict()
+                for sphere_id, sphere in state.spheres.items()
+            },
+            "haptics": [event.to_dict() for event in state.haptics],
+        }
+
+    def encode(self) -> str:
+        """Encode the JSON frame with every mesh ``asset_uri`` included."""
+        return self._frame(self._static_mesh_ids)
+
+    def encode_for_client(self, sent_static_mesh_asset_ids: set[str]) -> str:
+        """Encode the JSON frame for one client and update its static-asset set.
+
+        Mirrors :meth:`SceneState.to_dict_for_client`: ids of meshes that
+        disappeared are dropped from ``sent_static_mesh_asset_ids`` and static
+        meshes sent in full are added to it.
+        """
+        return self._frame(self._claim_pending(sent_static_mesh_asset_ids))
+
+    def encode_binary_for_client(
+        self, sent_static_mesh_asset_ids: set[str]
+    ) -> bytes:
+        """Encode the binary frame for one client; see :meth:`encode_for_client`."""
+        return self._binary_frame(
+            self._claim_pending(sent_static_mesh_asset_ids)
+        )
+
+    def _claim_pending(
+        self, sent_static_mesh_asset_ids: set[str]
+    ) -> frozenset[str]:
+        sent_static_mesh_asset_ids.intersection_update(self._meshes.keys())
+        pending = self._static_mesh_ids.difference(sent_static_mesh_asset_ids)
+        sent_static_mesh_asset_ids.update(pending)
+        return pending
+
+    def _frame(self, pending_static_ids: frozenset[str]) -> str:
+        frame = self._frames.get(pending_static_ids)
+        if frame is None:
+            if self._head is None:
+                arms = {
+                    arm_id: arm.to_dict()
+                    for arm_id, arm in self._state.arms.items()
+                }
+                payload = {"arms": arms, **self._shared}
+                envelope = json.dumps(make_message("scene_state", {}))
+                # ``envelope`` ends with the empty payload ``{}}``; splice the
+                # shared payload in and leave it open for the ``meshes`` member.
+                self._head = envelope[:-3] + json.dumps(payload)[:-1]
+            meshes = self._meshes_json(pending_static_ids)
+            frame = f'{self._head}, "meshes": {meshes}}}}}'
+            self._frames[pending_static_ids] = frame
+        return frame
+
+    def _binary_frame(self, pending_static_ids: frozenset[str]) -> bytes:
+        frame = self._binary_frames.get(pending_static_ids)
+        if frame is None:
+            if self._binary_head is None:
+                self._pack_binary_arms()
+            meshes = self._meshes_json(pending_static_ids)
+            text = f'{self._binary_head}, "meshes": {meshes}}}'.encode()
+            text += b" " * (-len(text) % 4)
+            frame = (
+                _BINARY_HEADER.pack(
+                    BINARY_SCENE_STATE_MAGIC,
+                    BINARY_SCENE_STATE_VERSION,
+                    0,
+                    len(text),
+                    len(self._binary_floats) // 4,
+                )
+                + text
+                + self._binary_floats
+            )
+            self._binary_frames[pending_static_ids] = frame
+        return frame
+
+    def _pack_binary_arms(self) -> None:
+        arms = self._state.arms
+        values = np.empty(
+            sum(packed_arm_size(arm) for arm in arms.values()),
+            dtype="<f4",
+        )
+        layout = []
+        offset = 0
+        for arm_id, arm in arms.items():
+            layout.append(
+                {
+                    "arm_id": arm_id,
+                    "owner_user_id": arm.owner_user_id,
+                    "offset": offset,
+                }
+            )
+            offset = pack_arm_state(values, offset, arm)
+        self._binary_floats = values.tobytes()
+        head = json.dumps({"arm_layout": layout, **self._shared})
+        self._binary_head = head[:-1]
+
+    def _meshes_json(self, pending_static_ids: frozenset[str]) -> str:
+        members = ", ".join(
+            self._mesh_fragment(mesh_id, pending_static_ids)
+            for mesh_id in self._meshes
+        )
+        return f"{{{members}}}"
+
+    def _mesh_fragment(
+        self, mesh_id: str, pending_static_ids: frozenset[str]
+    ) -> str:
+        if (
+            mesh_id in self._static_mesh_ids
+            and mesh_id not in pending_static_ids
+        ):
+            cache = self._stripped_fragments
+            include_asset_uri = False
+        else:
+            cache = self._full_fragments
+            include_asset_uri = True
+        fragment = cache.get(mesh_id)
+        if fragment is None:
+            mesh = self._meshes[mesh_id]
+            fragment = (
+                f"{json.dumps(mesh_id)}: "
+                f"{json.dumps(mesh.to_client_dict(include_asset_uri=include_asset_uri))}"
+            )
+            cache[mesh_id] = fragment
+        return fragment
+
+
+def decode_binary_scene_state(frame: bytes) -> dict[str, Any]:
+    """Decode a binary ``scene_state`` frame into a JSON-style payload.
+
+    The result has the same shape as :meth:`SceneState.to_dict`, with arm
+    arrays rounded to float32.
+
+    Raises
+    ------
+    ValueError
+        If the magic or layout version does not match.
+    """
+    magic, version, _, text_length, float_count = _BINARY_HEADER.unpack_from(
+        frame
+    )
+    if magic != BINARY_SCENE_STATE_MAGIC:
+        raise ValueError("not a binary scene_state frame")
+    if version != BINARY_SCENE_STATE_VERSION:
+        raise ValueError(f"unsupported binary scene_state version {version}")
+    text_start = _BINARY_HEADER.size
+    payload = json.loads(frame[text_start : text_start + text_length])
+    values = np.frombuffer(
+        frame,
+        dtype="<f4",
+        count=float_count,
+        offset=text_start + text_length,
+    )
+    payload["arms"] = {
+        entry["arm_id"]: unpack_arm_state(
+            values, entry["offset"], entry["arm_id"], entry["owner_user_id"]
+        ).to_dict()
+        for entry in payload.pop("arm_layout")
+    }
+    return payload
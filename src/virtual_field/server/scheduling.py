@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import time
+from dataclasses import dataclass, field
+
+OVERRUN_POLICIES = ("catch_up", "skip")
+
+
+@dataclass(slots=True)
+class TickStats:
+    """Tick counters of one :class:`FixedRateScheduler` window.
+
+    ``overruns`` counts ticks that finished after the next tick's deadline,
+    ``dropped_ticks`` the deadlines that were abandoned instead of run, and
+    ``last_lag``/``max_lag`` how late (in seconds) a tick finished relative to
+    that deadline.
+    """
+
+    started_at: float | None = None
+    last_tick_at: float | None = None
+    ticks: int = 0
+    overruns: int = 0
+    dropped_ticks: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None or self.last_tick_at is None:
+            return 0.0
+        return max(0.0, self.last_tick_at - self.started_at)
+
+    @property
+    def achieved_hz(self) -> float:
+        elapsed = self.elapsed
+        return self.ticks / elapsed if elapsed > 0.0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "dropped_ticks": self.dropped_ticks,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "elapsed": self.elapsed,
+            "achieved_hz": self.achieved_hz,
+        }
+
+
+@dataclass(slots=True)
+class FixedRateScheduler:
+    """Fixed-timestep scheduler that sleeps until absolute deadlines.
+
+    Tick ``k`` is due at ``start + k * period``. After each tick,
+    :meth:`tick_done` returns the delay until the next deadline, so the cost
+    of the tick itself no longer stretches the period. When a tick finishes
+    past the next deadline it counts as an overrun and ``policy`` decides
+    what happens to the missed deadlines:
+
+    ``"catch_up"``
+        Run the missed ticks back-to-back (zero delay) until the loop is back
+        on schedule. If it falls more than ``max_catch_up`` periods behind,
+        the backlog is dropped and the schedule restarts from now. Use this
+        when every tick must happen, e.g. simulation steps of fixed ``dt``.
+    ``"skip"``
+        Drop every missed deadline, run the next tick immediately and restart
+        the schedule from it. Use this when only the latest tick matters, e.g.
+        publishing snapshots.
+
+    Parameters
+    ----------
+    period : float
+        Target seconds between ticks.
+    policy : str
+        One of :data:`OVERRUN_POLICIES`.
+    max_catch_up : int
+        Largest backlog, in periods, that ``"catch_up"`` tries to recover.
+    clock : Callable[[], float]
+        Monotonic clock in seconds.
+    """
+
+    period: float
+    policy: str = "catch_up"
+    max_catch_up: int = 5
+    clock: Callable[[], float] = time.monotonic
+    stats: TickStats = field(init=False, default_factory=TickStats)
+    _deadline: float | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.period <= 0.0:
+            raise ValueError("period must be positive")
+        if self.policy not in OVERRUN_POLICIES:
+            raise ValueError(
+                f"Unsupported overrun policy: {self.policy}. "
+                f"Expected one of {OVERRUN_POLICIES}"
+            )
+        if self.max_catch_up < 0:
+            raise ValueError("max_catch_up must be >= 0")
+
+    @property
+    def target_hz(self) -> float:
+        return 1.0 / self.period
+
+    def start(self, now: float | None = None) -> None:
+        """Schedule the first tick at ``now`` and reset the statistics."""
+        now = self.clock() if now is None else now
+        self._deadline = now
+        self.stats = TickStats(started_at=now)
+
+    def tick_done(self, now: float | None = None) -> float:
+        """Record the end of a tick and return the delay until the next one.
+
+        Starts the schedule if :meth:`start` was not called.
+        """
+        now = self.clock() if now is None else now
+        if self._deadline is None:
+            self.start(now)
+        stats = self.stats
+        stats.ticks += 1
+        stats.last_tick_at = now
+
+        deadline = self._deadline + self.period
+        lag = now - deadline
+        if lag <= 0.0:
+            self._deadline = deadline
+            stats.last_lag = 0.0
+            return -lag
+
+        stats.overruns += 1
+        stats.last_lag = lag
+        stats.max_lag = max(stats.max_lag, lag)
+        # Deadlines after ``deadline`` that have already passed as well.
+        missed = int(lag // self.period)
+        if self.policy == "catch_up" and missed < self.max_catch_up:
+            self._deadline = deadline
+        else:
+            stats.dropped_ticks += missed
+            self._deadline = now
+        return 0.0
+
+    def roll_stats(self, now: float, interval: float) -> TickStats | None:
+        """Close the statistics window once it spans ``interval`` seconds.
+
+        Returns the finished window and starts a new one, or ``None`` if the
+        current window is still shorter than ``interval``. The schedule
+        itself is not affected.
+        """
+        stats = self.stats
+        if stats.started_at is None or now - stats.started_at < interval:
+            return None
+        self.stats = TickStats(started_at=now)
+        return stats
+
+    def report(self) -> dict[str, Any]:
+        """Current window statistics together with the target rate."""
+        return {
+            "target_hz": self.target_hz,
+            "policy": self.policy,
+            **self.stats.to_dict(),
+        }
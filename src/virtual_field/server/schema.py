@@ -3,6 +3,15 @@ from __future__ import annotations
 from typing import Any
 
 PROTOCOL_VERSION = 1
+# Layout version of binary ``scene_state`` frames. Binary frames are sent as raw
+# websocket binary messages without the JSON envelope, so they carry their own
+# version in the frame header.
+BINARY_SCENE_STATE_VERSION = 1
+# ``hello`` capability a client lists to receive binary ``scene_state`` frames.
+BINARY_SCENE_STATE_CAPABILITY = "binary_scene_state"
+# ``hello`` capability a client lists to receive ``scene_state_delta`` messages
+# (acknowledged with ``scene_state_ack``) instead of full ``scene_state``.
+DELTA_SCENE_STATE_CAPABILITY = "delta_scene_state"
 
 
 def make_message(message_type: str, payload: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+from typing import Any
+
+import multiprocessing as mp
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from virtual_field.core.commands import MultiArmCommand
+from virtual_field.core.state import HapticEvent, MeshEntity, SceneState
+from virtual_field.runtime.mode_registry import get_mode_spec
+
+from .backends import MultiArmPassThroughBackend, build_default_simulation
+from .checkpoints import CheckpointStore
+from .packing import (
+    ARM_HEADER_SIZE,
+    pack_arm_state,
+    pack_sphere,
+    unpack_arm_state,
+    unpack_sphere,
+)
+from .template_pool import SimulationTemplatePool
+
+
+def _pack_frame(
+    backend: MultiArmPassThroughBackend,
+    buffer: np.ndarray,
+    sent_meshes: dict[str, MeshEntity],
+    haptics: list[HapticEvent],
+) -> dict[str, Any]:
+    """Pack a shard's arms and spheres; describe everything else inline.
+
+    Meshes are large and mostly static, so only the ones that differ from
+    ``sent_meshes`` (updated in place) are shipped.
+    """
+    offset = 0
+    arm_layout: list[tuple[str, str | None, int]] = []
+    for arm_id, arm in backend._arms.items():
+        arm_layout.append((arm_id, arm.owner_user_id, offset))
+        offset = pack_arm_state(buffer, offset, arm)
+    sphere_layout: list[tuple[str, str, int]] = []
+    for sphere_id, sphere in backend._spheres.items():
+        sphere_layout.append((sphere_id, sphere.owner_id, offset))
+        offset = pack_sphere(buffer, offset, sphere)
+
+    changed_meshes = []
+    for mesh_id, mesh in backend._meshes.items():
+        if sent_meshes.get(mesh_id) != mesh:
+            changed_meshes.append(mesh)
+            sent_meshes[mesh_id] = MeshEntity.from_dict(mesh.to_dict())
+    removed_meshes = [
+        mesh_id for mesh_id in sent_meshes if mesh_id not in backend._meshes
+    ]
+    for mesh_id in removed_meshes:
+        sent_meshes.pop(mesh_id)
+
+    return {
+        "arms": arm_layout,
+        "spheres": sphere_layout,
+        "user_arms": {
+            user_id: list(arm_ids)
+            for user_id, arm_ids in backend._user_arms.items()
+        },
+        "meshes": changed_meshes,
+        "removed_meshes": removed_meshes,
+        "haptics": haptics,
+    }
+
+
+def _shard_main(
+    connection: Connection,
+    memory_name: str,
+    template_pool_sizes: dict[str, int],
+    checkpoint_dir: str | None = None,
+    checkpoint_interval: float = 5.0,
+) -> None:
+    """Entry point of a shard process.
+
+    Hosts a private :class:`MultiArmPassThroughBackend`, with its own template
+    pool if ``template_pool_sizes`` asks for one and its own checkpoint store
+    if ``checkpoint_dir`` is set, and answers
+    ``register``/``remove``/``reset``/``step``/``close`` requests from the
+    parent.
+    """
+    memory = SharedMemory(name=memory_name)
+    buffer = np.ndarray(
+        (memory.size // 8,), dtype=np.float64, buffer=memory.buf
+    )
+    template_pool = None
+    if any(template_pool_sizes.values()):
+        template_pool = SimulationTemplatePool(
+            build=build_default_simulation, pool_sizes=template_pool_sizes
+        )
+        template_pool.start()
+    checkpoint_store = None
+    if checkpoint_dir is not None:
+        checkpoint_store = CheckpointStore(
+            Path(checkpoint_dir), interval=checkpoint_interval
+        )
+        checkpoint_store.start()
+    backend = MultiArmPassThroughBackend(
+        template_pool=template_pool, checkpoint_store=checkpoint_store
+    )
+    sent_meshes: dict[str, MeshEntity] = {}
+    try:
+        while True:
+            operation, payload = connection.recv()
+            if operation == "close":
+                break
+            try:
+                haptics: list[HapticEvent] = []
+                if operation == "register":
+                    backend.register_user(**payload)
+                elif operation == "remove":
+                    backend.remove_user(payload)
+                elif operation == "reset":
+                    backend.reset_user(payload)
+                elif operation == "step":
+                    dt, command = payload
+                    haptics = backend.step(dt, command).haptics
+                else:
+                    raise ValueError(
+                        f"Unsupported shard operation: {operation}"
+                    )
+                frame = _pack_frame(backend, buffer, sent_meshes, haptics)
+            except Exception:
+                connection.send(("error", traceback.format_exc()))
+            else:
+                connection.send(("ok", frame))
+    finally:
+        backend.close()
+        del buffer
+        memory.close()
+        connection.close()
+
+
+@dataclass(slots=True)
+class _ProcessShard:
+    index: int
+    process: BaseProcess
+    connection: Connection
+    memory: SharedMemory
+    buffer: np.ndarray
+    user_ids: set[str] = field(default_factory=set)
+    arm_ids: set[str] = field(default_factory=set)
+    sphere_ids: set[str] = field(default_factory=set)
+    mesh_ids: set[str] = field(default_factory=set)
+
+    def send(self, operation: str, payload: Any) -> None:
+        self.connection.send((operation, payload))
+
+    def receive(self) -> dict[str, Any]:
+        status, result = self.connection.recv()
+        if status != "ok":
+            raise RuntimeError(
+                f"Simulation shard {self.index} failed:\n{result}"
+            )
+        return result
+
+    def request(self, operation: str, payload: Any) -> dict[str, Any]:
+        self.send(operation, payload)
+        return self.receive()
+
+
+@dataclass(slots=True)
+class ShardedProcessBackend(MultiArmPassThroughBackend):
+    """Backend that runs each user's simulation in a worker process.
+
+    Users are placed on the least-loaded of ``process_count`` shard processes.
+    Every shard hosts its own :class:`MultiArmPassThroughBackend`, so all
+    character modes behave exactly as in-process. :meth:`step` sends each shard
+    its slice of the command, lets all shards step concurrently, and reads the
+    resulting ``ArmState`` and ``SphereEntity`` data back from a per-shard
+    shared-memory block. Meshes and haptics travel over the shard pipe; meshes
+    only when they change.
+
+    Publisher meshes and overlays stay in the parent process. The public
+    interface matches :class:`MultiArmPassThroughBackend`; call :meth:`close`
+    to stop the shard processes.
+
+    Parameters
+    ----------
+    process_count : int
+        Number of shard processes.
+    frame_capacity : int
+        Size of each shard's shared frame, in float64 values.
+    start_method : str
+        ``multiprocessing`` start method for the shard processes.
+    template_pool_sizes : dict[str, int]
+        Ready simulations kept per character mode by each shard's
+        :class:`SimulationTemplatePool`; empty disables pooling.
+    checkpoint_dir : str | None
+        Directory of the shards' :class:`CheckpointStore`, shared by all
+        shards; ``None`` disables checkpointing.
+    checkpoint_interval : float
+        Simulated seconds between checkpoints.
+    """
+
+    process_count: int = 2
+    frame_capacity: int = 1 << 20
+    start_method: str = "spawn"
+    template_pool_sizes: dict[str, int] = field(default_factory=dict)
+    checkpoint_dir: str | None = None
+    checkpoint_interval: float = 5.0
+    _shards: list[_ProcessShard] = field(init=False, default_factory=list)
+    _user_shard: dict[str, _ProcessShard] = field(
+        init=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        if self.process_count < 1:
+            raise ValueError("process_count must be >= 1")
+        if self.frame_capacity < ARM_HEADER_SIZE:
+            raise ValueError("frame_capacity is too small for one arm")
+
+    def register_user(
+        self,
+        user_id: str,
+        character_mode: str,
+        requested_arm_count: int | None = None,
+        arm_spacing: float = 0.3,
+        base_x: float = 0.0,
+        base_y: float = 1.0,
+        base_z: float = -0.15,
+        checkpointed: bool = True,
+    ) -> list[str]:
+        """Register a user on the least-loaded shard and allocate arm ids.
+
+        See :meth:`MultiArmPassThroughBackend.register_user`.
+        """
+        if user_id in self._user_arms:
+            logger.warning(
+                f"User {user_id} already registered with arm ids {self._user_arms[user_id]}"
+            )
+            return self._user_arms[user_id]
+        if get_mode_spec(character_mode) is None:
+            raise ValueError(f"Unsupported character mode: {character_mode}")
+
+        self._ensure_started()
+        shard = min(self._shards, key=lambda item: len(item.user_ids))
+        frame = shard.request(
+            "register",
+            {
+                "user_id": user_id,
+                "character_mode": character_mode,
+                "requested_arm_count": requested_arm_count,
+                "arm_spacing": arm_spacing,
+                "base_x": base_x,
+                "base_y": base_y,
+                "base_z": base_z,
+                "checkpointed": checkpointed,
+            },
+        )
+        shard.user_ids.add(user_id)
+        self._user_shard[user_id] = shard
+        self._user_mode[user_id] = character_mode
+        self._merge_frame(shard, frame)
+        logger.debug("User {} placed on shard {}", user_id, shard.index)
+        return list(self._user_arms[user_id])
+
+    def reset_user(self, user_id: str) -> list[str]:
+        """Reset a user's simulation in place on its shard.
+
+        See :meth:`MultiArmPassThroughBackend.reset_user`.
+        """
+        shard = self._user_shard.get(user_id)
+        if shard is None:
+            raise ValueError(f"User {user_id} is not registered")
+        self._merge_frame(shard, shard.request("reset", user_id))
+        # The shard republishes its own meshes; drop the ones added here.
+        for mesh_id, mesh in list(self._meshes.items()):
+            if mesh.owner_id == user_id and mesh_id not in shard.mesh_ids:
+                self.remove_mesh(mesh_id)
+        self.remove_owner_overlay_points(user_id)
+        return list(self._user_arms[user_id])
+
+    def remove_user(self, user_id: str) -> None:
+        """Remove a user from its shard and from the merged scene."""
+        shard = self._user_shard.pop(user_id, None)
+        if shard is not None:
+            shard.user_ids.discard(user_id)
+            self._merge_frame(shard, shard.request("remove", user_id))
+        arm_ids = self._user_arms.pop(user_id, [])
+        for arm_id in arm_ids:
+            self._arms.pop(arm_id, None)
+        self._user_mode.pop(user_id, None)
+        self.remove_owner_meshes(user_id)
+        self.remove_owner_overlay_points(user_id)
+        self.remove_owner_spheres(user_id)
+
+    def step(self, dt: float, command: MultiArmCommand | None) -> SceneState:
+        """Step all shards concurrently and merge their frames."""
+        self._timestamp += max(0.0, dt)
+        active_shards = [shard for shard in self._shards if shard.user_ids]
+        for shard in active_shards:
+            shard.send("step", (dt, self._command_for_shard(command, shard)))
+        haptics: list[HapticEvent] = []
+        for shard in active_shards:
+            frame = shard.receive()
+            self._merge_frame(shard, frame)
+            haptics.extend(frame["haptics"])
+        self._haptics = haptics
+
+        return SceneState(
+            timestamp=self._timestamp,
+            arms=self._arms,
+            user_arms=self._user_arms,
+            meshes=self._meshes,
+            overlay_points=self._overlay_points,
+            spheres=self._spheres,
+            haptics=haptics,
+        )
+
+    def close(self) -> None:
+        """Stop the shard processes and release their shared memory."""
+        for shard in self._shards:
+            try:
+                shard.send("close", None)
+            except (BrokenPipeError, OSError):  # pragma: no cover
+                pass
+        for shard in self._shards:
+            shard.process.join(timeout=5.0)
+            if shard.process.is_alive():  # pragma: no cover - stuck shard
+                shard.process.terminate()
+            shard.connection.close()
+            shard.buffer = np.empty(0, dtype=np.float64)
+            shard.memory.close()
+            shard.memory.unlink()
+        self._shards.clear()
+        self._user_shard.clear()
+
+    def _ensure_started(self) -> None:
+        if self._shards:
+            return
+        context = mp.get_context(self.start_method)
+        for index in range(self.process_count):
+            memory = SharedMemory(create=True, size=8 * self.frame_capacity)
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_shard_main,
+                args=(
+                    child_connection,
+                    memory.name,
+                    dict(self.template_pool_sizes),
+                    self.checkpoint_dir,
+                    self.checkpoint_interval,
+                ),
+                name=f"virtual-field-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._shards.append(
+                _ProcessShard(
+                    index=index,
+                    process=process,
+                    connection=parent_connection,
+                    memory=memory,
+                    buffer=np.ndarray(
+                        (self.frame_capacity,),
+                        dtype=np.float64,
+                        buffer=memory.buf,
+                    ),
+                )
+            )
+        logger.debug("Started {} simulation shards", self.process_count)
+
+    def _command_for_shard(
+        self, command: MultiArmCommand | None, shard: _ProcessShard
+    ) -> MultiArmCommand | None:
+        if command is None:
+            return None
+        return MultiArmCommand(
+            timestamp=command.timestamp,
+            commands={
+                arm_id: arm_command
+                for arm_id, arm_command in command.commands.items()
+                if arm_id in shard.arm_ids
+            },
+            head_pose=command.head_pose,
+            actions=command.actions,
+        )
+
+    def _merge_frame(self, shard: _ProcessShard, frame: dict[str, Any]) -> None:
+        arm_ids: set[str] = set()
+        for arm_id, owner_user_id, offset in frame["arms"]:
+            self._arms[arm_id] = unpack_arm_state(
+                shard.buffer, offset, arm_id, owner_user_id
+            )
+            arm_ids.add(arm_id)
+        for arm_id in shard.arm_ids - arm_ids:
+            self._arms.pop(arm_id, None)
+        shard.arm_ids = arm_ids
+
+        sphere_ids: set[str] = set()
+        for sphere_id, owner_id, offset in frame["spheres"]:
+            self._spheres[sphere_id] = unpack_sphere(
+                shard.buffer, offset, sphere_id, owner_id
+            )
+            sphere_ids.add(sphere_id)
+        for sphere_id in shard.sphere_ids - sphere_ids:
+            self._spheres.pop(sphere_id, None)
+        shard.sphere_ids = sphere_ids
+
+        for mesh in frame["meshes"]:
+            self.add_or_update_mesh(mesh)
+            shard.mesh_ids.add(mesh.mesh_id)
+        removed_mesh = False
+        for mesh_id in frame["removed_meshes"]:
+            if mesh_id in shard.mesh_ids:
+                self._meshes.pop(mesh_id, None)
+                shard.mesh_ids.discard(mesh_id)
+                removed_mesh = True
+        if removed_mesh:
+            self._prune_assets()
+
+        for user_id in shard.user_ids:
+            if user_id in frame["user_arms"]:
+                self._user_arms[user_id] = frame["user_arms"][user_id]
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import Any
+
+import threading
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from virtual_field.core.commands import MultiArmCommand
+from virtual_field.core.state import SceneState
+
+from .backends import MultiArmPassThroughBackend
+from .scheduling import FixedRateScheduler
+
+STEPPING_MODES = ("inline", "thread")
+
+
+@dataclass(slots=True)
+class SimulationStepWorker:
+    """Step a backend on a dedicated thread, away from the asyncio loop.
+
+    The event loop and the worker exchange data through two single-slot
+    references: :meth:`submit` replaces the pending command and
+    :meth:`latest_snapshot` returns the most recent
+    :meth:`~virtual_field.server.backends.MultiArmPassThroughBackend.snapshot`.
+    Neither side waits on the other for these handoffs; older commands and
+    snapshots are simply overwritten. While inactive, the worker keeps
+    refreshing the snapshot without stepping.
+
+    Structural backend changes (user registration, publisher meshes, ...) must
+    be made while holding :attr:`lock`, which the worker also holds for the
+    duration of one ``backend.step`` call.
+
+    Ticks follow a :class:`~virtual_field.server.scheduling.FixedRateScheduler`
+    with ``overrun_policy``, so the step cost does not lower the rate below
+    ``1 / dt``; :meth:`tick_stats` reports how well it keeps up.
+
+    Parameters
+    ----------
+    backend : MultiArmPassThroughBackend
+        Backend to step.
+    dt : float
+        Simulated time per step, also used as the wall-clock step period.
+    lock : threading.RLock
+        Lock guarding the backend. Pass the owner's lock to share it.
+    overrun_policy : str
+        What to do with missed ticks; see
+        :data:`~virtual_field.server.scheduling.OVERRUN_POLICIES`.
+    """
+
+    backend: MultiArmPassThroughBackend
+    dt: float
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    overrun_policy: str = "catch_up"
+    _pending: tuple[bool, MultiArmCommand | None] = field(
+        init=False, default=(False, None)
+    )
+    _snapshot: SceneState | None = field(init=False, default=None)
+    _step_count: int = field(init=False, default=0)
+    _stop_event: threading.Event = field(
+        init=False, default_factory=threading.Event
+    )
+    _thread: threading.Thread | None = field(init=False, default=None)
+    _scheduler: FixedRateScheduler = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.dt <= 0.0:
+            raise ValueError("dt must be positive")
+        self._scheduler = FixedRateScheduler(
+            period=self.dt, policy=self.overrun_policy
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def active(self) -> bool:
+        """Whether the most recent submission asked the worker to step."""
+        return self._pending[0]
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    def tick_stats(self) -> dict[str, Any]:
+        """Tick statistics of the worker thread's schedule."""
+        return self._scheduler.report()
+
+    def submit(
+        self, command: MultiArmCommand | None, *, active: bool = True
+    ) -> None:
+        """Replace the pending command consumed by the next step.
+
+        Parameters
+        ----------
+        command : MultiArmCommand | None
+            Latest command, or ``None`` to step without controller input.
+        active : bool
+            If ``False`` the worker only refreshes the snapshot until the next
+            active submission.
+        """
+        self._pending = (active, command)
+
+    def latest_snapshot(self) -> SceneState | None:
+        """Return the most recent snapshot, or ``None`` before the first tick."""
+        return self._snapshot
+
+    def step_once(self) -> SceneState:
+        """Run one tick with the pending command and publish its snapshot.
+
+        Steps the backend only if the pending submission is active.
+        """
+        active, command = self._pending
+        with self.lock:
+            if active:
+                self.backend.step(self.dt, command)
+            snapshot = self.backend.snapshot()
+        self._snapshot = snapshot
+        if active:
+            self._step_count += 1
+        return snapshot
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="virtual-field-step", daemon=True
+        )
+        self._thread.start()
+        logger.debug("Simulation step worker started dt={}", self.dt)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():  # pragma: no cover - stuck step guard
+                logger.warning("Simulation step worker did not stop in time")
+        self._thread = None
+        logger.debug(
+            "Simulation step worker stopped steps={}", self._step_count
+        )
+
+    def _run(self) -> None:
+        self._scheduler.start()
+        while not self._stop_event.is_set():
+            try:
+                self.step_once()
+            except Exception:  # pragma: no cover - keep worker alive
+                logger.exception("Simulation step worker failed to step")
+            self._stop_event.wait(self._scheduler.tick_done())
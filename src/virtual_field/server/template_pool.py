@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator
+
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field, replace
+
+from loguru import logger
+
+from virtual_field.core.commands import ArmCommand, MultiArmCommand
+from virtual_field.core.state import (
+    ArmState,
+    HapticEvent,
+    MeshEntity,
+    SphereEntity,
+)
+from virtual_field.runtime.mode_base import SimulationBase
+
+SimulationBuilder = Callable[[str, str], SimulationBase]
+
+
+@dataclass(slots=True)
+class PooledSimulation:
+    """A pool template serving ``user_id``.
+
+    Templates are built for a placeholder user id, and every arm, mesh and
+    sphere id of a simulation starts with its user id. The backend-facing
+    methods below swap that prefix on the way in and out, so the backend sees
+    the same ids as for a simulation built for ``user_id``. Other attributes
+    are passed through to ``simulation`` unchanged, with template ids.
+    """
+
+    simulation: SimulationBase
+    user_id: str
+    arm_ids: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.arm_ids = tuple(
+            self._to_user(arm_id) for arm_id in self.simulation.arm_ids
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.simulation, name)
+
+    def _to_user(self, identifier: str) -> str:
+        prefix = self.simulation.user_id
+        if identifier.startswith(prefix):
+            return self.user_id + identifier[len(prefix) :]
+        return identifier
+
+    def _to_template(self, identifier: str) -> str:
+        if identifier.startswith(self.user_id):
+            return self.simulation.user_id + identifier[len(self.user_id) :]
+        return identifier
+
+    def _owned_by_template(self, owner_id: str | None) -> str | None:
+        return self.user_id if owner_id == self.simulation.user_id else owner_id
+
+    def _mesh_to_user(self, mesh: MeshEntity) -> MeshEntity:
+        return replace(
+            mesh,
+            mesh_id=self._to_user(mesh.mesh_id),
+            owner_id=self._owned_by_template(mesh.owner_id),
+        )
+
+    def _command_to_template(self, command: ArmCommand) -> ArmCommand:
+        return replace(command, arm_id=self._to_template(command.arm_id))
+
+    # --- Backend contract ---
+
+    @property
+    def mesh_version(self) -> int:
+        return self.simulation.mesh_version
+
+    def step(self, dt: float) -> None:
+        self.simulation.step(dt)
+
+    def close(self) -> None:
+        self.simulation.close()
+
+    def handle_commands(
+        self,
+        arm_id: str,
+        controller_command: ArmCommand,
+        previous_controller_command: ArmCommand | None = None,
+    ) -> None:
+        self.simulation.handle_commands(
+            self._to_template(arm_id),
+            self._command_to_template(controller_command),
+            previous_controller_command=(
+                None
+                if previous_controller_command is None
+                else self._command_to_template(previous_controller_command)
+            ),
+        )
+
+    def handle_command_inactive(self, arm_id: str) -> None:
+        self.simulation.handle_command_inactive(self._to_template(arm_id))
+
+    def handle_frame_command(self, command: MultiArmCommand) -> None:
+        self.simulation.handle_frame_command(
+            replace(
+                command,
+                commands={
+                    self._to_template(arm_id): self._command_to_template(
+                        arm_command
+                    )
+                    for arm_id, arm_command in command.commands.items()
+                },
+            )
+        )
+
+    def arm_states(self) -> dict[str, ArmState]:
+        states = {}
+        for state in self.simulation.arm_states().values():
+            state = replace(
+                state,
+                arm_id=self._to_user(state.arm_id),
+                owner_user_id=self._owned_by_template(state.owner_user_id),
+            )
+            states[state.arm_id] = state
+        return states
+
+    def mesh_entities(self) -> list[MeshEntity]:
+        return [
+            self._mesh_to_user(mesh) for mesh in self.simulation.mesh_entities()
+        ]
+
+    def changed_mesh_entities(self, since_version: int) -> list[MeshEntity]:
+        return [
+            self._mesh_to_user(mesh)
+            for mesh in self.simulation.changed_mesh_entities(since_version)
+        ]
+
+    def sphere_entities(self) -> list[SphereEntity]:
+        return [
+            replace(
+                sphere,
+                sphere_id=self._to_user(sphere.sphere_id),
+                owner_id=self._owned_by_template(sphere.owner_id),
+            )
+            for sphere in self.simulation.sphere_entities()
+        ]
+
+    def haptic_events(self) -> list[HapticEvent]:
+        return [
+            replace(event, arm_id=self._to_user(event.arm_id))
+            for event in self.simulation.haptic_events()
+        ]
+
+
+@dataclass(slots=True)
+class SimulationTemplatePool:
+    """Per-mode pool of built, finalized and warmed simulations.
+
+    Building a simulation allocates the rods, finalizes the simulator, loads
+    meshes and grids, and compiles kernels on their first call. That takes
+    seconds. Registering a user on the backend lock stalls every other
+    user's simulation for that time. The pool builds templates ahead of
+    time and steps each one once, so kernels are compiled and caches are
+    warm. :meth:`take` hands a ready template out as a
+    :class:`PooledSimulation`. A background thread started by :meth:`start`
+    refills the pool; :meth:`fill` does so synchronously.
+
+    Parameters
+    ----------
+    build : SimulationBuilder
+        ``build(user_id, character_mode)`` returns a new simulation of the
+        mode with the backend's default layout.
+    pool_sizes : dict[str, int]
+        Number of ready templates kept per character mode.
+    """
+
+    build: SimulationBuilder
+    pool_sizes: dict[str, int]
+    _ready: dict[str, deque[SimulationBase]] = field(
+        init=False, default_factory=dict
+    )
+    _condition: threading.Condition = field(
+        init=False, default_factory=threading.Condition
+    )
+    _thread: threading.Thread | None = field(init=False, default=None)
+    _closed: bool = field(init=False, default=False)
+    _template_numbers: Iterator[int] = field(
+        init=False, default_factory=itertools.count
+    )
+
+    def __post_init__(self) -> None:
+        for character_mode, size in self.pool_sizes.items():
+            if size < 0:
+                raise ValueError(
+                    f"Pool size of {character_mode} must be >= 0, got {size}"
+                )
+        self.pool_sizes = dict(self.pool_sizes)
+        self._ready = {mode: deque() for mode in self.pool_sizes}
+
+    def ready_count(self, character_mode: str) -> int:
+        with self._condition:
+            return len(self._ready.get(character_mode, ()))
+
+    def start(self) -> None:
+        """Start the background refill thread."""
+        if self._thread is not None or not any(self.pool_sizes.values()):
+            return
+        self._thread = threading.Thread(
+            target=self._refill_loop,
+            name="virtual-field-template-pool",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def fill(self) -> None:
+        """Build every missing template now, in the calling thread."""
+        while (character_mode := self._missing_mode()) is not None:
+            template = self._build_template(character_mode)
+            with self._condition:
+                if template is not None:
+                    self._ready[character_mode].append(template)
+
+    def take(
+        self, character_mode: str, user_id: str
+    ) -> PooledSimulation | None:
+        """Hand out a ready template for ``user_id``, or ``None`` if empty."""
+        with self._condition:
+            ready = self._ready.get(character_mode)
+            if not ready:
+                return None
+            template = ready.popleft()
+            self._condition.notify()
+        logger.debug(
+            "Serving user {} from a {} template", user_id, character_mode
+        )
+        return PooledSimulation(simulation=template, user_id=user_id)
+
+    def close(self) -> None:
+        """Stop refilling and release the unused templates."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._condition:
+            templates = [
+                template for ready in self._ready.values() for template in ready
+            ]
+            for ready in self._ready.values():
+                ready.clear()
+        for template in templates:
+            template.close()
+
+    def _missing_mode(self) -> str | None:
+        with self._condition:
+            if self._closed:
+                return None
+            for character_mode, size in self.pool_sizes.items():
+                if len(self._ready[character_mode]) < size:
+                    return character_mode
+            return None
+
+    def _build_template(self, character_mode: str) -> SimulationBase | None:
+        template_user_id = f"__template{next(self._template_numbers)}__"
+        try:
+            template = self.build(template_user_id, character_mode)
+            template.step(template.dt_internal)
+            template.arm_states()
+        except Exception:
+            # A mode that cannot be built now will not be built on retry
+            # either; stop pooling it and leave registration to the backend.
+            logger.exception(
+                "Could not build a {} template; pooling disabled for it",
+                character_mode,
+            )
+            with self._condition:
+                self.pool_sizes[character_mode] = 0
+            return None
+        return template
+
+    def _refill_loop(self) -> None:
+        while True:
+            with self._condition:
+                while (character_mode := self._missing_mode()) is None:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+            template = self._build_template(character_mode)
+            if template is None:
+                continue
+            with self._condition:
+                if not self._closed:
+                    self._ready[character_mode].append(template)
+                    continue
+            template.close()
+            return
@@ -113,6 +113,7 @@ async def _exercise_publisher_mesh_smoke() -> None:
         sim_hz=120.0,
         publish_hz=30.0,
         ssl_context=None,
+        serve_assets=True,
     )
     await server.start()
     try:
@@ -168,6 +169,19 @@ async def _exercise_publisher_mesh_smoke() -> None:
             mesh_ack = await _recv_message_type(publisher, "mesh_ack")
             assert mesh_ack["payload"]["status"] == "added"
             assert mesh_ack["version"] == 1
+
+            asset_uri = server.backend._meshes["tree_smoke"].asset_uri
+            assert asset_uri.startswith("/assets/")
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", server.port
+            )
+            writer.write(
+                f"GET {asset_uri} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode()
+            )
+            response = await reader.read()
+            writer.close()
+            assert response.startswith(b"HTTP/1.1 200")
+            assert response.endswith(b"\r\n\r\nglTF")
     finally:
         await server.stop()
 
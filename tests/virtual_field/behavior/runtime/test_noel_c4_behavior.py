@@ -23,15 +23,9 @@ def test_backend_registers_and_cleans_noel_c4_meshes() -> None:
     backend = MultiArmPassThroughBackend()
     arm_ids = backend.register_user("user_noel", character_mode="noel-c4")
     assert len(arm_ids) == 2
-    obstacle_mesh_ids = [
-        mesh_id
-        for mesh_id in backend._meshes
-        if mesh_id.startswith("user_noel_noel_c4_obstacle_")
-    ]
-    for mesh_id in obstacle_mesh_ids:
-        mesh = backend._meshes[mesh_id]
-        assert mesh.owner_id == "user_noel"
-        assert mesh.asset_uri.startswith("data:model/gltf+json;base64,")
+    mesh = backend._meshes["user_noel_noel_c4_obstacles"]
+    assert mesh.owner_id == "user_noel"
+    assert mesh.asset_uri.startswith("data:model/gltf-binary;base64,")
 
     backend.remove_user("user_noel")
     assert not any(
@@ -0,0 +1,313 @@
+import asyncio
+import base64
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from virtual_field.core.state import (
+    ArmState,
+    MeshEntity,
+    SceneState,
+    SphereEntity,
+    Transform,
+)
+from virtual_field.server.app import VRWebSocketServer
+from virtual_field.server.outbound import ClientSendQueue
+from virtual_field.server.scene_encoding import SceneStateFrameEncoder
+
+pytestmark = [
+    pytest.mark.behavior,
+    pytest.mark.skipif(shutil.which("node") is None, reason="node is required"),
+]
+
+CODEC = (
+    Path(__file__).parents[4] / "VR" / "client" / "app" / "scene_state_codec.js"
+)
+
+# Line-oriented stand-in for the websocket handlers of create_app.js: each
+# request is either the configured format (answered with the hello
+# capabilities) or a server message (answered with the resulting message and
+# the ack the client would send).
+DRIVER = """
+import { createInterface } from "node:readline";
+import * as codec from "./scene_state_codec.mjs";
+
+const views = new Map();
+for await (const line of createInterface({ input: process.stdin })) {
+  const request = JSON.parse(line);
+  if ("format" in request) {
+    console.log(JSON.stringify(codec.sceneStateCapabilities(request.format)));
+    continue;
+  }
+  const data =
+    request.binary === undefined
+      ? request.text
+      : new Uint8Array(Buffer.from(request.binary, "base64")).buffer;
+  const message = codec.parseServerMessage(data);
+  let ack = null;
+  if (message.type === "scene_state_delta") {
+    ack = codec.sceneStateAck(message.payload.frame_id);
+    message.type = "scene_state";
+    message.payload = codec.applySceneStateDelta(views, message.payload);
+  }
+  console.log(JSON.stringify({ message, ack, views: [...views.keys()] }));
+}
+"""
+
+
+class _Client:
+    """Browser client codec running in node."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        shutil.copy(CODEC, tmp_path / "scene_state_codec.mjs")
+        (tmp_path / "driver.mjs").write_text(DRIVER)
+        self._process = subprocess.Popen(
+            ["node", str(tmp_path / "driver.mjs")],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # Frame ids of the views the client holds after the last message.
+        self.views: list[int] = []
+
+    def _request(self, request: dict) -> Any:
+        assert self._process.stdin is not None
+        assert self._process.stdout is not None
+        self._process.stdin.write(json.dumps(request) + "\n")
+        self._process.stdin.flush()
+        line = self._process.stdout.readline()
+        assert line, "node client exited"
+        return json.loads(line)
+
+    def capabilities(self, format: str | None = None) -> list[str]:
+        return self._request({"format": format})
+
+    def receive(self, frame: str | bytes) -> tuple[dict, dict | None]:
+        if isinstance(frame, bytes):
+            request = {"binary": base64.b64encode(frame).decode("ascii")}
+        else:
+            request = {"text": frame}
+        response = self._request(request)
+        self.views = response["views"]
+        return response["message"], response["ack"]
+
+    def close(self) -> None:
+        assert self._process.stdin is not None
+        self._process.stdin.close()
+        self._process.wait(timeout=10)
+
+
+@pytest.fixture
+def client(tmp_path: Path) -> Iterator[_Client]:
+    node_client = _Client(tmp_path)
+    yield node_client
+    node_client.close()
+
+
+def _scene(tip_z: float = 0.3, with_sphere: bool = True) -> SceneState:
+    arm = ArmState(
+        arm_id="user_1_arm_0",
+        owner_user_id="user_1",
+        base=Transform(translation=[0.1, 1.0, -0.2]),
+        tip=Transform(
+            translation=[0.1, 1.0, tip_z], rotation_xyzw=[0.0, 0.6, 0.0, 0.8]
+        ),
+        centerline=[[0.1, 1.0, -0.2], [0.1, 1.0, 0.05], [0.1, 1.0, tip_z]],
+        radii=[0.02, 0.015],
+        element_lengths=[0.25, 0.25],
+        directors=[
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+            [[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+        ],
+        contact_points=[[0.1, 1.0, tip_z]],
+    )
+    terrain = MeshEntity(
+        mesh_id="terrain",
+        owner_id="user_1",
+        asset_uri="data:model/gltf-binary;base64,Z2xURg==",
+        static_asset=True,
+    )
+    spheres = {}
+    if with_sphere:
+        spheres["ball"] = SphereEntity(
+            sphere_id="ball",
+            owner_id="user_1",
+            translation=[0.0, 1.0, 0.0],
+            radius=0.05,
+        )
+    return SceneState(
+        timestamp=tip_z,
+        arms={arm.arm_id: arm},
+        user_arms={"user_1": [arm.arm_id]},
+        meshes={terrain.mesh_id: terrain},
+        spheres=spheres,
+    )
+
+
+def _connect(server: VRWebSocketServer, capabilities: list[str]) -> object:
+    websocket = object()
+    server._handle_hello(
+        websocket,  # type: ignore[arg-type]
+        {
+            "role": "vr_client",
+            "character_mode": "two-cr",
+            "capabilities": capabilities,
+        },
+    )
+    server._send_queues[websocket] = ClientSendQueue(
+        websocket  # type: ignore[arg-type]
+    )
+    return websocket
+
+
+def _published(server: VRWebSocketServer, websocket: object) -> str | bytes:
+    send_queue = server._send_queues[websocket]
+    frame = send_queue._frame
+    send_queue._frame = None
+    assert frame is not None
+    return frame()
+
+
+def _assert_same_scene(decoded: object, expected: object) -> None:
+    if isinstance(expected, dict):
+        assert isinstance(decoded, dict)
+        assert decoded.keys() == expected.keys()
+        for key, value in expected.items():
+            _assert_same_scene(decoded[key], value)
+    elif isinstance(expected, list):
+        assert isinstance(decoded, list)
+        assert len(decoded) == len(expected)
+        for decoded_item, expected_item in zip(decoded, expected):
+            _assert_same_scene(decoded_item, expected_item)
+    elif isinstance(expected, float):
+        # Arm arrays travel as float32.
+        assert decoded == pytest.approx(expected, abs=1e-6)
+    else:
+        assert decoded == expected
+
+
+def _server() -> VRWebSocketServer:
+    return VRWebSocketServer(
+        ssl_context=None,  # type: ignore[arg-type]
+        host="127.0.0.1",
+        port=0,
+        sim_hz=120.0,
+        publish_hz=30.0,
+    )
+
+
+def test_client_requests_binary_frames_and_decodes_them(
+    client: _Client,
+) -> None:
+    server = _server()
+    websocket = _connect(server, client.capabilities())
+    scene = _scene()
+    server._broadcast_scene_state(scene)
+    frame = _published(server, websocket)
+
+    assert server._sessions[websocket].scene_state_encoding == "binary"
+    assert isinstance(frame, bytes)
+    message, ack = client.receive(frame)
+    assert message["type"] == "scene_state" and ack is None
+    _assert_same_scene(
+        message["payload"],
+        json.loads(SceneStateFrameEncoder(scene).encode())["payload"],
+    )
+
+
+def test_client_json_format_keeps_json_frames(client: _Client) -> None:
+    capabilities = client.capabilities("json")
+    server = _server()
+    websocket = _connect(server, capabilities)
+    scene = _scene()
+    server._broadcast_scene_state(scene)
+    frame = _published(server, websocket)
+
+    assert capabilities == []
+    assert isinstance(frame, str)
+    message, _ = client.receive(frame)
+    assert message == json.loads(SceneStateFrameEncoder(scene).encode())
+
+
+def test_client_applies_and_acknowledges_delta_frames(
+    client: _Client,
+) -> None:
+    server = _server()
+    websocket = _connect(server, client.capabilities("delta"))
+    session = server._sessions[websocket]
+    assert session.scene_state_encoding == "delta"
+
+    def exchange(scene: SceneState) -> tuple[dict, dict]:
+        server._broadcast_scene_state(scene)
+        frame = _published(server, websocket)
+        delta = json.loads(frame)["payload"]
+        message, ack = client.receive(frame)
+        assert message["type"] == "scene_state"
+        assert ack is not None
+        asyncio.run(server._handle_raw_message(websocket, json.dumps(ack)))
+        expected = json.loads(SceneStateFrameEncoder(scene).encode())
+        _assert_same_scene(message["payload"], expected["payload"])
+        assert session.scene_delta.acked_frame_id == delta["frame_id"]
+        return delta, message["payload"]
+
+    keyframe, _ = exchange(_scene())
+    assert keyframe["keyframe"]
+
+    # The tip moves and the ball is gone: only those travel, and the client
+    # keeps the terrain (with its asset) from the acknowledged keyframe.
+    moved = _scene(tip_z=0.4, with_sphere=False)
+    delta, payload = exchange(moved)
+    assert not delta["keyframe"]
+    assert delta["baseline_frame_id"] == keyframe["frame_id"]
+    assert set(delta["arms"]) == {"user_1_arm_0"}
+    assert delta["meshes"] == {}
+    assert delta["removed"]["spheres"] == ["ball"]
+    assert payload["meshes"]["terrain"]["asset_uri"].startswith("data:")
+
+    idle, _ = exchange(moved)
+    assert idle["baseline_frame_id"] == delta["frame_id"]
+    assert idle["arms"] == {} and idle["removed"]["spheres"] == []
+
+
+def test_client_keyframes_keep_assets_and_prune_views(
+    client: _Client,
+) -> None:
+    server = _server()
+    websocket = _connect(server, client.capabilities("delta"))
+    session = server._sessions[websocket]
+    session.scene_delta.keyframe_interval = 3
+
+    def send(scene: SceneState, ack: bool = True) -> tuple[dict, dict]:
+        server._broadcast_scene_state(scene)
+        frame = _published(server, websocket)
+        message, client_ack = client.receive(frame)
+        if ack:
+            asyncio.run(
+                server._handle_raw_message(websocket, json.dumps(client_ack))
+            )
+        expected = json.loads(SceneStateFrameEncoder(scene).encode())
+        _assert_same_scene(message["payload"], expected["payload"])
+        return json.loads(frame)["payload"], message["payload"]
+
+    scenes = [_scene(tip_z=0.3 + 0.1 * step) for step in range(6)]
+    first, _ = send(scenes[0])
+    send(scenes[1])
+    acked, _ = send(scenes[2])
+    # The next keyframe is not acknowledged: the frame after it is diffed
+    # against the last acknowledged frame, whose view the client still has.
+    keyframe, payload = send(scenes[3], ack=False)
+    assert keyframe["keyframe"] and first["keyframe"]
+    assert keyframe["baseline_frame_id"] == acked["frame_id"]
+    assert payload["meshes"]["terrain"]["asset_uri"].startswith("data:")
+    assert acked["frame_id"] in client.views
+    delta, _ = send(scenes[4])
+    assert not delta["keyframe"]
+    assert delta["baseline_frame_id"] == acked["frame_id"]
+
+    # Only frames the server may still diff against are kept.
+    send(scenes[5])
+    assert min(client.views) >= delta["frame_id"]
@@ -0,0 +1,132 @@
+import elastica as ea
+import numpy as np
+import pytest
+
+from virtual_field.runtime.coomm_octopus_simulation import (
+    LEFT_OM_GROUP_INDEX,
+    LM_GROUP_COUNT,
+    LM_GROUP_START_INDEX,
+    RIGHT_OM_GROUP_INDEX,
+    SUCKER_A_MAX,
+    SUCKER_EPS,
+    TM_GROUP_INDEX,
+    _sucker_full_controller_kernel,
+    _sucker_multi_arm_controller_kernel,
+)
+
+pytestmark = pytest.mark.equations
+
+GROUP_COUNT = LEFT_OM_GROUP_INDEX + 1
+
+
+def _reference_activations(
+    rod: ea.CosseratRod, target_pos: np.ndarray, weight: float
+) -> np.ndarray:
+    a_r, a_l, *a_lm = _sucker_full_controller_kernel(
+        rod.position_collection,
+        rod.director_collection[0],
+        rod.director_collection[1],
+        rod.director_collection[2],
+        rod.radius,
+        target_pos,
+        SUCKER_EPS,
+    )
+    activations = np.zeros((GROUP_COUNT, rod.n_elems))
+    for lm_idx in range(LM_GROUP_COUNT):
+        activations[LM_GROUP_START_INDEX + lm_idx] = a_lm[lm_idx]
+    activations[RIGHT_OM_GROUP_INDEX] = a_r
+    activations[LEFT_OM_GROUP_INDEX] = a_l
+    return activations * weight
+
+
+def _bent_rods(n_arms: int, n_elem: int, seed: int) -> list[ea.CosseratRod]:
+    """Randomly bent and twisted arms living in one simulator memory block."""
+
+    class _Simulator(ea.BaseSystemCollection):
+        pass
+
+    rng = np.random.default_rng(seed)
+    simulator = _Simulator()
+    rods = []
+    for arm in range(n_arms):
+        rod = ea.CosseratRod.straight_rod(
+            n_elem,
+            np.array([0.1 * arm, 1.0, 0.0]),
+            np.array([0.0, 0.0, -1.0]),
+            np.array([0.0, -1.0, 0.0]),
+            0.5,
+            0.02,
+            1000.0,
+            youngs_modulus=1.0e6,
+        )
+        rod.position_collection += rng.normal(
+            scale=0.05, size=rod.position_collection.shape
+        )
+        for k in range(n_elem):
+            rod.director_collection[..., k] = np.linalg.qr(
+                rng.normal(size=(3, 3))
+            )[0].T
+        rod.radius *= rng.uniform(0.5, 1.0, size=n_elem)
+        simulator.append(rod)
+        rods.append(rod)
+    simulator.finalize()
+    return rods
+
+
+@pytest.mark.parametrize("n_arms", [1, 2, 5])
+def test_multi_arm_controller_matches_per_arm_kernel(n_arms: int) -> None:
+    rods = _bent_rods(n_arms, 15, seed=n_arms)
+    target_pos = np.array([0.1, 1.2, -0.4])
+    weight = 0.3
+    activations = tuple(np.full((GROUP_COUNT, 15), np.nan) for _ in rods)
+
+    _sucker_multi_arm_controller_kernel(
+        tuple(rod.position_collection for rod in rods),
+        tuple(rod.director_collection for rod in rods),
+        tuple(rod.radius for rod in rods),
+        target_pos,
+        weight,
+        SUCKER_EPS,
+        activations,
+    )
+
+    for rod, activation in zip(rods, activations):
+        expected = _reference_activations(rod, target_pos, weight)
+        np.testing.assert_allclose(activation, expected, rtol=1e-12, atol=1e-15)
+        assert np.all(activation[TM_GROUP_INDEX] == 0.0)
+    # Both muscle sides and some longitudinal muscles are exercised.
+    stacked = np.stack(activations)
+    assert np.any(stacked[:, RIGHT_OM_GROUP_INDEX] > 0.0)
+    assert np.any(stacked[:, LEFT_OM_GROUP_INDEX] > 0.0)
+    assert np.any(stacked[:, LM_GROUP_START_INDEX] > 0.0)
+
+
+def test_multi_arm_controller_on_contiguous_arrays() -> None:
+    rod = ea.CosseratRod.straight_rod(
+        20,
+        np.zeros(3),
+        np.array([0.0, 0.0, 1.0]),
+        np.array([1.0, 0.0, 0.0]),
+        1.0,
+        0.02,
+        1000.0,
+        youngs_modulus=1.0e6,
+    )
+    target_pos = np.array([0.3, 0.2, 0.45])
+    activations = (np.zeros((GROUP_COUNT, 20)),)
+
+    _sucker_multi_arm_controller_kernel(
+        (rod.position_collection,),
+        (rod.director_collection,),
+        (rod.radius,),
+        target_pos,
+        1.0,
+        SUCKER_EPS,
+        activations,
+    )
+
+    np.testing.assert_allclose(
+        activations[0], _reference_activations(rod, target_pos, 1.0)
+    )
+    assert np.all(activations[0] >= 0.0)
+    assert np.all(activations[0] <= SUCKER_A_MAX)
@@ -0,0 +1,192 @@
+"""Tests for the MeshBVH broadphase against the grid and brute force."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.custom_elastica.mesh.mesh_bvh import MeshBVH
+from virtual_field.runtime.custom_elastica.mesh.mesh_contact_utils import Grid
+from virtual_field.runtime.custom_elastica.mesh.mesh_surface import MeshSurface
+from virtual_field.runtime.custom_elastica.mesh.rod_mesh_surface_contact import (
+    RodMeshSurfaceContactGridMethod,
+)
+from virtual_field.runtime.custom_elastica.mesh.sphere_mesh_surface_contact import (
+    SphereMeshSurfaceContact,
+)
+
+pytestmark = pytest.mark.equations
+
+
+class _Rod:
+    rest_lengths = np.array([0.5], dtype=np.float64)
+    radius = np.array([0.05, 0.05], dtype=np.float64)
+
+    def __init__(self) -> None:
+        self.position_collection = np.array(
+            [[0.3, 0.5, 0.7], [0.5, 0.5, 0.5], [-0.02, -0.02, -0.02]],
+            dtype=np.float64,
+        )
+        self.director_collection = np.repeat(np.eye(3)[:, :, None], 2, axis=2)
+        self.mass = np.ones(3, dtype=np.float64)
+        self.velocity_collection = np.zeros((3, 3), dtype=np.float64)
+        self.external_forces = np.zeros((3, 3), dtype=np.float64)
+
+
+@pytest.fixture
+def sphere_surface() -> MeshSurface:
+    pyvista = pytest.importorskip("pyvista")
+    return MeshSurface(pyvista.Sphere(theta_resolution=24, phi_resolution=16))
+
+
+@pytest.fixture
+def thin_box_surface() -> MeshSurface:
+    pyvista = pytest.importorskip("pyvista")
+    return MeshSurface(pyvista.Box(bounds=[0, 1, 0, 1, 0, 0.2]).triangulate())
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+def test_query_box_matches_bruteforce_overlap(
+    sphere_surface: MeshSurface, leaf_size: int
+) -> None:
+    bvh = MeshBVH(sphere_surface, leaf_size=leaf_size)
+    face_lower = sphere_surface.faces.min(axis=1)
+    face_upper = sphere_surface.faces.max(axis=1)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        center = rng.uniform(-0.6, 0.6, 3)
+        half_width = rng.uniform(0.0, 0.3)
+        lower = center - half_width
+        upper = center + half_width
+        expected = np.flatnonzero(
+            np.all(
+                (face_lower <= upper[:, None]) & (face_upper >= lower[:, None]),
+                axis=0,
+            )
+        )
+        np.testing.assert_array_equal(
+            np.sort(bvh.query_box(lower, upper)), expected
+        )
+
+
+def test_find_faces_is_unbounded_and_grows_past_initial_buffers(
+    sphere_surface: MeshSurface,
+) -> None:
+    far_away = np.array([[10.0, 10.5], [10.0, 10.0], [10.0, 10.0]])
+    bvh = MeshBVH(sphere_surface, search_radius=0.01)
+    position_idx, face_idx, element_position = bvh.find_faces(far_away)
+    assert position_idx.size == face_idx.size == 0
+    np.testing.assert_allclose(element_position[:, 0], [10.25, 10.0, 10.0])
+
+    # A query box around the whole mesh returns every face for the element.
+    bvh = MeshBVH(sphere_surface, search_radius=2.0)
+    position_idx, face_idx, _ = bvh.find_faces(np.zeros((3, 2)))
+    np.testing.assert_array_equal(
+        np.sort(face_idx), np.arange(sphere_surface.n_faces)
+    )
+    assert np.all(position_idx == 0)
+
+
+def test_bvh_and_grid_rod_contact_forces_match(
+    thin_box_surface: MeshSurface,
+) -> None:
+    grid_rod = _Rod()
+    bvh_rod = _Rod()
+    grid = Grid(grid_rod, thin_box_surface, grid_dimension=3)
+    bvh = MeshBVH(thin_box_surface, search_radius=0.1)
+
+    RodMeshSurfaceContactGridMethod(k=1e4, nu=0.0, grid=grid).apply_contact(
+        grid_rod, thin_box_surface
+    )
+    RodMeshSurfaceContactGridMethod(k=1e4, nu=0.0, grid=bvh).apply_contact(
+        bvh_rod, thin_box_surface
+    )
+
+    assert np.any(grid_rod.external_forces != 0.0)
+    np.testing.assert_allclose(
+        bvh_rod.external_forces, grid_rod.external_forces, atol=1e-12
+    )
+
+
+def test_bvh_without_search_radius_uses_rod_radius() -> None:
+    pyvista = pytest.importorskip("pyvista")
+    # One large square under the rod, far from all vertices.
+    surface = MeshSurface(
+        pyvista.Plane(i_size=10.0, j_size=10.0, i_resolution=1, j_resolution=1)
+    )
+    rod = _Rod()
+    rod.position_collection[2] = 0.04
+
+    RodMeshSurfaceContactGridMethod(
+        k=1e4, nu=0.0, grid=MeshBVH(surface)
+    ).apply_contact(rod, surface)
+
+    # Both elements sink 0.01 into the plane; their forces are split
+    # between the nodes.
+    element_force = 1e4 * 0.01
+    np.testing.assert_allclose(
+        rod.external_forces,
+        element_force * np.array([[0.0] * 3, [0.0] * 3, [0.5, 1.0, 0.5]]),
+    )
+
+
+def test_bvh_search_radius_must_cover_the_rod(
+    sphere_surface: MeshSurface,
+) -> None:
+    elastica = pytest.importorskip("elastica")
+    rod = elastica.CosseratRod.straight_rod(
+        4,
+        np.zeros(3),
+        np.array([1.0, 0.0, 0.0]),
+        np.array([0.0, 0.0, 1.0]),
+        1.0,
+        0.05,
+        1000.0,
+        youngs_modulus=1.0e6,
+    )
+    with pytest.raises(ValueError, match="search_radius"):
+        MeshBVH(sphere_surface).find_faces(rod.position_collection)
+    with pytest.raises(ValueError, match="search_radius"):
+        MeshBVH(sphere_surface, search_radius=0.0)
+    with pytest.raises(ValueError, match="at least the rod radius"):
+        RodMeshSurfaceContactGridMethod(
+            k=1e4, nu=0.0, grid=MeshBVH(sphere_surface, search_radius=0.01)
+        )._check_systems_validity(rod, sphere_surface)
+    RodMeshSurfaceContactGridMethod(
+        k=1e4, nu=0.0, grid=MeshBVH(sphere_surface)
+    )._check_systems_validity(rod, sphere_surface)
+
+
+def test_sphere_contact_bvh_finds_faces_without_nearby_vertices() -> None:
+    pyvista = pytest.importorskip("pyvista")
+    elastica = pytest.importorskip("elastica")
+    # One large square; the sphere touches its middle, far from all vertices.
+    surface = MeshSurface(
+        pyvista.Plane(i_size=10.0, j_size=10.0, i_resolution=1, j_resolution=1)
+    )
+
+    def _apply(**kwargs) -> np.ndarray:  # noqa: ANN003
+        sphere = elastica.Sphere(np.array([0.0, 0.0, 0.09]), 0.1, 1000.0)
+        SphereMeshSurfaceContact(
+            k=1e4, nu=0.0, search_radius=0.2, **kwargs
+        ).apply_contact(sphere, surface)
+        return sphere.external_forces[:, 0]
+
+    np.testing.assert_array_equal(_apply(), 0.0)
+    force = _apply(bvh=MeshBVH(surface))
+    np.testing.assert_allclose(force, [0.0, 0.0, 2 * 1e4 * 0.01])
+
+
+def test_to_arrays_round_trip(sphere_surface: MeshSurface) -> None:
+    bvh = MeshBVH(sphere_surface, search_radius=0.05)
+    restored = MeshBVH.from_arrays(bvh.to_arrays())
+    position_collection = np.random.default_rng(1).uniform(
+        -0.6, 0.6, size=(3, 21)
+    )
+    for actual, expected in zip(
+        restored.find_faces(position_collection),
+        bvh.find_faces(position_collection),
+    ):
+        np.testing.assert_array_equal(actual, expected)
+    unset = MeshBVH.from_arrays(MeshBVH(sphere_surface).to_arrays())
+    assert unset.search_radius is None
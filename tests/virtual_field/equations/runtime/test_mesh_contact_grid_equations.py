@@ -5,7 +5,10 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
-from virtual_field.runtime.custom_elastica.mesh.mesh_contact_utils import Grid
+from virtual_field.runtime.custom_elastica.mesh.mesh_contact_utils import (
+    BoundaryError,
+    Grid,
+)
 from virtual_field.runtime.custom_elastica.mesh.mesh_surface import MeshSurface
 from virtual_field.runtime.custom_elastica.mesh.rod_mesh_surface_contact import (
     RodMeshSurfaceContactGridMethod,
@@ -15,20 +18,80 @@ from virtual_field.runtime.custom_elastica.mesh.rod_mesh_surface_contact import
 pytestmark = pytest.mark.equations
 
 
+def _packed_grid(cells, n_positions, grid_axes):  # noqa: ANN001, ANN202
+    """Grid of size 10 at the origin whose cells hold the given faces."""
+    dimension = len(n_positions)
+    padding = (0,) * (3 - dimension)
+    n_positions = np.array(n_positions + (1,) * len(padding))
+    cell_sizes = np.zeros(np.prod(n_positions), dtype=np.int64)
+    cell_faces = []
+    for cell, faces in sorted(cells.items()):
+        cell_sizes[np.ravel_multi_index(cell + padding, n_positions)] = len(
+            faces
+        )
+        cell_faces.extend(faces)
+    return Grid.from_arrays(
+        {
+            "dimension": dimension,
+            "n_faces": max(cell_faces, default=-1) + 1,
+            "size": 10.0,
+            "min_point": np.zeros(3),
+            "surface_scale": 1.0,
+            "axes": grid_axes[:2],
+            "n_positions": n_positions,
+            "cell_offsets": np.concatenate([[0], np.cumsum(cell_sizes)]),
+            "cell_faces": np.array(cell_faces, dtype=np.int64),
+            "grid_axes": np.array([*grid_axes, 0][:3], dtype=np.int64),
+            "grid_min": np.zeros(3),
+            "max_faces_per_cell": int(np.max(cell_sizes, initial=0)),
+        }
+    )
+
+
+def _surface_grid(grid):  # noqa: ANN001, ANN202
+    """Faces of each non-empty cell, keyed by the tuple of cell indices."""
+    cells = np.flatnonzero(np.diff(grid.cell_offsets))
+    keys = np.unravel_index(cells, tuple(grid.n_positions))
+    return {
+        key: grid.cell_faces[
+            grid.cell_offsets[cell] : grid.cell_offsets[cell + 1]
+        ]
+        for key, cell in zip(
+            zip(*(key.tolist() for key in keys[: grid.dimension])), cells
+        )
+    }
+
+
+def _dict_walk_find_faces(grid, position_collection):  # noqa: ANN001, ANN202
+    """Reference lookup of every element's nearest grid corner in the cell dict."""
+    surface_grid = _surface_grid(grid)
+    axes = [0, 1, 2] if grid.dimension == 3 else grid.axes
+    element_position = 0.5 * (
+        position_collection[:, 1:] + position_collection[:, :-1]
+    )
+    grid_position = np.round(
+        (element_position[axes] - grid.min_point[axes, None]) / grid.size
+    ).astype(int)
+    position_idx, face_idx = [], []
+    for i, cell in enumerate(grid_position.T):
+        faces = surface_grid.get(tuple(cell.tolist()), [])
+        position_idx.extend([i] * len(faces))
+        face_idx.extend(faces)
+    return (
+        np.array(position_idx, dtype=np.int64),
+        np.array(face_idx, dtype=np.int64),
+        element_position,
+    )
+
+
 def test_find_faces_2d_stacks_position_and_face_indices() -> None:
-    """Regression: chunked concat must preserve (element_idx, face_idx) pairing."""
+    """Regression: the query must preserve (element_idx, face_idx) pairing."""
     position_collection = np.array(
         [[0.0, 1.0, 2.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]], dtype=np.float64
     )
-    surface_grid = {(0, 0): np.array([0, 1], dtype=np.int64)}
-    position_idx, face_idx, element_position = Grid._find_faces_from_2D_grid(
-        surface_grid,
-        0.0,
-        0.0,
-        [0, 1],
-        10.0,
-        position_collection,
-        False,
+    grid = _packed_grid({(0, 0): [0, 1]}, (1, 1), [0, 1])
+    position_idx, face_idx, element_position = grid.find_faces(
+        position_collection
     )
     np.testing.assert_array_equal(position_idx, [0, 0, 1, 1])
     np.testing.assert_array_equal(face_idx, [0, 1, 0, 1])
@@ -39,15 +102,9 @@ def test_find_faces_3d_stacks_position_and_face_indices() -> None:
     position_collection = np.array(
         [[0.0, 1.0, 2.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]], dtype=np.float64
     )
-    surface_grid = {(0, 0, 0): np.array([2], dtype=np.int64)}
-    position_idx, face_idx, element_position = Grid._find_faces_from_3D_grid(
-        surface_grid,
-        0.0,
-        0.0,
-        0.0,
-        10.0,
-        position_collection,
-        False,
+    grid = _packed_grid({(0, 0, 0): [2]}, (1, 1, 1), [0, 1, 2])
+    position_idx, face_idx, element_position = grid.find_faces(
+        position_collection
     )
     np.testing.assert_array_equal(position_idx, [0, 1])
     np.testing.assert_array_equal(face_idx, [2, 2])
@@ -58,14 +115,9 @@ def test_find_faces_3d_empty_when_no_grid_cells() -> None:
     position_collection = np.array(
         [[0.0, 1.0], [0.0, 0.0], [0.0, 0.0]], dtype=np.float64
     )
-    position_idx, face_idx, element_position = Grid._find_faces_from_3D_grid(
-        {},
-        0.0,
-        0.0,
-        0.0,
-        10.0,
-        position_collection,
-        False,
+    grid = _packed_grid({}, (1, 1, 1), [0, 1, 2])
+    position_idx, face_idx, element_position = grid.find_faces(
+        position_collection
     )
     assert position_idx.size == 0 and face_idx.size == 0
     assert element_position.shape == (3, 1)
@@ -165,7 +217,7 @@ def test_grid_find_faces_end_to_end_non_empty(
         grid_dimension=3,
         exit_boundary_condition=False,
     )
-    assert len(grid.surface_grid) > 0
+    assert len(_surface_grid(grid)) > 0
 
     position_collection = np.array(
         [[0.5, 0.5], [0.5, 0.5], [0.1, 0.1]], dtype=np.float64
@@ -176,3 +228,134 @@ def test_grid_find_faces_end_to_end_non_empty(
     assert position_idx.shape == face_idx.shape
     assert element_position.shape[1] == position_collection.shape[1] - 1
     assert position_idx.size > 0
+
+
+def _scan_surface_grid(
+    faces, grid_size, min_point, axes
+):  # noqa: ANN001, ANN202
+    """Reference cell-by-cell scan over all faces (the former O(cells x faces) build)."""
+    face_lower = [np.min(faces[axis], axis=0) for axis in axes]
+    face_upper = [np.max(faces[axis], axis=0) for axis in axes]
+    n_positions = [
+        int(np.ceil((np.max(faces[axis]) - min_point[axis]) / grid_size))
+        for axis in axes
+    ]
+    grid = {}
+    for cell in np.ndindex(*n_positions):
+        overlaps = np.ones(faces.shape[-1], dtype=bool)
+        for dim, axis in enumerate(axes):
+            lower = min_point[axis] + max(0, cell[dim] - 1) * grid_size
+            upper = min_point[axis] + (
+                min(n_positions[dim] - 1, cell[dim] + 1) * grid_size
+            )
+            overlaps &= (face_lower[dim] <= upper) & (face_upper[dim] >= lower)
+        if overlaps.any():
+            grid[cell] = np.where(overlaps)[0]
+    return grid
+
+
+@pytest.mark.parametrize("rest_length", [0.02, 0.1, 0.5])
+@pytest.mark.parametrize(
+    ("grid_dimension", "grid_axes"),
+    [(3, [0, 1]), (2, [0, 1]), (2, [2, 0])],
+)
+def test_sorted_grid_build_matches_cell_scan(
+    rest_length: float, grid_dimension: int, grid_axes: list[int]
+) -> None:
+    pyvista = pytest.importorskip("pyvista")
+    surface = MeshSurface(
+        pyvista.Sphere(theta_resolution=24, phi_resolution=16)
+    )
+
+    class _Rod:
+        rest_lengths = np.array([rest_length], dtype=np.float64)
+        radius = np.array([0.01], dtype=np.float64)
+
+    grid = Grid(
+        _Rod(), surface, grid_dimension=grid_dimension, grid_axes=grid_axes
+    )
+    axes = [0, 1, 2] if grid_dimension == 3 else grid_axes
+    expected = _scan_surface_grid(
+        surface.faces, grid.size, surface.min_point, axes
+    )
+    surface_grid = _surface_grid(grid)
+    assert surface_grid.keys() == expected.keys()
+    for cell, face_indices in expected.items():
+        np.testing.assert_array_equal(surface_grid[cell], face_indices)
+
+
+@pytest.mark.parametrize(
+    ("grid_dimension", "grid_axes"),
+    [(3, [0, 1]), (2, [0, 1]), (2, [2, 1])],
+)
+def test_packed_grid_query_matches_dict_walk(
+    grid_dimension: int, grid_axes: list[int]
+) -> None:
+    pyvista = pytest.importorskip("pyvista")
+    surface = MeshSurface(
+        pyvista.Sphere(theta_resolution=24, phi_resolution=16)
+    )
+
+    class _Rod:
+        rest_lengths = np.array([0.05], dtype=np.float64)
+        radius = np.array([0.01], dtype=np.float64)
+
+    grid = Grid(
+        _Rod(), surface, grid_dimension=grid_dimension, grid_axes=grid_axes
+    )
+    position_collection = np.random.default_rng(0).uniform(
+        -0.6, 0.6, size=(3, 41)
+    )
+    expected = _dict_walk_find_faces(grid, position_collection)
+    result = grid.find_faces(position_collection=position_collection)
+    assert result[0].size > 0
+    for actual, reference in zip(result, expected):
+        np.testing.assert_array_equal(actual, reference)
+
+
+def test_packed_grid_raises_outside_boundary() -> None:
+    pyvista = pytest.importorskip("pyvista")
+    surface = MeshSurface(
+        pyvista.Box(bounds=[0, 1, 0, 1, 0, 0.2]).triangulate()
+    )
+
+    class _Rod:
+        rest_lengths = np.array([0.5], dtype=np.float64)
+        radius = np.array([0.05], dtype=np.float64)
+
+    grid = Grid(_Rod(), surface, exit_boundary_condition=True)
+    position_collection = np.array([[5.0, 5.0], [5.0, 5.0], [5.0, 5.0]])
+    with pytest.raises(BoundaryError):
+        grid.find_faces(position_collection=position_collection)
+
+
+def test_apply_contact_reuses_grid_query_buffers(
+    thin_box_surface: MeshSurface,
+) -> None:
+    class _Rod:
+        rest_lengths = np.array([0.5], dtype=np.float64)
+        radius = np.array([0.05], dtype=np.float64)
+        position_collection = np.array(
+            [[0.4, 0.6], [0.5, 0.5], [-0.02, -0.02]], dtype=np.float64
+        )
+        director_collection = np.repeat(np.eye(3)[:, :, None], 1, axis=2)
+        mass = np.ones(2, dtype=np.float64)
+        velocity_collection = np.zeros((3, 2), dtype=np.float64)
+        external_forces = np.zeros((3, 2), dtype=np.float64)
+
+    rod = _Rod()
+    grid = Grid(rod, thin_box_surface, grid_dimension=3)
+    contact = RodMeshSurfaceContactGridMethod(k=1e4, nu=0.0, grid=grid)
+
+    contact.apply_contact(rod, thin_box_surface)
+    position_buffer = contact._position_idx_buffer
+    element_position = contact.element_position
+    forces = rod.external_forces.copy()
+    assert contact.face_idx_array.size > 0
+    assert np.any(forces != 0.0)
+
+    rod.external_forces[:] = 0.0
+    contact.apply_contact(rod, thin_box_surface)
+    assert contact._position_idx_buffer is position_buffer
+    assert contact.element_position is element_position
+    np.testing.assert_array_equal(rod.external_forces, forces)
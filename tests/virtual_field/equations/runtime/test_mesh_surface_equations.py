@@ -0,0 +1,58 @@
+"""Tests for MeshSurface face arrays built from PyVista connectivity."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.custom_elastica.mesh.mesh_surface import MeshSurface
+
+pytestmark = pytest.mark.equations
+
+
+def _mixed_mesh():  # noqa: ANN202
+    pyvista = pytest.importorskip("pyvista")
+    points = np.array(
+        [
+            [0.0, 0.0, 0.0],
+            [1.0, 0.0, 0.0],
+            [1.0, 1.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [2.0, 0.0, 0.0],
+        ]
+    )
+    # One quad followed by one triangle.
+    faces = np.array([4, 0, 1, 2, 3, 3, 1, 4, 2])
+    return pyvista.PolyData(points, faces)
+
+
+def test_quads_split_into_two_triangles_in_face_order() -> None:
+    mesh = _mixed_mesh()
+    surface = MeshSurface(mesh)
+
+    expected_indices = np.array([[0, 1, 2], [0, 2, 3], [1, 4, 2]])
+    assert surface.n_faces == 3
+    np.testing.assert_array_equal(surface.face_indices, expected_indices.T)
+
+    points = np.asarray(mesh.points, dtype=np.float64)
+    for face, vertices in enumerate(expected_indices):
+        np.testing.assert_array_equal(
+            surface.faces[:, :, face], points[vertices].T
+        )
+        np.testing.assert_allclose(
+            surface.face_centers[:, face], points[vertices].mean(axis=0)
+        )
+    pyvista_normals = np.asarray(mesh.face_normals, dtype=np.float64)
+    np.testing.assert_array_equal(
+        surface.face_normals, pyvista_normals[[0, 0, 1]].T
+    )
+    np.testing.assert_array_equal(surface.min_point, points.min(axis=0))
+    np.testing.assert_array_equal(
+        surface.side_vectors[:, 2, :],
+        surface.faces[:, 2, :] - surface.faces[:, 1, :],
+    )
+
+
+def test_triangulate_faces_rejects_polygons() -> None:
+    with pytest.raises(ValueError, match="triangle and quad"):
+        MeshSurface.triangulate_faces(np.array([5, 0, 1, 2, 3, 4]), 1)
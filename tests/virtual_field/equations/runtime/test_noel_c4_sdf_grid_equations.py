@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.mesh_cache import MeshCache
+from virtual_field.runtime.spirob_elastica.sdf_objects import (
+    SDFObstacleCylinders,
+    obstacle_cylinder_sdf_and_normal,
+)
+from virtual_field.runtime.spirob_elastica.sdf_objects_grid import (
+    CylinderSDFGrid,
+    SDFObstacleCylindersGrid,
+    load_cylinder_sdf_grid,
+)
+
+pytestmark = pytest.mark.equations
+
+
+def _make_obstacles() -> tuple[np.ndarray, ...]:
+    starts = np.array(
+        [[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [0.0, 0.0, 1.5]], dtype=np.float64
+    )
+    directions = np.array(
+        [[0.0, 1.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]], dtype=np.float64
+    )
+    lengths = np.array([1.0, 1.0, 0.75], dtype=np.float64)
+    radii = np.array([0.2, 0.2, 0.15], dtype=np.float64)
+    normals = np.array(
+        [[1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], dtype=np.float64
+    )
+    return starts, directions, lengths, radii, normals
+
+
+def _rod(position: list[float], radius: float) -> SimpleNamespace:
+    positions = np.array(position, dtype=np.float64).reshape(3, 1)
+    return SimpleNamespace(
+        position_collection=positions,
+        velocity_collection=np.zeros_like(positions),
+        external_forces=np.zeros_like(positions),
+        radius=np.array([radius]),
+    )
+
+
+def test_sampled_sdf_is_within_error_bound_of_analytic() -> None:
+    obstacles = _make_obstacles()
+    grid = CylinderSDFGrid.build(*obstacles, spacing=0.02, band=0.3)
+
+    rng = np.random.default_rng(0)
+    for point in rng.uniform([-0.3, -0.3, -0.3], [1.8, 1.3, 1.8], (200, 3)):
+        exact, _, _ = obstacle_cylinder_sdf_and_normal(point, *obstacles)
+        sampled, _ = grid.sample(point)
+        assert abs(sampled - min(exact, grid.band)) <= grid.error_bound
+
+    assert grid.error_bound == pytest.approx(0.5 * np.sqrt(3.0) * 0.02)
+    assert grid.max_error(*obstacles, n_samples=5_000) <= grid.error_bound
+
+
+def test_sampled_normal_matches_analytic_normal_near_surface() -> None:
+    obstacles = _make_obstacles()
+    grid = CylinderSDFGrid.build(*obstacles, spacing=0.01, band=0.3)
+
+    point = np.array([0.25, 0.5, 0.01])
+    _, exact_normal, _ = obstacle_cylinder_sdf_and_normal(point, *obstacles)
+    _, normal = grid.sample(point)
+
+    np.testing.assert_allclose(normal, exact_normal, atol=0.05)
+    assert grid.sample(np.array([10.0, 0.0, 0.0]))[0] == grid.band
+
+
+def test_grid_force_approximates_bruteforce_force() -> None:
+    obstacles = _make_obstacles()
+    exact_state: dict[str, float] = {}
+    grid_state: dict[str, float] = {}
+    exact_rod = _rod([0.3, 0.5, 0.0], 0.15)
+    grid_rod = _rod([0.3, 0.5, 0.0], 0.15)
+
+    SDFObstacleCylinders(
+        *obstacles, tip_penetration_state=exact_state, tip_penetration_key="a"
+    ).apply_forces(exact_rod)
+    SDFObstacleCylindersGrid(
+        *obstacles,
+        tip_penetration_state=grid_state,
+        tip_penetration_key="a",
+        spacing=0.01,
+    ).apply_forces(grid_rod)
+
+    assert exact_rod.external_forces[0, 0] > 0.0
+    np.testing.assert_allclose(
+        grid_rod.external_forces, exact_rod.external_forces, rtol=0.05
+    )
+    assert grid_state["a"] == pytest.approx(exact_state["a"], abs=0.01)
+
+
+def test_grid_force_rebakes_band_for_thicker_rods() -> None:
+    obstacles = _make_obstacles()
+    force = SDFObstacleCylindersGrid(*obstacles, spacing=0.02)
+    assert force.sdf_grid.band == pytest.approx(0.2)
+
+    rod = _rod([0.45, 0.5, 0.0], 0.3)
+    force.apply_forces(rod)
+
+    assert force.sdf_grid.band == pytest.approx(0.3)
+    assert rod.external_forces[0, 0] > 0.0
+
+
+def test_sdf_grid_is_cached_on_disk(tmp_path) -> None:  # noqa: ANN001
+    obstacles = _make_obstacles()
+    cache = MeshCache(tmp_path)
+
+    built = load_cylinder_sdf_grid(*obstacles, spacing=0.05, cache=cache)
+    loaded = load_cylinder_sdf_grid(*obstacles, spacing=0.05, cache=cache)
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert isinstance(loaded.distance, np.memmap)
+    np.testing.assert_array_equal(loaded.distance, built.distance)
+    np.testing.assert_array_equal(loaded.normal, built.normal)
+    np.testing.assert_array_equal(loaded.lower, built.lower)
+    assert (loaded.spacing, loaded.band) == (built.spacing, built.band)
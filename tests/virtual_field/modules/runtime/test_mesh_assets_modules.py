@@ -0,0 +1,134 @@
+import base64
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.mesh_assets import (
+    EXT_MESH_GPU_INSTANCING,
+    KHR_MESH_QUANTIZATION,
+    build_cylinder_gltf_data_uri,
+    build_instanced_cylinders_gltf_data_uri,
+    build_mesh_glb,
+    decode_glb,
+)
+from virtual_field.runtime.orientation import quat_xyzw_to_matrix
+
+pytestmark = pytest.mark.modules
+
+
+def _cylinder(**kwargs) -> tuple[dict, bytes]:  # noqa: ANN003
+    uri = build_cylinder_gltf_data_uri(
+        np.zeros(3),
+        np.array([0.0, 1.0, 0.0]),
+        np.array([1.0, 0.0, 0.0]),
+        length=2.0,
+        radius=0.1,
+        **kwargs,
+    )
+    assert uri.startswith("data:model/gltf-binary;base64,")
+    return decode_glb(base64.b64decode(uri.split(",", 1)[1]))
+
+
+def _read_accessor(gltf: dict, binary: bytes, index: int) -> np.ndarray:
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = {5120: "<i1", 5122: "<i2", 5123: "<u2", 5126: "<f4"}[
+        accessor["componentType"]
+    ]
+    width = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}[accessor["type"]]
+    stride = view.get("byteStride", np.dtype(dtype).itemsize * width)
+    raw = np.frombuffer(
+        binary,
+        dtype=dtype,
+        count=accessor["count"] * stride // np.dtype(dtype).itemsize,
+        offset=view["byteOffset"],
+    )
+    return raw.reshape(accessor["count"], -1)[:, :width]
+
+
+def test_glb_uses_16_bit_indices_and_aligned_views() -> None:
+    gltf, binary = _cylinder()
+    index_accessor = gltf["accessors"][
+        gltf["meshes"][0]["primitives"][0]["indices"]
+    ]
+    assert index_accessor["componentType"] == 5123
+    assert all(view["byteOffset"] % 4 == 0 for view in gltf["bufferViews"])
+    assert gltf["buffers"][0]["byteLength"] <= len(binary)
+    assert "uri" not in gltf["buffers"][0]
+
+
+def test_quantized_glb_round_trips_within_tolerance() -> None:
+    plain, plain_binary = _cylinder()
+    quantized, quantized_binary = _cylinder(quantize=True)
+    assert quantized["extensionsRequired"] == [KHR_MESH_QUANTIZATION]
+    assert len(quantized_binary) < len(plain_binary)
+
+    node = quantized["nodes"][0]
+    positions = (
+        _read_accessor(quantized, quantized_binary, 0) / 32767.0
+    ) * np.asarray(node["scale"]) + np.asarray(node["translation"])
+    expected = _read_accessor(plain, plain_binary, 0)
+    assert np.allclose(positions, expected, atol=2.0e-4)
+    normals = _read_accessor(quantized, quantized_binary, 1) / 127.0
+    assert np.allclose(
+        normals, _read_accessor(plain, plain_binary, 1), atol=1.0e-2
+    )
+
+
+def test_build_mesh_glb_uses_32_bit_indices_for_large_meshes() -> None:
+    vertex_count = 70_000
+    positions = np.random.default_rng(0).normal(size=(vertex_count, 3))
+    normals = np.tile([0.0, 1.0, 0.0], (vertex_count, 1))
+    indices = np.arange(vertex_count - vertex_count % 3)
+    gltf, _ = decode_glb(
+        build_mesh_glb(positions, normals, indices, material={})
+    )
+    assert gltf["accessors"][-1]["componentType"] == 5125
+
+
+def test_instanced_cylinders_match_individual_cylinders() -> None:
+    rng = np.random.default_rng(1)
+    count = 4
+    starts = rng.normal(size=(count, 3))
+    directions = rng.normal(size=(count, 3))
+    normals = rng.normal(size=(count, 3))
+    lengths = rng.uniform(0.5, 2.0, size=count)
+    radii = rng.uniform(0.01, 0.1, size=count)
+    uri = build_instanced_cylinders_gltf_data_uri(
+        starts, directions, normals, lengths, radii
+    )
+    gltf, binary = decode_glb(base64.b64decode(uri.split(",", 1)[1]))
+    assert gltf["extensionsRequired"] == [EXT_MESH_GPU_INSTANCING]
+    attributes = gltf["nodes"][0]["extensions"][EXT_MESH_GPU_INSTANCING][
+        "attributes"
+    ]
+    translations = _read_accessor(gltf, binary, attributes["TRANSLATION"])
+    rotations = _read_accessor(gltf, binary, attributes["ROTATION"])
+    scales = _read_accessor(gltf, binary, attributes["SCALE"])
+    assert translations.shape == (count, 3)
+    unit_positions = _read_accessor(gltf, binary, 0)
+
+    for idx in range(count):
+        single_uri = build_cylinder_gltf_data_uri(
+            starts[idx], directions[idx], normals[idx], lengths[idx], radii[idx]
+        )
+        single, single_binary = decode_glb(
+            base64.b64decode(single_uri.split(",", 1)[1])
+        )
+        rotation = quat_xyzw_to_matrix(rotations[idx].tolist())
+        positions = (unit_positions * scales[idx]) @ rotation.T
+        positions += translations[idx]
+        expected = _read_accessor(single, single_binary, 0)
+        assert np.allclose(positions, expected, atol=1.0e-5)
+
+
+def test_instancing_rejects_quantization() -> None:
+    with pytest.raises(ValueError, match="quantized"):
+        build_mesh_glb(
+            np.zeros((3, 3)),
+            np.tile([0.0, 1.0, 0.0], (3, 1)),
+            np.arange(3),
+            material={},
+            quantize=True,
+            instances=(np.zeros((1, 3)), [[0, 0, 0, 1]], np.ones((1, 3))),
+        )
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.custom_elastica.mesh import Grid, MeshSurface
+from virtual_field.runtime.custom_elastica.mesh.rod_mesh_surface_contact import (
+    RodMeshSurfaceContactGridMethod,
+)
+from virtual_field.runtime.mesh_cache import (
+    DEFAULT_MESH_CACHE_DIR,
+    MESH_CACHE_ENV,
+    MeshCache,
+)
+
+pytestmark = pytest.mark.modules
+
+
+class _Rod:
+    rest_lengths = np.array([0.5], dtype=np.float64)
+    radius = np.array([0.05], dtype=np.float64)
+
+
+def test_store_then_load_returns_read_only_memmaps(tmp_path: Path) -> None:
+    cache = MeshCache(tmp_path)
+    key = "entry-0"
+    assert cache.load(key) is None
+
+    glb = np.frombuffer(b"glTF\x02\x00", dtype=np.uint8)
+    cache.store(key, {"maze": {"glb": glb, "centers": np.eye(3)}})
+
+    groups = cache.load(key)
+    assert groups is not None
+    assert set(groups) == {"maze"}
+    assert isinstance(groups["maze"]["centers"], np.memmap)
+    assert not groups["maze"]["centers"].flags.writeable
+    np.testing.assert_array_equal(groups["maze"]["centers"], np.eye(3))
+    assert groups["maze"]["glb"].tobytes() == glb.tobytes()
+    assert [p.name for p in tmp_path.iterdir()] == [key]
+
+
+def test_key_tracks_source_content_and_params(tmp_path: Path) -> None:
+    cache = MeshCache(tmp_path / "cache")
+    source = tmp_path / "mesh.stl"
+    source.write_bytes(b"solid a")
+
+    key = cache.key("maze", [source], reduction=0.8, center=np.zeros(3))
+    assert key.startswith("maze-")
+    assert key == cache.key("maze", [source], center=np.zeros(3), reduction=0.8)
+    assert key != cache.key("maze", [source], reduction=0.9, center=np.zeros(3))
+
+    source.write_bytes(b"solid b")
+    assert key != cache.key("maze", [source], reduction=0.8, center=np.zeros(3))
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv(MESH_CACHE_ENV, raising=False)
+    assert MeshCache.from_env() == MeshCache(DEFAULT_MESH_CACHE_DIR)
+    monkeypatch.setenv(MESH_CACHE_ENV, "off")
+    assert MeshCache.from_env() is None
+    monkeypatch.setenv(MESH_CACHE_ENV, str(tmp_path))
+    assert MeshCache.from_env() == MeshCache(tmp_path)
+
+
+def test_cached_surface_and_grid_match_fresh_build(tmp_path: Path) -> None:
+    pyvista = pytest.importorskip("pyvista")
+    surface = MeshSurface(
+        pyvista.Box(bounds=[0, 1, 0, 1, 0, 0.2]).triangulate()
+    )
+    grid = Grid(_Rod(), surface, grid_dimension=3)
+
+    cache = MeshCache(tmp_path)
+    cache.store(
+        "box", {"surface": surface.to_arrays(), "grid": grid.to_arrays()}
+    )
+    groups = cache.load("box")
+    assert groups is not None
+    cached_surface = MeshSurface.from_arrays(groups["surface"])
+    cached_grid = Grid.from_arrays(groups["grid"])
+
+    assert cached_surface.n_faces == surface.n_faces
+    np.testing.assert_array_equal(cached_surface.faces, surface.faces)
+    position_collection = np.array(
+        [[0.4, 0.6], [0.5, 0.5], [-0.02, -0.02]], dtype=np.float64
+    )
+    for actual, expected in zip(
+        cached_grid.find_faces(position_collection),
+        grid.find_faces(position_collection),
+    ):
+        np.testing.assert_array_equal(actual, expected)
+
+    # The contact kernels accept the read-only memory-mapped arrays.
+    class _ContactRod(_Rod):
+        position_collection = np.array(
+            [[0.4, 0.6], [0.5, 0.5], [-0.02, -0.02]], dtype=np.float64
+        )
+        director_collection = np.eye(3)[:, :, None]
+        mass = np.ones(2, dtype=np.float64)
+        velocity_collection = np.zeros((3, 2), dtype=np.float64)
+        external_forces = np.zeros((3, 2), dtype=np.float64)
+
+    rod = _ContactRod()
+    RodMeshSurfaceContactGridMethod(
+        k=1e4, nu=0.0, grid=cached_grid
+    ).apply_contact(rod, cached_surface)
+    assert np.any(rod.external_forces != 0.0)
@@ -1,7 +1,9 @@
 import numpy as np
 import pytest
 
+from virtual_field.core.state import MeshEntity
 from virtual_field.runtime.mode_base import OctoArmSimulationBase
+from virtual_field.runtime.two_cr_simulation import TwoCRSimulation
 from virtual_field.runtime.two_gcr_simulation import TwoGCRSimulation
 
 pytestmark = pytest.mark.modules
@@ -166,3 +168,194 @@ def test_two_gcr_control_state_exists_during_build_simulation() -> None:
 
     assert simulation.wave_event_before_post_setup == 0
     assert simulation._grip_wave_event == {"left_arm": 0, "right_arm": 0}
+
+
+def test_static_mesh_registry_reports_only_changed_meshes() -> None:
+    simulation = _DummySimulation(
+        user_id="user_dummy",
+        arm_ids=tuple(f"arm_{index}" for index in range(8)),
+        base_position=_base_position(),
+        dt_internal=0.1,
+    )
+    for name in ("rock", "tree"):
+        simulation.register_static_mesh(
+            MeshEntity(
+                mesh_id=name,
+                owner_id="user_dummy",
+                asset_uri="data:model/gltf-binary;base64,AA==",
+                static_asset=True,
+            )
+        )
+    version = simulation.mesh_version
+    assert simulation.changed_mesh_entities(version) == []
+
+    assert not simulation.update_mesh("rock", visible=True)
+    assert simulation.mesh_version == version
+    rock = simulation.mesh_entities()[0]
+    assert simulation.update_mesh("rock", translation=[1.0, 0.0, 0.0])
+
+    changed = simulation.changed_mesh_entities(version)
+    assert [mesh.mesh_id for mesh in changed] == ["rock"]
+    assert changed[0].translation == [1.0, 0.0, 0.0]
+    assert rock.translation == [0.0, 0.0, 0.0]
+    assert changed[0].asset_uri is rock.asset_uri
+
+
+def _two_cr_simulation() -> TwoCRSimulation:
+    return TwoCRSimulation(
+        user_id="user_dummy",
+        arm_ids=("left_arm", "right_arm"),
+        base_left=[-0.15, 1.0, -0.15],
+        base_right=[0.15, 1.0, -0.15],
+    )
+
+
+def _drive_and_step(simulation: TwoCRSimulation, steps: int) -> np.ndarray:
+    simulation.set_target_pose("left_arm", [0.1, 1.2, -0.4], [0, 0, 0, 1])
+    for _ in range(steps):
+        simulation.step(1.0 / 120.0)
+    return simulation.left_rod.position_collection.copy()
+
+
+def test_reset_restores_rods_in_place() -> None:
+    simulation = _two_cr_simulation()
+    rod = simulation.left_rod
+    initial_positions = rod.position_collection.copy()
+    initial_tip = simulation._target_position["left_arm"].copy()
+
+    first_run = _drive_and_step(simulation, 3)
+    assert not np.allclose(first_run, initial_positions)
+    simulation.reset()
+
+    assert simulation.left_rod is rod
+    assert simulation._time == 0.0
+    np.testing.assert_array_equal(rod.position_collection, initial_positions)
+    np.testing.assert_array_equal(
+        simulation._target_position["left_arm"], initial_tip
+    )
+    np.testing.assert_array_equal(_drive_and_step(simulation, 3), first_run)
+
+
+def test_reset_restores_changed_meshes_and_mode_state() -> None:
+    class _Counting(_DummySimulation):
+        resets: int = 0
+
+        def build_simulation(self) -> None:
+            _DummySimulation.build_simulation(self)
+            for rod in self.rods.values():
+                rod.position_collection = rod.position_collection.copy()
+            self.register_static_mesh(
+                MeshEntity(
+                    mesh_id="rock",
+                    owner_id="user_dummy",
+                    asset_uri="data:model/gltf-binary;base64,AA==",
+                )
+            )
+
+        def reset_mode_state(self) -> None:
+            type(self).resets += 1
+
+    simulation = _Counting(
+        user_id="user_dummy",
+        arm_ids=tuple(f"arm_{index}" for index in range(8)),
+        base_position=_base_position(),
+        dt_internal=0.1,
+    )
+    rock = simulation.mesh_entities()[0]
+    rod = simulation.rods["arm_0"]
+    initial_positions = rod.position_collection.copy()
+    rod.position_collection += 1.0
+    simulation.update_mesh("rock", translation=[1.0, 0.0, 0.0])
+    simulation.step(0.25)
+    version = simulation.mesh_version
+
+    simulation.reset()
+
+    np.testing.assert_array_equal(rod.position_collection, initial_positions)
+    assert simulation.changed_mesh_entities(version) == [rock]
+    assert simulation._time == 0.0
+    assert _Counting.resets == 1
+
+
+class _ControlledSimulation(_DummySimulation):
+    control_calls: list[float]
+    actuation: np.ndarray
+
+    def build_simulation(self) -> None:
+        _DummySimulation.build_simulation(self)
+        self.control_calls = []
+        self.actuation = np.zeros(2, dtype=np.float64)
+
+    def apply_control(self) -> None:
+        self.control_calls.append(self._time)
+        self.actuation[:] = [self._time, -self._time]
+
+    def control_buffers(self) -> list[np.ndarray]:
+        return [self.actuation]
+
+
+def _controlled(**kwargs: object) -> _ControlledSimulation:
+    return _ControlledSimulation(
+        user_id="user_dummy",
+        arm_ids=tuple(f"arm_{index}" for index in range(8)),
+        base_position=_base_position(),
+        dt_internal=0.1,
+        **kwargs,
+    )
+
+
+def test_control_runs_every_substep_by_default() -> None:
+    simulation = _controlled()
+
+    simulation.step(0.4)
+
+    assert simulation.control_calls == pytest.approx([0.0, 0.1, 0.2, 0.3])
+
+
+def test_control_dt_holds_actuation_between_updates() -> None:
+    simulation = _controlled(control_dt=0.2)
+    applied = []
+    stepper = simulation.timestepper
+    simulation.timestepper = type(
+        "RecordingStepper",
+        (),
+        {
+            "step": lambda _, system, time_value, step_dt: (
+                applied.append(simulation.actuation[0])
+                or stepper.step(system, time_value, step_dt)
+            )
+        },
+    )()
+
+    simulation.step(0.6)
+
+    assert simulation.control_calls == pytest.approx([0.0, 0.2, 0.4])
+    assert applied == pytest.approx([0.0, 0.0, 0.2, 0.2, 0.4, 0.4])
+
+
+def test_linear_control_interpolation_ramps_to_latest_output() -> None:
+    simulation = _controlled(control_dt=0.2, control_interpolation="linear")
+    applied = []
+    stepper = simulation.timestepper
+    simulation.timestepper = type(
+        "RecordingStepper",
+        (),
+        {
+            "step": lambda _, system, time_value, step_dt: (
+                applied.append(simulation.actuation.copy())
+                or stepper.step(system, time_value, step_dt)
+            )
+        },
+    )()
+
+    simulation.step(0.6)
+
+    # One control period behind: ramps from the previous to the latest.
+    np.testing.assert_allclose(
+        [value[0] for value in applied], [0.0, 0.0, 0.0, 0.1, 0.2, 0.3]
+    )
+    np.testing.assert_allclose(applied[-1], [0.3, -0.3])
+    with pytest.raises(ValueError, match="control interpolation"):
+        _controlled(control_interpolation="cubic")
+    with pytest.raises(ValueError, match="control_dt"):
+        _controlled(control_dt=0.0)
@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from virtual_field.runtime.mode_base import OctoArmSimulationBase
+from virtual_field.runtime.shared_assets import (
+    SHARED_ASSETS,
+    SharedAssetRegistry,
+    freeze_arrays,
+)
+
+pytestmark = pytest.mark.modules
+
+
+class _SceneryUser(OctoArmSimulationBase):
+    def build_simulation(self) -> None:
+        self.scenery = self.acquire_shared_asset(
+            "test-scenery", lambda: freeze_arrays({"points": np.zeros(3)})
+        )
+        self.rods = {}
+
+    def _initialize_arm_targets(self) -> None:
+        pass
+
+    def handle_commands(self, command) -> None:  # noqa: ANN001
+        _ = command
+
+
+class _BrokenSceneryUser(_SceneryUser):
+    def build_simulation(self) -> None:
+        _SceneryUser.build_simulation(self)
+        raise RuntimeError("build failed")
+
+
+def test_registry_builds_once_and_evicts_after_last_release() -> None:
+    registry = SharedAssetRegistry()
+    builds = []
+
+    def factory() -> list[int]:
+        builds.append(1)
+        return [len(builds)]
+
+    first = registry.acquire("scenery", factory)
+    second = registry.acquire("scenery", factory)
+    assert first is second
+    assert registry.refcount("scenery") == 2 and len(builds) == 1
+
+    registry.release("scenery")
+    assert "scenery" in registry
+    registry.release("scenery")
+    assert "scenery" not in registry and len(registry) == 0
+    with pytest.raises(KeyError):
+        registry.release("scenery")
+
+    assert registry.acquire("scenery", factory) == [2]
+
+
+def test_slow_build_only_blocks_acquirers_of_its_key() -> None:
+    registry = SharedAssetRegistry()
+    registry.acquire("cached", lambda: "cached")
+    started = threading.Event()
+    finish = threading.Event()
+    builds = []
+
+    def slow_factory() -> list[str]:
+        builds.append(1)
+        started.set()
+        assert finish.wait(timeout=10.0)
+        return ["slow"]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(registry.acquire, "slow", slow_factory)
+        assert started.wait(timeout=10.0)
+        second = pool.submit(registry.acquire, "slow", slow_factory)
+
+        # The lock is free while the slow factory runs.
+        assert registry.acquire("cached", lambda: "unused") == "cached"
+        assert registry.acquire("other", lambda: "other") == "other"
+        registry.release("cached")
+        assert not second.done()
+
+        finish.set()
+        assert first.result(timeout=10.0) is second.result(timeout=10.0)
+    assert len(builds) == 1 and registry.refcount("slow") == 2
+
+
+def test_failed_build_is_raised_to_waiters_and_retried() -> None:
+    registry = SharedAssetRegistry()
+    started = threading.Event()
+    finish = threading.Event()
+
+    def failing_factory() -> None:
+        started.set()
+        assert finish.wait(timeout=10.0)
+        raise RuntimeError("mesh missing")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(registry.acquire, "terrain", failing_factory)
+        assert started.wait(timeout=10.0)
+        second = pool.submit(registry.acquire, "terrain", failing_factory)
+        finish.set()
+        for future in (first, second):
+            with pytest.raises(RuntimeError, match="mesh missing"):
+                future.result(timeout=10.0)
+
+    assert "terrain" not in registry
+    assert registry.acquire("terrain", lambda: "terrain") == "terrain"
+
+
+def test_factory_acquiring_its_own_key_raises() -> None:
+    registry = SharedAssetRegistry()
+
+    def recursive_factory() -> None:
+        registry.acquire("terrain", recursive_factory)
+
+    with pytest.raises(ValueError, match="acquired while building"):
+        registry.acquire("terrain", recursive_factory)
+    assert "terrain" not in registry
+
+
+def test_freeze_arrays_marks_attribute_arrays_read_only() -> None:
+    class _Surface:
+        def __init__(self) -> None:
+            self.faces = np.zeros((3, 3, 2))
+            self.n_faces = 2
+
+    surface = freeze_arrays(_Surface())
+    with pytest.raises(ValueError, match="read-only"):
+        surface.faces[0, 0, 0] = 1.0
+
+
+def test_simulations_share_scenery_until_closed() -> None:
+    kwargs = {"arm_ids": ("arm_0",), "base_position": (0.0, 0.0, 0.0)}
+    first = _SceneryUser(user_id="user_a", **kwargs)
+    second = _SceneryUser(user_id="user_b", **kwargs)
+    assert first.scenery is second.scenery
+    assert SHARED_ASSETS.refcount("test-scenery") == 2
+
+    first.close()
+    first.close()
+    assert SHARED_ASSETS.refcount("test-scenery") == 1
+    second.close()
+    assert "test-scenery" not in SHARED_ASSETS
+
+
+def test_failed_build_releases_acquired_scenery() -> None:
+    with pytest.raises(RuntimeError, match="build failed"):
+        _BrokenSceneryUser(
+            user_id="user_a",
+            arm_ids=("arm_0",),
+            base_position=(0.0, 0.0, 0.0),
+        )
+    assert "test-scenery" not in SHARED_ASSETS
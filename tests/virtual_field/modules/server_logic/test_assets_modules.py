@@ -0,0 +1,164 @@
+import base64
+from http import HTTPStatus
+
+import numpy as np
+import pytest
+from websockets.datastructures import Headers
+
+from virtual_field.core.state import MeshEntity
+from virtual_field.server.assets import MeshAssetStore, parse_data_uri
+from virtual_field.server.backends import MultiArmPassThroughBackend
+from virtual_field.server.sharding import ShardedProcessBackend, _ProcessShard
+
+pytestmark = pytest.mark.modules
+
+
+def _data_uri(payload: bytes) -> str:
+    encoded = base64.b64encode(payload).decode("ascii")
+    return f"data:model/gltf-binary;base64,{encoded}"
+
+
+def test_parse_data_uri_reads_base64_and_plain_payloads() -> None:
+    assert parse_data_uri(_data_uri(b"glTF")) == (b"glTF", "model/gltf-binary")
+    assert parse_data_uri("data:,a%20b") == (b"a b", "text/plain")
+    with pytest.raises(ValueError, match="not a data URI"):
+        parse_data_uri("https://example.com/mesh.glb")
+
+
+def test_store_deduplicates_identical_assets() -> None:
+    store = MeshAssetStore()
+    first = store.intern_uri(_data_uri(b"glTF-obstacle"))
+    second = store.intern_uri(_data_uri(b"glTF-obstacle"))
+    assert first == second
+    assert first.startswith("/assets/")
+    assert len(store) == 1
+    assert store.intern_uri(first) == first
+
+
+def test_store_serves_cacheable_assets() -> None:
+    store = MeshAssetStore()
+    path = store.intern_uri(_data_uri(b"glTF"))
+    digest = path.rsplit("/", 1)[1]
+
+    status, headers, body = store.process_request(path, Headers())
+    assert status == HTTPStatus.OK
+    assert body == b"glTF"
+    assert ("Content-Type", "model/gltf-binary") in headers
+    assert ("ETag", f'"{digest}"') in headers
+
+    status, _, body = store.process_request(
+        path, Headers({"If-None-Match": f'"{digest}"'})
+    )
+    assert status == HTTPStatus.NOT_MODIFIED and body == b""
+    assert store.process_request("/assets/0", Headers())[0] == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert store.process_request("/", Headers()) is None
+
+
+def test_backend_interns_mesh_assets() -> None:
+    store = MeshAssetStore()
+    backend = MultiArmPassThroughBackend(asset_store=store)
+    for owner in ("user_a", "user_b"):
+        backend.add_or_update_mesh(
+            MeshEntity(
+                mesh_id=f"{owner}_rock",
+                owner_id=owner,
+                asset_uri=_data_uri(b"glTF-rock"),
+                static_asset=True,
+            )
+        )
+    uris = {mesh.asset_uri for mesh in backend._meshes.values()}
+    assert len(uris) == 1 and next(iter(uris)).startswith("/assets/")
+    assert len(store) == 1
+
+
+def test_backend_prunes_assets_of_removed_users() -> None:
+    store = MeshAssetStore()
+    backend = MultiArmPassThroughBackend(asset_store=store)
+    for owner, payload in (
+        ("user_a", b"glTF-rock"),
+        ("user_a", b"glTF-tree"),
+        ("user_b", b"glTF-rock"),
+    ):
+        backend.add_or_update_mesh(
+            MeshEntity(
+                mesh_id=f"{owner}_{payload.decode()}",
+                owner_id=owner,
+                asset_uri=_data_uri(payload),
+                static_asset=True,
+            )
+        )
+    assert len(store) == 2
+
+    backend.remove_user("user_a")
+    rock = backend._meshes["user_b_glTF-rock"].asset_uri
+    assert len(store) == 1
+    assert store.process_request(rock, Headers())[0] == HTTPStatus.OK
+
+    backend.remove_user("user_b")
+    assert len(store) == 0
+    assert store.intern_uri(_data_uri(b"glTF-rock")) == rock
+    assert len(store) == 1
+
+
+def test_backend_prunes_replaced_and_removed_mesh_assets() -> None:
+    store = MeshAssetStore()
+    backend = MultiArmPassThroughBackend(asset_store=store)
+    paths = []
+    for payload in (b"glTF-frame-0", b"glTF-frame-1"):
+        backend.add_or_update_mesh(
+            MeshEntity(
+                mesh_id="stream",
+                owner_id="publisher",
+                asset_uri=_data_uri(payload),
+            )
+        )
+        paths.append(backend._meshes["stream"].asset_uri)
+    old, new = paths
+
+    assert old != new and len(store) == 1
+    assert store.process_request(old, Headers())[0] == HTTPStatus.NOT_FOUND
+    assert store.process_request(new, Headers())[0] == HTTPStatus.OK
+
+    backend.remove_mesh("stream", owner_id="someone_else")
+    assert len(store) == 1
+    backend.remove_mesh("stream", owner_id="publisher")
+    assert len(store) == 0
+    assert store.process_request(new, Headers())[0] == HTTPStatus.NOT_FOUND
+
+
+def test_sharded_backend_prunes_assets_of_removed_shard_meshes() -> None:
+    store = MeshAssetStore()
+    backend = ShardedProcessBackend(process_count=1, asset_store=store)
+    shard = _ProcessShard(
+        index=0,
+        process=None,  # type: ignore[arg-type]
+        connection=None,  # type: ignore[arg-type]
+        memory=None,  # type: ignore[arg-type]
+        buffer=np.zeros(1),
+    )
+    frame = {
+        "arms": [],
+        "spheres": [],
+        "user_arms": {},
+        "meshes": [
+            MeshEntity(
+                mesh_id="user_a_rock",
+                owner_id="user_a",
+                asset_uri=_data_uri(b"glTF-rock"),
+                static_asset=True,
+            )
+        ],
+        "removed_meshes": [],
+        "haptics": [],
+    }
+    backend._merge_frame(shard, frame)
+    assert len(store) == 1
+
+    backend._merge_frame(
+        shard, {**frame, "meshes": [], "removed_meshes": ["user_a_rock"]}
+    )
+
+    assert "user_a_rock" not in backend._meshes
+    assert len(store) == 0
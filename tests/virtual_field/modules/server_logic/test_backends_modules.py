@@ -1,6 +1,6 @@
 import pytest
 
-from virtual_field.core.commands import ArmCommand
+from virtual_field.core.commands import ArmCommand, MultiArmCommand
 from virtual_field.core.state import MeshEntity, Transform
 from virtual_field.server.backends import MultiArmPassThroughBackend
 
@@ -46,3 +46,125 @@ def test_apply_command_pass_through_ignores_inactive() -> None:
         ),
     )
     assert arm.tip.translation == before
+
+
+def test_snapshot_does_not_advance_and_is_detached() -> None:
+    backend = MultiArmPassThroughBackend()
+    backend.register_user("user_two_cr", character_mode="two-cr")
+    backend.step(0.01, None)
+    timestamp = backend._timestamp
+
+    snapshot = backend.snapshot()
+    backend.add_or_update_mesh(
+        mesh=MeshEntity(
+            mesh_id="mesh_1",
+            owner_id="owner_a",
+            asset_uri="data:model/gltf-binary;base64,AA==",
+        )
+    )
+
+    assert backend._timestamp == timestamp
+    assert snapshot.timestamp == timestamp
+    assert "mesh_1" not in snapshot.meshes
+    assert snapshot.arms.keys() == backend._arms.keys()
+
+
+def test_snapshot_keeps_values_of_entities_updated_later() -> None:
+    backend = MultiArmPassThroughBackend()
+    arm_ids = backend.register_user("user_two_cr", character_mode="two-cr")
+    backend._simulations.pop("user_two_cr", None)
+    backend.add_or_update_mesh(
+        mesh=MeshEntity(
+            mesh_id="mesh_1",
+            owner_id="owner_a",
+            asset_uri="data:model/gltf-binary;base64,AA==",
+        )
+    )
+    snapshot = backend.snapshot()
+    arm = snapshot.arms[arm_ids[0]]
+    tip = arm.tip.translation.copy()
+    centerline = [point.copy() for point in arm.centerline]
+    mesh_translation = snapshot.meshes["mesh_1"].translation.copy()
+
+    backend._apply_command(
+        backend._arms[arm_ids[0]],
+        ArmCommand(
+            arm_id=arm_ids[0],
+            active=True,
+            target=Transform(
+                translation=[2.0, 2.0, 2.0], rotation_xyzw=[0, 0, 0, 1]
+            ),
+            buttons={},
+        ),
+    )
+    assert backend.update_mesh_transform(
+        mesh_id="mesh_1",
+        owner_id="owner_a",
+        translation=[1.0, 2.0, 3.0],
+        visible=False,
+    )
+
+    assert backend._arms[arm_ids[0]].tip.translation == [2.0, 2.0, 2.0]
+    assert backend._meshes["mesh_1"].translation == [1.0, 2.0, 3.0]
+    assert not backend._meshes["mesh_1"].visible
+    assert snapshot.arms[arm_ids[0]].tip.translation == tip
+    assert snapshot.arms[arm_ids[0]].centerline == centerline
+    assert snapshot.meshes["mesh_1"].translation == mesh_translation
+    assert snapshot.meshes["mesh_1"].visible
+
+
+def test_step_only_merges_changed_simulation_meshes() -> None:
+    backend = MultiArmPassThroughBackend()
+    backend.register_user("user_two_cr", character_mode="two-cr")
+    simulation = backend._simulations["user_two_cr"]
+    simulation.register_static_mesh(
+        MeshEntity(
+            mesh_id="mesh_1",
+            owner_id="user_two_cr",
+            asset_uri="data:model/gltf-binary;base64,AA==",
+            static_asset=True,
+        )
+    )
+    backend.step(0.01, None)
+    merged = backend._meshes["mesh_1"]
+
+    backend.step(0.01, None)
+    assert backend._meshes["mesh_1"] is merged
+
+    simulation.update_mesh("mesh_1", visible=False)
+    backend.step(0.01, None)
+    assert backend._meshes["mesh_1"].visible is False
+
+
+def test_reset_user_resets_simulation_in_place() -> None:
+    backend = MultiArmPassThroughBackend()
+    arm_ids = backend.register_user("user_two_cr", character_mode="two-cr")
+    simulation = backend._simulations["user_two_cr"]
+    initial_tip = list(backend._arms[arm_ids[0]].tip.translation)
+    command = ArmCommand(
+        arm_id=arm_ids[0],
+        active=True,
+        target=Transform(
+            translation=[0.2, 1.2, -0.4], rotation_xyzw=[0, 0, 0, 1]
+        ),
+    )
+    backend.step(
+        0.05, MultiArmCommand(timestamp=0.0, commands={arm_ids[0]: command})
+    )
+    backend.add_or_update_mesh(
+        mesh=MeshEntity(
+            mesh_id="user_two_cr_prop",
+            owner_id="user_two_cr",
+            asset_uri="data:model/gltf-binary;base64,AA==",
+        )
+    )
+    assert backend._arms[arm_ids[0]].tip.translation != initial_tip
+
+    assert backend.reset_user("user_two_cr") == arm_ids
+
+    assert backend._simulations["user_two_cr"] is simulation
+    assert backend._arms[arm_ids[0]].tip.translation == initial_tip
+    assert arm_ids[0] not in backend._previous_commands
+    assert "user_two_cr_prop" not in backend._meshes
+    with pytest.raises(ValueError, match="not registered"):
+        backend.reset_user("user_unknown")
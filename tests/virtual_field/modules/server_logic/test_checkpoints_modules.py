@@ -0,0 +1,183 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from virtual_field.core.commands import ArmCommand, MultiArmCommand
+from virtual_field.core.state import Transform
+from virtual_field.server.app import VRWebSocketServer
+from virtual_field.server.backends import (
+    MultiArmPassThroughBackend,
+    build_default_simulation,
+)
+from virtual_field.server.checkpoints import CheckpointStore, read_checkpoint
+from virtual_field.server.template_pool import SimulationTemplatePool
+
+pytestmark = pytest.mark.modules
+
+
+def _drive(backend: MultiArmPassThroughBackend, arm_id: str) -> None:
+    command = ArmCommand(
+        arm_id=arm_id,
+        active=True,
+        target=Transform(
+            translation=[0.2, 1.2, -0.4], rotation_xyzw=[0, 0, 0, 1]
+        ),
+    )
+    for _ in range(3):
+        backend.step(
+            1.0 / 60.0,
+            MultiArmCommand(timestamp=0.0, commands={arm_id: command}),
+        )
+
+
+def test_checkpoint_file_round_trips_simulation_state(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path)
+    simulation = build_default_simulation("user_a", "two-cr")
+    simulation.set_target_pose("user_a_arm_0", [0.1, 1.2, -0.4], [0, 0, 0, 1])
+    simulation.step(0.05)
+
+    store.submit("user_a", "two-cr", simulation)
+    store.close()
+    header, arrays = read_checkpoint(store.path("user_a"))
+    restored = build_default_simulation("user_a", "two-cr")
+
+    assert header["character_mode"] == "two-cr"
+    assert any(isinstance(array, np.memmap) for array in arrays)
+    assert CheckpointStore(tmp_path).restore("user_a", "two-cr", restored)
+    assert restored._time == simulation._time
+    for arm_id in simulation.arm_ids:
+        np.testing.assert_array_equal(
+            restored.rods[arm_id].position_collection,
+            simulation.rods[arm_id].position_collection,
+        )
+        np.testing.assert_array_equal(
+            restored.target_for_arm(arm_id)[0],
+            simulation.target_for_arm(arm_id)[0],
+        )
+    restored.step(0.01)
+    simulation.step(0.01)
+    np.testing.assert_array_equal(
+        restored.left_rod.position_collection,
+        simulation.left_rod.position_collection,
+    )
+
+
+def test_reconnecting_user_resumes_from_checkpoint(tmp_path: Path) -> None:
+    backend = MultiArmPassThroughBackend(
+        checkpoint_store=CheckpointStore(tmp_path)
+    )
+    arm_ids = backend.register_user("user_a", character_mode="two-cr")
+    _drive(backend, arm_ids[0])
+    tip = backend._arms[arm_ids[0]].tip.translation
+    backend.close()
+
+    # A new server process: the store only has the file.
+    backend = MultiArmPassThroughBackend(
+        checkpoint_store=CheckpointStore(tmp_path)
+    )
+    backend.register_user("user_a", character_mode="two-cr")
+    backend.register_user("user_b", character_mode="two-cr")
+
+    assert backend._arms[arm_ids[0]].tip.translation == tip
+    assert backend._simulations["user_b"]._time == 0.0
+    backend.close()
+
+
+def _server(checkpoint_dir: Path) -> VRWebSocketServer:
+    return VRWebSocketServer(
+        ssl_context=None,  # type: ignore[arg-type]
+        host="127.0.0.1",
+        port=0,
+        sim_hz=120.0,
+        publish_hz=30.0,
+        checkpoint_dir=str(checkpoint_dir),
+    )
+
+
+def _hello(server: VRWebSocketServer, **payload: str) -> tuple[str, str]:
+    ack = server._handle_hello(
+        object(),  # type: ignore[arg-type]
+        {"role": "vr_client", "character_mode": "two-cr", **payload},
+    )[0]["payload"]
+    return ack["user_id"], ack["arm_ids"][0]
+
+
+def test_generated_user_ids_are_never_checkpointed(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    user_id, arm_id = _hello(server)
+    named_id, named_arm_id = _hello(server, user_id="alice")
+    _drive(server.backend, arm_id)
+    _drive(server.backend, named_arm_id)
+    server.backend.close()
+
+    # After a restart the counter hands out the same generated id again.
+    server = _server(tmp_path)
+    assert _hello(server)[0] == user_id
+    _hello(server, user_id="alice")
+
+    assert not server.backend.checkpoint_store.path(user_id).exists()
+    assert server.backend._simulations[user_id]._time == 0.0
+    assert server.backend._simulations[named_id]._time > 0.0
+    server.backend.close()
+
+
+def test_checkpoint_of_another_mode_is_ignored(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path)
+    backend = MultiArmPassThroughBackend(checkpoint_store=store)
+    arm_ids = backend.register_user("user_a", character_mode="two-cr")
+    _drive(backend, arm_ids[0])
+    backend.remove_user("user_a")
+
+    backend.register_user("user_a", character_mode="spirobs")
+
+    assert backend._simulations["user_a"]._time == 0.0
+    assert not store.restore(
+        "user_a", "spirobs", build_default_simulation("user_a", "two-cr")
+    )
+    backend.close()
+
+
+def test_pooled_simulation_restores_with_template_arm_ids(
+    tmp_path: Path,
+) -> None:
+    store = CheckpointStore(tmp_path)
+    backend = MultiArmPassThroughBackend(checkpoint_store=store)
+    arm_ids = backend.register_user("user_a", character_mode="two-cr")
+    _drive(backend, arm_ids[0])
+    tip = backend._arms[arm_ids[0]].tip.translation
+    backend.remove_user("user_a")
+    pool = SimulationTemplatePool(
+        build=build_default_simulation, pool_sizes={"two-cr": 1}
+    )
+    pool.fill()
+    backend.template_pool = pool
+
+    backend.register_user("user_a", character_mode="two-cr")
+
+    assert backend.template_pool.ready_count("two-cr") == 0
+    assert backend._arms[arm_ids[0]].tip.translation == tip
+    backend.close()
+
+
+def test_writer_thread_writes_latest_checkpoint(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path, interval=0.02)
+    store.start()
+    backend = MultiArmPassThroughBackend(checkpoint_store=store)
+    arm_ids = backend.register_user("user/a", character_mode="two-cr")
+    _drive(backend, arm_ids[0])
+
+    path = store.path("user/a")
+    assert path.parent == tmp_path
+    deadline = time.monotonic() + 10.0
+    while not path.is_file() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert path.is_file()
+    assert not store.due(backend._timestamp)
+    backend.close()
+    assert read_checkpoint(path)[0]["time"] == pytest.approx(
+        backend._timestamp, abs=1.0e-3
+    )
+    with pytest.raises(ValueError, match="interval"):
+        CheckpointStore(tmp_path, interval=0.0)
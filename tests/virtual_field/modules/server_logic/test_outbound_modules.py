@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from virtual_field.server.outbound import ClientSendQueue
+
+pytestmark = pytest.mark.modules
+
+
+class _BlockingSocket:
+    """Fake websocket whose ``send`` blocks until released."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.release = asyncio.Event()
+        self.closed_code: int | None = None
+
+    async def send(self, message: str) -> None:
+        await self.release.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_code = code
+
+
+async def _exercise_slow_client() -> tuple[_BlockingSocket, ClientSendQueue]:
+    socket = _BlockingSocket()
+    queue = ClientSendQueue(socket)  # type: ignore[arg-type]
+    queue.start()
+    queue.offer_scene_state(lambda: "frame-1")
+    await asyncio.sleep(0)  # sender is now blocked inside send("frame-1")
+    encoded: list[str] = []
+    for index in (2, 3, 4):
+        queue.offer_scene_state(
+            lambda index=index: encoded.append(index) or f"frame-{index}"
+        )
+    queue.send_control("ack-1")
+    queue.send_control("ack-2")
+    socket.release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    await queue.close()
+    assert encoded == [4]
+    return socket, queue
+
+
+def test_send_queue_keeps_newest_frame_and_all_control_messages() -> None:
+    socket, queue = asyncio.run(_exercise_slow_client())
+    assert socket.sent == ["frame-1", "ack-1", "ack-2", "frame-4"]
+    assert queue.dropped_frames == 2
+    assert queue.stats()["sent_frames"] == 2
+    assert queue.stats()["sent_control"] == 2
+
+
+async def _exercise_control_overflow() -> _BlockingSocket:
+    socket = _BlockingSocket()
+    queue = ClientSendQueue(socket, max_control=2)  # type: ignore[arg-type]
+    for index in range(3):
+        queue.send_control(f"ack-{index}")
+    queue.start()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    await queue.close()
+    return socket
+
+
+def test_send_queue_disconnects_instead_of_dropping_control() -> None:
+    socket = asyncio.run(_exercise_control_overflow())
+    assert socket.sent == []
+    assert socket.closed_code == 1013
+
+
+async def _exercise_failing_encoder() -> (
+    tuple[_BlockingSocket, ClientSendQueue]
+):
+    socket = _BlockingSocket()
+    socket.release.set()
+    queue = ClientSendQueue(socket)  # type: ignore[arg-type]
+    queue.start()
+
+    def broken() -> str:
+        raise ValueError("cannot pack arm")
+
+    queue.offer_scene_state(broken)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    queue.send_control("ack-1")
+    queue.offer_scene_state(lambda: "frame-2")
+    for _ in range(5):
+        await asyncio.sleep(0)
+    await queue.close()
+    return socket, queue
+
+
+def test_send_queue_skips_frames_that_fail_to_encode() -> None:
+    socket, queue = asyncio.run(_exercise_failing_encoder())
+    assert socket.sent == ["ack-1", "frame-2"]
+    assert socket.closed_code is None
+    assert queue.failed_frames == 1
+    assert queue.stats()["sent_frames"] == 1
@@ -0,0 +1,162 @@
+import asyncio
+import copy
+
+import pytest
+
+from virtual_field.core.state import (
+    ArmState,
+    MeshEntity,
+    SceneState,
+    SphereEntity,
+    Transform,
+)
+from virtual_field.server.app import VRWebSocketServer
+from virtual_field.server.scene_delta import (
+    DELTA_ENTITY_KINDS,
+    SceneStateDeltaEncoder,
+    entity_changed,
+    scene_state_entities,
+)
+
+pytestmark = pytest.mark.modules
+
+
+def _scene(tip_z: float = 1.0, with_sphere: bool = True) -> SceneState:
+    arm = ArmState(
+        arm_id="user_a_arm_0",
+        owner_user_id="user_a",
+        base=Transform(),
+        tip=Transform(translation=[0.0, 0.0, tip_z]),
+        centerline=[[0.0, 0.0, 0.0], [0.0, 0.0, tip_z]],
+        radii=[0.1],
+    )
+    terrain = MeshEntity(
+        mesh_id="terrain",
+        owner_id="user_a",
+        asset_uri="data:model/gltf+json;base64,AAAA",
+        static_asset=True,
+    )
+    spheres = {}
+    if with_sphere:
+        spheres["ball"] = SphereEntity(
+            sphere_id="ball",
+            owner_id="user_a",
+            translation=[0.0, 1.0, 0.0],
+            radius=0.05,
+        )
+    return SceneState(
+        timestamp=tip_z,
+        arms={arm.arm_id: arm},
+        user_arms={"user_a": [arm.arm_id]},
+        meshes={terrain.mesh_id: terrain},
+        spheres=spheres,
+    )
+
+
+def _encode(encoder: SceneStateDeltaEncoder, scene: SceneState) -> dict:
+    return encoder.encode(scene, scene_state_entities(scene))
+
+
+def _apply(view: dict, payload: dict) -> dict:
+    """Reference client: merge one delta payload into ``view``."""
+    if payload["keyframe"]:
+        view = {kind: {} for kind in DELTA_ENTITY_KINDS}
+    else:
+        view = copy.deepcopy(view)
+    for kind in DELTA_ENTITY_KINDS:
+        for entity_id in payload["removed"].get(kind, []):
+            view[kind].pop(entity_id, None)
+        for entity_id, entity in payload[kind].items():
+            merged = dict(view[kind].get(entity_id, {}))
+            merged.update(entity)
+            view[kind][entity_id] = merged
+    return view
+
+
+def test_entity_changed_respects_tolerance() -> None:
+    assert not entity_changed({"x": [1.0, 2.0]}, {"x": [1.0, 2.00001]}, 1e-4)
+    assert entity_changed({"x": [1.0, 2.0]}, {"x": [1.0, 2.1]}, 1e-4)
+    assert entity_changed({"x": [1.0]}, {"x": [1.0, 2.0]}, 1e-4)
+    assert entity_changed({"visible": True}, {"visible": False}, 1e-4)
+
+
+def test_delta_sends_keyframe_until_acknowledged() -> None:
+    encoder = SceneStateDeltaEncoder()
+    first = _encode(encoder, _scene())
+    second = _encode(encoder, _scene())
+    assert first["keyframe"] and second["keyframe"]
+    assert set(second["arms"]) == {"user_a_arm_0"}
+    assert "asset_uri" in second["meshes"]["terrain"]
+
+
+def test_delta_sends_only_changes_against_acknowledged_baseline() -> None:
+    encoder = SceneStateDeltaEncoder(tolerance=1e-3)
+    keyframe = _encode(encoder, _scene())
+    assert encoder.acknowledge(keyframe["frame_id"])
+
+    idle = _encode(encoder, _scene(tip_z=1.0 + 1e-4))
+    assert not idle["keyframe"]
+    assert idle["baseline_frame_id"] == keyframe["frame_id"]
+    assert idle["arms"] == {} and idle["meshes"] == {}
+
+    moved = _encode(encoder, _scene(tip_z=1.5, with_sphere=False))
+    assert set(moved["arms"]) == {"user_a_arm_0"}
+    assert moved["removed"]["spheres"] == ["ball"]
+    assert moved["meshes"] == {}
+
+
+def test_delta_payloads_reconstruct_scene() -> None:
+    encoder = SceneStateDeltaEncoder(keyframe_interval=4, tolerance=0.0)
+    view: dict = {}
+    for step in range(10):
+        scene = _scene(tip_z=1.0 + 0.1 * step, with_sphere=step % 3 != 0)
+        payload = _encode(encoder, scene)
+        view = _apply(view, payload)
+        encoder.acknowledge(payload["frame_id"])
+        expected = scene_state_entities(scene)
+        for kind in DELTA_ENTITY_KINDS:
+            assert set(view[kind]) == set(expected[kind])
+        assert view["arms"] == expected["arms"]
+        assert view["meshes"]["terrain"]["static_asset"]
+
+
+def test_delta_keyframe_interval_and_asset_reuse() -> None:
+    encoder = SceneStateDeltaEncoder(keyframe_interval=3)
+    payloads = []
+    for _ in range(7):
+        payload = _encode(encoder, _scene())
+        encoder.acknowledge(payload["frame_id"])
+        payloads.append(payload)
+    flags = [payload["keyframe"] for payload in payloads]
+    assert flags == [True, False, False, True, False, False, True]
+    for payload in payloads:
+        if payload["keyframe"]:
+            # Keyframes replace the client view, assets included.
+            assert "asset_uri" in payload["meshes"]["terrain"]
+        else:
+            assert payload["meshes"] == {}
+    # A keyframe names the baseline that deltas use until it is acknowledged.
+    assert payloads[0]["baseline_frame_id"] is None
+    assert payloads[3]["baseline_frame_id"] == payloads[2]["frame_id"]
+
+
+def test_server_routes_scene_state_ack_to_delta_encoder() -> None:
+    server = VRWebSocketServer(ssl_context=None, port=0)
+    websocket = object()
+    responses = server._handle_hello(
+        websocket,  # type: ignore[arg-type]
+        {"role": "spectator", "capabilities": ["delta_scene_state"]},
+    )
+    assert responses[0]["payload"]["scene_state_encoding"] == "delta"
+    session = server._sessions[websocket]
+    assert session.scene_delta is not None
+    payload = _encode(session.scene_delta, _scene())
+
+    asyncio.run(
+        server._handle_raw_message(
+            websocket,
+            '{"version": 1, "type": "scene_state_ack", "payload": {"frame_id": %d}}'
+            % payload["frame_id"],
+        )
+    )
+    assert session.scene_delta.acked_frame_id == payload["frame_id"]
@@ -0,0 +1,124 @@
+import json
+
+import numpy as np
+import pytest
+
+from virtual_field.core.state import (
+    ArmState,
+    HapticEvent,
+    MeshEntity,
+    SceneState,
+    Transform,
+)
+from virtual_field.server.scene_encoding import (
+    SceneStateFrameEncoder,
+    decode_binary_scene_state,
+)
+from virtual_field.server.schema import make_message
+
+pytestmark = pytest.mark.modules
+
+
+def _scene(meshes: list[MeshEntity]) -> SceneState:
+    arm = ArmState(
+        arm_id="user_a_arm_0",
+        owner_user_id="user_a",
+        base=Transform(),
+        tip=Transform(translation=[0.0, 0.0, 1.0]),
+        centerline=[[0.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+        radii=[0.1],
+        element_lengths=[1.0],
+        directors=[[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]],
+        contact_points=[[0.1, 0.2, 0.3]],
+    )
+    return SceneState(
+        timestamp=1.5,
+        arms={arm.arm_id: arm},
+        user_arms={"user_a": [arm.arm_id]},
+        meshes={mesh.mesh_id: mesh for mesh in meshes},
+        haptics=[HapticEvent(arm_id=arm.arm_id, active=True, intensity=0.5)],
+    )
+
+
+def _meshes() -> list[MeshEntity]:
+    return [
+        MeshEntity(
+            mesh_id="terrain",
+            owner_id="user_a",
+            asset_uri="data:model/gltf+json;base64,AAAA",
+            static_asset=True,
+        ),
+        MeshEntity(
+            mesh_id="prop",
+            owner_id="publisher_1",
+            asset_uri="data:model/gltf-binary;base64,AA==",
+            translation=[1.0, 0.0, 0.0],
+        ),
+    ]
+
+
+def test_encoder_matches_per_client_serialization() -> None:
+    scene = _scene(_meshes())
+    reference_sent: set[str] = set()
+    encoder_sent: set[str] = set()
+    for _ in range(2):
+        encoder = SceneStateFrameEncoder(scene)
+        expected = make_message(
+            "scene_state", scene.to_dict_for_client(reference_sent)
+        )
+        assert json.loads(encoder.encode_for_client(encoder_sent)) == expected
+        assert encoder_sent == reference_sent
+    assert json.loads(SceneStateFrameEncoder(scene).encode()) == make_message(
+        "scene_state", scene.to_dict()
+    )
+
+
+def test_encoder_shares_frames_between_up_to_date_clients() -> None:
+    scene = _scene(_meshes())
+    encoder = SceneStateFrameEncoder(scene)
+    first = encoder.encode_for_client({"terrain"})
+    second = encoder.encode_for_client({"terrain"})
+    fresh = encoder.encode_for_client(set())
+
+    assert first is second
+    assert "asset_uri" in json.loads(fresh)["payload"]["meshes"]["terrain"]
+    assert "asset_uri" not in json.loads(first)["payload"]["meshes"]["terrain"]
+
+
+def test_encoder_drops_removed_static_meshes_from_sent_ids() -> None:
+    sent = {"terrain", "gone"}
+    SceneStateFrameEncoder(_scene(_meshes())).encode_for_client(sent)
+    assert sent == {"terrain"}
+
+
+def test_binary_frame_decodes_to_json_payload() -> None:
+    scene = _scene(_meshes())
+    encoder = SceneStateFrameEncoder(scene)
+    frame = encoder.encode_binary_for_client(set())
+    expected = scene.to_dict()
+
+    assert frame[:4] == b"VFSS"
+    assert (len(frame) - 16) % 4 == 0
+    decoded = decode_binary_scene_state(frame)
+    decoded_arms = decoded.pop("arms")
+    expected_arms = expected.pop("arms")
+    assert decoded == expected
+    for arm_id, arm in expected_arms.items():
+        decoded_arm = decoded_arms[arm_id]
+        assert decoded_arm["owner_user_id"] == arm["owner_user_id"]
+        for key in ("centerline", "radii", "directors", "contact_points"):
+            np.testing.assert_allclose(decoded_arm[key], arm[key], rtol=1e-6)
+
+    stripped = decode_binary_scene_state(
+        encoder.encode_binary_for_client({"terrain"})
+    )
+    assert "asset_uri" not in stripped["meshes"]["terrain"]
+
+
+def test_binary_frame_rejects_unknown_version() -> None:
+    frame = bytearray(
+        SceneStateFrameEncoder(_scene([])).encode_binary_for_client(set())
+    )
+    frame[4] = 99
+    with pytest.raises(ValueError, match="unsupported binary"):
+        decode_binary_scene_state(bytes(frame))
@@ -0,0 +1,63 @@
+import pytest
+
+from virtual_field.server.scheduling import FixedRateScheduler
+
+pytestmark = pytest.mark.modules
+
+
+def test_scheduler_sleeps_to_absolute_deadlines() -> None:
+    scheduler = FixedRateScheduler(period=0.01)
+    scheduler.start(now=0.0)
+    # A tick costing 4 ms sleeps 6 ms, not a full period.
+    assert scheduler.tick_done(now=0.004) == pytest.approx(0.006)
+    assert scheduler.tick_done(now=0.013) == pytest.approx(0.007)
+    assert scheduler.stats.ticks == 2
+    assert scheduler.stats.overruns == 0
+    assert scheduler.stats.achieved_hz == pytest.approx(2 / 0.013)
+
+
+def test_scheduler_catch_up_runs_missed_ticks_back_to_back() -> None:
+    scheduler = FixedRateScheduler(period=0.01, policy="catch_up")
+    scheduler.start(now=0.0)
+    # Finishing at 25 ms misses the 10 ms and 20 ms deadlines.
+    assert scheduler.tick_done(now=0.025) == 0.0
+    assert scheduler.tick_done(now=0.026) == 0.0
+    assert scheduler.tick_done(now=0.027) == pytest.approx(0.003)
+    assert scheduler.stats.overruns == 2
+    assert scheduler.stats.dropped_ticks == 0
+    assert scheduler.stats.max_lag == pytest.approx(0.015)
+
+
+def test_scheduler_catch_up_drops_backlog_beyond_limit() -> None:
+    scheduler = FixedRateScheduler(
+        period=0.01, policy="catch_up", max_catch_up=2
+    )
+    scheduler.start(now=0.0)
+    assert scheduler.tick_done(now=0.055) == 0.0
+    assert scheduler.stats.dropped_ticks == 4
+    # The schedule restarts from the late tick.
+    assert scheduler.tick_done(now=0.060) == pytest.approx(0.005)
+
+
+def test_scheduler_skip_drops_missed_ticks() -> None:
+    scheduler = FixedRateScheduler(period=0.01, policy="skip")
+    scheduler.start(now=0.0)
+    assert scheduler.tick_done(now=0.025) == 0.0
+    assert scheduler.stats.dropped_ticks == 1
+    assert scheduler.tick_done(now=0.027) == pytest.approx(0.008)
+
+
+def test_scheduler_roll_stats_returns_finished_window() -> None:
+    scheduler = FixedRateScheduler(period=0.01)
+    scheduler.start(now=0.0)
+    scheduler.tick_done(now=0.001)
+    assert scheduler.roll_stats(0.005, interval=1.0) is None
+    window = scheduler.roll_stats(1.5, interval=1.0)
+    assert window is not None and window.ticks == 1
+    assert scheduler.stats.ticks == 0
+    assert scheduler.report()["target_hz"] == pytest.approx(100.0)
+
+
+def test_scheduler_rejects_unknown_policy() -> None:
+    with pytest.raises(ValueError, match="Unsupported overrun policy"):
+        FixedRateScheduler(period=0.01, policy="sometimes")
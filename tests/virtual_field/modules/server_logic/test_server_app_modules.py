@@ -92,3 +92,31 @@ def test_publisher_message_rejects_update_without_mesh_id() -> None:
     )
     assert responses[0]["type"] == "error"
     assert "requires mesh_id" in responses[0]["payload"]["reason"]
+
+
+def test_hello_negotiates_binary_scene_state_capability() -> None:
+    server = _server()
+    websocket = object()
+    binary = server._handle_hello(
+        websocket,  # type: ignore[arg-type]
+        {"role": "spectator", "capabilities": ["binary_scene_state"]},
+    )
+    plain = server._handle_hello(
+        object(),  # type: ignore[arg-type]
+        {"role": "spectator"},
+    )
+    assert binary[0]["payload"]["scene_state_encoding"] == "binary"
+    assert binary[0]["payload"]["binary_scene_state_version"] == 1
+    assert server._sessions[websocket].scene_state_encoding == "binary"
+    assert plain[0]["payload"]["scene_state_encoding"] == "json"
+
+
+def test_scene_state_for_publish_never_steps_backend() -> None:
+    server = _server()
+    assert server._scene_state_for_publish() is None
+    server._latest_snapshot = server.backend.snapshot()
+    timestamp = server.backend._timestamp
+    for _ in range(3):
+        state = server._scene_state_for_publish()
+    assert state is server._latest_snapshot
+    assert server.backend._timestamp == timestamp
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from virtual_field.core.state import ArmState, SphereEntity, Transform
+from virtual_field.server.backends import MultiArmPassThroughBackend
+from virtual_field.server.packing import (
+    pack_arm_state,
+    pack_sphere,
+    unpack_arm_state,
+    unpack_sphere,
+)
+from virtual_field.server.sharding import ShardedProcessBackend
+
+pytestmark = pytest.mark.modules
+
+
+def _arm() -> ArmState:
+    return ArmState(
+        arm_id="user_a_arm_0",
+        owner_user_id="user_a",
+        base=Transform(translation=[0.1, 1.0, -0.2]),
+        tip=Transform(
+            translation=[0.1, 1.0, 0.3], rotation_xyzw=[0.0, 0.6, 0.0, 0.8]
+        ),
+        centerline=[[0.1, 1.0, -0.2], [0.1, 1.0, 0.05], [0.1, 1.0, 0.3]],
+        radii=[0.02, 0.015],
+        element_lengths=[0.25, 0.25],
+        directors=[
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+            [[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+        ],
+        contact_points=[[0.1, 1.0, 0.3]],
+    )
+
+
+def test_arm_and_sphere_pack_round_trip() -> None:
+    buffer = np.zeros(256, dtype=np.float64)
+    arm = _arm()
+    sphere = SphereEntity(
+        sphere_id="ball",
+        owner_id="user_a",
+        translation=[0.0, 1.2, -0.4],
+        radius=0.05,
+        visible=False,
+    )
+    sphere_offset = pack_arm_state(buffer, 0, arm)
+    end = pack_sphere(buffer, sphere_offset, sphere)
+
+    assert end <= buffer.shape[0]
+    assert unpack_arm_state(buffer, 0, arm.arm_id, "user_a") == arm
+    assert unpack_sphere(buffer, sphere_offset, "ball", "user_a") == sphere
+
+
+def test_pack_arm_state_rejects_small_buffer() -> None:
+    with pytest.raises(ValueError, match="capacity exceeded"):
+        pack_arm_state(np.zeros(8, dtype=np.float64), 0, _arm())
+
+
+def test_sharded_backend_rejects_invalid_configuration() -> None:
+    with pytest.raises(ValueError, match="process_count"):
+        ShardedProcessBackend(process_count=0)
+    backend = ShardedProcessBackend(process_count=1)
+    with pytest.raises(ValueError, match="Unsupported character mode"):
+        backend.register_user("user_invalid", character_mode="unknown-mode")
+    backend.close()
+
+
+@pytest.mark.slow
+def test_sharded_backend_matches_in_process_backend() -> None:
+    reference = MultiArmPassThroughBackend()
+    sharded = ShardedProcessBackend(process_count=2)
+    try:
+        for backend in (reference, sharded):
+            backend.register_user("user_a", character_mode="two-cr")
+            backend.register_user("user_b", character_mode="spirobs")
+        for _ in range(3):
+            expected = reference.step(1.0 / 120.0, None)
+            actual = sharded.step(1.0 / 120.0, None)
+        assert actual.to_dict() == expected.to_dict()
+
+        for backend in (reference, sharded):
+            backend.remove_user("user_a")
+        expected = reference.step(1.0 / 120.0, None)
+        actual = sharded.step(1.0 / 120.0, None)
+        assert actual.to_dict() == expected.to_dict()
+        assert "user_a" not in actual.user_arms
+    finally:
+        sharded.close()
+
+
+@pytest.mark.slow
+def test_sharded_reset_matches_in_process_backend() -> None:
+    reference = MultiArmPassThroughBackend()
+    sharded = ShardedProcessBackend(process_count=1)
+    try:
+        for backend in (reference, sharded):
+            backend.register_user("user_a", character_mode="spirobs")
+            for _ in range(3):
+                backend.step(1.0 / 120.0, None)
+            assert backend.reset_user("user_a") == [
+                "user_a_arm_0",
+                "user_a_arm_1",
+            ]
+        expected = reference.step(1.0 / 120.0, None)
+        actual = sharded.step(1.0 / 120.0, None)
+        assert actual.to_dict() == expected.to_dict()
+        assert set(actual.meshes) == set(expected.meshes)
+    finally:
+        sharded.close()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from virtual_field.server.app import VRWebSocketServer
+from virtual_field.server.backends import MultiArmPassThroughBackend
+from virtual_field.server.stepping import SimulationStepWorker
+
+pytestmark = pytest.mark.modules
+
+
+def test_step_worker_idles_until_active_submission() -> None:
+    worker = SimulationStepWorker(
+        backend=MultiArmPassThroughBackend(), dt=1.0 / 120.0
+    )
+    assert worker.latest_snapshot() is None
+    idle = worker.step_once()
+    assert idle.timestamp == 0.0
+    assert worker.step_count == 0
+
+    worker.submit(None, active=True)
+    snapshot = worker.step_once()
+    assert snapshot.timestamp == pytest.approx(1.0 / 120.0)
+    assert worker.latest_snapshot() is snapshot
+    assert worker.step_count == 1
+
+
+def test_step_worker_snapshot_is_detached_from_backend() -> None:
+    backend = MultiArmPassThroughBackend()
+    arm_ids = backend.register_user("user_two_cr", character_mode="two-cr")
+    worker = SimulationStepWorker(backend=backend, dt=1.0 / 120.0)
+    worker.submit(None)
+    snapshot = worker.step_once()
+    assert snapshot is not None
+
+    backend.remove_user("user_two_cr")
+    assert set(arm_ids) <= set(snapshot.arms)
+    assert snapshot.user_arms["user_two_cr"] == arm_ids
+
+
+def test_step_worker_thread_steps_and_stops() -> None:
+    worker = SimulationStepWorker(
+        backend=MultiArmPassThroughBackend(), dt=1.0 / 500.0
+    )
+    worker.submit(None)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while worker.step_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        worker.stop()
+    assert worker.step_count >= 3
+    assert not worker.running
+
+
+def test_server_rejects_unknown_stepping_mode() -> None:
+    with pytest.raises(ValueError, match="Unsupported stepping mode"):
+        VRWebSocketServer(ssl_context=None, port=0, stepping="fiber")
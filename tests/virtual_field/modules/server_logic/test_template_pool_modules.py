@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from virtual_field.core.commands import ArmCommand, MultiArmCommand
+from virtual_field.core.state import MeshEntity, Transform
+from virtual_field.server.backends import (
+    MultiArmPassThroughBackend,
+    build_default_simulation,
+)
+from virtual_field.server.template_pool import (
+    PooledSimulation,
+    SimulationTemplatePool,
+)
+
+pytestmark = pytest.mark.modules
+
+
+def _pooled_backend(size: int = 1) -> MultiArmPassThroughBackend:
+    pool = SimulationTemplatePool(
+        build=build_default_simulation, pool_sizes={"two-cr": size}
+    )
+    pool.fill()
+    return MultiArmPassThroughBackend(template_pool=pool)
+
+
+def test_register_user_takes_template_with_user_ids() -> None:
+    backend = _pooled_backend()
+    assert backend.template_pool.ready_count("two-cr") == 1
+
+    arm_ids = backend.register_user("user_a", character_mode="two-cr")
+
+    simulation = backend._simulations["user_a"]
+    assert isinstance(simulation, PooledSimulation)
+    assert backend.template_pool.ready_count("two-cr") == 0
+    assert arm_ids == ["user_a_arm_0", "user_a_arm_1"]
+    assert simulation.arm_ids == tuple(arm_ids)
+    assert set(simulation.arm_states()) == set(arm_ids)
+    assert all(
+        state.owner_user_id == "user_a"
+        for state in simulation.arm_states().values()
+    )
+    backend.close()
+
+
+def test_pooled_simulation_translates_commands_and_meshes() -> None:
+    backend = _pooled_backend()
+    arm_ids = backend.register_user("user_a", character_mode="two-cr")
+    simulation = backend._simulations["user_a"]
+    template_arm_id = simulation.simulation.arm_ids[0]
+    target = [0.2, 1.1, 0.3]
+
+    command = ArmCommand(
+        arm_id=arm_ids[0],
+        active=True,
+        target=Transform(translation=target, rotation_xyzw=[0, 0, 0, 1]),
+    )
+    backend.step(
+        0.001, MultiArmCommand(timestamp=0.0, commands={arm_ids[0]: command})
+    )
+    simulation.simulation.register_static_mesh(
+        MeshEntity(
+            mesh_id=f"{simulation.simulation.user_id}_prop",
+            owner_id=simulation.simulation.user_id,
+            asset_uri="data:model/gltf-binary;base64,AA==",
+        )
+    )
+    backend.step(0.001, None)
+
+    position, _ = simulation.simulation.target_for_arm(template_arm_id)
+    assert position.tolist() == target
+    assert backend._meshes["user_a_prop"].owner_id == "user_a"
+    assert set(arm_ids) <= set(backend._arms)
+    assert not any(key.startswith("__template") for key in backend._arms)
+    backend.close()
+
+
+def test_non_default_layout_builds_without_pool() -> None:
+    backend = _pooled_backend()
+
+    backend.register_user("user_a", character_mode="two-cr", base_x=1.0)
+
+    assert not isinstance(backend._simulations["user_a"], PooledSimulation)
+    assert backend.template_pool.ready_count("two-cr") == 1
+    backend.close()
+
+
+def test_background_thread_refills_taken_templates() -> None:
+    pool = SimulationTemplatePool(
+        build=build_default_simulation, pool_sizes={"two-cr": 1}
+    )
+    pool.start()
+    deadline = time.monotonic() + 60.0
+    while pool.ready_count("two-cr") < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.take("two-cr", "user_a") is not None
+
+    while pool.ready_count("two-cr") < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.ready_count("two-cr") == 1
+    assert pool.take("spirobs", "user_b") is None
+    pool.close()
+    assert pool.ready_count("two-cr") == 0
+
+
+def test_failing_builds_disable_pooling_for_the_mode() -> None:
+    def _fail(user_id: str, character_mode: str) -> None:
+        raise RuntimeError("missing scene data")
+
+    pool = SimulationTemplatePool(build=_fail, pool_sizes={"noel-c4": 2})
+    pool.fill()
+
+    assert pool.pool_sizes["noel-c4"] == 0
+    assert pool.take("noel-c4", "user_a") is None